@@ -0,0 +1,92 @@
+"""Benchmark clustering on full-dimensional vs pre-reduced embeddings.
+
+Runs the same KMeans fit, silhouette score and clustering-stability evaluation used by
+the topic modeling pipeline on the full embeddings and on PCA/SVD/Matryoshka reduced
+embeddings, and reports the runtime, the silhouette score and the ARI between the
+reduced-space labels and the full-space labels.
+
+Usage:
+    python experiments/benchmark_dimensionality_reduction.py --embeddings path/to/embeddings.csv
+    python experiments/benchmark_dimensionality_reduction.py --synthetic 20000
+"""
+
+import os
+import sys
+import time
+import argparse
+
+import numpy as np
+import pandas as pd
+from sklearn.cluster import KMeans
+from sklearn.metrics import silhouette_score, adjusted_rand_score
+
+# Set up the root directory and make Viktor's modules importable
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+sys.path.append(root_dir)
+sys.path.append(os.path.join(root_dir, "users", "viktor", "src"))
+
+from modules.embedding_reducer import EmbeddingReducer
+from modules.embedding_utils import parse_embeddings
+
+
+def load_embeddings(args):
+    if args.embeddings:
+        return parse_embeddings(pd.read_csv(args.embeddings)["description_embeddings"])
+    # Synthetic clustered data with the shape of all-mpnet-base-v2 embeddings
+    rng = np.random.default_rng(42)
+    centers = rng.normal(size=(args.n_topics, args.dim))
+    labels = rng.integers(0, args.n_topics, args.synthetic)
+    X = centers[labels] + rng.normal(scale=2.0, size=(args.synthetic, args.dim))
+    return X.astype(np.float32)
+
+
+def run_pipeline(X, n_topics, n_runs, silhouette_sample):
+    start = time.perf_counter()
+    labels = KMeans(n_clusters=n_topics, random_state=42).fit(X).labels_
+    sil = silhouette_score(X, labels, sample_size=min(silhouette_sample, len(X)), random_state=42)
+
+    prev_labels, stability = None, []
+    for i in range(n_runs):
+        run_labels = KMeans(n_clusters=n_topics, max_iter=300, random_state=42 + i).fit(X).labels_
+        if prev_labels is not None:
+            stability.append(adjusted_rand_score(prev_labels, run_labels))
+        prev_labels = run_labels
+    elapsed = time.perf_counter() - start
+    return labels, sil, float(np.mean(stability)) if stability else 1.0, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--embeddings", help="Path to an embeddings.csv from the registry.")
+    parser.add_argument("--synthetic", type=int, default=10000, help="Number of synthetic rows if no file is given.")
+    parser.add_argument("--dim", type=int, default=768)
+    parser.add_argument("--n-topics", type=int, default=10)
+    parser.add_argument("--n-runs", type=int, default=5)
+    parser.add_argument("--components", type=int, nargs="+", default=[32, 64, 128])
+    parser.add_argument("--silhouette-sample", type=int, default=5000)
+    args = parser.parse_args()
+
+    X = load_embeddings(args)
+    print(f"Embeddings: {X.shape[0]} x {X.shape[1]}")
+
+    full_labels, full_sil, full_stab, full_time = run_pipeline(X, args.n_topics, args.n_runs, args.silhouette_sample)
+    rows = [("full", X.shape[1], 0.0, full_time, full_sil, full_stab, 1.0)]
+
+    for method in ("pca", "svd", "matryoshka"):
+        for d in args.components:
+            if d >= X.shape[1]:
+                continue
+            start = time.perf_counter()
+            X_red = EmbeddingReducer(method, d).fit_transform(X)
+            reduce_time = time.perf_counter() - start
+            labels, sil, stab, elapsed = run_pipeline(X_red, args.n_topics, args.n_runs, args.silhouette_sample)
+            rows.append((method, d, reduce_time, elapsed, sil, stab, adjusted_rand_score(full_labels, labels)))
+
+    results = pd.DataFrame(rows, columns=["method", "dim", "reduce_s", "cluster_s", "silhouette", "stability",
+                                          "ari_vs_full"])
+    results["speedup"] = full_time / (results["reduce_s"] + results["cluster_s"])
+    print(results.round(3).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""Benchmark the cold-start import time of the Streamlit pages.
+
+For every page in users/viktor/src/pages, the page's own import statements (without
+streamlit itself, which every page shares) are executed in a fresh interpreter and timed,
+so the measurement covers everything the page pulls in through the managers and modules.
+Each page is measured several times and the median is reported, together with the modules
+contributing the most cumulative import time according to `python -X importtime`.
+
+Usage:
+    python experiments/benchmark_startup.py
+    python experiments/benchmark_startup.py --repeat 5 --output startup_times.csv
+"""
+
+import os
+import ast
+import sys
+import argparse
+import subprocess
+import statistics
+
+import pandas as pd
+
+# Set up the root directory; the pages run with Viktor's src folder as working directory
+root_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), "../"))
+src_dir = os.path.join(root_dir, "users", "viktor", "src")
+pages_dir = os.path.join(src_dir, "pages")
+
+# Imported by every page and by the Streamlit runner before any page
+SHARED_PACKAGES = {"streamlit"}
+
+TIMER = """
+import sys, time
+sys.path.insert(0, {src_dir!r})
+start = time.perf_counter()
+{imports}
+print(time.perf_counter() - start)
+"""
+
+
+def page_imports(path):
+    """Return the top-level import statements of a page, without the shared packages."""
+    with open(path) as f:
+        tree = ast.parse(f.read())
+    statements = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names = [alias for alias in node.names if alias.name.split(".")[0] not in SHARED_PACKAGES]
+            if names:
+                statements.append(ast.unparse(ast.Import(names=names)))
+        elif isinstance(node, ast.ImportFrom) and (node.module or "").split(".")[0] not in SHARED_PACKAGES:
+            statements.append(ast.unparse(node))
+    return statements
+
+
+def time_imports(statements):
+    code = TIMER.format(src_dir=src_dir, imports="\n".join(statements) or "pass")
+    result = subprocess.run([sys.executable, "-c", code], cwd=src_dir, capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def import_times(code):
+    """Cumulative import time per top-level import, from `python -X importtime`."""
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=src_dir,
+                            capture_output=True, text=True, check=True)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        # Only top-level imports, so nested imports are not counted twice
+        if not name.startswith("  "):
+            times[name.strip()] = int(cumulative) / 1e6
+    return times
+
+
+def slowest_imports(statements, top):
+    """The imports of a page with the largest cumulative time, without interpreter start-up."""
+    interpreter = import_times("pass")
+    times = import_times(TIMER.format(src_dir=src_dir, imports="\n".join(statements) or "pass"))
+    rows = [(name, seconds) for name, seconds in times.items() if name not in interpreter]
+    rows.sort(key=lambda row: row[1], reverse=True)
+    return ", ".join(f"{name} {seconds:.2f}s" for name, seconds in rows[:top])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="Measurements per page.")
+    parser.add_argument("--top", type=int, default=3, help="Number of slowest imports listed per page.")
+    parser.add_argument("--output", help="Write the results to this CSV file.")
+    args = parser.parse_args()
+
+    rows = []
+    for page in sorted(os.listdir(pages_dir)):
+        if not page.endswith(".py"):
+            continue
+        statements = page_imports(os.path.join(pages_dir, page))
+        times = [time_imports(statements) for _ in range(args.repeat)]
+        rows.append({
+            "page": page,
+            "median_seconds": statistics.median(times),
+            "max_seconds": max(times),
+            "slowest_imports": slowest_imports(statements, args.top),
+        })
+        print(f"{page}: {rows[-1]['median_seconds']:.3f}s")
+
+    results = pd.DataFrame(rows)
+    print(results.to_string(index=False))
+    if args.output:
+        results.to_csv(args.output, index=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -3,16 +3,80 @@ This module implements the Repository interface using a pandas DataFrame as the
 The DataFrameRepo class provides methods to list and filter job posts stored in a DataFrame.
 """
 
+import os
 import pandas as pd
 from src.interfaces.repository import Repository
 from src.entities.job_post_sample import JobPostSample
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Tuple
+
+
+def listed_times(values: pd.Series) -> pd.Series:
+    """Convert listing times to timestamps; numbers are epoch milliseconds."""
+    if pd.api.types.is_numeric_dtype(values):
+        return pd.to_datetime(values, unit="ms", errors="coerce")
+    return pd.to_datetime(values, errors="coerce")
 
 
 class DataFrameRepo(Repository):
     def __init__(self, data: pd.DataFrame):
         self.data = data
 
+    @classmethod
+    def from_partitions(
+        cls,
+        partitions_folder: str,
+        date_range: Optional[Tuple[Any, Any]] = None,
+        columns: Optional[List[str]] = None,
+    ) -> "DataFrameRepo":
+        """
+        Load job posts from a layout partitioned by listing month.
+
+        The layout has one folder per month, named 'month=YYYY-MM', as written for
+        registered datasets. With a date range, only the months overlapping it are
+        read; the undated 'month=none' partition is then skipped.
+
+        Args:
+            partitions_folder: Folder holding the monthly partitions
+            date_range: Optional (start, end) with start <= original_listed_time < end;
+                either bound may be None
+            columns: Optional columns to load; the embeddings column is never loaded
+
+        Returns:
+            A DataFrameRepo holding the job posts of the overlapping months
+        """
+        start, end = date_range or (None, None)
+        frames = []
+        for name in sorted(os.listdir(partitions_folder)):
+            month = name.removeprefix("month=")
+            if month == name or (date_range and month == "none"):
+                continue
+            if month != "none":
+                period = pd.Period(month, freq="M")
+                if start is not None and period.end_time < pd.Timestamp(start):
+                    continue
+                if end is not None and period.start_time >= pd.Timestamp(end):
+                    continue
+            frame = pd.read_parquet(os.path.join(partitions_folder, name))
+            frames.append(frame.drop(columns="description_embeddings", errors="ignore"))
+        data = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+        if date_range and not data.empty:
+            data = cls._in_date_range(data, date_range)
+        if columns is not None:
+            data = data[[column for column in columns if column in data.columns]]
+        return cls(data)
+
+    @staticmethod
+    def _in_date_range(jobs: pd.DataFrame, date_range: Tuple[Any, Any]) -> pd.DataFrame:
+        """Job posts listed within [start, end); either bound may be None."""
+        start, end = date_range
+        times = listed_times(jobs["original_listed_time"])
+        mask = times.notna()
+        if start is not None:
+            mask &= times >= pd.Timestamp(start)
+        if end is not None:
+            mask &= times < pd.Timestamp(end)
+        return jobs[mask]
+
     def list(self, filters: Optional[Dict[str, Any]] = None) -> JobPostSample:
         """
         Retrieve a list of job posts from the DataFrame, optionally filtered by specified criteria.
@@ -22,6 +86,8 @@ class DataFrameRepo(Repository):
                 - 'industries': List of industries to filter by
                 - 'skills': List of skills to filter by
                 - 'include_companies': List of company names to include
+                - 'date_range': (start, end) listing time range, start inclusive and
+                  end exclusive; either bound may be None
 
         Returns:
             A JobPostSample object, holding JobPost objects matching the filter criteria
@@ -32,6 +98,8 @@ class DataFrameRepo(Repository):
         if not filters:
             return JobPostSample.from_df(self.data)
         jobs = self.data
+        if "date_range" in filters:
+            jobs = self._in_date_range(jobs, filters["date_range"])
         if "industries" in filters:
             selected_industries = filters["industries"]
             jobs = jobs[
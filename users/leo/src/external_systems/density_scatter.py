@@ -0,0 +1,166 @@
+"""Module providing scalable 2-D scatter rendering for large embedding projections.
+
+SVG scatter plots with one marker per point become unusable beyond a few tens of
+thousands of points. This module renders points with WebGL (Scattergl) and, above
+a threshold, replaces the individual markers with a density grid computed by NumPy
+histogramming, overlaid with a small decimated sample of points. Hover labels are
+only requested for points that are actually drawn. When the user zooms in, the
+figure is rebuilt for the new viewport, so only the points inside it are drawn and
+the markers become denser as the visible area shrinks.
+"""
+
+import numpy as np
+import plotly.graph_objects as go
+from typing import Callable, Optional, Sequence, Tuple, Union
+
+HoverText = Union[Sequence[str], Callable[[np.ndarray], Sequence[str]]]
+Viewport = Tuple[Tuple[float, float], Tuple[float, float]]
+
+
+def decimate(
+    n_points: int, max_points: int, random_state: Optional[int] = None
+) -> np.ndarray:
+    """Select at most max_points indices out of n_points, uniformly at random.
+
+    Args:
+        n_points: Total number of points
+        max_points: Maximum number of indices to return
+        random_state: Seed for the random selection
+
+    Returns:
+        Sorted array of selected indices
+    """
+    if n_points <= max_points:
+        return np.arange(n_points)
+    rng = np.random.default_rng(random_state)
+    return np.sort(rng.choice(n_points, max_points, replace=False))
+
+
+def density_grid(
+    data: np.ndarray, bins: int = 256
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Aggregate 2-D points into a regular grid of counts.
+
+    Args:
+        data: Array of shape (n_points, 2)
+        bins: Number of bins per axis
+
+    Returns:
+        Tuple of (counts with shape (bins, bins) indexed [y, x], x centers, y centers)
+    """
+    counts, x_edges, y_edges = np.histogram2d(data[:, 0], data[:, 1], bins=bins)
+    x_centers = (x_edges[:-1] + x_edges[1:]) / 2
+    y_centers = (y_edges[:-1] + y_edges[1:]) / 2
+    return counts.T, x_centers, y_centers
+
+
+def visible_points(
+    data: np.ndarray,
+    x_range: Tuple[float, float],
+    y_range: Tuple[float, float],
+    max_points: int,
+    random_state: Optional[int] = None,
+) -> np.ndarray:
+    """Return indices of (a decimated sample of) the points inside a viewport.
+
+    Used to redraw markers and load hover data when the user zooms in.
+
+    Args:
+        data: Array of shape (n_points, 2)
+        x_range: (min, max) of the visible x axis
+        y_range: (min, max) of the visible y axis
+        max_points: Maximum number of indices to return
+        random_state: Seed for the decimation
+
+    Returns:
+        Sorted array of indices into data
+    """
+    mask = (
+        (data[:, 0] >= x_range[0])
+        & (data[:, 0] <= x_range[1])
+        & (data[:, 1] >= y_range[0])
+        & (data[:, 1] <= y_range[1])
+    )
+    inside = np.flatnonzero(mask)
+    return inside[decimate(len(inside), max_points, random_state)]
+
+
+def _hover_for(hover_text: Optional[HoverText], indices: np.ndarray):
+    if hover_text is None:
+        return None
+    if callable(hover_text):
+        return list(hover_text(indices))
+    return [hover_text[i] for i in indices]
+
+
+def build_scatter(
+    data: np.ndarray,
+    hover_text: Optional[HoverText] = None,
+    max_points: int = 50000,
+    bins: int = 256,
+    overlay_points: int = 5000,
+    random_state: Optional[int] = None,
+    viewport: Optional[Viewport] = None,
+) -> go.Figure:
+    """Build a WebGL scatter plot, switching to a density grid for large inputs.
+
+    Args:
+        data: Array of shape (n_points, 2)
+        hover_text: Labels per point, or a callable that returns labels for an
+            array of indices; only called for the points that are drawn
+        max_points: Largest number of points drawn as individual markers
+        bins: Number of density bins per axis above max_points
+        overlay_points: Number of decimated markers drawn over the density grid
+        random_state: Seed for the decimation
+        viewport: ((x_min, x_max), (y_min, y_max)) of the visible area after a
+            zoom; only the points inside it are drawn and the axes are fixed to it
+
+    Returns:
+        The plotly figure
+    """
+    data = np.asarray(data)
+    if viewport is None:
+        candidates = np.arange(len(data))
+    else:
+        candidates = visible_points(data, viewport[0], viewport[1], len(data))
+    points = data[candidates]
+
+    if len(points) <= max_points:
+        fig = go.Figure(
+            go.Scattergl(
+                x=points[:, 0],
+                y=points[:, 1],
+                mode="markers",
+                text=_hover_for(hover_text, candidates),
+                customdata=candidates,
+            )
+        )
+    else:
+        counts, x_centers, y_centers = density_grid(points, bins)
+        fig = go.Figure(
+            go.Heatmap(
+                x=x_centers,
+                y=y_centers,
+                z=np.log1p(counts),
+                customdata=counts,
+                colorscale="Viridis",
+                hovertemplate="x: %{x:.2f}<br>y: %{y:.2f}<br>points: %{customdata}<extra></extra>",
+                colorbar={"title": "log(1 + count)"},
+            )
+        )
+        indices = candidates[decimate(len(points), overlay_points, random_state)]
+        fig.add_trace(
+            go.Scattergl(
+                x=data[indices, 0],
+                y=data[indices, 1],
+                mode="markers",
+                marker={"size": 3, "color": "white", "opacity": 0.6},
+                text=_hover_for(hover_text, indices),
+                customdata=indices,
+                name="sample",
+            )
+        )
+    if viewport is not None:
+        fig.update_xaxes(range=list(viewport[0]))
+        fig.update_yaxes(range=list(viewport[1]))
+    return fig
@@ -4,6 +4,7 @@ This module implements the Repository interface for storing and retrieving
 embeddings using pandas DataFrames as the storage mechanism.
 """
 
+import numpy as np
 import pandas as pd
 from typing import Optional, Dict, List
 from src.entities.embedding_sample import EmbeddingSample
@@ -14,15 +15,50 @@ class EmbeddingsDfRepo(Repository):
     """Repository implementation that uses pandas DataFrames to store embeddings.
 
     This class provides methods to query and filter embeddings stored in a DataFrame.
+    It can also hold cached 2-D coordinates of the embeddings in the x and y columns,
+    so visualizations of filtered subsets do not need to reduce dimensions again. The
+    coordinates are stored with the key of the reducer that computed them, so they are
+    not reused once the reducer changes.
+
+    The vectors can be kept outside the DataFrame in a 2-D matrix aligned row by row
+    with it, such as a read-only np.memmap. Listed embeddings then hold row views of
+    that matrix and gathers only read the requested rows, so processes opening the
+    same file share its pages instead of each holding a copy. The matrix may be stored
+    compactly as float16, or as int8 with a float32 scale per dimension; listed and
+    gathered vectors are then converted back to float32.
     """
 
-    def __init__(self, embeddings_df: pd.DataFrame):
+    COORDINATE_COLUMNS = ["x", "y"]
+    REDUCER_KEY_COLUMN = "reducer_key"
+
+    def __init__(
+        self,
+        embeddings_df: pd.DataFrame,
+        vectors: Optional[np.ndarray] = None,
+        scales: Optional[np.ndarray] = None,
+    ):
         """Initialize the repository with a DataFrame containing embeddings.
 
         Args:
             embeddings_df: DataFrame containing the embedding data
+            vectors: Optional matrix of shape (len(embeddings_df), n_features) used
+                instead of the vector column; it is referenced, not copied
+            scales: Scale per feature of an int8 vectors matrix
         """
+        if vectors is not None and len(vectors) != len(embeddings_df):
+            raise ValueError("The vectors must be aligned with the embeddings rows")
+        if vectors is not None and (vectors.dtype == np.int8) != (scales is not None):
+            raise ValueError("Scales must be given exactly for int8 vectors")
         self.embeddings_df = embeddings_df
+        self.vectors = vectors
+        self.scales = scales
+
+    def _read_vectors(self, positions) -> np.ndarray:
+        """Rows of the vectors matrix as float32, views when no conversion is needed."""
+        rows = self.vectors[positions]
+        if self.scales is not None:
+            return rows.astype(np.float32) * self.scales
+        return rows.astype(np.float32, copy=False)
 
     def list(
         self, filters: Optional[Dict] = None, job_ids: Optional[List[str]] = None
@@ -36,9 +72,102 @@ class EmbeddingsDfRepo(Repository):
         Returns:
             EmbeddingSample containing the filtered embeddings
         """
-        if not filters:
-            return EmbeddingSample.from_df(self.embeddings_df)
-        embeddings = self.embeddings_df[
-            self.embeddings_df["model_id"] == filters["model_id"]
-        ]
-        return EmbeddingSample.from_df(embeddings[embeddings["job_id"].isin(job_ids)])
+        embeddings_df = self.embeddings_df.drop(
+            columns=[*self.COORDINATE_COLUMNS, self.REDUCER_KEY_COLUMN], errors="ignore"
+        )
+        if filters:
+            embeddings_df = embeddings_df[
+                (embeddings_df["model_id"] == filters["model_id"])
+                & embeddings_df["job_id"].isin(job_ids)
+            ]
+        if self.vectors is not None:
+            positions = self.embeddings_df.index.get_indexer(embeddings_df.index)
+            embeddings_df = embeddings_df.assign(
+                vector=[self._read_vectors(position) for position in positions]
+            )
+        return EmbeddingSample.from_df(embeddings_df)
+
+    def gather_vectors(self, model_id: int, job_ids: List[str]) -> np.ndarray:
+        """Collect the vectors of the given jobs into one matrix.
+
+        With an external vector matrix only the requested rows are read from it.
+
+        Args:
+            model_id: Model whose embeddings to collect
+            job_ids: Job IDs to collect, in the desired order
+
+        Returns:
+            Array of shape (len(job_ids), n_features)
+        """
+        rows = self._rows_for(model_id, job_ids)
+        if len(rows) != len(job_ids):
+            raise ValueError("Every job ID must have an embedding for the model")
+        if self.vectors is not None:
+            return self._read_vectors(self.embeddings_df.index.get_indexer(rows))
+        return np.asarray(self.embeddings_df.loc[rows, "vector"].tolist())
+
+    def _rows_for(self, model_id: int, job_ids: List[str]) -> pd.Index:
+        """Index labels of the rows for model_id, ordered like job_ids."""
+        rows = self.embeddings_df[self.embeddings_df["model_id"] == model_id]
+        index_by_job = pd.Series(rows.index, index=rows["job_id"])
+        return pd.Index(index_by_job.reindex(list(job_ids)).dropna().astype(int))
+
+    def store_coordinates(
+        self,
+        model_id: int,
+        job_ids: List[str],
+        coordinates: np.ndarray,
+        reducer_key: Optional[str] = None,
+    ) -> None:
+        """Store 2-D coordinates for the embeddings of the given jobs.
+
+        Args:
+            model_id: Model whose embeddings the coordinates belong to
+            job_ids: Job IDs, in the same order as the coordinate rows
+            coordinates: Array of shape (len(job_ids), 2)
+            reducer_key: Key of the reducer that computed the coordinates
+        """
+        rows = self._rows_for(model_id, job_ids)
+        if len(rows) != len(job_ids):
+            raise ValueError("Every job ID must have an embedding for the model")
+        for column in self.COORDINATE_COLUMNS:
+            if column not in self.embeddings_df.columns:
+                self.embeddings_df[column] = np.nan
+        if self.REDUCER_KEY_COLUMN not in self.embeddings_df.columns:
+            self.embeddings_df[self.REDUCER_KEY_COLUMN] = pd.Series(
+                None, index=self.embeddings_df.index, dtype=object
+            )
+        self.embeddings_df.loc[rows, self.COORDINATE_COLUMNS] = np.asarray(
+            coordinates
+        )[:, :2]
+        self.embeddings_df.loc[rows, self.REDUCER_KEY_COLUMN] = reducer_key
+
+    def list_coordinates(
+        self, model_id: int, job_ids: List[str], reducer_key: Optional[str] = None
+    ) -> Optional[np.ndarray]:
+        """Retrieve cached 2-D coordinates for the embeddings of the given jobs.
+
+        Args:
+            model_id: Model whose embeddings the coordinates belong to
+            job_ids: Job IDs to retrieve, in the desired order
+            reducer_key: Key of the reducer the coordinates must come from
+
+        Returns:
+            Array of shape (len(job_ids), 2), or None if any coordinate is missing
+            or was computed by another reducer
+        """
+        columns = [*self.COORDINATE_COLUMNS, self.REDUCER_KEY_COLUMN]
+        if not set(columns).issubset(self.embeddings_df.columns):
+            return None
+        rows = self._rows_for(model_id, job_ids)
+        if len(rows) != len(job_ids):
+            return None
+        keys = self.embeddings_df.loc[rows, self.REDUCER_KEY_COLUMN]
+        if not (keys.isna() if reducer_key is None else keys == reducer_key).all():
+            return None
+        coordinates = self.embeddings_df.loc[rows, self.COORDINATE_COLUMNS].to_numpy(
+            dtype=float
+        )
+        if np.isnan(coordinates).any():
+            return None
+        return coordinates
@@ -0,0 +1,79 @@
+"""Module providing a linear pre-reduction step for high-dimensional embeddings.
+
+Clustering and UMAP both scale poorly with the embedding dimension. Reducing the
+768-d sentence embeddings to a few dozen dimensions first keeps most of the
+structure while making the downstream algorithms considerably faster.
+"""
+
+import numpy as np
+from typing import Optional
+from sklearn.decomposition import PCA
+
+
+class PCAAlg:
+    """Randomized PCA or Matryoshka-style truncation of embedding vectors.
+
+    The 'pca' method fits a randomized PCA on the first call to reduce_dimensions
+    and reuses the fitted projection in transform. The 'matryoshka' method keeps the
+    leading dimensions and re-normalizes them, which is only meaningful for models
+    trained with Matryoshka representation learning.
+    """
+
+    METHODS = ("pca", "matryoshka")
+
+    def __init__(
+        self,
+        n_components: int = 50,
+        method: str = "pca",
+        random_state: Optional[int] = None,
+    ):
+        """Initialize the reducer.
+
+        Args:
+            n_components: Target dimensionality
+            method: Either 'pca' or 'matryoshka'
+            random_state: Seed for the randomized PCA solver
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}")
+        self.n_components = n_components
+        self.method = method
+        self.random_state = random_state
+        self.model = None
+
+    def reduce_dimensions(self, data) -> np.ndarray:
+        """Fit the reduction on the data and return the reduced vectors.
+
+        Args:
+            data: Array of shape (n_samples, n_features)
+
+        Returns:
+            Array of shape (n_samples, n_components)
+        """
+        data = np.asarray(data, dtype=np.float32)
+        if self.method == "pca":
+            n_components = min(self.n_components, *data.shape)
+            self.model = PCA(
+                n_components=n_components,
+                svd_solver="randomized",
+                random_state=self.random_state,
+            ).fit(data)
+        return self.transform(data)
+
+    def transform(self, data) -> np.ndarray:
+        """Reduce new data with the already fitted projection.
+
+        Args:
+            data: Array of shape (n_samples, n_features)
+
+        Returns:
+            Array of shape (n_samples, n_components)
+        """
+        data = np.asarray(data, dtype=np.float32)
+        if self.method == "matryoshka":
+            truncated = data[:, : self.n_components]
+            norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+            return truncated / np.where(norms == 0, 1.0, norms)
+        if self.model is None:
+            raise ValueError("reduce_dimensions must be called before transform")
+        return self.model.transform(data)
@@ -1,6 +1,12 @@
+import os
+import json
+import hashlib
+import joblib
+import numpy as np
 from typing import Optional
-import plotly.express as px
 from umap import UMAP
+from src.external_systems.pca import PCAAlg
+from src.external_systems.density_scatter import build_scatter, HoverText, Viewport
 
 
 class UMAPAlg:
@@ -8,13 +14,179 @@ class UMAPAlg:
         self,
         n_components: int = 2,
         random_state: Optional[int] = None,
+        pre_reduction: Optional[PCAAlg] = None,
+        fit_sample_size: Optional[int] = None,
+        cache_dir: Optional[str] = None,
+        dataset_id: Optional[str] = None,
+        model_id: Optional[int] = None,
     ):
+        """Initialize the UMAP reducer.
+
+        The reducer is fitted once on the dataset with fit, optionally on a random
+        subsample of at most fit_sample_size points, and new or filtered points are
+        then projected with transform instead of refitting. When cache_dir is
+        given, the reducer fitted with fit is persisted per (dataset_id, model_id,
+        params) and loaded on construction; the cached reducer is not checked
+        against the data, so both identifiers are required with cache_dir.
+
+        Args:
+            n_components: Number of output dimensions
+            random_state: Seed for UMAP and for drawing the fitting subsample
+            pre_reduction: Optional linear reduction applied before UMAP
+            fit_sample_size: Maximum number of points used to fit the reducer
+            cache_dir: Folder in which fitted reducers are persisted
+            dataset_id: Identifier of the dataset the reducer is fitted on
+            model_id: Identifier of the embedding model
+
+        Raises:
+            ValueError: If cache_dir is given without dataset_id and model_id
+        """
+        if cache_dir is not None and (dataset_id is None or model_id is None):
+            raise ValueError("dataset_id and model_id are required when cache_dir is set")
         self.n_components = n_components
         self.random_state = random_state
+        self.pre_reduction = pre_reduction
+        self.fit_sample_size = fit_sample_size
+        self.cache_dir = cache_dir
+        self.dataset_id = dataset_id
+        self.model_id = model_id
         self.model = UMAP(n_components=n_components, random_state=random_state)
+        self.is_fitted = False
+        self._load_cached()
+
+    @property
+    def cache_key(self) -> str:
+        """Identifier of the fitted reducer for this dataset, model and parameters."""
+        params = {
+            "n_components": self.n_components,
+            "random_state": self.random_state,
+            "fit_sample_size": self.fit_sample_size,
+            "pre_reduction": (
+                None
+                if self.pre_reduction is None
+                else [self.pre_reduction.method, self.pre_reduction.n_components]
+            ),
+        }
+        digest = hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()
+        return f"{self.dataset_id}_{self.model_id}_{digest[:12]}"
+
+    @property
+    def cache_path(self) -> Optional[str]:
+        """Path of the persisted reducer for this dataset, model and parameters."""
+        if self.cache_dir is None:
+            return None
+        return os.path.join(self.cache_dir, f"umap_{self.cache_key}.joblib")
+
+    def _load_cached(self):
+        if self.cache_path and os.path.isfile(self.cache_path):
+            cached = joblib.load(self.cache_path)
+            self.model = cached["model"]
+            self.pre_reduction = cached["pre_reduction"]
+            self.is_fitted = True
+
+    def _save_cached(self):
+        if self.cache_path:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            joblib.dump(
+                {"model": self.model, "pre_reduction": self.pre_reduction},
+                self.cache_path,
+            )
+
+    def _needs_sampling(self, data) -> bool:
+        return self.fit_sample_size is not None and len(data) > self.fit_sample_size
+
+    def fit(self, data):
+        """Fit the reducer on (a subsample of) the data and persist it.
+
+        The data should be the embeddings of the whole dataset, since the persisted
+        reducer is reused for every subset of it.
+
+        Args:
+            data: Array of shape (n_samples, n_features)
+
+        Returns:
+            The fitted UMAPAlg
+        """
+        self._fit(np.asarray(data))
+        self._save_cached()
+        return self
+
+    def _fit(self, data):
+        if self._needs_sampling(data):
+            rng = np.random.default_rng(self.random_state)
+            data = data[rng.choice(len(data), self.fit_sample_size, replace=False)]
+        if self.pre_reduction is not None:
+            data = self.pre_reduction.reduce_dimensions(data)
+        self.model.fit(data)
+        self.is_fitted = True
+
+    def transform(self, data):
+        """Project points with the already fitted reducer.
+
+        Args:
+            data: Array of shape (n_samples, n_features)
+
+        Returns:
+            Array of shape (n_samples, n_components)
+        """
+        if not self.is_fitted:
+            raise ValueError("The reducer must be fitted before calling transform")
+        if self.pre_reduction is not None:
+            data = self.pre_reduction.transform(data)
+        return self.model.transform(data)
 
     def reduce_dimensions(self, data):
-        return self.model.fit_transform(data)
+        """Project the data, fitting the reducer on it first if it is not fitted yet.
+
+        A reducer fitted here is not persisted, as the data may only be a subset of
+        the dataset; use fit for the reducer that is cached and shared.
+
+        Args:
+            data: Array of shape (n_samples, n_features)
+
+        Returns:
+            Array of shape (n_samples, n_components)
+        """
+        data = np.asarray(data)
+        if self.is_fitted:
+            return self.transform(data)
+        if self._needs_sampling(data):
+            self._fit(data)
+            return self.transform(data)
+        # Small enough to fit on everything: keep the exact training embedding
+        if self.pre_reduction is not None:
+            data = self.pre_reduction.reduce_dimensions(data)
+        reduced = self.model.fit_transform(data)
+        self.is_fitted = True
+        return reduced
+
+    def generate_2d_viz(
+        self,
+        data,
+        hover_text: Optional[HoverText] = None,
+        max_points: int = 50000,
+        viewport: Optional[Viewport] = None,
+    ):
+        """Build a WebGL scatter plot of the 2-D data.
+
+        Above max_points the points are aggregated into a density grid with a
+        decimated marker overlay, so the figure stays interactive for very large
+        datasets. Hover labels are only requested for drawn points. After a zoom,
+        the figure is rebuilt for the viewport, drawing only the visible points.
+
+        Args:
+            data: Array of shape (n_samples, 2)
+            hover_text: Labels per point, or a callable returning labels for indices
+            max_points: Largest number of points drawn as individual markers
+            viewport: ((x_min, x_max), (y_min, y_max)) of the zoomed-in area
 
-    def generate_2d_viz(self, data):
-        return px.scatter(x=data[:, 0], y=data[:, 1])
+        Returns:
+            The plotly figure
+        """
+        return build_scatter(
+            data,
+            hover_text=hover_text,
+            max_points=max_points,
+            random_state=self.random_state,
+            viewport=viewport,
+        )
@@ -1,5 +1,52 @@
-def visualize_embeddings(embeddings, dim_reduction):
+from typing import List, Optional
+from src.external_systems.embeddings_df_repo import EmbeddingsDfRepo
+
+
+def visualize_embeddings(
+    embeddings,
+    dim_reduction,
+    embeddings_repo: Optional[EmbeddingsDfRepo] = None,
+    model_id: Optional[int] = None,
+    job_ids: Optional[List[str]] = None,
+    viewport=None,
+):
+    """Project embeddings to 2-D and build the scatter plot.
+
+    The reducer must already be fitted on the embeddings of the whole dataset, so
+    every filtered subset is projected into the same space with transform. When an
+    embeddings repository is given, the 2-D coordinates cached in it for
+    (model_id, job_ids) and the reducer's cache key are reused, so redrawing a
+    filtered subset skips the projection. Missing coordinates are computed and
+    stored for the next call.
+    Redrawing after a zoom passes the visible viewport, so only the points in it
+    are drawn and given hover labels.
+
+    Args:
+        embeddings: Array of shape (n_samples, n_features), ordered like job_ids
+        dim_reduction: Fitted reducer providing transform, cache_key and generate_2d_viz
+        embeddings_repo: Optional repository holding cached coordinates
+        model_id: Model the embeddings were created with
+        job_ids: Job IDs of the embedding rows
+        viewport: Optional ((x_min, x_max), (y_min, y_max)) of the zoomed-in area
+
+    Returns:
+        The generated figure
+
+    Raises:
+        ValueError: If the reducer is not fitted
+    """
     """if not embeddings:
     return False"""
-    reduced_data = dim_reduction.reduce_dimensions(embeddings)
-    return dim_reduction.generate_2d_viz(reduced_data)
+    if not dim_reduction.is_fitted:
+        raise ValueError("The reducer must be fitted on the dataset embeddings first")
+    if embeddings_repo is not None:
+        reducer_key = dim_reduction.cache_key
+        coordinates = embeddings_repo.list_coordinates(model_id, job_ids, reducer_key)
+        if coordinates is None:
+            coordinates = dim_reduction.transform(embeddings)
+            embeddings_repo.store_coordinates(
+                model_id, job_ids, coordinates, reducer_key
+            )
+        return dim_reduction.generate_2d_viz(coordinates, viewport=viewport)
+    reduced_data = dim_reduction.transform(embeddings)
+    return dim_reduction.generate_2d_viz(reduced_data, viewport=viewport)
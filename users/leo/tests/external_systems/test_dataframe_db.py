@@ -79,3 +79,26 @@ def test_repository_list_with_include_company_filter(jobs_df):
     assert jobs_searched.jobs[0].company_name == "company1"
     assert jobs_searched.jobs[1].company_name == "company2"
     assert jobs_searched.jobs[1].skills == "Java, C++"
+
+
+def test_repository_list_with_date_range_filter(jobs_df):
+    repo = DataFrameRepo(jobs_df)
+    jobs_searched = repo.list({"date_range": (pd.Timestamp(2, unit="ms"), None)})
+    assert [job.job_id for job in jobs_searched.jobs] == ["2"]
+
+
+def test_repository_from_partitions_reads_overlapping_months(tmp_path):
+    for month, job_id, listed in [
+        ("2023-12", "1", "2023-12-20"),
+        ("2024-01", "2", "2024-01-10"),
+        ("2024-02", "3", "2024-02-01"),
+    ]:
+        (tmp_path / f"month={month}").mkdir()
+        job = dict(JOB_POST_1, job_id=job_id, original_listed_time=listed)
+        pd.DataFrame([job]).to_parquet(tmp_path / f"month={month}" / "part-0.parquet")
+    # A partition outside the range that cannot be read proves it is skipped
+    (tmp_path / "month=2022-01").mkdir()
+    (tmp_path / "month=2022-01" / "part-0.parquet").write_text("not parquet")
+
+    repo = DataFrameRepo.from_partitions(str(tmp_path), ("2024-01-01", "2024-02-01"))
+    assert repo.data["job_id"].tolist() == ["2"]
@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from unittest import mock
+from src.external_systems.density_scatter import (
+    build_scatter,
+    decimate,
+    density_grid,
+    visible_points,
+)
+
+
+@pytest.fixture
+def points():
+    return np.random.default_rng(0).normal(size=(1000, 2))
+
+
+def test_decimate_small_input():
+    np.testing.assert_array_equal(decimate(5, 10), np.arange(5))
+
+
+def test_decimate_large_input():
+    indices = decimate(1000, 10, random_state=0)
+    assert len(indices) == 10
+    assert len(set(indices)) == 10
+
+
+def test_density_grid_counts_all_points(points):
+    counts, x_centers, y_centers = density_grid(points, bins=16)
+    assert counts.shape == (16, 16)
+    assert counts.sum() == len(points)
+    assert len(x_centers) == len(y_centers) == 16
+
+
+def test_visible_points(points):
+    indices = visible_points(points, (0, 10), (0, 10), max_points=1000)
+    assert np.all(points[indices] >= 0)
+    assert len(visible_points(points, (0, 10), (0, 10), max_points=5)) == 5
+
+
+def test_build_scatter_uses_webgl(points):
+    fig = build_scatter(points, max_points=5000)
+    assert fig.data[0].type == "scattergl"
+    assert len(fig.data[0].x) == 1000
+
+
+def test_build_scatter_density_above_threshold(points):
+    fig = build_scatter(points, max_points=100, bins=8, overlay_points=50)
+    assert fig.data[0].type == "heatmap"
+    assert fig.data[1].type == "scattergl"
+    assert len(fig.data[1].x) == 50
+
+
+def test_hover_text_loaded_only_for_drawn_points(points):
+    hover = mock.Mock(side_effect=lambda idx: [f"job {i}" for i in idx])
+    fig = build_scatter(points, hover_text=hover, max_points=100, overlay_points=20)
+    hover.assert_called_once()
+    assert len(hover.call_args[0][0]) == 20
+    assert len(fig.data[1].text) == 20
+
+
+def test_zoomed_viewport_draws_only_visible_points(points):
+    hover = mock.Mock(side_effect=lambda idx: [f"job {i}" for i in idx])
+    fig = build_scatter(points, hover_text=hover, max_points=500, viewport=((0, 10), (0, 10)))
+    inside = visible_points(points, (0, 10), (0, 10), max_points=len(points))
+    assert fig.data[0].type == "scattergl"
+    np.testing.assert_array_equal(fig.data[0].customdata, inside)
+    np.testing.assert_array_equal(hover.call_args[0][0], inside)
+    assert tuple(fig.layout.xaxis.range) == (0, 10)
+
+
+def test_zoomed_viewport_switches_back_to_markers(points):
+    assert build_scatter(points, max_points=500).data[0].type == "heatmap"
+    fig = build_scatter(points, max_points=500, viewport=((-1, 1), (-1, 1)))
+    assert [trace.type for trace in fig.data] == ["scattergl"]
@@ -1,3 +1,4 @@
+import numpy as np
 import pandas as pd
 import pytest
 from src.external_systems.embeddings_df_repo import EmbeddingsDfRepo
@@ -63,3 +64,86 @@ def test_repository_list_with_filters(embeddings_df):
             embeddings_actual.embeddings[i].model_id == embeddings_expected[i].model_id
         )
         assert embeddings_actual.embeddings[i].vector == embeddings_expected[i].vector
+
+
+def test_store_and_list_coordinates(embeddings_df):
+    repo = EmbeddingsDfRepo(embeddings_df)
+    assert repo.list_coordinates(1, ["1", "2"]) is None
+
+    repo.store_coordinates(1, ["2", "1"], np.array([[2.0, 2.5], [1.0, 1.5]]))
+    np.testing.assert_array_equal(
+        repo.list_coordinates(1, ["1", "2"]), np.array([[1.0, 1.5], [2.0, 2.5]])
+    )
+    assert repo.list_coordinates(2, ["2"]) is None
+
+
+def test_coordinates_of_another_reducer_are_not_listed(embeddings_df):
+    repo = EmbeddingsDfRepo(embeddings_df)
+    repo.store_coordinates(1, ["1", "2"], np.array([[1.0, 1.5], [2.0, 2.5]]), "old")
+    assert repo.list_coordinates(1, ["1", "2"], "new") is None
+    assert repo.list_coordinates(1, ["1", "2"]) is None
+
+    repo.store_coordinates(1, ["1"], np.array([[3.0, 3.5]]), "new")
+    np.testing.assert_array_equal(repo.list_coordinates(1, ["1"], "new"), [[3.0, 3.5]])
+    assert repo.list_coordinates(1, ["1", "2"], "new") is None
+
+
+def test_list_ignores_coordinate_columns(embeddings_df):
+    repo = EmbeddingsDfRepo(embeddings_df)
+    repo.store_coordinates(1, ["1"], np.array([[1.0, 1.5]]), "key")
+    assert len(repo.list().embeddings) == 3
+
+
+def test_store_coordinates_unknown_job(embeddings_df):
+    repo = EmbeddingsDfRepo(embeddings_df)
+    with pytest.raises(ValueError):
+        repo.store_coordinates(1, ["9"], np.array([[1.0, 1.5]]))
+
+
+@pytest.fixture
+def memmap_vectors(tmp_path, embeddings_df):
+    path = tmp_path / "vectors.npy"
+    np.save(path, np.array(embeddings_df["vector"].tolist(), dtype=np.float32))
+    return np.load(path, mmap_mode="r")
+
+
+def test_list_with_external_vectors_returns_row_views(embeddings_df, memmap_vectors):
+    repo = EmbeddingsDfRepo(embeddings_df.drop(columns="vector"), memmap_vectors)
+    embeddings = repo.list({"model_id": 1}, ["2"]).embeddings
+    assert [embedding.id for embedding in embeddings] == [2]
+    assert np.shares_memory(embeddings[0].vector, memmap_vectors)
+    np.testing.assert_allclose(embeddings[0].vector, EMBEDDING_2["vector"], rtol=1e-6)
+
+
+def test_gather_vectors(embeddings_df, memmap_vectors):
+    repo = EmbeddingsDfRepo(embeddings_df.drop(columns="vector"), memmap_vectors)
+    np.testing.assert_allclose(
+        repo.gather_vectors(1, ["2", "1"]),
+        [EMBEDDING_2["vector"], EMBEDDING_1["vector"]],
+        rtol=1e-6,
+    )
+    np.testing.assert_allclose(
+        EmbeddingsDfRepo(embeddings_df).gather_vectors(2, ["2"]),
+        [EMBEDDING_3["vector"]],
+    )
+    with pytest.raises(ValueError):
+        repo.gather_vectors(2, ["1"])
+
+
+def test_external_vectors_must_be_aligned(embeddings_df, memmap_vectors):
+    with pytest.raises(ValueError):
+        EmbeddingsDfRepo(embeddings_df.iloc[:2], memmap_vectors)
+
+
+def test_quantized_vectors_are_rescaled(embeddings_df):
+    vectors = np.array(embeddings_df["vector"].tolist(), dtype=np.float32)
+    scales = np.abs(vectors).max(axis=0) / 127
+    quantized = np.rint(vectors / scales).astype(np.int8)
+    repo = EmbeddingsDfRepo(embeddings_df.drop(columns="vector"), quantized, scales)
+    np.testing.assert_allclose(
+        repo.gather_vectors(1, ["1", "2"]), vectors[:2], atol=0.01
+    )
+    embedding = repo.list({"model_id": 2}, ["2"]).embeddings[0]
+    np.testing.assert_allclose(embedding.vector, EMBEDDING_3["vector"], atol=0.01)
+    with pytest.raises(ValueError):
+        EmbeddingsDfRepo(embeddings_df.drop(columns="vector"), quantized)
@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+from src.external_systems.pca import PCAAlg
+from src.external_systems.umap import UMAPAlg
+
+
+def test_pca_initialization():
+    pca = PCAAlg()
+    assert pca.n_components == 50
+    assert pca.method == "pca"
+
+    with pytest.raises(ValueError):
+        PCAAlg(method="tsne")
+
+
+def test_reduce_dimensions_pca():
+    data = np.random.rand(100, 20)
+    reduced = PCAAlg(n_components=5, random_state=42).reduce_dimensions(data)
+    assert reduced.shape == (100, 5)
+
+
+def test_transform_uses_fitted_projection():
+    data = np.random.rand(100, 20)
+    pca = PCAAlg(n_components=5, random_state=42)
+    reduced = pca.reduce_dimensions(data)
+    np.testing.assert_array_almost_equal(pca.transform(data[:10]), reduced[:10])
+
+
+def test_transform_before_fit():
+    with pytest.raises(ValueError):
+        PCAAlg().transform(np.random.rand(10, 20))
+
+
+def test_reduce_dimensions_matryoshka():
+    data = np.random.rand(10, 20)
+    reduced = PCAAlg(n_components=4, method="matryoshka").reduce_dimensions(data)
+    assert reduced.shape == (10, 4)
+    np.testing.assert_array_almost_equal(np.linalg.norm(reduced, axis=1), np.ones(10))
+
+
+def test_umap_with_pre_reduction():
+    data = np.random.rand(50, 20)
+    umap = UMAPAlg(random_state=42, pre_reduction=PCAAlg(n_components=5))
+    assert umap.reduce_dimensions(data).shape == (50, 2)
@@ -1,5 +1,7 @@
+import os
 import numpy as np
 import pytest
+from unittest import mock
 import plotly.express as px
 from src.external_systems.umap import UMAPAlg
 
@@ -48,3 +50,65 @@ def test_generate_2d_viz_output():
     viz = umap.generate_2d_viz(reduced_data)
     assert viz.data[0].x.shape[0] == 100
     assert viz.data[0].y.shape[0] == 100
+
+
+def test_reduce_dimensions_reuses_fitted_reducer():
+    umap = UMAPAlg(random_state=42)
+    data = np.random.rand(100, 5)
+    umap.reduce_dimensions(data)
+    with mock.patch.object(umap.model, "fit_transform") as fit_transform:
+        subset = umap.reduce_dimensions(data[:10])
+        fit_transform.assert_not_called()
+    assert subset.shape == (10, 2)
+
+
+def test_fit_on_subsample():
+    umap = UMAPAlg(random_state=42, fit_sample_size=50)
+    data = np.random.rand(200, 5)
+    reduced = umap.reduce_dimensions(data)
+    assert reduced.shape == (200, 2)
+    assert umap.model.embedding_.shape == (50, 2)
+
+
+def test_transform_before_fit():
+    with pytest.raises(ValueError):
+        UMAPAlg().transform(np.random.rand(10, 5))
+
+
+def test_fitted_reducer_is_persisted(tmp_path):
+    data = np.random.rand(100, 5)
+    umap = UMAPAlg(random_state=42, cache_dir=str(tmp_path), dataset_id="d", model_id=1)
+    umap.fit(data)
+    assert os.path.isfile(umap.cache_path)
+
+    cached = UMAPAlg(random_state=42, cache_dir=str(tmp_path), dataset_id="d", model_id=1)
+    assert cached.is_fitted
+    np.testing.assert_array_almost_equal(
+        cached.transform(data[:10]), umap.transform(data[:10])
+    )
+
+    other_params = UMAPAlg(
+        random_state=7, cache_dir=str(tmp_path), dataset_id="d", model_id=1
+    )
+    assert not other_params.is_fitted
+
+
+def test_implicit_fit_is_not_persisted(tmp_path):
+    umap = UMAPAlg(random_state=42, cache_dir=str(tmp_path), dataset_id="d", model_id=1)
+    umap.reduce_dimensions(np.random.rand(20, 5))
+    assert umap.is_fitted
+    assert not os.path.exists(umap.cache_path)
+
+
+def test_cache_key_depends_on_parameters():
+    umap = UMAPAlg(random_state=42, dataset_id="d", model_id=1)
+    assert umap.cache_key == UMAPAlg(random_state=42, dataset_id="d", model_id=1).cache_key
+    assert umap.cache_key != UMAPAlg(random_state=7, dataset_id="d", model_id=1).cache_key
+    assert umap.cache_key != UMAPAlg(random_state=42, dataset_id="e", model_id=1).cache_key
+
+
+def test_cache_requires_dataset_and_model(tmp_path):
+    with pytest.raises(ValueError):
+        UMAPAlg(cache_dir=str(tmp_path), model_id=1)
+    with pytest.raises(ValueError):
+        UMAPAlg(cache_dir=str(tmp_path), dataset_id="d")
@@ -25,3 +25,41 @@ def test_visualize_embeddings_with_parameters(vector_2d):
     embeddings = np.random.rand(100, 100)
     actual_viz = visualize_embeddings(embeddings, umap)
     assert actual_viz == expected_viz
+
+
+def test_visualize_embeddings_reuses_cached_coordinates(vector_2d):
+    umap = mock.Mock(cache_key="d_1_abc")
+    umap.transform.return_value = vector_2d
+    repo = mock.Mock()
+    repo.list_coordinates.return_value = None
+    job_ids = [str(i) for i in range(100)]
+    embeddings = np.random.rand(100, 100)
+
+    visualize_embeddings(embeddings, umap, repo, model_id=1, job_ids=job_ids)
+    umap.transform.assert_called_once()
+    repo.store_coordinates.assert_called_once_with(1, job_ids, vector_2d, "d_1_abc")
+
+    repo.list_coordinates.return_value = vector_2d[:10]
+    visualize_embeddings(embeddings[:10], umap, repo, model_id=1, job_ids=job_ids[:10])
+    repo.list_coordinates.assert_called_with(1, job_ids[:10], "d_1_abc")
+    umap.transform.assert_called_once()
+    umap.fit.assert_not_called()
+    umap.reduce_dimensions.assert_not_called()
+    np.testing.assert_array_equal(
+        umap.generate_2d_viz.call_args[0][0], vector_2d[:10]
+    )
+
+
+def test_visualize_embeddings_passes_viewport(vector_2d):
+    umap = mock.Mock()
+    umap.transform.return_value = vector_2d
+    viewport = ((0, 0.5), (0, 0.5))
+    visualize_embeddings(np.random.rand(100, 100), umap, viewport=viewport)
+    assert umap.generate_2d_viz.call_args[1]["viewport"] == viewport
+
+
+def test_visualize_embeddings_requires_fitted_reducer():
+    umap = mock.Mock(is_fitted=False)
+    with pytest.raises(ValueError):
+        visualize_embeddings(np.random.rand(10, 5), umap)
+    umap.fit.assert_not_called()
@@ -6,6 +6,7 @@ from .files import reports_folder_path
 from .files import registry_file_path
 from .files import registry_folder_path
 from .files import keywords_folder_path
+from .files import jobs_file_path
 
 # from pathlib import Path
 
@@ -33,6 +34,40 @@ class Config():
 
         self._registry_file = registry_file_path
 
+        # Significance level for flagging drift when assigning new postings to a saved topic model
+        self._drift_p_value_threshold = 0.01
+
+        # Optional dimensionality reduction before clustering: None, 'pca', 'svd' or 'matryoshka'
+        self._reduction_method = None
+        self._reduction_components = 64
+
+        # Softmax temperature for the box plot keyword features
+        self._box_plots_temperature = 0.5
+
+        # Storage type of the memory-mapped embedding matrices: 'float32', 'float16' or 'int8'
+        self._embedding_storage_dtype = 'float32'
+
+        # Memory budget of the process-wide dataset cache shared by the managers, in bytes
+        self._dataset_cache_bytes = 2 * 1024 ** 3
+
+        # Disk budget of the memoized report folders in the reports folder, in bytes
+        self._report_cache_bytes = 5 * 1024 ** 3
+
+        # Disk budget of the cached word cloud layouts in the reports folder, in bytes
+        self._wordcloud_cache_bytes = 256 * 1024 ** 2
+
+        # Background job queue: database, number of worker processes and running jobs allowed per job type
+        self._jobs_file = jobs_file_path
+        self._job_workers = 2
+        self._job_concurrency_limits = {'esco_analysis': 1}
+
+        # Processes rendering the topic model figures and word cloud groups; one metrics panel instead of a chart per metric
+        self._visualization_workers = 4
+        self._combined_metrics_panel = False
+
+        # Processes tokenizing and smoothing in the Word2Vec keyword trend analysis; -1 uses all CPUs
+        self._trend_workers = -1
+
         # Column renames
 
         self._COLUMN_RENAMES = {
@@ -100,6 +135,62 @@ class Config():
     def registry_file(self):
         return self._registry_file
     
+    @property
+    def drift_p_value_threshold(self):
+        return self._drift_p_value_threshold
+
+    @property
+    def reduction_method(self):
+        return self._reduction_method
+
+    @property
+    def reduction_components(self):
+        return self._reduction_components
+
+    @property
+    def box_plots_temperature(self):
+        return self._box_plots_temperature
+
+    @property
+    def embedding_storage_dtype(self):
+        return self._embedding_storage_dtype
+
+    @property
+    def dataset_cache_bytes(self):
+        return self._dataset_cache_bytes
+
+    @property
+    def report_cache_bytes(self):
+        return self._report_cache_bytes
+
+    @property
+    def wordcloud_cache_bytes(self):
+        return self._wordcloud_cache_bytes
+
+    @property
+    def jobs_file(self):
+        return self._jobs_file
+
+    @property
+    def job_workers(self):
+        return self._job_workers
+
+    @property
+    def job_concurrency_limits(self):
+        return self._job_concurrency_limits
+
+    @property
+    def visualization_workers(self):
+        return self._visualization_workers
+
+    @property
+    def combined_metrics_panel(self):
+        return self._combined_metrics_panel
+
+    @property
+    def trend_workers(self):
+        return self._trend_workers
+
     @property
     def COLUMN_RENAMES(self):
         return self._COLUMN_RENAMES
@@ -195,6 +286,105 @@ class Config():
         else:
             raise ValueError("registry_file must be a string or Path object.")
         
+    @drift_p_value_threshold.setter
+    def drift_p_value_threshold(self, value):
+        if isinstance(value, float) and 0 < value < 1:
+            self._drift_p_value_threshold = value
+        else:
+            raise ValueError("drift_p_value_threshold must be a float between 0 and 1.")
+
+    @reduction_method.setter
+    def reduction_method(self, value):
+        if value is None or value in ("pca", "svd", "matryoshka"):
+            self._reduction_method = value
+        else:
+            raise ValueError("reduction_method must be None, 'pca', 'svd' or 'matryoshka'.")
+
+    @reduction_components.setter
+    def reduction_components(self, value):
+        if isinstance(value, int) and value > 0:
+            self._reduction_components = value
+        else:
+            raise ValueError("reduction_components must be a positive integer.")
+
+    @box_plots_temperature.setter
+    def box_plots_temperature(self, value):
+        if isinstance(value, (int, float)) and value > 0:
+            self._box_plots_temperature = float(value)
+        else:
+            raise ValueError("box_plots_temperature must be a positive number.")
+
+    @embedding_storage_dtype.setter
+    def embedding_storage_dtype(self, value):
+        if value in ('float32', 'float16', 'int8'):
+            self._embedding_storage_dtype = value
+        else:
+            raise ValueError("embedding_storage_dtype must be 'float32', 'float16' or 'int8'.")
+
+    @dataset_cache_bytes.setter
+    def dataset_cache_bytes(self, value):
+        if isinstance(value, int) and value >= 0:
+            self._dataset_cache_bytes = value
+        else:
+            raise ValueError("dataset_cache_bytes must be a non-negative integer.")
+
+    @report_cache_bytes.setter
+    def report_cache_bytes(self, value):
+        if isinstance(value, int) and value >= 0:
+            self._report_cache_bytes = value
+        else:
+            raise ValueError("report_cache_bytes must be a non-negative integer.")
+
+    @wordcloud_cache_bytes.setter
+    def wordcloud_cache_bytes(self, value):
+        if isinstance(value, int) and value >= 0:
+            self._wordcloud_cache_bytes = value
+        else:
+            raise ValueError("wordcloud_cache_bytes must be a non-negative integer.")
+
+    @jobs_file.setter
+    def jobs_file(self, value):
+        if isinstance(value, str):
+            self._jobs_file = value
+        else:
+            raise ValueError("jobs_file must be a string.")
+
+    @job_workers.setter
+    def job_workers(self, value):
+        if isinstance(value, int) and value > 0:
+            self._job_workers = value
+        else:
+            raise ValueError("job_workers must be a positive integer.")
+
+    @job_concurrency_limits.setter
+    def job_concurrency_limits(self, value):
+        if isinstance(value, dict) and all(isinstance(k, str) and isinstance(v, int) and v > 0
+                                           for k, v in value.items()):
+            self._job_concurrency_limits = value
+        else:
+            raise ValueError("job_concurrency_limits must be a dictionary of job types and positive integers.")
+
+    @visualization_workers.setter
+    def visualization_workers(self, value):
+        if isinstance(value, int) and value > 0:
+            self._visualization_workers = value
+        else:
+            raise ValueError("visualization_workers must be a positive integer.")
+
+    @combined_metrics_panel.setter
+    def combined_metrics_panel(self, value):
+        if isinstance(value, bool):
+            self._combined_metrics_panel = value
+        else:
+            raise ValueError("combined_metrics_panel must be a boolean.")
+
+    @trend_workers.setter
+    def trend_workers(self, value):
+        if isinstance(value, int) and (value > 0 or value == -1):
+            self._trend_workers = value
+        else:
+            raise ValueError("trend_workers must be a positive integer or -1.")
+
     @COLUMN_RENAMES.setter
     def COLUMN_RENAMES(self, value):
         if isinstance(value, dict):
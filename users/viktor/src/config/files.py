@@ -49,5 +49,9 @@ reports_folder_path = os.path.join(data_folder, "reports")
 registry_folder_path = os.path.join(data_folder, "registry")
 
 # path to file registry
-registry_file_name = "registry.csv"
-registry_file_path = Path(data_folder) / "registry" / registry_file_name
\ No newline at end of file
+registry_file_name = "registry.db"
+registry_file_path = Path(data_folder) / "registry" / registry_file_name
+
+# path to the background job queue
+jobs_folder_path = os.path.join(data_folder, "jobs")
+jobs_file_path = os.path.join(jobs_folder_path, "jobs.db")
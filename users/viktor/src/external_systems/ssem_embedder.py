@@ -1,8 +1,5 @@
 import numpy as np
 from typing import List
-from sentence_transformers import SentenceTransformer
-from sentence_transformers.util import cos_sim
-from transformers import AutoTokenizer, AutoModel
 
 from interfaces import IEmbedder
 
@@ -10,10 +7,14 @@ from interfaces import IEmbedder
 class SSEMEmbedder(IEmbedder):
     def __init__(self, model_name: str):
         self.model_name = model_name
+        # sentence-transformers and transformers take seconds to import, so they are only
+        # loaded once an embedder is actually created
         if model_name == "all-mpnet-base-v2":
+            from sentence_transformers import SentenceTransformer
             self.model = SentenceTransformer("all-mpnet-base-v2")
             self.tokenizer = None
         else:
+            from transformers import AutoTokenizer, AutoModel
             self.tokenizer = AutoTokenizer.from_pretrained(model_name)
             self.model = AutoModel.from_pretrained(model_name)
 
@@ -131,7 +131,7 @@ class IDatasetRegistry(ABC):
             project_name (str): The name of the project folder.
             dataset_name (str): The name of the dataset file.
             BASE_FOLDER (str): The base directory where projects and datasets are stored.
-            REGISTRY_FILE (Path): Path to the registry file (CSV) for tracking datasets.
+            REGISTRY_FILE (Path): Path to the registry database (SQLite) for tracking datasets.
         """
         pass
 
@@ -155,6 +155,26 @@ class IDatasetRegistry(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_dataset_info(self) -> dict:
+        """
+        Retrieve the registry entry (size, row count, embedding model, content hash) of a dataset.
+
+        Returns:
+            dict: The registry entry, or None if the dataset is not registered.
+        """
+        pass
+
+    @abstractmethod
+    def find_content(self) -> dict:
+        """
+        Find a registered dataset whose stored content was created from the same upload.
+
+        Returns:
+            dict: The registry entry referencing the stored content, or None if it is unknown.
+        """
+        pass
+
     @abstractmethod
     def get_existing_projects(self) -> List[str]:
         """
@@ -256,6 +276,21 @@ class ISemiannualFeatureDistribution(ABC):
         """
         pass
 
+class ITrendCube(ABC):
+    """
+    Interface for a materialized period x topic x measure aggregate read by the time-series plots.
+    """
+
+    @abstractmethod
+    def semiannual_percentages(self) -> pd.DataFrame:
+        """Return the percentage of the summed scores per topic in each 6-month period."""
+        pass
+
+    @abstractmethod
+    def save(self, path: str) -> str:
+        """Persist the cube and return the path written to."""
+        pass
+
 class ISoftmaxTransformer(ABC):
     """
     Interface for a class that applies a softmax transformation with a temperature parameter.
@@ -336,7 +371,7 @@ class IBoxPlots(ABC):
         Abstract method to create and save box plots based on the trends.
 
         Returns:
-            None: Saves box plot visualizations to the output folder.
+            str: The folder the box plot visualizations were saved to.
         """
         pass
 
@@ -448,6 +483,138 @@ class ITopicModel(ABC):
         """Execute the topic modeling process and return results."""
         pass
 
+    @abstractmethod
+    def save_model(self, keywords: Dict[int, List[str]], folder: str = None) -> str:
+        """Persist the fitted model as a versioned artifact and return its folder."""
+        pass
+
+class IEmbeddingReducer(ABC):
+    """
+    Interface for reducing embedding dimensionality before clustering and visualization.
+    """
+
+    @abstractmethod
+    def fit(self, X: np.ndarray):
+        """Fit the reduction on an embedding matrix and return self."""
+        pass
+
+    @abstractmethod
+    def transform(self, X: np.ndarray) -> np.ndarray:
+        """Project embeddings with the fitted reduction."""
+        pass
+
+    @abstractmethod
+    def fit_transform(self, X: np.ndarray) -> np.ndarray:
+        """Fit the reduction and return the projected embeddings."""
+        pass
+
+class IEmbeddingStore(ABC):
+    """
+    Interface for read-only, memory-mapped access to an embedding matrix.
+    """
+
+    @abstractmethod
+    def iter_blocks(self, batch_size: int = 65536):
+        """Yield (start row, view) pairs over aligned row blocks of the matrix."""
+        pass
+
+    @abstractmethod
+    def gather(self, job_ids) -> np.ndarray:
+        """Return the embeddings of the given job IDs, in the given order."""
+        pass
+
+class IDatasetCache(ABC):
+    """
+    Interface for a process-wide cache of loaded datasets.
+    """
+
+    @abstractmethod
+    def get_or_load(self, name, version, loader):
+        """Return the cached value for name at version, calling loader() on a miss."""
+        pass
+
+    @abstractmethod
+    def stats(self) -> dict:
+        """Return the hit, miss, eviction and memory counters of the cache."""
+        pass
+
+class IRunCache(ABC):
+    """
+    Interface for memoizing whole analysis runs by a fingerprint of their inputs.
+    """
+
+    @abstractmethod
+    def lookup(self, fingerprint: str):
+        """Return the report folder of a completed run with this fingerprint, or None."""
+        pass
+
+    @abstractmethod
+    def record(self, fingerprint: str, analysis: str, folder: str, parameters: dict = None):
+        """Record the report folder of a completed run."""
+        pass
+
+    @abstractmethod
+    def run(self, fingerprint: str, analysis: str, compute, parameters: dict = None, force_refresh: bool = False) -> tuple:
+        """Return (report folder, reused), computing the reports only when no completed run matches."""
+        pass
+
+class IJobQueue(ABC):
+    """
+    Interface for a queue running long analyses in background processes.
+    """
+
+    @abstractmethod
+    def submit(self, job_type: str, target, *args, **kwargs) -> str:
+        """Queue target(*args, **kwargs) as a job of job_type and return the job ID."""
+        pass
+
+    @abstractmethod
+    def status(self, job_id: str) -> dict:
+        """Return the status, progress and ETA of a job."""
+        pass
+
+    @abstractmethod
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job."""
+        pass
+
+class ITopicModelArtifact(ABC):
+    """
+    Interface for a persisted topic model that assigns new documents without refitting.
+    """
+
+    @abstractmethod
+    def assign(self, embeddings) -> tuple:
+        """
+        Assign each embedding to its nearest topic.
+
+        Args:
+            embeddings: 2-D array or iterable of embeddings.
+
+        Returns:
+            tuple: (labels, distances) arrays.
+        """
+        pass
+
+    @abstractmethod
+    def detect_drift(self, distances: np.ndarray, p_value_threshold: float = 0.01) -> dict:
+        """
+        Flag a shift in the assignment-distance distribution compared with training.
+
+        Args:
+            distances (np.ndarray): Assignment distances of new documents.
+            p_value_threshold (float): Significance level for flagging drift.
+
+        Returns:
+            dict: Drift statistics and a 'drift_detected' flag.
+        """
+        pass
+
+    @abstractmethod
+    def save(self, folder: str) -> str:
+        """Save the artifact to a folder and return the folder path."""
+        pass
+
 class ISkillKnowledgeExtractor(ABC):
     """
     Interface for extracting skills and knowledge from job descriptions, saving progress, and generating reports.
@@ -490,6 +657,61 @@ class ISkillKnowledgeExtractor(ABC):
         """
         pass
 
+class IWord2VecPreprocessor(ABC):
+    """
+    Interface for tokenizing job descriptions for Word2Vec training and keyword trends.
+    """
+
+    @abstractmethod
+    def preprocess(self, text: str) -> list:
+        """Tokenize, clean and lemmatize a single text."""
+        pass
+
+    @abstractmethod
+    def preprocess_many(self, texts: List[str]) -> List[list]:
+        """Tokenize a collection of texts, optionally in parallel."""
+        pass
+
+class ITrendSmoother(ABC):
+    """
+    Interface for smoothing trend series that share the same x grid.
+    """
+
+    @abstractmethod
+    def smooth(self, trend_data: pd.DataFrame, n_points: int = 500, length_scale: float = 10, method: str = None) -> tuple:
+        """
+        Smooth every column of a trend table.
+
+        Args:
+            trend_data (pd.DataFrame): One row per period and one column per series.
+            n_points (int): Number of points on the smooth grid.
+            length_scale (float): RBF length scale for Gaussian-process smoothing.
+            method (str): Smoothing method for this run.
+
+        Returns:
+            tuple: (x_smooth, curves) with curves mapping column names to smoothed values.
+        """
+        pass
+
+class IKeywordTrendTracker(ABC):
+    """
+    Interface for computing keyword prevalence over time for one or more keyword dictionaries.
+    """
+
+    @abstractmethod
+    def compute(self, token_lists, periods) -> pd.DataFrame:
+        """
+        Compute the share of documents mentioning each keyword per period.
+
+        Args:
+            token_lists (iterable): One token list per document.
+            periods (pd.Series or list): Period label per document.
+
+        Returns:
+            pd.DataFrame: Tidy table with columns 'period', 'dictionary', 'keyword' and 'share'.
+        """
+        pass
+
 class IWord2VecEmbeddingTrendAnalysis(ABC):
     """
     Abstract base class for Word2Vec embedding trend analysis.
@@ -1,5 +1,5 @@
 from .InterfaceBase import IWordCloudGenerator, ITextPreprocessor, ITopicModel, IFeatureExtractor, ISemiannualFeatureDistribution
 from .InterfaceBase import ISoftmaxTransformer, ITopicOverlapGraphGenerator, ITopicAssignment, ISkillKnowledgeExtractor, IEmbedder
 from .InterfaceBase import IWord2VecEmbeddingTrendAnalysis, IKeywordFeatureExtractor, IBoxPlots, IDatasetRegistry, IDataFormatter
-from .InterfaceBase import ITopicModelVisualizer
+from .InterfaceBase import ITopicModelVisualizer, ITopicModelArtifact, IEmbeddingReducer, IEmbeddingStore, IDatasetCache, IRunCache, IJobQueue, IWord2VecPreprocessor, ITrendSmoother, IKeywordTrendTracker, ITrendCube
 from .repository import IRepository
\ No newline at end of file
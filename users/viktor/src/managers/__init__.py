@@ -1,5 +1,37 @@
-from .topic_modeling_manager import Topic_Modeling_Manager
-from .box_plots_manager import Box_Plots_Manager, get_json_files_for_box_plots
-from .data_registry_manager import DataRegistryManager
-from .word_clouds_manager import Word_Clouds_Manager, get_json_files_for_word_clouds
-from .esco_analysis_manager import ESCOManager
\ No newline at end of file
+import importlib
+
+# Exported names and the manager modules defining them, imported on first access (PEP 562)
+# so a page only loads the managers it uses. A manager still reads its Config at import;
+# that only assigns defaults and is not worth deferring.
+_EXPORTS = {
+    'Topic_Modeling_Manager': 'topic_modeling_manager',
+    'Box_Plots_Manager': 'box_plots_manager',
+    'get_json_files_for_box_plots': 'box_plots_manager',
+    'DataRegistryManager': 'data_registry_manager',
+    'get_projects': 'data_registry_manager',
+    'get_dataset_folders': 'data_registry_manager',
+    'get_dataset_cache_stats': 'data_registry_manager',
+    'render_dataset_cache_stats': 'data_registry_manager',
+    'submit_dataset': 'data_registry_manager',
+    'Word_Clouds_Manager': 'word_clouds_manager',
+    'get_json_files_for_word_clouds': 'word_clouds_manager',
+    'Word2Vec_Trends_Manager': 'word2vec_trends_manager',
+    'ESCOManager': 'esco_analysis_manager',
+    'submit_esco_analysis': 'esco_analysis_manager',
+    'get_job': 'job_manager',
+    'get_jobs': 'job_manager',
+    'cancel_job': 'job_manager',
+    'render_jobs': 'job_manager',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
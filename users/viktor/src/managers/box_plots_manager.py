@@ -3,8 +3,8 @@ from datetime import datetime
 import os
 import json
 import sys
-from external_systems import SSEMEmbedder
-from modules import KeywordFeatureExtractorBoxPlots, BoxPlotsVisualizer
+from modules import TrendCube
+from modules import find_dataset_file, find_embeddings_file, partitions_for_folder, DatasetCache, RunCache
 from interfaces import IKeywordFeatureExtractor, IBoxPlots
 
 from config import Config
@@ -18,13 +18,25 @@ csv_dataset = configs.csv_dataset
 text_column = configs.text_column
 name_of_topics = configs.name_of_topics
 reports_folder_path = configs.reports_folder_path
+box_plots_temperature = configs.box_plots_temperature
+embedding_storage_dtype = configs.embedding_storage_dtype
+report_cache_bytes = configs.report_cache_bytes
+
+# The embedder and the plotting modules (sentence-transformers, seaborn) are imported where
+# they are used, so opening the page does not load them
+
+# Loaded datasets are shared with the other managers in the process
+dataset_cache = DatasetCache.shared(configs.dataset_cache_bytes)
+
+# Postings column the trend aggregates are bucketed by
+time_column = 'original_listed_time'
 
 def get_json_files_for_box_plots():
     try:
         # Get all files in the specified folder
         files = [
             os.path.splitext(f)[0]  # Extract filename without extension
-            for f in os.listdir(keywords_folder_path)
+            for f in dataset_cache.listdir(keywords_folder_path)
             if os.path.isfile(os.path.join(keywords_folder_path, f))
         ]
 
@@ -42,10 +54,18 @@ def get_json_files_for_box_plots():
         return []
 
 class Box_Plots_Manager():
-    def __init__(self, selected_folder, output_subfolder):
+    def __init__(self, selected_folder, output_subfolder, date_range=None):
+        """
+        Args:
+            selected_folder (str): Dataset folder.
+            output_subfolder (str): Folder the plots are saved to.
+            date_range (tuple): (start, end) restricting the postings to start <= time < end;
+                either bound may be None. Only the monthly partitions overlapping the range are read.
+        """
         self.selected_folder = selected_folder
         self.output_subfolder = output_subfolder
         self.topics_file = configs.topics_file
+        self.date_range = date_range
 
     def set_json_file_name(self, topics_file_name):
         topics_file = os.path.join(keywords_folder_path, topics_file_name)
@@ -56,7 +76,7 @@ class Box_Plots_Manager():
             # Get all files in the specified folder
             files = [
                 os.path.splitext(f)[0]  # Extract filename without extension
-                for f in os.listdir(keywords_folder_path)
+                for f in dataset_cache.listdir(keywords_folder_path)
                 if os.path.isfile(os.path.join(keywords_folder_path, f))
             ]
 
@@ -73,32 +93,57 @@ class Box_Plots_Manager():
             print(f"Unexpected error: {e}")
             return []
 
-    def main(self):
-        try:
-            # Find a CSV file in the selected folder, excluding 'embeddings.csv'
-            csv_files = [
-                f for f in os.listdir(self.selected_folder)
-                if f.endswith('.csv') and f != 'embeddings.csv'
-            ]
-
-            if not csv_files:
-                raise FileNotFoundError("No valid CSV dataset files found in the selected folder.")
+    def main(self, force_refresh=False):
+        """
+        Create the box plots for the selected dataset, reusing the reports of an identical earlier run.
+
+        The run is fingerprinted by the contents of the dataset, embeddings and keyword file,
+        the embedding model, the parameters and the version of the box plot code.
+
+        Args:
+            force_refresh (bool): Write new plots even when an identical run exists.
+
+        Returns:
+            str: The report folder.
+        """
+        from modules import BoxPlotsVisualizer
+
+        run_cache = RunCache(reports_folder_path, report_cache_bytes, dataset_cache)
+        date_range = None if self.date_range is None else [None if bound is None else str(pd.Timestamp(bound))
+                                                            for bound in self.date_range]
+        parameters = {
+            'temperature': float(box_plots_temperature),
+            'date_range': date_range,
+            'name_of_topics': name_of_topics,
+            'embedding_storage_dtype': embedding_storage_dtype,
+        }
+        fingerprint = run_cache.fingerprint(
+            'box_plots',
+            [find_dataset_file(self.selected_folder), find_embeddings_file(self.selected_folder)],
+            embedding_model="all-mpnet-base-v2",
+            keyword_file=self.topics_file,
+            parameters=parameters,
+            code_version=RunCache.code_version(BoxPlotsVisualizer, TrendCube),
+        )
+        output_folder, _ = run_cache.run(fingerprint, 'box_plots', self.run_analysis, parameters,
+                                         force_refresh=force_refresh)
+        return output_folder
+
+    def run_analysis(self):
+        """
+        Extract the keyword features and write the box plots to a new timestamped report folder.
+
+        Returns:
+            str: The report folder.
+        """
+        from modules import BoxPlotsVisualizer
 
-            # Use the first valid CSV file
-            csv_dataset = os.path.join(self.selected_folder, csv_files[0])
+        try:
+            # Locate the dataset (Parquet, or CSV for older datasets) and its embeddings
+            csv_dataset = find_dataset_file(self.selected_folder)
             print(f"Using dataset: {csv_dataset}")
 
-            # Find a CSV file in the selected folder called 'embeddings.csv'
-            embedding_files = [
-                f for f in os.listdir(self.selected_folder)
-                if f.endswith('.csv') and f == 'embeddings.csv'
-            ]
-
-            if not embedding_files:
-                raise FileNotFoundError("No valid CSV embeddings files found in the selected folder.")
-
-            # Use the first valid CSV file
-            embeddings_dataset = os.path.join(self.selected_folder, embedding_files[0])
+            embeddings_dataset = find_embeddings_file(self.selected_folder)
             print(f"Using embeddings dataset: {embeddings_dataset}")
 
             # Load keyword dictionary from JSON
@@ -118,9 +163,99 @@ class Box_Plots_Manager():
             print(f"Unexpected error loading JSON file: {e}")
             sys.exit(1)
 
+        role_columns = list(keyword_dict.keys()) + ['Other']
+
+        cube = self.load_trend_cube(csv_dataset, embeddings_dataset, json_file_path, keyword_dict, role_columns)
+
+        try:
+            # Initialize visualizer using the interface IBoxPlots
+            box_plots_visualizer: IBoxPlots = BoxPlotsVisualizer(cube.trend_df(), cube.monthly_trend_df(), role_columns, self.output_subfolder, reports_folder_path, name_of_topics, cube=cube)
+
+            # Plot the feature percentage distribution
+            output_folder = box_plots_visualizer.plot_distribution()
+
+        except Exception as e:
+            print(f"Unexpected error during visualization: {e}")
+            sys.exit(1)
+
+        print("Process completed successfully.")
+        return output_folder
+
+    def load_trend_cube(self, csv_dataset, embeddings_dataset, keyword_file, keyword_dict, role_columns):
+        """
+        Load the trend cube of the dataset, updating it if the dataset has changed.
+
+        Cubes are stored in the '.trend_cubes' folder of the registry and keyed by the
+        project and name of the dataset, so a dataset that is uploaded again with appended
+        postings keeps its cube and only the new postings are processed.
+
+        Args:
+            csv_dataset (str): Path to the postings file (Parquet or CSV).
+            embeddings_dataset (str): Path to the embeddings file (Parquet or CSV).
+            keyword_file (str): Path of the keyword JSON file.
+            keyword_dict (dict): Feature names mapped to lists of keywords.
+            role_columns (list): Feature columns including 'Other'.
+
+        Returns:
+            TrendCube: The up-to-date cube.
+        """
+        # The dataset folder is <registry>/<project>/<dataset>
+        dataset_folder = os.path.abspath(self.selected_folder)
+        project_folder, dataset_name = os.path.split(dataset_folder)
+        registry_folder, project_name = os.path.split(project_folder)
+
+        cube_key = TrendCube.cache_key(project_name, dataset_name, keyword_file, box_plots_temperature, self.date_range)
+        cube_folder = os.path.join(registry_folder, '.trend_cubes')
+        cube_file = os.path.join(cube_folder, f"trend_cube_{cube_key[:16]}.parquet")
+        cube = TrendCube.load(cube_file) if os.path.isfile(cube_file) else None
+        dataset_version = TrendCube.dataset_version([csv_dataset, embeddings_dataset])
+
+        if cube is not None and cube.metadata.get('dataset_version') == dataset_version:
+            print(f"Using cached trend aggregates: {cube_file}")
+            return cube
+
+        df, embeddings_df = self.load_postings(csv_dataset, embeddings_dataset)
+        cube = self.update_trend_cube(cube, df, embeddings_df, keyword_dict, role_columns)
+        cube.metadata.update({
+            'dataset_version': dataset_version,
+            'n_rows': len(df),
+            'rows_fingerprint': TrendCube.rows_fingerprint(df, embeddings_df),
+        })
+        os.makedirs(cube_folder, exist_ok=True)
+        cube.save(cube_file)
+        return cube
+
+    def load_postings(self, csv_dataset, embeddings_dataset):
+        """
+        Load the posting timestamps and open their embeddings.
+
+        Only the timestamp column is read from the postings; older CSV datasets may still
+        use a source column name that the configured renames map to it. The embeddings are
+        opened as a read-only memory-mapped matrix, so they are not copied into the process.
+        With a date range, the postings and embeddings are read from the monthly partitions
+        that overlap it instead. The embeddings of those months are loaded into memory as a
+        float32 matrix, so ranged runs are not memory-mapped and ignore `embedding_storage_dtype`.
+
+        Args:
+            csv_dataset (str): Path to the postings file (Parquet or CSV).
+            embeddings_dataset (str): Path to the embeddings file (Parquet or CSV).
+
+        Returns:
+            tuple: (df, embeddings) with the configured column renames applied to df and
+                embeddings a 2-D matrix aligned row by row with df, memory-mapped unless a
+                date range is set.
+        """
+        if self.date_range is not None:
+            partitions = partitions_for_folder(self.selected_folder, column_renames=column_renames)
+            df, embeddings = dataset_cache.read_partitions(partitions, *self.date_range, columns=[time_column],
+                                                           with_embeddings=True)
+            print(f"Dataset loaded with {len(df)} records between {self.date_range[0]} and {self.date_range[1]}.")
+            return df, embeddings
+
+        time_columns = [time_column] + [source for source, target in column_renames.items() if target == time_column]
         try:
             # Load the dataset into a pandas DataFrame
-            df = pd.read_csv(csv_dataset)
+            df = dataset_cache.read_dataset(csv_dataset, columns=time_columns)
             print(f"Dataset loaded with {len(df)} records.")
             print(df.columns)
 
@@ -135,10 +270,10 @@ class Box_Plots_Manager():
             sys.exit(1)
 
         try:
-            # Load the dataset into a pandas DataFrame
-            embeddings_df = pd.read_csv(embeddings_dataset)
-            print(f"Dataset loaded with {len(embeddings_df)} records.")
-            print(embeddings_df.columns)
+            # Open the embeddings as a memory-mapped matrix
+            embeddings = dataset_cache.embedding_store(os.path.dirname(embeddings_dataset), embeddings_dataset,
+                                                       dtype=embedding_storage_dtype).embeddings
+            print(f"Embeddings opened with {len(embeddings)} records.")
 
         except FileNotFoundError:
             print(f"Error: Dataset file not found: {embeddings_dataset}")
@@ -150,7 +285,55 @@ class Box_Plots_Manager():
             print(f"Unexpected error loading dataset: {e}")
             sys.exit(1)
 
-        df = df.rename(columns=column_renames)
+        return df.rename(columns=column_renames), embeddings
+
+    def update_trend_cube(self, cube, df, embeddings_df, keyword_dict, role_columns):
+        """
+        Bring a stored trend cube up to date with the postings.
+
+        If the postings and embeddings aggregated into the stored cube are still the leading
+        rows of the dataset, features are only extracted for the appended rows and their
+        monthly partial sums are merged into the cube. Otherwise the cube is rebuilt from all
+        postings.
+
+        Args:
+            cube (TrendCube): The stored cube, or None.
+            df (pd.DataFrame): All postings.
+            embeddings_df (pd.DataFrame or np.ndarray): Embeddings aligned row by row with df.
+            keyword_dict (dict): Feature names mapped to lists of keywords.
+            role_columns (list): Feature columns including 'Other'.
+
+        Returns:
+            TrendCube: The up-to-date cube.
+        """
+        n_aggregated = cube.metadata.get('n_rows', 0) if cube is not None else 0
+        if (cube is not None and 0 < n_aggregated <= len(df)
+                and TrendCube.rows_fingerprint(df.iloc[:n_aggregated], embeddings_df[:n_aggregated])
+                == cube.metadata.get('rows_fingerprint')):
+            if n_aggregated == len(df):
+                return cube
+            print(f"Extracting features for {len(df) - n_aggregated} new postings.")
+            new_rows = self.build_trend_cube(df.iloc[n_aggregated:], embeddings_df[n_aggregated:],
+                                             keyword_dict, role_columns)
+            return cube.merge(new_rows)
+
+        return self.build_trend_cube(df, embeddings_df, keyword_dict, role_columns)
+
+    def build_trend_cube(self, df, embeddings_df, keyword_dict, role_columns):
+        """
+        Extract keyword features from postings and aggregate them into a trend cube.
+
+        Args:
+            df (pd.DataFrame): Postings to aggregate.
+            embeddings_df (pd.DataFrame or np.ndarray): Embeddings aligned row by row with df.
+            keyword_dict (dict): Feature names mapped to lists of keywords.
+            role_columns (list): Feature columns including 'Other'.
+
+        Returns:
+            TrendCube: The aggregated cube.
+        """
+        from external_systems import SSEMEmbedder
+        from modules import KeywordFeatureExtractorBoxPlots
 
         # Initialize the embedder
         embedder = SSEMEmbedder(model_name="all-mpnet-base-v2")
@@ -165,28 +348,15 @@ class Box_Plots_Manager():
 
         try:
             # Initialize keyword feature extractor using the interface IKeywordFeatureExtractor
-            kfe: IKeywordFeatureExtractor = KeywordFeatureExtractorBoxPlots(df, embeddings_df, text_column, keyword_dict, keyword_embeddings, temp=0.5)
+            kfe: IKeywordFeatureExtractor = KeywordFeatureExtractorBoxPlots(df, embeddings_df, text_column, keyword_dict, keyword_embeddings, temp=box_plots_temperature)
 
-            # Apply keyword feature extraction
-            df_features = kfe.extract_features()
+            # Apply keyword feature extraction; only the timestamp is needed for aggregation
+            df_features = kfe.extract_features(columns_to_keep=[time_column])
 
             print(df_features.head())
 
-            role_columns = list(keyword_dict.keys()) + ['Other']
-            df_features['original_listed_time'] = pd.to_datetime(df_features['original_listed_time'], errors='coerce')
-            if df_features['original_listed_time'].isnull().all():
-                raise ValueError("All 'original_listed_time' values are invalid or missing.")
-
-            df_features['year_month'] = df_features['original_listed_time'].dt.to_period('M')
-
-            # Group by year and month for trend analysis
-            trend_df = df_features.groupby('year_month')[role_columns].sum().reset_index()
-            trend_df['year_month'] = trend_df['year_month'].dt.to_timestamp()
-
-            # Monthly trend analysis
-            df_features['month'] = df_features['year_month'].dt.month
-            monthly_trend_df = df_features.groupby('month')[role_columns].mean().reset_index()
-            monthly_trend_df['month'] = monthly_trend_df['month'].astype('category')
+            # Aggregate per month and half-year once; every time-series plot reads the cube
+            return TrendCube.from_features(df_features, role_columns, time_column=time_column)
 
         except KeyError as e:
             print(f"KeyError: Missing column in dataset - {e}")
@@ -197,16 +367,3 @@ class Box_Plots_Manager():
         except Exception as e:
             print(f"Unexpected error during data processing: {e}")
             sys.exit(1)
-
-        try:
-            # Initialize visualizer using the interface IBoxPlots
-            box_plots_visualizer: IBoxPlots = BoxPlotsVisualizer(trend_df, monthly_trend_df, role_columns, self.output_subfolder, reports_folder_path, name_of_topics)
-
-            # Plot the feature percentage distribution
-            box_plots_visualizer.plot_distribution()
-
-        except Exception as e:
-            print(f"Unexpected error during visualization: {e}")
-            sys.exit(1)
-
-        print("Process completed successfully.")
\ No newline at end of file
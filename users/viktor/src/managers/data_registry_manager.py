@@ -1,21 +1,115 @@
 from modules import DatasetRegistry, DataFormatter 
+from modules import DatasetCache, find_embeddings_file, quantization_report, report_progress
 from interfaces import IDataFormatter
 from config import Config
-from external_systems import SSEMEmbedder
+from .job_manager import job_queue
 
 import pandas as pd
 import json
+import os
 import numpy as np
+import io
+import uuid
 
 # Load configuration
 configs = Config()
 
 base_folder = configs.base_folder
 registry_file = configs.registry_file
+jobs_file = configs.jobs_file
 
 column_renames = configs.COLUMN_RENAMES
 special_handlings_columns = configs.SPECIAL_HANDLINGS_COLUMNS
 
+embedding_model = "all-mpnet-base-v2"
+
+# Loaded datasets are shared with the other managers in the process
+dataset_cache = DatasetCache.shared(configs.dataset_cache_bytes)
+
+def get_projects(base_dir):
+    """
+    List the project folders of the registry, through the shared directory listing cache.
+    """
+    return [f for f in dataset_cache.listdir(base_dir)
+            if not f.startswith('.') and os.path.isdir(os.path.join(base_dir, f))]
+
+def get_dataset_folders(project_path):
+    """
+    List the folders below a project that hold a dataset file, relative to the project.
+
+    Hidden folders and the derived monthly partitions are skipped. Listings come from the
+    shared cache, so only folders that changed are listed again.
+    """
+    folders = []
+    pending = ['']
+    while pending:
+        relative = pending.pop()
+        folder = os.path.join(project_path, relative)
+        entries = dataset_cache.listdir(folder)
+        if any(f.endswith(('.csv', '.parquet')) and os.path.isfile(os.path.join(folder, f)) for f in entries):
+            folders.append(relative)
+        pending += [os.path.join(relative, f) for f in entries
+                    if not f.startswith('.') and f != 'partitions' and os.path.isdir(os.path.join(folder, f))]
+    return sorted(folders)
+
+def get_dataset_cache_stats():
+    """
+    Return the hit, miss, eviction and memory counters of the dataset cache of this process.
+    """
+    return dataset_cache.stats()
+
+def render_dataset_cache_stats():
+    """
+    Show the counters of the dataset cache of this process in the Streamlit sidebar.
+
+    Only meaningful on pages whose analysis runs in the page process; background jobs load
+    their datasets through the cache of their worker process.
+    """
+    # Imported here, so the job workers loading the managers do not import Streamlit
+    import streamlit as st
+
+    cache_stats = get_dataset_cache_stats()
+    st.sidebar.caption(f"Dataset cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                       f"{cache_stats['bytes'] / 1024 ** 2:.1f} of {cache_stats['max_bytes'] / 1024 ** 2:.0f} MB")
+
+def save_staged_dataset(staged_path, upload_name, file_name, project_name):
+    """
+    Register a dataset file staged on disk; the entry point of the background job.
+
+    The staged copy is removed afterwards.
+    """
+    try:
+        with open(staged_path, 'rb') as f:
+            dataset = io.BytesIO(f.read())
+        dataset.name = upload_name
+        return DataRegistryManager(dataset, file_name, project_name).save_dataset(dataset, project_name)
+    finally:
+        os.remove(staged_path)
+
+def submit_dataset(dataset, file_name, project_name):
+    """
+    Queue the registration (and embedding) of an uploaded dataset as a background job.
+
+    Uploads cannot be passed to another process, so the file is staged next to the job queue first.
+
+    Args:
+        dataset: The uploaded file object, e.g. a Streamlit UploadedFile.
+        file_name (str): Name of the dataset.
+        project_name (str): Project to register the dataset in.
+
+    Returns:
+        str: ID of the job; its result is the registry message.
+    """
+    staging_folder = os.path.join(os.path.dirname(jobs_file), 'uploads')
+    os.makedirs(staging_folder, exist_ok=True)
+    staged_path = os.path.join(staging_folder, f"{uuid.uuid4().hex}_{os.path.basename(dataset.name)}")
+    dataset.seek(0)
+    with open(staged_path, 'wb') as f:
+        f.write(dataset.read())
+    dataset.seek(0)
+    return job_queue.submit('dataset_registration', save_staged_dataset, staged_path, dataset.name, file_name,
+                            project_name)
+
 class DataRegistryManager:
     """
     Wrapper for DatasetRegistry to manage datasets and database connections.
@@ -34,9 +128,16 @@ class DataRegistryManager:
         if db_connection:
             # Save database connection details
             dataset_name = f"{db_connection['name']}_db"
-            return self.dataset_registry.save_dataset(None, dataset_name, project_name, db_connection=db_connection)
+            return self.dataset_registry.save_dataset(None, None, dataset_name, project_name, db_connection=db_connection)
 
         if dataset is not None:
+            # Content the registry already stores is referenced instead of re-read and re-embedded
+            source_hash = DatasetRegistry.hash_upload(dataset)
+            if self.dataset_registry.find_content(source_hash) is not None:
+                return self.dataset_registry.save_dataset(None, None, dataset.name, project_name,
+                                                         source_hash=source_hash)
+
+            report_progress(0.0, "Reading the dataset")
             if dataset.name.endswith('.csv'):
                 df = pd.read_csv(dataset)
             elif dataset.name.endswith('.xlsx'):
@@ -49,10 +150,12 @@ class DataRegistryManager:
             data_formatter: IDataFormatter = DataFormatter(df, column_renames, special_handlings_columns)
             df = data_formatter.rename_columns()
 
-            # Initialize embedder
-            embedder = SSEMEmbedder(model_name="all-mpnet-base-v2")
+            # Initialize embedder; sentence-transformers is only imported when a dataset is embedded
+            from external_systems import SSEMEmbedder
+            embedder = SSEMEmbedder(model_name=embedding_model)
 
             # Generate embeddings for the 'description' column
+            report_progress(0.1, "Embedding the descriptions")
             descriptions = df["description"].tolist()
             embeddings = embedder.generate_embeddings(descriptions)
 
@@ -67,11 +170,26 @@ class DataRegistryManager:
 
             dataset_name = dataset.name
 
-            return self.dataset_registry.save_dataset(df, embeddings_df, dataset_name, project_name)
+            report_progress(0.9, "Saving the dataset")
+            return self.dataset_registry.save_dataset(df, embeddings_df, dataset_name, project_name,
+                                                     embedding_model=embedding_model, source_hash=source_hash)
 
     def remove_dataset(self, project_to_remove, dataset_to_remove):
         return self.dataset_registry.remove_dataset(project_to_remove, dataset_to_remove)
 
+    def get_dataset_info(self, project_name, dataset_name):
+        return self.dataset_registry.get_dataset_info(project_name, dataset_name)
+
+    def get_quantization_report(self, project_name, dataset_name, k=10):
+        """
+        Compare float16 and int8 embedding storage against float32 on a registered dataset.
+        """
+        info = self.dataset_registry.get_dataset_info(project_name, dataset_name)
+        if info is None or info["is_database"]:
+            return None
+        embeddings = dataset_cache.read_embeddings(find_embeddings_file(os.path.dirname(info["original_location"])))
+        return quantization_report(embeddings["description_embeddings"], k=k)
+
     def get_existing_projects(self):
         return self.dataset_registry.get_existing_projects()
 
@@ -1,28 +1,57 @@
 import pandas as pd
 import os
 from interfaces import ISkillKnowledgeExtractor
-from modules import ESCOAnalyzer, detect_language
+from modules import report_progress
 import datetime
 
 from config import Config
+from .job_manager import job_queue
 
 # Load configuration
 configs = Config()
 
 reports_folder_path = configs.reports_folder_path
 
+# The ESCO analyzer (transformers, docx, langdetect) is imported where it is used, so
+# opening the page, which only submits jobs, does not load it
+
+def run_esco_analysis(input_file, output_subfolder):
+    """
+    Run the ESCO analysis of a CSV file; the entry point of the background job.
+    """
+    return ESCOManager(input_file, output_subfolder).run_analysis()
+
+def submit_esco_analysis(input_file, output_subfolder):
+    """
+    Queue the ESCO analysis of a CSV file as a background job.
+
+    The extraction pipelines are loaded in the worker process, not in the app.
+
+    Args:
+        input_file (str): Path of the input CSV file.
+        output_subfolder (str): Name of the report subfolder.
+
+    Returns:
+        str: ID of the job; its result is the completion message.
+    """
+    return job_queue.submit('esco_analysis', run_esco_analysis, input_file, output_subfolder)
+
 class ESCOManager:
     def __init__(self, input_file: str, output_subfolder):
         self.input_file = input_file
         timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
         self.output_subfolder = os.path.join(reports_folder_path, output_subfolder)
         self.output_file = os.path.join(self.output_subfolder, f"extracted_skills_{timestamp}.csv")
+        from modules import ESCOAnalyzer
+
         self.analyzer :ISkillKnowledgeExtractor = ESCOAnalyzer()
 
     def run_analysis(self):
         """
         Executes the ESCO analysis and saves results.
         """
+        from modules import detect_language
+
         os.makedirs(self.output_subfolder, exist_ok=True)
         df = pd.read_csv(self.input_file, encoding='utf-8')
         results = []
@@ -32,14 +61,15 @@ class ESCOManager:
             lang = detect_language(job_description)
             extracted_data = self.analyzer.extract_skills_and_knowledge(job_description, lang)
             results.append(extracted_data)
+            report_progress((i + 1) / len(df), f"Analyzed {i + 1} of {len(df)} postings")
 
-            if (i + 1) % (len(df) // 10) == 0 or i == len(df) - 1:
+            if (i + 1) % max(1, len(df) // 10) == 0 or i == len(df) - 1:
                 progress_df = pd.DataFrame(results)
                 self.analyzer.save_progress(progress_df, self.output_subfolder)
 
         # Ensure the output folder is inside the 'reports' directory
         try:
-            timestamp = datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
+            timestamp = datetime.datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
             self.output_folder_path = os.path.join(reports_folder_path, f'{self.output_subfolder}_{timestamp}')
             os.makedirs(self.output_folder_path, exist_ok=True)
         except Exception as e:
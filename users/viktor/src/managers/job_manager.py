@@ -0,0 +1,53 @@
+from modules import JobQueue
+
+from config import Config
+
+# Load configuration
+configs = Config()
+
+# Jobs submitted by any session of the app run in the same queue and worker pool
+job_queue = JobQueue.shared(configs.jobs_file, configs.job_workers, configs.job_concurrency_limits)
+
+def get_job(job_id):
+    """
+    Return the status, progress and ETA of a background job, or None if it does not exist.
+    """
+    return job_queue.status(job_id)
+
+def get_jobs(job_type=None, limit=20):
+    """
+    List the most recently submitted background jobs, optionally of one job type.
+    """
+    return job_queue.jobs(job_type=job_type, limit=limit)
+
+def cancel_job(job_id):
+    """
+    Cancel a queued or running background job; returns False if it had already finished.
+    """
+    return job_queue.cancel(job_id)
+
+def render_jobs(job_type, limit=5):
+    """
+    Show the recent background jobs of one job type on the current Streamlit page.
+
+    Every rerun of the page, e.g. through the Refresh button, polls the progress of the
+    jobs. Queued and running jobs can be cancelled. A job whose result is an error message
+    is shown as an error.
+    """
+    # Imported here, so the job workers loading the managers do not import Streamlit
+    import streamlit as st
+
+    st.subheader("Background jobs")
+    st.button("Refresh", key=f"refresh_{job_type}")
+    for job in get_jobs(job_type, limit=limit):
+        eta = f", about {job['eta']:.0f} s left" if job['eta'] and job['status'] in ('queued', 'running') else ""
+        st.write(f"{job['submitted_at'][:19]}: {job['status']}{eta}")
+        if job['status'] == 'running':
+            st.progress(job['progress'], text=job['message'])
+        if job['status'] in ('queued', 'running') and not job['cancel_requested']:
+            if st.button("Cancel", key=f"cancel_{job['id']}"):
+                cancel_job(job['id'])
+        if job['error'] or (job['result'] and job['result'].startswith("Error")):
+            st.error(job['error'] or job['result'])
+        elif job['result']:
+            st.success(job['result'])
@@ -1,10 +1,12 @@
 import os
+import json
 import pandas as pd
 from datetime import datetime
 
 from config import Config
-from modules import TopicModel, TopicModelVisualizer
-from interfaces import ITopicModel, ITopicModelVisualizer
+from modules import find_dataset_file, find_embeddings_file, DatasetCache, RunCache, report_progress
+from interfaces import ITopicModel, ITopicModelVisualizer, ITopicModelArtifact, IEmbeddingReducer
+from .job_manager import job_queue
 
 # Load the dataset path and stopword files from the configuration
 configs = Config()
@@ -13,6 +15,23 @@ text_column = configs.text_column
 
 stopword_file_names = configs.stopword_file_names
 reports_folder_path = configs.reports_folder_path
+drift_p_value_threshold = configs.drift_p_value_threshold
+reduction_method = configs.reduction_method
+reduction_components = configs.reduction_components
+embedding_storage_dtype = configs.embedding_storage_dtype
+report_cache_bytes = configs.report_cache_bytes
+wordcloud_cache_bytes = configs.wordcloud_cache_bytes
+visualization_workers = configs.visualization_workers
+combined_metrics_panel = configs.combined_metrics_panel
+
+# Word cloud layouts are cached across reports and shared with the keyword word clouds
+wordcloud_cache_folder = os.path.join(reports_folder_path, '.wordcloud_cache')
+
+# The topic model, visualizer (sklearn, sentence-transformers, wordcloud, docx) and artifact
+# modules are imported where they are used, so opening the page does not load them
+
+# Loaded datasets are shared with the other managers in the process
+dataset_cache = DatasetCache.shared(configs.dataset_cache_bytes)
 
 class Topic_Modeling_Manager():
     def __init__(self, selected_folder, output_folder, n_topics, num_top_words, epochs):
@@ -22,53 +41,96 @@ class Topic_Modeling_Manager():
         self.num_top_words = num_top_words
         self.epochs = epochs
         self.column_name = text_column
-
-    def main(self):
-        # Find a CSV file in the selected folder
-        normal_files = [
-            f for f in os.listdir(self.selected_folder)
-            if f.endswith('.csv') and f != 'embeddings.csv'
-        ]
-
-        if not normal_files:
-            raise FileNotFoundError("No valid CSV dataset files found in the selected folder.")
-        
-        # Use the first valid CSV file
-        normal_dataset = os.path.join(self.selected_folder, normal_files[0])
+        self.model = "all-mpnet-base-v2"
+
+    def main(self, force_refresh=False):
+        """
+        Run topic modeling on the selected dataset, reusing the reports of an identical earlier run.
+
+        The run is fingerprinted by the contents of the dataset and embeddings, the embedding
+        model, the parameters and the version of the topic modeling code; when a completed
+        run with the same fingerprint exists its report folder is returned without refitting.
+
+        Args:
+            force_refresh (bool): Refit and write new reports even when an identical run exists.
+
+        Returns:
+            str: The report folder, or None if the run failed.
+        """
+        from modules import TopicModel, TopicModelVisualizer, EmbeddingReducer, render_wordcloud
+
+        run_cache = RunCache(reports_folder_path, report_cache_bytes, dataset_cache)
+        parameters = {
+            'text_column': self.column_name,
+            'n_topics': int(self.n_topics),
+            'num_top_words': int(self.num_top_words),
+            'epochs': int(self.epochs),
+            'reduction_method': reduction_method,
+            'reduction_components': reduction_components,
+            'embedding_storage_dtype': embedding_storage_dtype,
+            'combined_metrics_panel': combined_metrics_panel,
+        }
+        fingerprint = run_cache.fingerprint(
+            'topic_modeling',
+            [find_dataset_file(self.selected_folder), find_embeddings_file(self.selected_folder)],
+            embedding_model=self.model,
+            parameters=parameters,
+            code_version=RunCache.code_version(TopicModel, TopicModelVisualizer, EmbeddingReducer, render_wordcloud),
+        )
+        output_folder_path, _ = run_cache.run(fingerprint, 'topic_modeling', self.run_analysis, parameters,
+                                              force_refresh=force_refresh)
+        return output_folder_path
+
+    def submit(self, force_refresh=False):
+        """
+        Queue `main` as a background job.
+
+        Args:
+            force_refresh (bool): Refit and write new reports even when an identical run exists.
+
+        Returns:
+            str: ID of the job; its result is the report folder.
+        """
+        return job_queue.submit('topic_modeling', self.main, force_refresh=force_refresh)
+
+    def run_analysis(self):
+        """
+        Fit the topic model and write its reports to a new timestamped report folder.
+
+        Returns:
+            str: The report folder, or None if the run failed.
+        """
+        from modules import TopicModel, TopicModelVisualizer, EmbeddingReducer, evict_layouts
+
+        # Locate the dataset (Parquet, or CSV for older datasets) in the selected folder
+        normal_dataset = find_dataset_file(self.selected_folder)
         print(f"Using dataset: {normal_dataset}")
 
         try:
-            # Load the CSV dataset
-            normal_data = pd.read_csv(normal_dataset)
+            # Load only the text column
+            report_progress(0.0, "Loading the dataset")
+            normal_data = dataset_cache.read_dataset(normal_dataset, columns=[self.column_name])
         except FileNotFoundError:
-            raise FileNotFoundError(f"CSV dataset not found at path: {normal_dataset}")
+            raise FileNotFoundError(f"Dataset not found at path: {normal_dataset}")
         except pd.errors.EmptyDataError:
-            raise ValueError(f"The CSV dataset at {normal_dataset} is empty.")
+            raise ValueError(f"The dataset at {normal_dataset} is empty.")
         except Exception as e:
-            raise RuntimeError(f"Failed to load CSV dataset: {e}")
-
-        # Find a CSV file in the selected folder which is'embeddings.csv'
-        embedding_files = [
-            f for f in os.listdir(self.selected_folder)
-            if f.endswith('.csv') and f == 'embeddings.csv'
-        ]
-
-        if not embedding_files:
-            raise FileNotFoundError("No valid CSV dataset files found in the selected folder.")
-        
-        # Use the first valid CSV file
-        embeddings_dataset = os.path.join(self.selected_folder, embedding_files[0])
+            raise RuntimeError(f"Failed to load dataset: {e}")
+
+        # Locate the embeddings in the selected folder
+        embeddings_dataset = find_embeddings_file(self.selected_folder)
         print(f"Using dataset: {embeddings_dataset}")
 
         try:
-            # Load the CSV dataset
-            embeddings_data = pd.read_csv(embeddings_dataset)
+            # Open the embeddings as a read-only memory-mapped matrix
+            embeddings_data = dataset_cache.embedding_store(self.selected_folder, embeddings_dataset,
+                                                            dtype=embedding_storage_dtype).embeddings
         except FileNotFoundError:
-            raise FileNotFoundError(f"CSV dataset not found at path: {embeddings_dataset}")
+            raise FileNotFoundError(f"Embeddings dataset not found at path: {embeddings_dataset}")
         except pd.errors.EmptyDataError:
-            raise ValueError(f"The CSV dataset at {embeddings_dataset} is empty.")
+            raise ValueError(f"The embeddings dataset at {embeddings_dataset} is empty.")
         except Exception as e:
-            raise RuntimeError(f"Failed to load CSV dataset: {e}")
+            raise RuntimeError(f"Failed to load embeddings dataset: {e}")
    
         try:
             # Get current timestamp for unique folder naming
@@ -81,12 +143,15 @@ class Topic_Modeling_Manager():
             os.makedirs(output_folder_path, exist_ok=True)
 
             texts = normal_data[self.column_name]
-            
-            self.column_name = 'description_embeddings'
 
-            model = "all-mpnet-base-v2"
+            model = self.model
+
+            embeddings = embeddings_data
 
-            embeddings = embeddings_data[self.column_name]
+            # Optional pre-reduction, cached next to the embeddings so it is fitted once per dataset
+            reducer: IEmbeddingReducer = None
+            if reduction_method:
+                reducer = EmbeddingReducer(reduction_method, reduction_components, cache_folder=self.selected_folder)
 
             topic_model: ITopicModel = TopicModel(
                 embeddings=embeddings,
@@ -96,9 +161,12 @@ class Topic_Modeling_Manager():
                 max_iter=self.epochs,
                 model=model,
                 output_subfolder=output_folder_path,
+                reducer=reducer,
             )
 
+            report_progress(0.1, "Fitting the topic model")
             topic_model.fit_model()
+            report_progress(0.6, "Evaluating the topics")
             
             # Execute topic modeling and display the topics
             metrics_data, keywords, desc_embeddings = topic_model.execute_topic_modeling()
@@ -119,7 +187,13 @@ class Topic_Modeling_Manager():
         experiment_file = "experiment_file.txt"
 
         # Visualize the topics and evaluation metrics
-        visualizer: ITopicModelVisualizer = TopicModelVisualizer(topic_model, output_folder_path, experiment_file)
+        report_progress(0.8, "Creating the visualizations")
+        visualizer: ITopicModelVisualizer = TopicModelVisualizer(
+            topic_model, output_folder_path, experiment_file,
+            max_workers=visualization_workers,
+            combined_metrics=combined_metrics_panel,
+            wordcloud_cache_folder=wordcloud_cache_folder,
+        )
         visualizer.create_all_visualizations(
             metrics_data["topic_diversity_score"], 
             metrics_data["silhouette_score"], 
@@ -128,4 +202,43 @@ class Topic_Modeling_Manager():
             metrics_data["inertia"],
             metrics_data["adjusted_rand_index"],
             keywords
-        )
\ No newline at end of file
+        )
+
+        # Keep the layout cache within its budget
+        evict_layouts(wordcloud_cache_folder, wordcloud_cache_bytes)
+        return output_folder_path
+
+    def assign_new_postings(self, model_folder):
+        """
+        Label the postings in the selected folder with a previously saved topic model.
+
+        Loads the TopicModelArtifact from `model_folder`, assigns every embedding of the
+        selected dataset to its nearest topic without refitting, and writes the labels
+        and a drift report next to the model.
+
+        Args:
+            model_folder (str): Folder containing a saved topic model artifact.
+
+        Returns:
+            dict: The drift report for the assigned postings.
+        """
+        from modules import TopicModelArtifact
+
+        artifact: ITopicModelArtifact = TopicModelArtifact.load(model_folder)
+        embeddings = dataset_cache.embedding_store(self.selected_folder, find_embeddings_file(self.selected_folder),
+                                                   dtype=embedding_storage_dtype).embeddings
+
+        labels, distances = artifact.assign(embeddings)
+        drift_report = artifact.detect_drift(distances, p_value_threshold=drift_p_value_threshold)
+
+        timestamp = datetime.now().strftime("%Y_%m_%d_%H_%M_%S")
+        assignments_file = os.path.join(model_folder, f"topic_assignments_{timestamp}.csv")
+        pd.DataFrame({"topic": labels, "distance": distances}).to_csv(assignments_file, index=False)
+
+        drift_file = os.path.join(model_folder, f"drift_report_{timestamp}.json")
+        with open(drift_file, "w") as f:
+            json.dump(drift_report, f, indent=4)
+
+        print(f"Topic assignments saved to: {assignments_file}")
+        print(f"Drift report saved to: {drift_file}")
+        return drift_report
@@ -0,0 +1,73 @@
+import os
+
+from config import Config
+
+# Load configuration
+configs = Config()
+
+csv_dataset = configs.csv_dataset
+keywords_folder_path = configs.keywords_folder_path
+reports_folder_path = configs.reports_folder_path
+stopword_file_names = configs.stopword_file_names
+trend_workers = configs.trend_workers
+
+# The analysis module (gensim, scikit-learn, ruptures) is imported where it is used,
+# so importing the manager does not load it
+
+class Word2Vec_Trends_Manager():
+    """
+    Builds the Word2Vec keyword trend analysis from the configuration, trains the model and plots the trends.
+
+    The report folder is not timestamped, so the saved Word2Vec model, its token cache and its
+    smoothed curves are reused by the next run, and new postings can be trained incrementally.
+
+    Args:
+        output_subfolder (str): Name of the report folder inside the reports folder.
+        input_file (str): CSV file with 'Description' and 'CreatedAt' columns; defaults to the configured dataset.
+        keywords_list_file (str): JSON list of keywords joined into single tokens (optional).
+        date_range (tuple): (start, end) restricting the postings to start <= 'CreatedAt' < end (optional).
+        dictionaries (list): Names of the keyword dictionaries in the keywords folder to track;
+            defaults to all of them.
+    """
+    def __init__(self, output_subfolder, input_file=None, keywords_list_file=None, date_range=None,
+                 dictionaries=None):
+        self.output_subfolder = output_subfolder
+        self.input_file = input_file or csv_dataset
+        self.keywords_list_file = keywords_list_file
+        self.date_range = date_range
+        self.dictionaries = dictionaries
+
+    def build_analysis(self):
+        """
+        Create the analysis for the report folder with the configured stopwords and workers,
+        tracking the keyword dictionaries of the keywords folder.
+
+        Returns:
+            Word2Vec_Embedding_Analysis: The analysis.
+        """
+        from modules import TextPreprocessor, load_keyword_dictionaries
+        from modules.word2vec_embedding_trend_analysis import Word2Vec_Embedding_Analysis
+
+        output_subfolder_path = os.path.join(reports_folder_path, self.output_subfolder)
+        stopwords = TextPreprocessor(stopword_file_names).stopwords
+        trend_dictionaries = load_keyword_dictionaries(keywords_folder_path, self.dictionaries)
+        return Word2Vec_Embedding_Analysis(self.input_file, output_subfolder_path, self.keywords_list_file,
+                                           sorted(stopwords), n_jobs=trend_workers,
+                                           trend_dictionaries=trend_dictionaries, date_range=self.date_range)
+
+    def run_analysis(self, incremental=True, smoothing_method=None):
+        """
+        Train (or update) the Word2Vec model and plot the trends of every tracked keyword dictionary.
+
+        Args:
+            incremental (bool): Only train on the postings added since the saved model.
+            smoothing_method (str): Smoothing method of the trend plots; defaults to Gaussian processes.
+
+        Returns:
+            str: The report folder.
+        """
+        analysis = self.build_analysis()
+        analysis.tokenize_and_train(incremental=incremental)
+        for dictionary in analysis.trend_dictionaries:
+            analysis.produce_scatter_plot(smoothing_method=smoothing_method, dictionary=dictionary)
+        return analysis.output_subfolder
@@ -4,8 +4,7 @@ import json
 
 from config import Config
 
-from external_systems import SSEMEmbedder
-from modules import WordCloudGenerator
+from modules import DatasetCache, RunCache, find_embeddings_file
 from interfaces import IWordCloudGenerator
 
 from datetime import datetime
@@ -18,13 +17,26 @@ text_column = configs.text_column
 stopword_file_names = configs.stopword_file_names
 name_of_topics = configs.name_of_topics
 reports_folder_path = configs.reports_folder_path
+embedding_storage_dtype = configs.embedding_storage_dtype
+report_cache_bytes = configs.report_cache_bytes
+wordcloud_cache_bytes = configs.wordcloud_cache_bytes
+visualization_workers = configs.visualization_workers
+
+# Word cloud layouts are cached next to the reports and shared with the topic model reports
+wordcloud_cache_folder = os.path.join(reports_folder_path, '.wordcloud_cache')
+
+# The word cloud module (sentence-transformers, wordcloud) is imported where it is used,
+# so opening the page does not load it
+
+# Loaded datasets are shared with the other managers in the process
+dataset_cache = DatasetCache.shared(configs.dataset_cache_bytes)
 
 def get_json_files_for_word_clouds():
     try:
         # Get all files in the specified folder
         files = [
             os.path.splitext(f)[0]  # Extract filename without extension
-            for f in os.listdir(keywords_folder_path)
+            for f in dataset_cache.listdir(keywords_folder_path)
             if os.path.isfile(os.path.join(keywords_folder_path, f))
         ]
 
@@ -67,7 +79,7 @@ class Word_Clouds_Manager():
             # Get all files in the specified folder
             files = [
                 os.path.splitext(f)[0]  # Extract filename without extension
-                for f in os.listdir(keywords_folder_path)
+                for f in dataset_cache.listdir(keywords_folder_path)
                 if os.path.isfile(os.path.join(keywords_folder_path, f))
             ]
 
@@ -84,29 +96,62 @@ class Word_Clouds_Manager():
             print(f"Unexpected error: {e}")
             return []
 
-    def main(self):
-        # Find a CSV file in the selected folder called 'embeddings.csv'
-        embedding_files = [
-            f for f in os.listdir(self.selected_folder)
-            if f.endswith('.csv') and f == 'embeddings.csv'
-        ]
-
-        if not embedding_files:
-            raise FileNotFoundError("No valid CSV embeddings files found in the selected folder.")
-
-        # Use the first valid CSV file
-        embeddings_dataset = os.path.join(self.selected_folder, embedding_files[0])
+    def main(self, force_refresh=False):
+        """
+        Generate the word clouds for the selected dataset, reusing the reports of an identical earlier run.
+
+        The run is fingerprinted by the contents of the embeddings, keyword file and stopword
+        files, the embedding model, the parameters and the version of the word cloud code.
+
+        Args:
+            force_refresh (bool): Write new word clouds even when an identical run exists.
+
+        Returns:
+            str: The report folder.
+        """
+        from modules import WordCloudGenerator, render_wordcloud
+
+        run_cache = RunCache(reports_folder_path, report_cache_bytes, dataset_cache)
+        parameters = {
+            'name_of_topics': name_of_topics,
+            'stopwords': run_cache.content_hash(*stopword_file_names) if stopword_file_names else None,
+            'embedding_storage_dtype': embedding_storage_dtype,
+        }
+        fingerprint = run_cache.fingerprint(
+            'word_clouds',
+            [find_embeddings_file(self.selected_folder)],
+            embedding_model="all-mpnet-base-v2",
+            keyword_file=self.topics_file,
+            parameters=parameters,
+            code_version=RunCache.code_version(WordCloudGenerator, render_wordcloud),
+        )
+        output_subfolder_path, _ = run_cache.run(fingerprint, 'word_clouds', self.run_analysis, parameters,
+                                                 force_refresh=force_refresh)
+        return output_subfolder_path
+
+    def run_analysis(self):
+        """
+        Generate the word clouds into a new timestamped report folder.
+
+        Returns:
+            str: The report folder.
+        """
+        from modules import WordCloudGenerator, evict_layouts
+
+        # Locate the embeddings (Parquet, or CSV for older datasets) in the selected folder
+        embeddings_dataset = find_embeddings_file(self.selected_folder)
         print(f"Using embeddings dataset: {embeddings_dataset}")
         
         try:
-            # Load the CSV dataset
-            embeddings_data = pd.read_csv(embeddings_dataset)
+            # Open the embeddings as a read-only memory-mapped matrix
+            embeddings_data = dataset_cache.embedding_store(self.selected_folder, embeddings_dataset,
+                                                            dtype=embedding_storage_dtype).embeddings
         except FileNotFoundError:
-            raise FileNotFoundError(f"CSV embeddings dataset not found at path: {embeddings_dataset}")
+            raise FileNotFoundError(f"Embeddings dataset not found at path: {embeddings_dataset}")
         except pd.errors.EmptyDataError:
-            raise ValueError(f"The CSV embeddings dataset at {embeddings_dataset} is empty.")
+            raise ValueError(f"The embeddings dataset at {embeddings_dataset} is empty.")
         except Exception as e:
-            raise RuntimeError(f"Failed to load CSV embeddings dataset: {e}")
+            raise RuntimeError(f"Failed to load embeddings dataset: {e}")
         
         # Ensure the output folder is inside the 'reports' directory
         try:
@@ -135,7 +180,9 @@ class Word_Clouds_Manager():
 
         # Initialize the WordCloudGenerator
         try:
-            generator :IWordCloudGenerator = WordCloudGenerator(embeddings_data, keyword_dict, output_subfolder_path, name_of_topics, stopword_file_names, text_column)
+            generator :IWordCloudGenerator = WordCloudGenerator(embeddings_data, keyword_dict, output_subfolder_path, name_of_topics, stopword_file_names, text_column,
+                                                                max_workers=visualization_workers,
+                                                                layout_cache_folder=wordcloud_cache_folder)
         except Exception as e:
             raise RuntimeError(f"Failed to initialize WordCloudGenerator: {e}")
 
@@ -145,6 +192,9 @@ class Word_Clouds_Manager():
         except Exception as e:
             raise RuntimeError(f"Error generating WordCloud images: {e}")
 
+        # Keep the layout cache within its budget
+        evict_layouts(wordcloud_cache_folder, wordcloud_cache_bytes)
+
         # Ensure images were generated successfully
         if not image_paths:
             raise RuntimeError("No WordCloud images were generated. Please check the input data and topics.")
@@ -155,4 +205,6 @@ class Word_Clouds_Manager():
             for path in image_paths:
                 print(path)
         except Exception as e:
-            raise RuntimeError(f"Error logging generated image paths: {e}")
\ No newline at end of file
+            raise RuntimeError(f"Error logging generated image paths: {e}")
+
+        return output_subfolder_path
\ No newline at end of file
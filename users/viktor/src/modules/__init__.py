@@ -1,12 +1,63 @@
-# from .topic_modeling import NMFModel
-from .topic_modeling import TopicModel
-from .topic_modeling_visualisation import TopicModelVisualizer
-from .box_plots import KeywordFeatureExtractorBoxPlots, BoxPlotsVisualizer
-from .feature_extractor import KeywordFeatureExtractor
-from .word_clouds import WordCloudGenerator
-from .data_registry import DatasetRegistry
-from .data_formatter import DataFormatter
-from .semiannual_feature_distribution import SemiannualFeatureDistributionPlotter
-from .temperature import SoftmaxWithTemperature
-from .text_preprocessor import TextPreprocessor
-from .esco_extraction import ESCOAnalyzer, detect_language
\ No newline at end of file
+import importlib
+
+# Exported names and the submodules defining them. Submodules are imported on first access
+# (PEP 562), so importing the package, or one name from it, only loads the dependencies of
+# what is used; e.g. the data registry does not pull in transformers, gensim or wordcloud.
+_EXPORTS = {
+    # 'NMFModel': 'topic_modeling',
+    'TopicModel': 'topic_modeling',
+    'TopicModelArtifact': 'topic_model_artifact',
+    'EmbeddingReducer': 'embedding_reducer',
+    'EmbeddingStore': 'embedding_store',
+    'QuantizedEmbeddings': 'quantization',
+    'quantize': 'quantization',
+    'dequantize': 'quantization',
+    'quantization_report': 'quantization',
+    'TopicModelVisualizer': 'topic_modeling_visualisation',
+    'KeywordFeatureExtractorBoxPlots': 'box_plots',
+    'BoxPlotsVisualizer': 'box_plots',
+    'KeywordFeatureExtractor': 'feature_extractor',
+    'WordCloudGenerator': 'word_clouds',
+    'render_wordcloud': 'wordcloud_layouts',
+    'wordcloud_layout': 'wordcloud_layouts',
+    'evict_layouts': 'wordcloud_layouts',
+    'DatasetRegistry': 'data_registry',
+    'DataFormatter': 'data_formatter',
+    'TrendCube': 'trend_cube',
+    'SemiannualFeatureDistributionPlotter': 'semiannual_feature_distribution',
+    'SoftmaxWithTemperature': 'temperature',
+    'TextPreprocessor': 'text_preprocessor',
+    'Word2VecPreprocessor': 'word2vec_preprocessing',
+    'TrendSmoother': 'trend_smoother',
+    'KeywordTrendTracker': 'keyword_trend_tracker',
+    'load_keyword_dictionaries': 'keyword_trend_tracker',
+    'ESCOAnalyzer': 'esco_extraction',
+    'detect_language': 'esco_extraction',
+    'parse_embedding': 'embedding_utils',
+    'parse_embeddings': 'embedding_utils',
+    'read_dataset': 'dataset_storage',
+    'dataset_columns': 'dataset_storage',
+    'read_embeddings': 'dataset_storage',
+    'find_dataset_file': 'dataset_storage',
+    'find_embeddings_file': 'dataset_storage',
+    'partitions_for_folder': 'time_partitions',
+    'read_partitions': 'time_partitions',
+    'in_date_range': 'time_partitions',
+    'DatasetCache': 'dataset_cache',
+    'RunCache': 'run_cache',
+    'JobQueue': 'job_queue',
+    'JobCancelled': 'job_queue',
+    'report_progress': 'job_queue',
+}
+
+__all__ = list(_EXPORTS)
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -1,43 +1,54 @@
 import os
-import sys
 import pandas as pd
 import numpy as np
 import json
 import re
-import ast
 import seaborn as sns
 import matplotlib.pyplot as plt
-from scipy.special import softmax
 from datetime import datetime
 from interfaces import IKeywordFeatureExtractor, IBoxPlots
-from sklearn.metrics.pairwise import cosine_similarity
+from .embedding_utils import parse_embeddings
+from .quantization import QuantizedEmbeddings
+from .trend_cube import TrendCube
 
 class KeywordFeatureExtractorBoxPlots(IKeywordFeatureExtractor):
     """
     A class for extracting keyword-based features from a DataFrame containing embeddings and applying softmax normalization.
 
+    The embeddings are processed in row blocks: each block is parsed, normalized and multiplied
+    once with the stacked, normalized keyword embeddings of all features, after which the
+    per-feature maximum similarity and the softmax are computed vectorized. Peak memory is
+    bounded by the block size instead of the corpus size.
+
     Attributes:
-        df (pd.DataFrame): The input DataFrame containing the embeddings.
-        column (str): The name of the column in the DataFrame that contains embeddings (e.g., sentence embeddings).
+        df (pd.DataFrame): The input DataFrame the features are added to.
+        embeddings_df (pd.DataFrame or np.ndarray): DataFrame holding the embeddings, or a 2-D embedding matrix
+            such as a read-only memory-mapped view; aligned row by row with df. QuantizedEmbeddings are
+            scored on their int8 form.
+        column (str): The name of the column in embeddings_df that contains embeddings (e.g., sentence embeddings).
         keyword_dict (dict): A dictionary where keys are feature names and values are lists of keywords.
         keyword_embeddings (dict): A dictionary where the keys are feature names and the values are the embeddings for the keywords.
         temp (float): Temperature parameter for softmax normalization, which controls the scale of the values (default is 0.5).
+        batch_size (int): Number of embeddings processed per block.
 
     Methods:
         extract_features():
             Extracts features based on cosine similarity between the embeddings and keyword embeddings, then applies softmax normalization.
     """
     
-    def __init__(self, df, embeddings_df, column, keyword_dict, keyword_embeddings, temp=0.5):
+    def __init__(self, df, embeddings_df, column, keyword_dict, keyword_embeddings, temp=0.5, batch_size=4096):
         """
         Initializes the KeywordFeatureExtractorBoxPlots instance.
 
         Args:
-            df (pd.DataFrame): DataFrame containing embeddings.
+            df (pd.DataFrame): DataFrame the features are added to.
+            embeddings_df (pd.DataFrame or np.ndarray): DataFrame containing embeddings, or a 2-D embedding matrix
+                that is read block by block without copying.
             column (str): Name of the column containing embeddings.
             keyword_dict (dict): Dictionary with feature names as keys and lists of keywords as values.
             keyword_embeddings (dict): Dictionary with feature names as keys and their corresponding keyword embeddings as values.
             temp (float): Temperature parameter for softmax normalization (default is 0.5).
+            batch_size (int): Number of embeddings processed per block (default is 4096).
         """
         self.df = df
         self.embeddings_df = embeddings_df
@@ -45,45 +56,86 @@ class KeywordFeatureExtractorBoxPlots(IKeywordFeatureExtractor):
         self.keyword_dict = keyword_dict
         self.keyword_embeddings = keyword_embeddings
         self.temp = temp
-    
-    def extract_features(self):
-        """
-        Extracts features based on cosine similarity between embeddings and keyword embeddings, and normalizes the features using softmax.
-        """
-        # Check if column exists
-        if self.column not in self.embeddings_df.columns:
-            print(f"Column '{self.column}' not found in DataFrame.")
-            sys.exit(1)
+        self.batch_size = batch_size
 
-        # Ensure the embeddings are in the correct format (convert string representation to list)
-        embeddings = np.array(self.embeddings_df[self.column].apply(lambda x: np.array(ast.literal_eval(x))).tolist())
+    @staticmethod
+    def _normalize_rows(matrix):
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.where(norms == 0, 1.0, norms)
 
-        # Create a copy of the original DataFrame to store the features
-        feature_df = self.df.copy()
-
-        # Calculate the cosine similarity between each embedding and the keyword embeddings
-        for feature_name, keywords in self.keyword_dict.items():
-            # Get the keyword embeddings
-            keyword_embeds = self.keyword_embeddings[feature_name]
+    def _stacked_keyword_matrix(self):
+        """
+        Stack the keyword embeddings of all features into one normalized matrix.
 
-            # Calculate the cosine similarity for each embedding in the column
-            similarities = cosine_similarity(embeddings, keyword_embeds)
+        Returns:
+            tuple: (matrix of shape (n_keywords, dim), start offset of each feature's rows)
+        """
+        blocks = [np.atleast_2d(np.asarray(self.keyword_embeddings[feature_name], dtype=np.float32))
+                  for feature_name in self.keyword_dict]
+        if any(block.shape[0] == 0 for block in blocks):
+            raise ValueError("Every feature needs at least one keyword embedding.")
+        offsets = np.cumsum([0] + [block.shape[0] for block in blocks[:-1]])
+        return self._normalize_rows(np.vstack(blocks)), offsets
+
+    def compute_scores(self):
+        """
+        Compute the softmax-normalized feature scores for all embeddings, block by block.
 
-            # Assign the maximum similarity to the corresponding feature
-            feature_df[feature_name] = np.max(similarities, axis=1)
+        Returns:
+            np.ndarray: float32 array of shape (n_documents, n_features + 1); the last column is 'Other'.
+        """
+        if not isinstance(self.embeddings_df, pd.DataFrame):
+            embeddings = self.embeddings_df
+        elif self.column not in self.embeddings_df.columns:
+            raise KeyError(f"Column '{self.column}' not found in DataFrame.")
+        else:
+            embeddings = self.embeddings_df[self.column]
+
+        keyword_matrix, offsets = self._stacked_keyword_matrix()
+        scores = np.empty((len(embeddings), len(self.keyword_dict) + 1), dtype=np.float32)
+
+        for start in range(0, len(embeddings), self.batch_size):
+            rows = embeddings.iloc[start:start + self.batch_size] if isinstance(embeddings, pd.Series) \
+                else embeddings[start:start + self.batch_size]
+
+            # One GEMM for all features, then the maximum similarity within each feature's keywords
+            if isinstance(rows, QuantizedEmbeddings):
+                similarities = rows.cosine_scores(keyword_matrix)
+            else:
+                similarities = self._normalize_rows(parse_embeddings(rows)) @ keyword_matrix.T
+            block_scores = np.empty((similarities.shape[0], scores.shape[1]), dtype=np.float32)
+            block_scores[:, :-1] = np.maximum.reduceat(similarities, offsets, axis=1)
+
+            # 'Other' captures how poorly the best feature matches
+            block_scores[:, -1] = 1 - block_scores[:, :-1].max(axis=1)
+
+            # Row-wise softmax with temperature
+            logits = block_scores / self.temp
+            logits -= logits.max(axis=1, keepdims=True)
+            np.exp(logits, out=logits)
+            scores[start:start + len(logits)] = logits / logits.sum(axis=1, keepdims=True)
+
+        return scores
+
+    def extract_features(self, columns_to_keep=None):
+        """
+        Extracts features based on cosine similarity between embeddings and keyword embeddings, and normalizes the features using softmax.
 
-        # Add 'Other' feature for no match (this will be handled by the lowest similarity values)
-        feature_df['Other'] = 1 - feature_df[list(self.keyword_dict.keys())].max(axis=1)
+        Args:
+            columns_to_keep (list): Columns of df to include in the result; defaults to all columns.
 
-        # Normalize the features using softmax
-        def apply_softmax_with_temp(row):
-            return softmax(np.array(row) / self.temp)
+        Returns:
+            pd.DataFrame: The selected columns of df with one float32 column per feature and 'Other'.
 
-        # Apply softmax to the features
-        feature_df[list(self.keyword_dict.keys()) + ['Other']] = feature_df[list(self.keyword_dict.keys()) + ['Other']].apply(
-            apply_softmax_with_temp, axis=1, result_type='expand')
+        Raises:
+            KeyError: If the embeddings column is missing.
+        """
+        scores = self.compute_scores()
+        feature_columns = list(self.keyword_dict.keys()) + ['Other']
 
-        return feature_df
+        feature_df = self.df if columns_to_keep is None else self.df[columns_to_keep]
+        features = pd.DataFrame(scores, columns=feature_columns, index=feature_df.index)
+        return pd.concat([feature_df.drop(columns=feature_columns, errors='ignore'), features], axis=1)
 
 class BoxPlotsVisualizer(IBoxPlots):
     """
@@ -95,13 +147,15 @@ class BoxPlotsVisualizer(IBoxPlots):
         role_columns (list): A list of column names that represent different features (e.g., job roles).
         output_subfolder_base (str): Base name for the output subfolder where reports will be saved.
         reports_folder_path (str): Path to the folder where reports will be stored.
+        cube (TrendCube): Materialized aggregates to plot from; built from trend_df if not given.
 
     Methods:
         plot_distribution():
             Creates and saves box plots visualizing the distribution of feature percentages, with the option to order by median or mean.
     """
     
-    def __init__(self, trend_df, monthly_trend_df, role_columns, output_subfolder_base, reports_folder_path, name_of_topics):
+    def __init__(self, trend_df, monthly_trend_df, role_columns, output_subfolder_base, reports_folder_path, name_of_topics,
+                 cube=None):
         """
         Initializes the BoxPlotsVisualizer instance.
 
@@ -111,6 +165,7 @@ class BoxPlotsVisualizer(IBoxPlots):
             role_columns (list): List of column names representing different roles or features.
             output_subfolder_base (str): Base name for the output subfolder for saving plots.
             reports_folder_path (str): Path to the folder where the reports will be saved.
+            cube (TrendCube): Precomputed aggregates; when given, trend_df and monthly_trend_df are not used.
         """
         self.trend_df = trend_df
         self.monthly_trend_df = monthly_trend_df
@@ -118,6 +173,7 @@ class BoxPlotsVisualizer(IBoxPlots):
         self.output_subfolder_base = output_subfolder_base
         self.reports_folder_path = reports_folder_path
         self.name_of_topics = name_of_topics
+        self.cube = cube
 
     def plot_distribution(self):
         """
@@ -129,7 +185,7 @@ class BoxPlotsVisualizer(IBoxPlots):
         The trends are resampled at 6-month intervals to give a semi-annual view.
 
         Returns:
-            None: This method generates and saves the box plots, it does not return any value.
+            str: The timestamped subfolder the box plots were saved to.
         """
         # Define the parent folder and create a timestamped subfolder for saving the plots
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
@@ -138,14 +194,10 @@ class BoxPlotsVisualizer(IBoxPlots):
         # Ensure the output directory exists
         os.makedirs(output_subfolder, exist_ok=True)
 
-        # Extract the month from 'year_month' and merge with monthly trends
-        self.trend_df['month'] = self.trend_df['year_month'].dt.month
-        adjusted_trend_df = self.trend_df.merge(self.monthly_trend_df, on='month', suffixes=('', '_monthly'))
-        adjusted_trend_df.set_index('year_month', inplace=True)
-
-        # Resample the data by 6-month intervals and calculate percentage distribution
-        semiannual_trends_df = adjusted_trend_df[self.role_columns].resample('6ME').sum()
-        semiannual_trends_percent_df = semiannual_trends_df.div(semiannual_trends_df.sum(axis=1), axis=0) * 100
+        # Semiannual percentage distribution, read from the materialized cube
+        if self.cube is None:
+            self.cube = TrendCube.from_trends(self.trend_df, self.monthly_trend_df, self.role_columns)
+        semiannual_trends_percent_df = self.cube.semiannual_percentages()[self.role_columns]
 
         # Melt the data for plotting
         melted_data = semiannual_trends_percent_df.reset_index().melt(
@@ -193,4 +245,6 @@ class BoxPlotsVisualizer(IBoxPlots):
         plt.xticks(rotation=45, ha='right', fontsize=12)
         plt.tight_layout()
         plt.savefig(os.path.join(output_subfolder, 'feature_percentage_distribution_boxplot_mean.png'))
-        plt.close()
\ No newline at end of file
+        plt.close()
+
+        return output_subfolder
\ No newline at end of file
@@ -1,82 +1,380 @@
 import os
+import uuid
+import shutil
+import sqlite3
+import hashlib
 import pandas as pd
 from pathlib import Path
 from datetime import datetime
+from contextlib import closing
 from interfaces import IDatasetRegistry
+from .dataset_storage import write_dataset, write_embeddings, export_csv, EMBEDDINGS_NAME
 
 class DatasetRegistry(IDatasetRegistry):
     """
     A class to manage datasets and database connections in a structured way.
+
+    Registry entries are stored in a local SQLite database (WAL mode) next to the project
+    folders. Inserts and removals run in a single write transaction, so concurrent sessions
+    cannot overwrite each other's entries, and project/dataset lookups are indexed queries
+    instead of filesystem walks. Every entry records the row count, the size on disk, the
+    embedding model and a content hash of the saved dataset.
+
+    Datasets and embeddings are stored as Parquet with typed columns, so readers can load
+    only the columns they need; `export_dataset_csv` writes CSV copies for compatibility.
+
+    Dataset and embedding files are content-addressed: each unique file is stored once under
+    '.blobs/<hash>' in the base folder and hard-linked (or copied, where links are not
+    supported) into the project folders that reference it. Uploading content the registry
+    already knows reuses the stored files, and a blob is only deleted once no entry refers to it.
+    """
+
+    BLOBS_FOLDER = ".blobs"
+
+    COLUMNS = ["id", "project_name", "dataset_name", "original_location", "is_database", "n_rows", "n_bytes",
+               "embedding_model", "content_hash", "embeddings_hash", "source_hash", "time_of_creation",
+               "last_update"]
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS datasets (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_name TEXT NOT NULL,
+            dataset_name TEXT NOT NULL,
+            original_location TEXT NOT NULL,
+            is_database INTEGER NOT NULL DEFAULT 0,
+            n_rows INTEGER,
+            n_bytes INTEGER,
+            embedding_model TEXT,
+            content_hash TEXT,
+            embeddings_hash TEXT,
+            source_hash TEXT,
+            time_of_creation TEXT NOT NULL,
+            last_update TEXT NOT NULL,
+            UNIQUE (project_name, dataset_name)
+        );
+    """
+
+    INDEXES = """
+        CREATE INDEX IF NOT EXISTS idx_datasets_content_hash ON datasets (content_hash);
+        CREATE INDEX IF NOT EXISTS idx_datasets_embeddings_hash ON datasets (embeddings_hash);
+        CREATE INDEX IF NOT EXISTS idx_datasets_source_hash ON datasets (source_hash);
     """
 
     def __init__(self, dataset, project_name, dataset_name, BASE_FOLDER, REGISTRY_FILE):
+        """
+        Initialize the DatasetRegistry.
+
+        Args:
+            dataset: The dataset file object to be saved or removed.
+            project_name (str): The name of the project folder.
+            dataset_name (str): The name of the dataset file.
+            BASE_FOLDER (str): The base directory where projects and datasets are stored.
+            REGISTRY_FILE (Path): Path to the SQLite registry database.
+        """
         self.dataset = dataset
         self.dataset_name = dataset_name
         self.project_name = project_name
         self.BASE_FOLDER = BASE_FOLDER
-        self.REGISTRY_FILE = REGISTRY_FILE
-    
-    def save_dataset(self, dataset, embeddings_dataset, dataset_name, project_name, db_connection=None):
+        self.REGISTRY_FILE = Path(REGISTRY_FILE)
+        self._initialize()
+
+    def _connect(self):
+        """
+        Open a connection to the registry database.
+
+        Connections run in autocommit mode so transactions are started explicitly with
+        BEGIN IMMEDIATE, which takes the write lock up front instead of failing on upgrade.
+
+        Returns:
+            sqlite3.Connection: The open connection.
+        """
+        connection = sqlite3.connect(self.REGISTRY_FILE, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA busy_timeout=30000")
+        return connection
+
+    def _initialize(self):
+        """
+        Create the registry schema and, for a new registry, register the existing dataset folders.
+        """
+        is_new = not self.REGISTRY_FILE.exists()
+        self.REGISTRY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.executescript(self.SCHEMA)
+            # Registries created before content-addressed storage lack the blob hash columns
+            existing_columns = {row["name"] for row in connection.execute("PRAGMA table_info(datasets)")}
+            for column in ("embeddings_hash", "source_hash"):
+                if column not in existing_columns:
+                    connection.execute(f"ALTER TABLE datasets ADD COLUMN {column} TEXT")
+            connection.executescript(self.INDEXES)
+            if is_new:
+                self._register_existing_folders(connection)
+
+    def _register_existing_folders(self, connection):
+        """
+        Register dataset folders that were saved before the registry database existed.
+
+        Args:
+            connection (sqlite3.Connection): Open registry connection.
+        """
+        base_folder = Path(self.BASE_FOLDER)
+        if not base_folder.is_dir():
+            return
+
+        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        entries = []
+        for project_folder in sorted(folder for folder in base_folder.iterdir()
+                                     if folder.is_dir() and not folder.name.startswith(".")):
+            for dataset_folder in sorted(folder for folder in project_folder.iterdir() if folder.is_dir()):
+                n_bytes = sum(file.stat().st_size for file in dataset_folder.rglob("*") if file.is_file())
+                is_database = any(dataset_folder.glob("*_connection.json"))
+                entries.append((project_folder.name, dataset_folder.name, str(dataset_folder), int(is_database),
+                                n_bytes, timestamp, timestamp))
+
+        connection.execute("BEGIN IMMEDIATE")
+        connection.executemany(
+            "INSERT OR IGNORE INTO datasets (project_name, dataset_name, original_location, is_database, n_bytes, "
+            "time_of_creation, last_update) VALUES (?, ?, ?, ?, ?, ?, ?)",
+            entries,
+        )
+        connection.execute("COMMIT")
+
+    @staticmethod
+    def content_hash(*paths):
+        """
+        Compute a SHA-256 hash over the contents of one or more files.
+
+        Args:
+            *paths: Paths of the files to hash, in order.
+
+        Returns:
+            str: Hex digest of the file contents.
+        """
+        digest = hashlib.sha256()
+        for path in paths:
+            with open(path, "rb") as f:
+                for chunk in iter(lambda: f.read(1 << 20), b""):
+                    digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def hash_upload(file):
+        """
+        Compute a SHA-256 hash over an uploaded file object without consuming it.
+
+        Args:
+            file: A binary file-like object, such as a Streamlit UploadedFile.
+
+        Returns:
+            str: Hex digest of the file contents.
+        """
+        digest = hashlib.sha256()
+        file.seek(0)
+        for chunk in iter(lambda: file.read(1 << 20), b""):
+            digest.update(chunk)
+        file.seek(0)
+        return digest.hexdigest()
+
+    def blob_path(self, blob_hash):
+        """
+        Path of a content-addressed file in the blob store.
+
+        Args:
+            blob_hash (str): Content hash of the file.
+
+        Returns:
+            Path: Location of the blob.
+        """
+        return Path(self.BASE_FOLDER) / self.BLOBS_FOLDER / blob_hash[:2] / blob_hash
+
+    def _store_blob(self, write):
+        """
+        Write a file into the blob store under its content hash.
+
+        Args:
+            write (callable): Function writing the content to the path it is given.
+
+        Returns:
+            tuple: (content hash, whether a new blob was created)
+        """
+        blobs_folder = Path(self.BASE_FOLDER) / self.BLOBS_FOLDER
+        blobs_folder.mkdir(parents=True, exist_ok=True)
+        temporary_path = blobs_folder / f"tmp_{uuid.uuid4().hex}"
+        try:
+            write(temporary_path)
+            blob_hash = self.content_hash(temporary_path)
+            blob_path = self.blob_path(blob_hash)
+            if blob_path.exists():
+                return blob_hash, False
+            blob_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(temporary_path, blob_path)
+            return blob_hash, True
+        finally:
+            temporary_path.unlink(missing_ok=True)
+
+    def _link_blob(self, blob_hash, target):
+        """
+        Make a stored blob available at a path inside a project folder.
+
+        Args:
+            blob_hash (str): Content hash of the blob.
+            target (Path): Path the blob should appear at.
+        """
+        try:
+            os.link(self.blob_path(blob_hash), target)
+        except OSError:
+            # Filesystems without hard links get a copy; the blob stays the reference
+            shutil.copyfile(self.blob_path(blob_hash), target)
+
+    def _collect_blobs(self, connection, blob_hashes):
+        """
+        Delete blobs that are no longer referenced by any registry entry.
+
+        Must run inside the write transaction that removed the references.
+
+        Args:
+            connection (sqlite3.Connection): Connection holding the write transaction.
+            blob_hashes (iterable): Content hashes whose references may have been removed.
+        """
+        for blob_hash in {blob_hash for blob_hash in blob_hashes if blob_hash}:
+            referenced = connection.execute(
+                "SELECT 1 FROM datasets WHERE content_hash = ? OR embeddings_hash = ? LIMIT 1",
+                (blob_hash, blob_hash),
+            ).fetchone()
+            if referenced is None:
+                self.blob_path(blob_hash).unlink(missing_ok=True)
+
+    def find_content(self, source_hash, connection=None):
+        """
+        Find a registered dataset that was created from an upload with the given hash.
+
+        Args:
+            source_hash (str): Hash of the uploaded file, see `hash_upload`.
+            connection (sqlite3.Connection): Open connection to reuse (optional).
+
+        Returns:
+            dict: The registry entry whose blobs hold the content, or None if the content is unknown.
+        """
+        query = (f"SELECT {', '.join(self.COLUMNS)} FROM datasets "
+                 "WHERE source_hash = ? AND embeddings_hash IS NOT NULL LIMIT 1")
+        if connection is not None:
+            row = connection.execute(query, (source_hash,)).fetchone()
+        else:
+            with closing(self._connect()) as connection:
+                row = connection.execute(query, (source_hash,)).fetchone()
+        if row is None or not self.blob_path(row["content_hash"]).exists():
+            return None
+        return dict(row)
+
+    def save_dataset(self, dataset, embeddings_dataset, dataset_name, project_name, db_connection=None,
+                     embedding_model=None, source_hash=None):
         """
         Save a dataset or database connection to the project folder and update the registry.
 
+        The registry entry and the files are written inside one write transaction: if writing
+        the files fails, the entry is rolled back, and a concurrent save of the same dataset
+        is rejected by the unique (project, dataset) constraint.
+
+        The dataset and embeddings are stored once per unique content in the blob store. When
+        source_hash matches an upload the registry already holds, the stored files are reused
+        and dataset and embeddings_dataset may be None.
+
         Args:
             dataset: The dataset to save (can be a file or DataFrame).
+            embeddings_dataset (pd.DataFrame): Embeddings DataFrame to save next to the dataset.
             dataset_name (str): The name of the dataset or connection file.
             project_name (str): The project folder name.
             db_connection (dict): Optional database connection details.
-            embeddings_df (pd.DataFrame): Optional embeddings DataFrame to save.
-            embeddings_name (str): Optional name for the embeddings file.
+            embedding_model (str): Name of the model used to create the embeddings (optional).
+            source_hash (str): Hash of the uploaded file the dataset was created from (optional).
+
+        Returns:
+            str: Success or error message.
         """
         project_folder = Path(self.BASE_FOLDER) / project_name
         dataset_folder = project_folder / dataset_name
+        written_files = []
+        new_blobs = []
+        content_hash = embeddings_hash = None
 
         try:
-            # Create project and dataset folders if they don't exist
-            dataset_folder.mkdir(parents=True, exist_ok=True)
-
-            # Save database connection
-            if db_connection:
-                connection_file = dataset_folder / f"{dataset_name}_connection.json"
-                if connection_file.exists():
-                    return f"Error: A connection file with the name {dataset_name}_connection.json already exists."
-
-                pd.DataFrame([db_connection]).to_json(connection_file, orient='records', lines=True)
-                dataset_path = connection_file
-            else:
-                # Save the dataset
-                file_path = dataset_folder / f"{dataset_name}.csv"
-                if file_path.exists():
-                    return f"Error: A dataset with the name {dataset_name}.csv already exists."
-                
-                embeddings_file_path = dataset_folder / "embeddings.csv"
-                if embeddings_file_path.exists():
-                    return f"Error: A dataset with the name {embeddings_file_path}.csv already exists."
-
-                dataset.to_csv(file_path, index=False)
-                embeddings_dataset.to_csv(embeddings_file_path, index=False)
-
-                dataset_path = file_path
-
-            # Update registry file
-            if self.REGISTRY_FILE.exists():
-                registry_df = pd.read_csv(self.REGISTRY_FILE)
-                next_id = registry_df["id"].max() + 1 if not registry_df.empty else 1
-            else:
-                registry_df = pd.DataFrame(columns=["id", "dataset_name", "original_location", "project_name", "last_update", "time_of_creation", "is_database"])
-                next_id = 1
-
-            new_entry = {
-                "id": next_id,
-                "dataset_name": dataset_name,
-                "original_location": str(dataset_path),
-                "project_name": project_name,
-                "last_update": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "time_of_creation": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "is_database": bool(db_connection)
-            }
-            registry_df = pd.concat([registry_df, pd.DataFrame([new_entry])], ignore_index=True)
-            registry_df.to_csv(self.REGISTRY_FILE, index=False)
+            with closing(self._connect()) as connection:
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    if self.get_dataset_info(project_name, dataset_name, connection=connection) is not None:
+                        connection.execute("ROLLBACK")
+                        return f"Error: A dataset with the name {dataset_name} already exists in project {project_name}."
+
+                    # Create project and dataset folders if they don't exist
+                    dataset_folder.mkdir(parents=True, exist_ok=True)
+
+                    # Save database connection
+                    if db_connection:
+                        connection_file = dataset_folder / f"{dataset_name}_connection.json"
+                        if connection_file.exists():
+                            connection.execute("ROLLBACK")
+                            return f"Error: A connection file with the name {dataset_name}_connection.json already exists."
+
+                        pd.DataFrame([db_connection]).to_json(connection_file, orient='records', lines=True)
+                        written_files = [connection_file]
+                        dataset_path = connection_file
+                        content_hash = self.content_hash(connection_file)
+                        n_rows = None
+                    else:
+                        # Save the dataset
+                        file_path = dataset_folder / f"{dataset_name}.parquet"
+                        if file_path.exists():
+                            connection.execute("ROLLBACK")
+                            return f"Error: A dataset with the name {dataset_name}.parquet already exists."
+
+                        embeddings_file_path = dataset_folder / f"{EMBEDDINGS_NAME}.parquet"
+                        if embeddings_file_path.exists():
+                            connection.execute("ROLLBACK")
+                            return f"Error: A dataset with the name {embeddings_file_path} already exists."
+
+                        known = self.find_content(source_hash, connection=connection) if source_hash else None
+                        if known is not None:
+                            # Known upload: reference the stored files instead of writing new copies
+                            content_hash, embeddings_hash = known["content_hash"], known["embeddings_hash"]
+                            n_rows = known["n_rows"]
+                            embedding_model = embedding_model or known["embedding_model"]
+                        elif dataset is None:
+                            raise ValueError(f"No stored content matches the upload of {dataset_name}.")
+                        else:
+                            content_hash, created = self._store_blob(lambda path: write_dataset(dataset, path))
+                            new_blobs += [content_hash] if created else []
+                            embeddings_hash, created = self._store_blob(
+                                lambda path: write_embeddings(embeddings_dataset, path))
+                            new_blobs += [embeddings_hash] if created else []
+                            n_rows = len(dataset)
+
+                        self._link_blob(content_hash, file_path)
+                        written_files.append(file_path)
+                        self._link_blob(embeddings_hash, embeddings_file_path)
+                        written_files.append(embeddings_file_path)
+
+                        dataset_path = file_path
+
+                    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                    connection.execute(
+                        "INSERT INTO datasets (project_name, dataset_name, original_location, is_database, n_rows, "
+                        "n_bytes, embedding_model, content_hash, embeddings_hash, source_hash, time_of_creation, "
+                        "last_update) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                        (project_name, dataset_name, str(dataset_path), int(bool(db_connection)), n_rows,
+                         sum(os.path.getsize(path) for path in written_files), embedding_model,
+                         content_hash, embeddings_hash, source_hash, timestamp, timestamp),
+                    )
+                    connection.execute("COMMIT")
+                except BaseException:
+                    if connection.in_transaction:
+                        connection.execute("ROLLBACK")
+                    # Do not leave files behind for an entry that was not registered
+                    for path in written_files:
+                        path.unlink(missing_ok=True)
+                    for blob_hash in new_blobs:
+                        self.blob_path(blob_hash).unlink(missing_ok=True)
+                    raise
 
             return f"Dataset or connection saved successfully in {dataset_folder}."
         except Exception as e:
@@ -84,7 +382,11 @@ class DatasetRegistry(IDatasetRegistry):
 
     def remove_dataset(self, project_to_remove, dataset_to_remove):
         """
-        Remove a dataset or database connection subfolder and update the registry.
+        Remove a dataset or database connection subfolder and its registry entry.
+
+        The entry is deleted and the folder removed within one write transaction; if the
+        folder cannot be removed, the entry is kept. Stored blobs are deleted only when no
+        other entry references them.
 
         Args:
             project_to_remove (str): The name of the project containing the dataset.
@@ -93,58 +395,99 @@ class DatasetRegistry(IDatasetRegistry):
         Returns:
             str: A message indicating success or the error encountered.
         """
-        project_folder = Path(self.BASE_FOLDER) / project_to_remove
-        dataset_folder = project_folder / dataset_to_remove
+        dataset_folder = Path(self.BASE_FOLDER) / project_to_remove / dataset_to_remove
 
         try:
-            # Check if the dataset subfolder exists
-            if dataset_folder.exists() and dataset_folder.is_dir():
-                # Delete all files in the subfolder and then remove the folder
-                for file in dataset_folder.iterdir():
-                    if file.is_file():
-                        file.unlink()  # Remove individual files
-                    elif file.is_dir():
-                        # Recursively delete subdirectories
-                        for subfile in file.iterdir():
-                            subfile.unlink()
-                        file.rmdir()
-                dataset_folder.rmdir()  # Remove the main dataset folder
-
-                # Update the registry
-                if self.REGISTRY_FILE.exists():
-                    registry_df = pd.read_csv(self.REGISTRY_FILE)
-                    registry_df = registry_df[~((registry_df["dataset_name"] == dataset_to_remove) & 
-                                                (registry_df["project_name"] == project_to_remove))]
-                    registry_df.to_csv(self.REGISTRY_FILE, index=False)
-
-                return f"Dataset {dataset_to_remove} removed successfully from project {project_to_remove}."
-            else:
-                return f"Error: Dataset {dataset_to_remove} not found in project {project_to_remove}."
+            with closing(self._connect()) as connection:
+                connection.execute("BEGIN IMMEDIATE")
+                try:
+                    entry = self.get_dataset_info(project_to_remove, dataset_to_remove, connection=connection)
+                    folder_exists = dataset_folder.exists() and dataset_folder.is_dir()
+                    if entry is None and not folder_exists:
+                        connection.execute("ROLLBACK")
+                        return f"Error: Dataset {dataset_to_remove} not found in project {project_to_remove}."
+
+                    connection.execute(
+                        "DELETE FROM datasets WHERE project_name = ? AND dataset_name = ?",
+                        (project_to_remove, dataset_to_remove),
+                    )
+                    if folder_exists:
+                        shutil.rmtree(dataset_folder)
+                    if entry is not None:
+                        self._collect_blobs(connection, (entry["content_hash"], entry["embeddings_hash"]))
+                    connection.execute("COMMIT")
+                except BaseException:
+                    if connection.in_transaction:
+                        connection.execute("ROLLBACK")
+                    raise
+
+            return f"Dataset {dataset_to_remove} removed successfully from project {project_to_remove}."
         except Exception as e:
             return f"Error: {e}"
 
+    def export_dataset_csv(self, project_name, dataset_name, target_folder):
+        """
+        Export a registered dataset and its embeddings as CSV files.
+
+        Args:
+            project_name (str): The name of the project.
+            dataset_name (str): The name of the dataset.
+            target_folder (str): Folder to write the CSV files to.
+
+        Returns:
+            tuple: Paths of the exported dataset and embeddings files.
+        """
+        return export_csv(str(Path(self.BASE_FOLDER) / project_name / dataset_name), target_folder)
+
+    def get_dataset_info(self, project_name, dataset_name, connection=None):
+        """
+        Retrieve the registry entry of a dataset.
+
+        Args:
+            project_name (str): The name of the project.
+            dataset_name (str): The name of the dataset.
+            connection (sqlite3.Connection): Open connection to reuse (optional).
+
+        Returns:
+            dict: The registry entry, or None if the dataset is not registered.
+        """
+        query = f"SELECT {', '.join(self.COLUMNS)} FROM datasets WHERE project_name = ? AND dataset_name = ?"
+        if connection is not None:
+            row = connection.execute(query, (project_name, dataset_name)).fetchone()
+        else:
+            with closing(self._connect()) as connection:
+                row = connection.execute(query, (project_name, dataset_name)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["is_database"] = bool(entry["is_database"])
+        return entry
+
     def get_existing_projects(self):
         """
-        Retrieve a list of existing projects (folders) in the base directory.
+        Retrieve a list of projects that have registered datasets.
 
         Returns:
-            list: A list of project folder names found in the base directory.
+            list: A sorted list of project names.
         """
-        project_folders = [folder.name for folder in Path(self.BASE_FOLDER).iterdir() if folder.is_dir()]
-        return project_folders
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT DISTINCT project_name FROM datasets ORDER BY project_name").fetchall()
+        return [row["project_name"] for row in rows]
 
     def get_datasets_in_project(self, project_name):
         """
-        Retrieve a list of dataset subfolders within the specified project folder.
+        Retrieve a list of datasets registered within the specified project.
 
         Args:
-            project_name (str): The name of the project folder.
+            project_name (str): The name of the project.
 
         Returns:
-            list: A list of dataset subfolder names in the project folder. If the folder
-                  does not exist, an empty list is returned.
+            list: A sorted list of dataset names in the project. If the project has no
+                  registered datasets, an empty list is returned.
         """
-        project_folder = Path(self.BASE_FOLDER) / project_name
-        if project_folder.exists() and project_folder.is_dir():
-            return [folder.name for folder in project_folder.iterdir() if folder.is_dir()]
-        return []
\ No newline at end of file
+        with closing(self._connect()) as connection:
+            rows = connection.execute(
+                "SELECT dataset_name FROM datasets WHERE project_name = ? ORDER BY dataset_name",
+                (project_name,),
+            ).fetchall()
+        return [row["dataset_name"] for row in rows]
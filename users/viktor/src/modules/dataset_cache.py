@@ -0,0 +1,291 @@
+import os
+import sys
+import threading
+from collections import OrderedDict
+import numpy as np
+import pandas as pd
+from interfaces import IDatasetCache
+from .dataset_storage import read_dataset, read_embeddings, dataset_columns
+from .embedding_store import EmbeddingStore
+from .time_partitions import read_partitions
+
+class DatasetCache(IDatasetCache):
+    """
+    Process-wide LRU cache of loaded datasets, embeddings and directory listings.
+
+    Every entry is stored under a name (what was loaded, from where, with which options)
+    together with the version of its source files, i.e. their path, modification time and
+    size. A lookup with a different version reloads the entry and replaces the stale one,
+    so a changed file is never served from the cache. Entries are evicted least recently
+    used first once their estimated size exceeds the memory budget; memory-mapped arrays
+    count as zero bytes, since their pages belong to the OS page cache.
+
+    The cache lives in the memory of one process. The managers in a process share one
+    instance through `shared()`, so switching between analyses on the same dataset does not
+    read it again. The app page and every background job worker have their own instance;
+    the worker caches start empty and persist across the jobs a worker runs. Embeddings are
+    memory-mapped, so the processes share their pages through the OS page cache instead of
+    holding one copy each.
+
+    Attributes:
+        max_bytes (int): Memory budget of the cached values.
+        hits (int): Number of lookups served from the cache.
+        misses (int): Number of lookups that loaded the value.
+        evictions (int): Number of entries evicted to stay within the budget.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, max_bytes=2 * 1024 ** 3):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_bytes (int): Memory budget of the cached values.
+        """
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+    @classmethod
+    def shared(cls, max_bytes=None):
+        """
+        Return the cache shared within the current process, creating it on first use.
+
+        Args:
+            max_bytes (int): Memory budget; when given, replaces the current budget.
+
+        Returns:
+            DatasetCache: The shared cache.
+        """
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls() if max_bytes is None else cls(max_bytes)
+            elif max_bytes is not None:
+                cls._shared.set_max_bytes(max_bytes)
+            return cls._shared
+
+    @staticmethod
+    def file_version(*paths):
+        """
+        Identify the current version of files or folders by path, modification time and size.
+
+        Args:
+            *paths (str): Paths to identify.
+
+        Returns:
+            tuple: One (path, mtime_ns, size) triple per path.
+
+        Raises:
+            FileNotFoundError: If a path does not exist.
+        """
+        version = []
+        for path in paths:
+            stat = os.stat(path)
+            version.append((os.path.abspath(path), stat.st_mtime_ns, stat.st_size))
+        return tuple(version)
+
+    @staticmethod
+    def size_of(value):
+        """
+        Estimate the memory held by a cached value.
+
+        Args:
+            value: The cached value.
+
+        Returns:
+            int: Estimated size in bytes.
+        """
+        if isinstance(value, pd.DataFrame):
+            return int(value.memory_usage(index=True, deep=True).sum())
+        if isinstance(value, np.memmap):
+            return 0
+        if isinstance(value, np.ndarray):
+            return value.nbytes
+        if isinstance(value, EmbeddingStore):
+            matrix = 0 if isinstance(value.matrix, np.memmap) else value.matrix.nbytes
+            job_ids = value.job_ids.nbytes if value.job_ids is not None else 0
+            return matrix + job_ids
+        if isinstance(value, (tuple, list)):
+            return sum(DatasetCache.size_of(item) for item in value)
+        return sys.getsizeof(value)
+
+    @property
+    def bytes(self):
+        return self._bytes
+
+    def set_max_bytes(self, max_bytes):
+        with self._lock:
+            self.max_bytes = max_bytes
+            self._evict()
+
+    def get_or_load(self, name, version, loader):
+        """
+        Return the cached value for name at version, calling loader() on a miss.
+
+        Args:
+            name (tuple): What is loaded, e.g. ('dataset', path, columns).
+            version: Version of the sources, e.g. from `file_version`.
+            loader (callable): Loads the value.
+
+        Returns:
+            The cached or freshly loaded value.
+        """
+        with self._lock:
+            found, value = self._lookup(name, version)
+            if found:
+                self.hits += 1
+                return value
+            self.misses += 1
+
+        value = loader()
+        self._store(name, version, value)
+        return value
+
+    def _lookup(self, name, version):
+        # The caller holds the lock; a hit becomes the most recently used entry
+        entry = self._entries.get(name)
+        if entry is not None and entry[0] == version:
+            self._entries.move_to_end(name)
+            return True, entry[1]
+        return False, None
+
+    def _store(self, name, version, value):
+        size = self.size_of(value)
+        with self._lock:
+            self._discard(name)
+            if size <= self.max_bytes:
+                self._entries[name] = (version, value, size)
+                self._bytes += size
+                self._evict()
+
+    def _discard(self, name):
+        entry = self._entries.pop(name, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+
+    def _evict(self):
+        while self._bytes > self.max_bytes and self._entries:
+            _, (_, _, size) = self._entries.popitem(last=False)
+            self._bytes -= size
+            self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """
+        Return the counters of the cache.
+
+        Returns:
+            dict: 'hits', 'misses', 'hit_rate', 'evictions', 'entries', 'bytes' and 'max_bytes'.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
+
+    def read_dataset(self, path, columns=None):
+        """
+        Cached `read_dataset`, caching every column separately.
+
+        Analyses reading different columns of the same dataset share the columns they have
+        in common, and a read of all columns reuses the columns read before; only the
+        columns that are not cached are read from the file, in one read. A read counts as a
+        hit when all its columns are cached.
+
+        Returns a new frame over the cached columns, so callers adding or replacing columns
+        do not change the cache.
+        """
+        source = os.path.abspath(path)
+        version = self.file_version(path)
+        with self._lock:
+            found, available = self._lookup(('dataset_columns', source), version)
+        if not found:
+            available = dataset_columns(path)
+            self._store(('dataset_columns', source), version, available)
+
+        wanted = list(available) if columns is None else [column for column in dict.fromkeys(columns)
+                                                          if column in available]
+        if not wanted:
+            return read_dataset(path, columns=wanted)
+
+        cached = {}
+        with self._lock:
+            for column in wanted:
+                found, value = self._lookup(('dataset', source, column), version)
+                if found:
+                    cached[column] = value
+            missing = [column for column in wanted if column not in cached]
+            if missing:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if missing:
+            loaded = read_dataset(path, columns=missing)
+            for column in missing:
+                cached[column] = loaded[[column]]
+                self._store(('dataset', source, column), version, cached[column])
+        return pd.concat([cached[column] for column in wanted], axis=1)
+
+    def read_embeddings(self, path):
+        """Cached `read_embeddings`; returns a shallow copy like `read_dataset`."""
+        name = ('embeddings', os.path.abspath(path))
+        return self.get_or_load(name, self.file_version(path), lambda: read_embeddings(path)).copy(deep=False)
+
+    def embedding_store(self, folder, source, dtype='float32'):
+        """
+        Cached `EmbeddingStore.for_folder`.
+
+        Args:
+            folder (str): Dataset folder.
+            source (str): Embeddings file the store is derived from.
+            dtype (str): Storage type of the matrix.
+
+        Returns:
+            EmbeddingStore: Store over the dataset's embeddings.
+        """
+        name = ('embedding_store', os.path.abspath(folder), dtype)
+        return self.get_or_load(name, self.file_version(source),
+                                lambda: EmbeddingStore.for_folder(folder, dtype=dtype))
+
+    def read_partitions(self, partitions_folder, start=None, end=None, columns=None, with_embeddings=False):
+        """Cached `read_partitions`; a rewritten partitions folder is read again."""
+        name = ('partitions', os.path.abspath(partitions_folder), str(start), str(end),
+                None if columns is None else tuple(columns), with_embeddings)
+        def load():
+            result = read_partitions(partitions_folder, start, end, columns=columns, with_embeddings=with_embeddings)
+            if with_embeddings:
+                # The matrix is shared by all callers
+                result[1].flags.writeable = False
+            return result
+
+        result = self.get_or_load(name, self.file_version(partitions_folder), load)
+        if with_embeddings:
+            return result[0].copy(deep=False), result[1]
+        return result.copy(deep=False)
+
+    def listdir(self, path):
+        """
+        Cached, sorted `os.listdir`.
+
+        A folder's modification time changes whenever an entry is added, removed or
+        renamed, so the listing is refreshed exactly when it changes.
+        """
+        name = ('listdir', os.path.abspath(path))
+        return list(self.get_or_load(name, self.file_version(path), lambda: tuple(sorted(os.listdir(path)))))
@@ -0,0 +1,216 @@
+import os
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .embedding_utils import parse_embeddings
+
+# Columns stored with a dedicated type; other columns keep the type pandas infers
+CATEGORICAL_COLUMNS = ('language', 'location', 'company_name')
+DATETIME_COLUMNS = ('original_listed_time',)
+
+EMBEDDINGS_COLUMN = 'description_embeddings'
+EMBEDDINGS_NAME = 'embeddings'
+
+def to_typed_frame(df) -> pd.DataFrame:
+    """
+    Cast the known posting columns to compact, typed dtypes.
+
+    Args:
+        df (pd.DataFrame): Postings as read from an upload or CSV.
+
+    Returns:
+        pd.DataFrame: Copy of df with categorical and datetime columns converted.
+    """
+    df = df.copy()
+    for column in CATEGORICAL_COLUMNS:
+        if column in df.columns:
+            df[column] = df[column].astype('category')
+    for column in DATETIME_COLUMNS:
+        if column in df.columns:
+            df[column] = pd.to_datetime(df[column], errors='coerce')
+    return df
+
+def write_dataset(df, path):
+    """
+    Write postings to a Parquet file with typed columns.
+
+    Args:
+        df (pd.DataFrame): Postings to write.
+        path (str): Target file path.
+
+    Returns:
+        str: The path written to.
+    """
+    to_typed_frame(df).to_parquet(path, engine='pyarrow', index=False)
+    return path
+
+def write_embeddings(embeddings_df, path):
+    """
+    Write embeddings to a Parquet file as a fixed-size float32 list column.
+
+    Args:
+        embeddings_df (pd.DataFrame): DataFrame with a 'description_embeddings' column.
+        path (str): Target file path.
+
+    Returns:
+        str: The path written to.
+    """
+    column = embeddings_column(parse_embeddings(embeddings_df[EMBEDDINGS_COLUMN]))
+    pq.write_table(pa.table({EMBEDDINGS_COLUMN: column}), path)
+    return path
+
+def embeddings_column(matrix):
+    """
+    Convert an embedding matrix to a fixed-size float32 list Arrow column.
+
+    Args:
+        matrix (np.ndarray): float32 array of shape (n_documents, embedding_dim).
+
+    Returns:
+        pa.Array: One list per document.
+    """
+    if matrix.size:
+        return pa.FixedSizeListArray.from_arrays(pa.array(matrix.reshape(-1), type=pa.float32()), matrix.shape[1])
+    return pa.array([], type=pa.list_(pa.float32()))
+
+def embeddings_matrix(column):
+    """
+    Convert a fixed-size list Arrow column back to an embedding matrix.
+
+    Args:
+        column (pa.ChunkedArray or pa.Array): Column written by `embeddings_column`.
+
+    Returns:
+        np.ndarray: float32 array of shape (n_documents, embedding_dim).
+    """
+    if isinstance(column, pa.ChunkedArray):
+        column = column.combine_chunks()
+    if len(column) == 0:
+        return np.empty((0, 0), dtype=np.float32)
+    return column.flatten().to_numpy(zero_copy_only=False).reshape(len(column), -1)
+
+def read_dataset(path, columns=None) -> pd.DataFrame:
+    """
+    Read postings from a Parquet or CSV file, loading only the requested columns.
+
+    Requested columns that the file does not contain are skipped, so callers can list
+    alternative names of the same column.
+
+    Args:
+        path (str): Path to a '.parquet' or '.csv' file.
+        columns (list): Columns to load; defaults to all columns.
+
+    Returns:
+        pd.DataFrame: The loaded columns.
+    """
+    if path.endswith('.parquet'):
+        if columns is not None:
+            available = set(pq.read_schema(path).names)
+            columns = [column for column in columns if column in available]
+        return pd.read_parquet(path, columns=columns, engine='pyarrow')
+
+    usecols = None if columns is None else (lambda column: column in set(columns))
+    return pd.read_csv(path, usecols=usecols)
+
+def dataset_columns(path) -> list:
+    """
+    List the columns of a Parquet or CSV postings file without reading its rows.
+
+    Args:
+        path (str): Path to a '.parquet' or '.csv' file.
+
+    Returns:
+        list: Column names in file order.
+    """
+    if path.endswith('.parquet'):
+        return list(pq.read_schema(path).names)
+    return list(pd.read_csv(path, nrows=0).columns)
+
+def read_embeddings(path) -> pd.DataFrame:
+    """
+    Read embeddings from a Parquet or CSV file.
+
+    Args:
+        path (str): Path to 'embeddings.parquet' or 'embeddings.csv'.
+
+    Returns:
+        pd.DataFrame: DataFrame with a 'description_embeddings' column. Parquet embeddings
+            are returned as float32 arrays, CSV embeddings as stored strings; both are
+            accepted by `parse_embeddings`.
+    """
+    if path.endswith('.parquet'):
+        matrix = embeddings_matrix(pq.read_table(path, columns=[EMBEDDINGS_COLUMN]).column(EMBEDDINGS_COLUMN))
+        if len(matrix) == 0:
+            return pd.DataFrame({EMBEDDINGS_COLUMN: pd.Series([], dtype=object)})
+        return pd.DataFrame({EMBEDDINGS_COLUMN: list(matrix)})
+    return pd.read_csv(path, usecols=[EMBEDDINGS_COLUMN])
+
+def find_dataset_file(folder):
+    """
+    Locate the postings file of a registered dataset folder.
+
+    Prefers '<folder name>.parquet' and '<folder name>.csv'; for folders saved before the
+    Parquet format, falls back to the first CSV file that is not 'embeddings.csv'.
+
+    Args:
+        folder (str): Dataset folder.
+
+    Returns:
+        str: Path to the postings file.
+
+    Raises:
+        FileNotFoundError: If the folder contains no postings file.
+    """
+    name = os.path.basename(os.path.normpath(folder))
+    for extension in ('.parquet', '.csv'):
+        candidate = os.path.join(folder, f"{name}{extension}")
+        if os.path.isfile(candidate):
+            return candidate
+
+    csv_files = sorted(f for f in os.listdir(folder) if f.endswith('.csv') and f != f"{EMBEDDINGS_NAME}.csv")
+    if not csv_files:
+        raise FileNotFoundError(f"No valid dataset files found in the selected folder: {folder}")
+    return os.path.join(folder, csv_files[0])
+
+def find_embeddings_file(folder):
+    """
+    Locate the embeddings file of a registered dataset folder.
+
+    Args:
+        folder (str): Dataset folder.
+
+    Returns:
+        str: Path to 'embeddings.parquet', or 'embeddings.csv' for older datasets.
+
+    Raises:
+        FileNotFoundError: If the folder contains no embeddings file.
+    """
+    for extension in ('.parquet', '.csv'):
+        candidate = os.path.join(folder, f"{EMBEDDINGS_NAME}{extension}")
+        if os.path.isfile(candidate):
+            return candidate
+    raise FileNotFoundError(f"No valid embeddings files found in the selected folder: {folder}")
+
+def export_csv(folder, target_folder):
+    """
+    Export a registered dataset and its embeddings as CSV files.
+
+    Args:
+        folder (str): Dataset folder.
+        target_folder (str): Folder to write '<folder name>.csv' and 'embeddings.csv' to.
+
+    Returns:
+        tuple: Paths of the exported dataset and embeddings files.
+    """
+    os.makedirs(target_folder, exist_ok=True)
+    name = os.path.basename(os.path.normpath(folder))
+    dataset_file = os.path.join(target_folder, f"{name}.csv")
+    embeddings_file = os.path.join(target_folder, f"{EMBEDDINGS_NAME}.csv")
+
+    read_dataset(find_dataset_file(folder)).to_csv(dataset_file, index=False)
+    embeddings = parse_embeddings(read_embeddings(find_embeddings_file(folder))[EMBEDDINGS_COLUMN])
+    # str() of a float32 gives its shortest representation, matching the values that were uploaded
+    rows = ["[" + ", ".join(str(value) for value in row) + "]" for row in embeddings]
+    pd.DataFrame({EMBEDDINGS_COLUMN: rows}).to_csv(embeddings_file, index=False)
+    return dataset_file, embeddings_file
@@ -0,0 +1,191 @@
+import os
+import hashlib
+import numpy as np
+from sklearn.decomposition import PCA, TruncatedSVD
+from interfaces import IEmbeddingReducer
+
+class EmbeddingReducer(IEmbeddingReducer):
+    """
+    Reduces embedding dimensionality before clustering and visualization.
+
+    Supported methods:
+        - 'pca': randomized PCA (centered) to `n_components` dimensions.
+        - 'svd': truncated SVD (uncentered) to `n_components` dimensions.
+        - 'matryoshka': keep the first `n_components` dimensions and re-normalize. Only
+          meaningful for models trained with Matryoshka representation learning.
+
+    The fitted projection and the reduced matrix can be cached in a folder (normally
+    the dataset folder next to 'embeddings.csv'), keyed by method, dimension and a
+    hash of the input embeddings, so the reduction is fitted once per dataset.
+
+    Attributes:
+        method (str): Reduction method.
+        n_components (int): Target dimensionality.
+        cache_folder (str): Folder for the cached reduction, or None to disable caching.
+        random_state (int): Seed for the randomized solvers.
+    """
+
+    METHODS = ("pca", "svd", "matryoshka")
+
+    def __init__(self, method="pca", n_components=64, cache_folder=None, random_state=42):
+        """
+        Initialize the EmbeddingReducer.
+
+        Args:
+            method (str): One of 'pca', 'svd' or 'matryoshka'.
+            n_components (int): Target dimensionality.
+            cache_folder (str): Folder to cache the fitted reduction in (optional).
+            random_state (int): Seed for the randomized solvers.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}, got '{method}'.")
+        if not isinstance(n_components, int) or n_components <= 0:
+            raise ValueError("n_components must be a positive integer.")
+        self.method = method
+        self.n_components = n_components
+        self.cache_folder = cache_folder
+        self.random_state = random_state
+        self.components_ = None
+        self.mean_ = None
+
+    @property
+    def is_fitted(self):
+        return self.method == "matryoshka" or self.components_ is not None
+
+    @property
+    def cache_file(self):
+        if self.cache_folder is None:
+            return None
+        return os.path.join(self.cache_folder, f"reduced_embeddings_{self.method}_{self.n_components}.npz")
+
+    @staticmethod
+    def fingerprint(X):
+        """
+        Hash an embedding matrix so a cached reduction is only reused for the same data.
+
+        Args:
+            X (np.ndarray): Embedding matrix.
+
+        Returns:
+            str: Hex digest identifying the matrix contents and shape.
+        """
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        digest = hashlib.sha1(str(X.shape).encode())
+        digest.update(X.data)
+        return digest.hexdigest()
+
+    def fit(self, X):
+        """
+        Fit the projection on an embedding matrix.
+
+        Args:
+            X (np.ndarray): Array of shape (n_documents, embedding_dim).
+
+        Returns:
+            EmbeddingReducer: The fitted reducer.
+        """
+        X = np.asarray(X, dtype=np.float32)
+        n_components = min(self.n_components, X.shape[1])
+        if self.method == "matryoshka":
+            return self
+
+        if self.method == "pca":
+            model = PCA(n_components=min(n_components, X.shape[0]), svd_solver="randomized",
+                        random_state=self.random_state)
+            model.fit(X)
+            self.mean_ = model.mean_.astype(np.float32)
+        else:
+            model = TruncatedSVD(n_components=min(n_components, X.shape[1] - 1), algorithm="randomized",
+                                 random_state=self.random_state)
+            model.fit(X)
+            self.mean_ = np.zeros(X.shape[1], dtype=np.float32)
+        self.components_ = model.components_.astype(np.float32)
+        return self
+
+    def transform(self, X):
+        """
+        Project embeddings with the fitted reduction.
+
+        Args:
+            X (np.ndarray): Array of shape (n_documents, embedding_dim).
+
+        Returns:
+            np.ndarray: Reduced float32 array of shape (n_documents, n_components).
+        """
+        X = np.asarray(X, dtype=np.float32)
+        if self.method == "matryoshka":
+            truncated = X[:, :self.n_components]
+            norms = np.linalg.norm(truncated, axis=1, keepdims=True)
+            return truncated / np.where(norms == 0, 1.0, norms)
+        if self.components_ is None:
+            raise ValueError("The reducer must be fitted before calling transform.")
+        return (X - self.mean_) @ self.components_.T
+
+    def fit_transform(self, X):
+        """
+        Fit the reduction and project the embeddings, reusing the cache when possible.
+
+        Args:
+            X (np.ndarray): Array of shape (n_documents, embedding_dim).
+
+        Returns:
+            np.ndarray: Reduced float32 array of shape (n_documents, n_components).
+        """
+        X = np.asarray(X, dtype=np.float32)
+        fingerprint = self.fingerprint(X) if self.cache_file else None
+
+        if fingerprint and os.path.isfile(self.cache_file):
+            with np.load(self.cache_file) as cached:
+                if str(cached["fingerprint"]) == fingerprint:
+                    self._set_state(cached)
+                    return cached["reduced"]
+
+        reduced = self.fit(X).transform(X).astype(np.float32)
+        if fingerprint:
+            os.makedirs(self.cache_folder, exist_ok=True)
+            np.savez(self.cache_file, reduced=reduced, fingerprint=fingerprint, **self._get_state())
+        return reduced
+
+    def _get_state(self):
+        empty = np.empty(0, dtype=np.float32)
+        return {
+            "method": self.method,
+            "n_components": self.n_components,
+            "components": self.components_ if self.components_ is not None else empty,
+            "mean": self.mean_ if self.mean_ is not None else empty,
+        }
+
+    def _set_state(self, state):
+        self.method = str(state["method"])
+        self.n_components = int(state["n_components"])
+        self.components_ = state["components"] if state["components"].size else None
+        self.mean_ = state["mean"] if state["mean"].size else None
+
+    def save(self, path):
+        """
+        Save the fitted projection (without the reduced matrix) to an NPZ file.
+
+        Args:
+            path (str): Target file path.
+
+        Returns:
+            str: The path written to.
+        """
+        np.savez(path, **self._get_state())
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a projection previously written by `save`.
+
+        Args:
+            path (str): Path to the NPZ file.
+
+        Returns:
+            EmbeddingReducer: The fitted reducer.
+        """
+        with np.load(path) as state:
+            reducer = cls(method=str(state["method"]), n_components=int(state["n_components"]))
+            reducer._set_state(state)
+        return reducer
@@ -0,0 +1,249 @@
+import os
+import math
+import mmap
+import uuid
+import numpy as np
+import pandas as pd
+from interfaces import IEmbeddingStore
+from .embedding_utils import parse_embeddings
+from .quantization import quantize, cosine_scores, QuantizedEmbeddings
+from .dataset_storage import read_dataset, read_embeddings, find_dataset_file, find_embeddings_file, EMBEDDINGS_COLUMN
+
+def normalize_job_ids(job_ids):
+    """
+    Convert job IDs to the strings they are stored and looked up as.
+
+    A job_id column can be read as integers, strings or, e.g. with missing values, as
+    floats; integral floats are written without the '.0', so 1, 1.0 and '1' are one ID.
+
+    Args:
+        job_ids: Job IDs of any type.
+
+    Returns:
+        np.ndarray: The job IDs as strings.
+    """
+    # Through pandas, a list mixing numbers and strings keeps its element types
+    ids = job_ids if isinstance(job_ids, np.ndarray) else pd.Series(job_ids).to_numpy()
+    if ids.dtype.kind == 'f':
+        integral = np.isfinite(ids) & (ids == np.round(ids))
+        strings = ids.astype(str)
+        strings[integral] = ids[integral].astype(np.int64).astype(str)
+        return strings
+    if ids.dtype.kind == 'O':
+        return np.array([str(int(job_id)) if isinstance(job_id, (float, np.floating)) and float(job_id).is_integer()
+                         else str(job_id) for job_id in ids], dtype=str)
+    return ids.astype(str)
+
+class EmbeddingStore(IEmbeddingStore):
+    """
+    Read-only, memory-mapped access to the embedding matrix of a dataset.
+
+    The embeddings are kept as a '.npy' file and opened with np.load(mmap_mode='r'), so
+    the matrix is never copied into the process: analyses read rows straight from the
+    OS page cache, and several processes working on the same dataset share those pages.
+    The matrix is stored as float32, float16 or int8 with a scale per dimension (see
+    `quantize`). Job IDs, when available, are stored alongside to gather rows by job_id.
+
+    Attributes:
+        path (str): Path to the '.npy' embedding matrix.
+        matrix (np.memmap): Read-only view of the stored matrix, shape (n_documents, embedding_dim).
+        scales (np.ndarray): Scale per dimension of an int8 matrix, or None.
+        job_ids (np.ndarray): Job ID per row, or None.
+    """
+
+    MATRIX_FILE = "embeddings.npy"
+    JOB_IDS_FILE = "embeddings_job_ids.npy"
+    SCALES_FILE = "embeddings_scales.npy"
+
+    def __init__(self, path, job_ids_path=None):
+        """
+        Open an embedding matrix written by `write`.
+
+        Args:
+            path (str): Path to the '.npy' embedding matrix.
+            job_ids_path (str): Path to the '.npy' job IDs aligned with the rows (optional).
+        """
+        self.path = path
+        self.matrix = np.load(path, mmap_mode='r')
+        self.scales = None
+        if self.matrix.dtype == np.int8:
+            self.scales = np.load(self.scales_path(path), allow_pickle=False)
+        self.job_ids = None
+        self._row_by_job_id = None
+        if job_ids_path is not None and os.path.isfile(job_ids_path):
+            self.job_ids = np.load(job_ids_path, allow_pickle=False)
+            if len(self.job_ids) != len(self.matrix):
+                raise ValueError("The job IDs are not aligned with the embedding rows.")
+
+    def __len__(self):
+        return self.matrix.shape[0]
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    @property
+    def dtype(self):
+        return self.matrix.dtype
+
+    @property
+    def embeddings(self):
+        """
+        The embeddings as accepted by the analyses: the memory-mapped matrix itself, or a
+        QuantizedEmbeddings wrapping it for int8 storage.
+        """
+        if self.scales is not None:
+            return QuantizedEmbeddings(self.matrix, self.scales)
+        return self.matrix
+
+    @staticmethod
+    def write(path, embeddings, job_ids=None, dtype='float32'):
+        """
+        Write an embedding matrix (and optional job IDs) for memory-mapped access.
+
+        Files are written under a temporary name and moved into place, so concurrent
+        readers never see a partially written matrix.
+
+        Args:
+            path (str): Target path of the '.npy' embedding matrix.
+            embeddings: 2-D array or iterable of stored embeddings.
+            job_ids: Job ID per row (optional), stored as normalized by `normalize_job_ids`.
+            dtype (str): Storage type, 'float32', 'float16' or 'int8'.
+
+        Returns:
+            str: The path written to.
+
+        Raises:
+            ValueError: If the job IDs are not unique.
+        """
+        matrix, scales = quantize(embeddings, dtype)
+        outputs = [(path, np.ascontiguousarray(matrix))]
+        if scales is not None:
+            outputs.append((EmbeddingStore.scales_path(path), scales))
+        if job_ids is not None:
+            job_ids = normalize_job_ids(job_ids)
+            if not pd.Index(job_ids).is_unique:
+                raise ValueError("The job IDs must be unique to gather embeddings by job ID.")
+            outputs.append((EmbeddingStore.job_ids_path(path), job_ids))
+
+        for target, array in outputs:
+            temporary_path = f"{target}.{uuid.uuid4().hex}.tmp"
+            with open(temporary_path, 'wb') as f:
+                np.save(f, array, allow_pickle=False)
+            os.replace(temporary_path, target)
+        return path
+
+    @staticmethod
+    def job_ids_path(path):
+        return os.path.join(os.path.dirname(path), EmbeddingStore.JOB_IDS_FILE)
+
+    @staticmethod
+    def scales_path(path):
+        return os.path.join(os.path.dirname(path), EmbeddingStore.SCALES_FILE)
+
+    @classmethod
+    def for_folder(cls, folder, dtype='float32'):
+        """
+        Open the embeddings of a registered dataset folder, creating the matrix file once.
+
+        The '.npy' matrix is derived from the Parquet (or CSV) embeddings, which stay the
+        float32 source of truth, and rebuilt when those are newer or when another storage
+        type is requested.
+
+        Args:
+            folder (str): Dataset folder.
+            dtype (str): Storage type, 'float32', 'float16' or 'int8'.
+
+        Returns:
+            EmbeddingStore: Store over the dataset's embeddings.
+        """
+        path = os.path.join(folder, cls.MATRIX_FILE)
+        source = find_embeddings_file(folder)
+        if not os.path.isfile(path) or os.path.getmtime(path) < os.path.getmtime(source) \
+                or np.load(path, mmap_mode='r').dtype != np.dtype(dtype):
+            job_ids = None
+            try:
+                postings = read_dataset(find_dataset_file(folder), columns=['job_id'])
+                if 'job_id' in postings.columns:
+                    job_ids = postings['job_id'].to_numpy()
+                    if not pd.Index(normalize_job_ids(job_ids)).is_unique:
+                        print(f"Duplicate job IDs in {folder}; the embeddings cannot be gathered by job ID.")
+                        job_ids = None
+            except FileNotFoundError:
+                pass
+            cls.write(path, read_embeddings(source)[EMBEDDINGS_COLUMN], job_ids=job_ids, dtype=dtype)
+        return cls(path, cls.job_ids_path(path))
+
+    def aligned_batch_size(self, batch_size):
+        """
+        Round a block size up so every block starts on a page boundary of the file.
+
+        Args:
+            batch_size (int): Requested number of rows per block.
+
+        Returns:
+            int: Number of rows per block, a multiple of the rows spanning whole pages.
+        """
+        row_bytes = self.matrix.shape[1] * self.matrix.itemsize
+        rows_per_page_group = math.lcm(row_bytes, mmap.PAGESIZE) // row_bytes if row_bytes else 1
+        return max(1, math.ceil(batch_size / rows_per_page_group)) * rows_per_page_group
+
+    def iter_blocks(self, batch_size=65536):
+        """
+        Iterate over the matrix in page-aligned row blocks.
+
+        Args:
+            batch_size (int): Approximate number of rows per block.
+
+        Yields:
+            tuple: (start row, read-only view of the block, as returned by `embeddings`)
+        """
+        batch_size = self.aligned_batch_size(batch_size)
+        embeddings = self.embeddings
+        for start in range(0, len(self), batch_size):
+            yield start, embeddings[start:start + batch_size]
+
+    def cosine_scores(self, queries, batch_size=65536):
+        """
+        Cosine similarity of every stored embedding with the queries, computed block by
+        block on the stored form.
+
+        Args:
+            queries (np.ndarray): Query vectors, shape (n_queries, embedding_dim).
+            batch_size (int): Approximate number of rows per block.
+
+        Returns:
+            np.ndarray: float32 array of shape (n_documents, n_queries).
+        """
+        queries = np.atleast_2d(queries)
+        scores = np.empty((len(self), len(queries)), dtype=np.float32)
+        for start, block in self.iter_blocks(batch_size):
+            data = block.data if isinstance(block, QuantizedEmbeddings) else block
+            scores[start:start + len(data)] = cosine_scores(data, queries, self.scales)
+        return scores
+
+    def gather(self, job_ids):
+        """
+        Collect the embeddings of the given jobs, in the given order.
+
+        Args:
+            job_ids: Job IDs to collect.
+
+        Returns:
+            np.ndarray: float32 array of shape (len(job_ids), embedding_dim); only these rows are read.
+
+        Raises:
+            KeyError: If the store has no unique job IDs or a job ID is unknown.
+        """
+        if self.job_ids is None:
+            raise KeyError("This embedding store has no job IDs.")
+        if self._row_by_job_id is None:
+            self._row_by_job_id = pd.Index(self.job_ids)
+        if not self._row_by_job_id.is_unique:
+            # Written before duplicates were rejected
+            raise KeyError("The job IDs of this embedding store are not unique.")
+        rows = self._row_by_job_id.get_indexer(normalize_job_ids(job_ids))
+        if (rows < 0).any():
+            missing = np.asarray(job_ids)[rows < 0]
+            raise KeyError(f"Unknown job IDs: {list(missing[:5])}")
+        return parse_embeddings(self.embeddings[rows])
@@ -0,0 +1,46 @@
+import ast
+import json
+import numpy as np
+
+def parse_embedding(value) -> np.ndarray:
+    """
+    Convert a single stored embedding into a float32 vector.
+
+    Embeddings saved through the registry are written to CSV as the string
+    representation of a list (e.g. "[0.1, 0.2, ...]"). Values that are already
+    list-like are converted directly.
+
+    Args:
+        value: String representation of a list, or a list/array of floats.
+
+    Returns:
+        np.ndarray: 1-D float32 array.
+    """
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except json.JSONDecodeError:
+            value = ast.literal_eval(value)
+    return np.asarray(value, dtype=np.float32)
+
+def parse_embeddings(embeddings) -> np.ndarray:
+    """
+    Convert a collection of stored embeddings into a 2-D float32 matrix.
+
+    Args:
+        embeddings: A 2-D array, quantized embeddings (anything with a `dequantize`
+            method), or an iterable (list, pd.Series) of embeddings in any format
+            accepted by `parse_embedding`.
+
+    Returns:
+        np.ndarray: Array of shape (n_documents, embedding_dim).
+    """
+    if hasattr(embeddings, 'dequantize'):
+        return embeddings.dequantize()
+    if isinstance(embeddings, np.ndarray) and embeddings.ndim == 2:
+        return embeddings.astype(np.float32, copy=False)
+
+    vectors = [parse_embedding(embedding) for embedding in embeddings]
+    if not vectors:
+        return np.empty((0, 0), dtype=np.float32)
+    return np.vstack(vectors)
@@ -0,0 +1,467 @@
+import os
+import time
+import uuid
+import pickle
+import sqlite3
+import threading
+import multiprocessing
+from datetime import datetime
+from contextlib import closing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from interfaces import IJobQueue
+
+QUEUED = 'queued'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+# Statuses of jobs that will not change any more
+FINISHED_STATUSES = (COMPLETED, FAILED, CANCELLED)
+
+class JobCancelled(Exception):
+    """Raised inside a running job by `report_progress` once its cancellation was requested."""
+
+# The job running in this worker process: (queue file, job ID, time of the last progress write)
+_current_job = None
+
+def report_progress(progress, message=None):
+    """
+    Report the progress of the job running in this process.
+
+    Outside a job this does nothing, so analyses can report progress unconditionally.
+    Writes are throttled to one per half second, except for completion. This is also
+    where a running job notices that it was cancelled.
+
+    Args:
+        progress (float): Completed fraction of the job, between 0 and 1.
+        message (str): Short description of the current step (optional).
+
+    Raises:
+        JobCancelled: If cancellation of the job was requested.
+    """
+    global _current_job
+    if _current_job is None:
+        return
+    queue_file, job_id, last_write = _current_job
+    now = time.monotonic()
+    if now - last_write < 0.5 and progress < 1:
+        return
+    _current_job = (queue_file, job_id, now)
+    with closing(_connect(queue_file)) as connection:
+        connection.execute("UPDATE jobs SET progress = ?, message = COALESCE(?, message) WHERE id = ?",
+                           (min(max(float(progress), 0.0), 1.0), message, job_id))
+        cancel_requested = connection.execute("SELECT cancel_requested FROM jobs WHERE id = ?",
+                                              (job_id,)).fetchone()[0]
+    if cancel_requested:
+        raise JobCancelled(f"Job {job_id} was cancelled.")
+
+def _connect(queue_file):
+    connection = sqlite3.connect(queue_file, timeout=30, isolation_level=None)
+    connection.row_factory = sqlite3.Row
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA busy_timeout=30000")
+    return connection
+
+def _now():
+    return datetime.now().isoformat()
+
+def _finish(queue_file, job_id, status, result=None, error=None):
+    with closing(_connect(queue_file)) as connection:
+        connection.execute(
+            "UPDATE jobs SET status = ?, result = ?, error = ?, finished_at = ?, "
+            "progress = CASE WHEN ? = 'completed' THEN 1.0 ELSE progress END WHERE id = ?",
+            (status, None if result is None else str(result), error, _now(), status, job_id))
+
+def _execute(queue_file, job_id):
+    """
+    Run one job in a worker process and store its outcome.
+
+    Args:
+        queue_file (str): Path of the queue database.
+        job_id (str): ID of the claimed job.
+    """
+    global _current_job
+    with closing(_connect(queue_file)) as connection:
+        row = connection.execute("SELECT payload, cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        connection.execute("UPDATE jobs SET pid = ? WHERE id = ?", (os.getpid(), job_id))
+    if row['cancel_requested']:
+        _finish(queue_file, job_id, CANCELLED)
+        return
+
+    _current_job = (queue_file, job_id, 0.0)
+    try:
+        target, args, kwargs = pickle.loads(row['payload'])
+        result = target(*args, **kwargs)
+        with closing(_connect(queue_file)) as connection:
+            cancel_requested = connection.execute("SELECT cancel_requested FROM jobs WHERE id = ?",
+                                                  (job_id,)).fetchone()[0]
+        _finish(queue_file, job_id, CANCELLED if cancel_requested else COMPLETED, result=result)
+    except JobCancelled:
+        _finish(queue_file, job_id, CANCELLED)
+    except BaseException as e:
+        _finish(queue_file, job_id, FAILED, error=f"{type(e).__name__}: {e}")
+    finally:
+        _current_job = None
+
+class JobQueue(IJobQueue):
+    """
+    Local runner for long-running analyses: a SQLite-backed queue drained by a process pool.
+
+    Jobs are pickled callables with their arguments, e.g. a manager's bound `main` method.
+    They are stored in a SQLite database (WAL mode), so every Streamlit session, and
+    every process opening the same file, sees the same queue, and a rerun of a page does
+    not affect jobs that were already submitted. A dispatcher thread claims queued jobs in
+    submission order and runs them in a pool of worker processes, respecting an overall
+    worker limit and an optional limit per job type.
+
+    Jobs report their progress through `report_progress`; the ETA is extrapolated from it,
+    or, for jobs that do not report progress, estimated from the mean duration of earlier
+    jobs of the same type. Queued jobs are cancelled immediately; running jobs stop at
+    their next progress report, and the result of a job that never reports is discarded.
+
+    Attributes:
+        queue_file (str): Path of the queue database.
+        max_workers (int): Number of jobs running at the same time.
+        concurrency_limits (dict): Maximum number of running jobs per job type.
+        poll_interval (float): Seconds between two checks of the queue.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(self, queue_file, max_workers=2, concurrency_limits=None, poll_interval=1.0):
+        """
+        Initialize the queue; the database is created on first use.
+
+        Args:
+            queue_file (str): Path of the queue database.
+            max_workers (int): Number of jobs running at the same time.
+            concurrency_limits (dict): Maximum number of running jobs per job type.
+            poll_interval (float): Seconds between two checks of the queue.
+        """
+        self.queue_file = str(queue_file)
+        self.max_workers = max_workers
+        self.concurrency_limits = dict(concurrency_limits or {})
+        self.poll_interval = poll_interval
+        self._initialized = False
+        self._pool = None
+        self._futures = {}
+        self._dispatcher = None
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, queue_file, max_workers=2, concurrency_limits=None):
+        """
+        Return the queue of the process for a database file, creating it on first use.
+
+        Args:
+            queue_file (str): Path of the queue database.
+            max_workers (int): Number of jobs running at the same time.
+            concurrency_limits (dict): Maximum number of running jobs per job type.
+
+        Returns:
+            JobQueue: The shared queue.
+        """
+        key = os.path.abspath(queue_file)
+        with cls._shared_lock:
+            if key not in cls._shared:
+                cls._shared[key] = cls(queue_file, max_workers, concurrency_limits)
+            return cls._shared[key]
+
+    def _connect(self):
+        if not self._initialized:
+            os.makedirs(os.path.dirname(os.path.abspath(self.queue_file)), exist_ok=True)
+            with closing(_connect(self.queue_file)) as connection:
+                connection.executescript("""
+                    CREATE TABLE IF NOT EXISTS jobs (
+                        id TEXT PRIMARY KEY,
+                        job_type TEXT NOT NULL,
+                        description TEXT NOT NULL,
+                        payload BLOB NOT NULL,
+                        status TEXT NOT NULL,
+                        progress REAL NOT NULL DEFAULT 0,
+                        message TEXT,
+                        result TEXT,
+                        error TEXT,
+                        cancel_requested INTEGER NOT NULL DEFAULT 0,
+                        runner_pid INTEGER,
+                        pid INTEGER,
+                        submitted_at TEXT NOT NULL,
+                        started_at TEXT,
+                        finished_at TEXT
+                    );
+                    CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs (status, submitted_at);
+                """)
+            self._initialized = True
+        return _connect(self.queue_file)
+
+    def submit(self, job_type, target, *args, **kwargs):
+        """
+        Queue a job and make sure the dispatcher is running.
+
+        Args:
+            job_type (str): Type of the job, e.g. 'topic_modeling'; used for the concurrency limits.
+            target (callable): Picklable callable to run, e.g. a module-level function or a
+                bound method of a picklable manager.
+            *args: Positional arguments for target.
+            **kwargs: Keyword arguments for target.
+
+        Returns:
+            str: ID of the queued job.
+        """
+        payload = pickle.dumps((target, args, kwargs))
+        job_id = uuid.uuid4().hex
+        description = getattr(target, '__qualname__', repr(target))
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "INSERT INTO jobs (id, job_type, description, payload, status, submitted_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (job_id, job_type, description, payload, QUEUED, _now()))
+        self.start()
+        return job_id
+
+    def cancel(self, job_id):
+        """
+        Cancel a job: a queued job is never started, a running job stops at its next progress report.
+
+        Args:
+            job_id (str): ID of the job.
+
+        Returns:
+            bool: False if the job had already finished or does not exist.
+        """
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            row = connection.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None or row['status'] in FINISHED_STATUSES:
+                connection.execute("COMMIT")
+                return False
+            if row['status'] == QUEUED:
+                connection.execute("UPDATE jobs SET status = ?, cancel_requested = 1, finished_at = ? WHERE id = ?",
+                                   (CANCELLED, _now(), job_id))
+            else:
+                connection.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            connection.execute("COMMIT")
+        return True
+
+    def status(self, job_id):
+        """
+        Return the state of a job.
+
+        Args:
+            job_id (str): ID of the job.
+
+        Returns:
+            dict: 'id', 'job_type', 'description', 'status', 'progress', 'message', 'result',
+                'error', 'cancel_requested', the timestamps and 'eta' (estimated seconds
+                until completion, or None); None if the job does not exist.
+        """
+        with closing(self._connect()) as connection:
+            row = connection.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            return self._describe(connection, row) if row is not None else None
+
+    def jobs(self, job_type=None, limit=50):
+        """
+        List the most recently submitted jobs.
+
+        Args:
+            job_type (str): Only list jobs of this type (optional).
+            limit (int): Maximum number of jobs.
+
+        Returns:
+            list: One dict per job, as returned by `status`.
+        """
+        with closing(self._connect()) as connection:
+            if job_type is None:
+                rows = connection.execute("SELECT * FROM jobs ORDER BY submitted_at DESC LIMIT ?", (limit,))
+            else:
+                rows = connection.execute("SELECT * FROM jobs WHERE job_type = ? ORDER BY submitted_at DESC LIMIT ?",
+                                          (job_type, limit))
+            return [self._describe(connection, row) for row in rows.fetchall()]
+
+    def _describe(self, connection, row):
+        job = {key: row[key] for key in row.keys() if key not in ('payload', 'runner_pid', 'pid')}
+        job['cancel_requested'] = bool(job['cancel_requested'])
+        job['eta'] = self._eta(connection, row)
+        return job
+
+    def _eta(self, connection, row):
+        if row['status'] in FINISHED_STATUSES:
+            return 0.0
+        if row['status'] == RUNNING:
+            elapsed = (datetime.now() - datetime.fromisoformat(row['started_at'])).total_seconds()
+            if row['progress'] > 0:
+                return elapsed * (1 - row['progress']) / row['progress']
+        else:
+            elapsed = 0.0
+        mean_duration = connection.execute(
+            "SELECT AVG((julianday(finished_at) - julianday(started_at)) * 86400) FROM "
+            "(SELECT started_at, finished_at FROM jobs WHERE job_type = ? AND status = ? "
+            "ORDER BY finished_at DESC LIMIT 20)", (row['job_type'], COMPLETED)).fetchone()[0]
+        return max(mean_duration - elapsed, 0.0) if mean_duration is not None else None
+
+    def start(self):
+        """
+        Start the dispatcher thread and the worker pool of this process, if they are not running.
+
+        Jobs left running by a dispatcher process that no longer exists, or by this process
+        without a worker still running them, are marked as failed.
+        """
+        with self._lock:
+            if self._dispatcher is not None and self._dispatcher.is_alive():
+                return
+            self._recover_interrupted()
+            self._stop.clear()
+            if self._pool is None:
+                self._pool = self._new_pool()
+            self._dispatcher = threading.Thread(target=self._dispatch, name='job-queue-dispatcher', daemon=True)
+            self._dispatcher.start()
+
+    def _new_pool(self):
+        return ProcessPoolExecutor(max_workers=self.max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+    def shutdown(self, wait=True):
+        """
+        Stop claiming jobs and shut the worker pool down.
+
+        Args:
+            wait (bool): Wait for the running jobs to finish.
+        """
+        with self._lock:
+            self._stop.set()
+            if self._dispatcher is not None:
+                self._dispatcher.join()
+                self._dispatcher = None
+            if self._pool is not None:
+                self._pool.shutdown(wait=wait, cancel_futures=True)
+                self._pool = None
+
+    def _recover_interrupted(self):
+        # Jobs of this process whose futures are still pending keep running in the pool
+        live = {job_id for job_id, future in self._futures.items() if not future.done()}
+        with closing(self._connect()) as connection:
+            for row in connection.execute("SELECT id, runner_pid FROM jobs WHERE status = ?", (RUNNING,)).fetchall():
+                if row['id'] in live:
+                    continue
+                if row['runner_pid'] == os.getpid() or not self._is_alive(row['runner_pid']):
+                    _finish(self.queue_file, row['id'], FAILED, error="Interrupted: the job runner stopped.")
+
+    @staticmethod
+    def _is_alive(pid):
+        if pid is None:
+            return False
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+        return True
+
+    def _dispatch(self):
+        while not self._stop.is_set():
+            try:
+                dispatched = self._dispatch_next()
+            except Exception as e:
+                # E.g. a database lock timeout; the dispatcher must outlive it, so it retries later
+                print(f"Job queue dispatcher error, retrying: {type(e).__name__}: {e}")
+                dispatched = False
+            if not dispatched:
+                self._stop.wait(self.poll_interval)
+
+    def _dispatch_next(self):
+        """
+        Claim the next job and submit it to the worker pool.
+
+        A pool broken by a dead worker is replaced; the claimed job goes back to the queue,
+        while the jobs that were running in the broken pool fail through their futures.
+
+        Returns:
+            bool: False if no job could be claimed.
+        """
+        self._futures = {job_id: future for job_id, future in self._futures.items() if not future.done()}
+        job_id = self._claim() if len(self._futures) < self.max_workers else None
+        if job_id is None:
+            return False
+        try:
+            future = self._pool.submit(_execute, self.queue_file, job_id)
+        except BrokenProcessPool:
+            self._requeue(job_id)
+            self._pool.shutdown(wait=False)
+            self._pool = self._new_pool()
+            return True
+        except BaseException:
+            self._requeue(job_id)
+            raise
+        future.add_done_callback(lambda future, job_id=job_id: self._on_done(job_id, future))
+        self._futures[job_id] = future
+        return True
+
+    def _requeue(self, job_id):
+        with closing(self._connect()) as connection:
+            connection.execute("UPDATE jobs SET status = ?, started_at = NULL, runner_pid = NULL "
+                               "WHERE id = ? AND status = ?", (QUEUED, job_id, RUNNING))
+
+    def _claim(self):
+        """
+        Mark the oldest queued job whose type is below its concurrency limit as running.
+
+        The counts and the claim happen in one write transaction, so the limits also hold
+        across processes sharing the queue.
+
+        Returns:
+            str: ID of the claimed job, or None.
+        """
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                running = dict(connection.execute(
+                    "SELECT job_type, COUNT(*) FROM jobs WHERE status = ? GROUP BY job_type", (RUNNING,)).fetchall())
+                full = [job_type for job_type, limit in self.concurrency_limits.items()
+                        if running.get(job_type, 0) >= limit]
+                row = connection.execute(
+                    f"SELECT id FROM jobs WHERE status = ? AND job_type NOT IN ({','.join('?' * len(full))}) "
+                    "ORDER BY submitted_at LIMIT 1", (QUEUED, *full)).fetchone()
+                if row is not None:
+                    connection.execute("UPDATE jobs SET status = ?, started_at = ?, runner_pid = ? WHERE id = ?",
+                                       (RUNNING, _now(), os.getpid(), row['id']))
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        return row['id'] if row is not None else None
+
+    def _on_done(self, job_id, future):
+        # Failures of the pool itself, e.g. a worker killed by the OS, never reach _execute's handlers
+        error = future.exception() if not future.cancelled() else None
+        if future.cancelled() or error is not None:
+            with closing(self._connect()) as connection:
+                status = connection.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()[0]
+            if status == RUNNING:
+                _finish(self.queue_file, job_id, CANCELLED if future.cancelled() else FAILED,
+                        error=None if error is None else f"{type(error).__name__}: {error}")
+
+    def wait(self, job_id, timeout=None):
+        """
+        Block until a job has finished.
+
+        Args:
+            job_id (str): ID of the job.
+            timeout (float): Maximum number of seconds to wait (optional).
+
+        Returns:
+            dict: The final state of the job, as returned by `status`.
+
+        Raises:
+            TimeoutError: If the job did not finish in time.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.status(job_id)
+            if job is None or job['status'] in FINISHED_STATUSES:
+                return job
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"Job {job_id} did not finish within {timeout} seconds.")
+            time.sleep(min(self.poll_interval, 0.2))
@@ -0,0 +1,158 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from interfaces import IKeywordTrendTracker
+
+def load_keyword_dictionaries(folder, names=None):
+    """
+    Load keyword dictionaries from the JSON files in a folder.
+
+    Each file maps keyword (group) names to lists of terms, like the files in
+    `keywords_folder_path`.
+
+    Args:
+        folder (str): Folder containing the JSON files.
+        names (list): File names without extension to load; defaults to all JSON files.
+
+    Returns:
+        dict: Mapping of dictionary names to {keyword: [terms]} dicts.
+    """
+    if not os.path.isdir(folder):
+        raise FileNotFoundError(f"Keywords folder not found: {folder}")
+    available = sorted(os.path.splitext(f)[0] for f in os.listdir(folder) if f.endswith('.json'))
+    dictionaries = {}
+    for name in (names or available):
+        if name not in available:
+            raise FileNotFoundError(f"Keyword dictionary '{name}' not found in: {folder}")
+        with open(os.path.join(folder, f"{name}.json"), 'r', encoding='utf-8') as f:
+            keyword_dict = json.load(f)
+        if not isinstance(keyword_dict, dict):
+            raise ValueError(f"Keyword dictionary '{name}' must map keywords to lists of terms.")
+        dictionaries[name] = keyword_dict
+    return dictionaries
+
+class KeywordTrendTracker(IKeywordTrendTracker):
+    """
+    Tracks the prevalence of keyword dictionaries in tokenized documents over time.
+
+    The dictionaries are compiled once into a term-id lookup and a sparse term x keyword
+    membership matrix. Prevalence for every keyword of every dictionary is then computed
+    in a single pass over the tokenized corpus, followed by sparse products that sum the
+    hits per period.
+
+    Attributes:
+        dictionaries (dict): Mapping of dictionary names to {keyword: [terms]} dicts.
+        term_index (dict): Mapping of normalized terms to term ids.
+        columns (list): (dictionary, keyword) pairs in membership-matrix column order.
+        membership (scipy.sparse.csr_matrix): Term x keyword membership matrix.
+    """
+
+    def __init__(self, dictionaries, normalize_term=None):
+        """
+        Initialize and compile the KeywordTrendTracker.
+
+        Args:
+            dictionaries (dict): Mapping of dictionary names to {keyword: [terms]} dicts.
+            normalize_term (callable): Maps a term onto its token form; defaults to
+                lowercasing and joining words with underscores.
+        """
+        if not dictionaries:
+            raise ValueError("At least one keyword dictionary is required.")
+        self.dictionaries = dictionaries
+        self.normalize_term = normalize_term or (lambda term: term.lower().replace(" ", "_"))
+        self.compile()
+
+    def compile(self):
+        """
+        Compile the dictionaries into the term-id lookup and the membership matrix.
+
+        Returns:
+            None
+        """
+        self.term_index = {}
+        self.columns = []
+        rows, cols = [], []
+        for dictionary, keyword_dict in self.dictionaries.items():
+            for keyword, terms in keyword_dict.items():
+                col = len(self.columns)
+                self.columns.append((dictionary, keyword))
+                for term in {self.normalize_term(term) for term in terms}:
+                    rows.append(self.term_index.setdefault(term, len(self.term_index)))
+                    cols.append(col)
+        self.membership = sparse.csr_matrix((np.ones(len(rows), dtype=np.int32), (rows, cols)),
+                                            shape=(len(self.term_index), len(self.columns)))
+
+    @property
+    def multi_word_terms(self):
+        """Normalized terms spanning several words, which the tokenizer must join."""
+        return sorted(term for term in self.term_index if "_" in term)
+
+    def presence_matrix(self, token_lists):
+        """
+        Build a sparse document x term presence matrix in one pass over the corpus.
+
+        Args:
+            token_lists (iterable): One token list per document.
+
+        Returns:
+            scipy.sparse.csr_matrix: Binary matrix of shape (n_documents, n_terms).
+        """
+        indptr, indices = [0], []
+        for tokens in token_lists:
+            indices.extend(self.term_index[token] for token in set(tokens) if token in self.term_index)
+            indptr.append(len(indices))
+        data = np.ones(len(indices), dtype=np.int32)
+        return sparse.csr_matrix((data, indices, indptr), shape=(len(indptr) - 1, len(self.term_index)))
+
+    def compute(self, token_lists, periods):
+        """
+        Compute the share of documents mentioning each keyword per period.
+
+        Args:
+            token_lists (iterable): One token list per document.
+            periods (pd.Series or list): Period label per document; missing labels are ignored.
+
+        Returns:
+            pd.DataFrame: Tidy table with columns 'period', 'dictionary', 'keyword' and 'share',
+                where share is the fraction of the period's documents mentioning the keyword.
+        """
+        codes, labels = pd.factorize(pd.Series(periods), sort=True)
+        document_flags = (self.presence_matrix(token_lists) @ self.membership) > 0
+
+        # Period x documents indicator, so a single product sums the flags per period
+        documents = np.flatnonzero(codes >= 0)
+        period_matrix = sparse.csr_matrix((np.ones(len(documents), dtype=np.int32), (codes[documents], documents)),
+                                          shape=(len(labels), len(codes)))
+        counts = np.asarray((period_matrix @ document_flags.astype(np.int32)).todense(), dtype=float)
+        totals = np.bincount(codes[documents], minlength=len(labels))[:, None]
+        shares = counts / np.maximum(totals, 1)
+
+        return pd.DataFrame({
+            'period': np.repeat(np.asarray(labels), len(self.columns)),
+            'dictionary': [dictionary for dictionary, _ in self.columns] * len(labels),
+            'keyword': [keyword for _, keyword in self.columns] * len(labels),
+            'share': shares.ravel(),
+        })
+
+    @staticmethod
+    def to_wide(table, dictionary):
+        """
+        Pivot one dictionary of a tidy trend table into percentages per period and keyword.
+
+        Args:
+            table (pd.DataFrame): Table returned by `compute`.
+            dictionary (str): Dictionary to select.
+
+        Returns:
+            pd.DataFrame: Percentages indexed by period with one column per keyword, in
+                dictionary order.
+        """
+        selected = table[table['dictionary'] == dictionary]
+        if selected.empty and dictionary not in set(table['dictionary']):
+            raise KeyError(f"Unknown keyword dictionary: {dictionary}")
+        wide = selected.pivot(index='period', columns='keyword', values='share') * 100
+        wide = wide[list(dict.fromkeys(selected['keyword']))]
+        wide.columns.name = None
+        return wide
@@ -0,0 +1,172 @@
+import numpy as np
+import pandas as pd
+from .embedding_utils import parse_embeddings
+
+# Storage types for embedding matrices, from exact to most compact
+STORAGE_DTYPES = ('float32', 'float16', 'int8')
+
+def quantize(embeddings, dtype='float32'):
+    """
+    Convert embeddings to a storage type.
+
+    float16 halves the size of float32. int8 quarters it: every dimension is scaled
+    symmetrically by its own maximum absolute value, so dimensions with a small range
+    keep their resolution.
+
+    Args:
+        embeddings: 2-D array or iterable of stored embeddings.
+        dtype (str): One of STORAGE_DTYPES.
+
+    Returns:
+        tuple: (data, scales), where scales is the float32 scale per dimension for
+            'int8' and None otherwise.
+    """
+    if dtype not in STORAGE_DTYPES:
+        raise ValueError(f"dtype must be one of {STORAGE_DTYPES}.")
+    matrix = parse_embeddings(embeddings)
+    if dtype != 'int8':
+        return matrix.astype(dtype), None
+
+    scales = np.abs(matrix).max(axis=0) / 127 if len(matrix) else np.ones(matrix.shape[1], dtype=np.float32)
+    scales = np.where(scales > 0, scales, 1).astype(np.float32)
+    data = np.clip(np.rint(matrix / scales), -127, 127).astype(np.int8)
+    return data, scales
+
+def dequantize(data, scales=None):
+    """
+    Convert stored embeddings back to float32.
+
+    Args:
+        data (np.ndarray): Stored matrix (float32, float16 or int8).
+        scales (np.ndarray): Scale per dimension for int8 data.
+
+    Returns:
+        np.ndarray: float32 matrix; float32 data is returned without a copy.
+    """
+    if scales is None:
+        return data.astype(np.float32, copy=False)
+    return data.astype(np.float32) * scales
+
+def cosine_scores(data, queries, scales=None):
+    """
+    Cosine similarity between stored embeddings and queries, computed on the stored form.
+
+    For int8 data the per-dimension scales are folded into the queries,
+    x_i . q = sum_j d_ij s_j q_j = d_i . (s * q), so the rows are never rescaled; only
+    their norms are computed from the rescaled values.
+
+    Args:
+        data (np.ndarray): Block of stored embeddings, shape (n_documents, embedding_dim).
+        queries (np.ndarray): Query vectors, shape (n_queries, embedding_dim).
+        scales (np.ndarray): Scale per dimension for int8 data.
+
+    Returns:
+        np.ndarray: float32 array of shape (n_documents, n_queries).
+    """
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    queries = queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-8)
+    block = data.astype(np.float32, copy=False)
+    if scales is not None:
+        queries = queries * scales
+        norms = np.linalg.norm(block * scales, axis=1, keepdims=True)
+    else:
+        norms = np.linalg.norm(block, axis=1, keepdims=True)
+    return (block @ queries.T) / np.maximum(norms, 1e-8)
+
+class QuantizedEmbeddings:
+    """
+    An int8 embedding matrix together with its per-dimension scales.
+
+    Behaves like a read-only 2-D array for the analyses: it has a length and a shape,
+    slicing rows returns another QuantizedEmbeddings over a view of the data, and
+    `parse_embeddings` turns it into float32.
+
+    Attributes:
+        data (np.ndarray): int8 matrix, possibly memory-mapped.
+        scales (np.ndarray): float32 scale per dimension.
+    """
+
+    def __init__(self, data, scales):
+        self.data = data
+        self.scales = scales
+
+    def __len__(self):
+        return self.data.shape[0]
+
+    def __getitem__(self, rows):
+        return QuantizedEmbeddings(self.data[rows], self.scales)
+
+    @property
+    def shape(self):
+        return self.data.shape
+
+    @property
+    def nbytes(self):
+        return self.data.nbytes + self.scales.nbytes
+
+    def dequantize(self):
+        return dequantize(self.data, self.scales)
+
+    def cosine_scores(self, queries):
+        return cosine_scores(self.data, queries, self.scales)
+
+def _top_k(scores, k):
+    top = np.argpartition(-scores, kth=k - 1, axis=0)[:k]
+    return [set(column) for column in top.T]
+
+def quantization_report(embeddings, queries=None, k=10, n_queries=100, dtypes=STORAGE_DTYPES, batch_size=65536,
+                        seed=0) -> pd.DataFrame:
+    """
+    Compare the storage types against float32 on a set of embeddings.
+
+    For every type the report gives the storage size, the cosine error between each
+    original and reconstructed embedding, and the overlap of the top-k most similar
+    documents per query, scored on the stored form.
+
+    Args:
+        embeddings: 2-D array or iterable of stored embeddings.
+        queries (np.ndarray): Query vectors; defaults to n_queries sampled documents.
+        k (int): Number of most similar documents to compare.
+        n_queries (int): Number of documents to sample as queries.
+        dtypes (tuple): Storage types to compare.
+        batch_size (int): Number of documents quantized and scored per block.
+        seed (int): Seed for sampling the queries.
+
+    Returns:
+        pd.DataFrame: One row per storage type with the columns 'dtype',
+            'bytes_per_vector', 'compression', 'mean_cosine_error', 'max_cosine_error'
+            and 'top_k_overlap'.
+    """
+    matrix = parse_embeddings(embeddings)
+    if queries is None:
+        rng = np.random.default_rng(seed)
+        queries = matrix[rng.choice(len(matrix), size=min(n_queries, len(matrix)), replace=False)]
+    k = max(1, min(k, len(matrix)))
+    reference = _top_k(cosine_scores(matrix, queries), k)
+
+    rows = []
+    for dtype in dtypes:
+        data, scales = quantize(matrix, dtype)
+        errors = []
+        scores = np.empty((len(matrix), len(queries)), dtype=np.float32)
+        for start in range(0, len(matrix), batch_size):
+            original = matrix[start:start + batch_size]
+            stored = data[start:start + batch_size]
+            restored = dequantize(stored, scales)
+            cosine = (original * restored).sum(axis=1) / np.maximum(
+                np.linalg.norm(original, axis=1) * np.linalg.norm(restored, axis=1), 1e-8)
+            errors.append(1 - cosine)
+            scores[start:start + len(stored)] = cosine_scores(stored, queries, scales)
+        errors = np.concatenate(errors) if errors else np.zeros(0)
+
+        bytes_per_vector = data.itemsize * matrix.shape[1]
+        overlap = [len(expected & found) / k for expected, found in zip(reference, _top_k(scores, k))]
+        rows.append({
+            'dtype': dtype,
+            'bytes_per_vector': bytes_per_vector,
+            'compression': matrix.itemsize * matrix.shape[1] / bytes_per_vector,
+            'mean_cosine_error': float(errors.mean()) if errors.size else 0.0,
+            'max_cosine_error': float(errors.max()) if errors.size else 0.0,
+            'top_k_overlap': float(np.mean(overlap)),
+        })
+    return pd.DataFrame(rows)
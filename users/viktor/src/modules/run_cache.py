@@ -0,0 +1,252 @@
+import os
+import json
+import shutil
+import sqlite3
+import inspect
+import hashlib
+from datetime import datetime
+from contextlib import closing
+from interfaces import IRunCache
+from .data_registry import DatasetRegistry
+
+# Bump when a change outside the fingerprinted sources alters the reports
+CODE_VERSION = 1
+
+class RunCache(IRunCache):
+    """
+    Memoizes whole analysis runs by a fingerprint of their inputs.
+
+    A run is identified by the content hash of its dataset files, the embedding model, the
+    content hash of its keyword file, its parameters and the version of the code producing
+    the reports. When a run with the same fingerprint has completed before and its report
+    folder (topics.json, metrics.json, PNGs, docx) still exists, that folder is returned
+    instead of running the analysis again.
+
+    Completed runs are indexed in a SQLite database (WAL mode) in the reports folder. Once
+    the recorded report folders exceed the byte budget, the least recently used ones are
+    deleted. Report folders the cache did not record are never touched.
+
+    Attributes:
+        reports_folder_path (str): Folder the reports are written to.
+        max_bytes (int): Disk budget of the recorded report folders.
+        index_file (str): Path of the SQLite index.
+    """
+
+    INDEX_FILE = ".run_cache.db"
+
+    def __init__(self, reports_folder_path, max_bytes=5 * 1024 ** 3, dataset_cache=None):
+        """
+        Open (or create) the run index of a reports folder.
+
+        Args:
+            reports_folder_path (str): Folder the reports are written to.
+            max_bytes (int): Disk budget of the recorded report folders.
+            dataset_cache (DatasetCache): Cache memoizing the content hashes of unchanged
+                files (optional).
+        """
+        self.reports_folder_path = reports_folder_path
+        self.max_bytes = max_bytes
+        self.dataset_cache = dataset_cache
+        self.index_file = os.path.join(reports_folder_path, self.INDEX_FILE)
+        os.makedirs(reports_folder_path, exist_ok=True)
+        with closing(self._connect()) as connection:
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS runs (
+                    folder TEXT PRIMARY KEY,
+                    fingerprint TEXT NOT NULL,
+                    analysis TEXT NOT NULL,
+                    parameters TEXT NOT NULL,
+                    bytes INTEGER NOT NULL,
+                    created_at TEXT NOT NULL,
+                    last_used_at TEXT NOT NULL
+                )""")
+            connection.execute("CREATE INDEX IF NOT EXISTS runs_fingerprint ON runs (fingerprint)")
+
+    def _connect(self):
+        connection = sqlite3.connect(self.index_file, timeout=30, isolation_level=None)
+        connection.row_factory = sqlite3.Row
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA busy_timeout=30000")
+        return connection
+
+    @staticmethod
+    def code_version(*objects):
+        """
+        Identify the code producing a report by the source files of the given classes or modules.
+
+        Args:
+            *objects: Classes, functions or modules whose source files produce the report.
+
+        Returns:
+            str: Hex digest over CODE_VERSION and the source files.
+        """
+        digest = hashlib.sha256(repr(CODE_VERSION).encode())
+        for path in sorted({inspect.getfile(obj) for obj in objects}):
+            with open(path, 'rb') as f:
+                digest.update(f.read())
+        return digest.hexdigest()
+
+    def content_hash(self, *paths):
+        """
+        SHA-256 over the contents of files, recomputed only when a file changed.
+
+        Args:
+            *paths (str): Paths of the files to hash, in order.
+
+        Returns:
+            str: Hex digest of the file contents.
+        """
+        if self.dataset_cache is None:
+            return DatasetRegistry.content_hash(*paths)
+        name = ('content_hash',) + tuple(os.path.abspath(path) for path in paths)
+        return self.dataset_cache.get_or_load(name, self.dataset_cache.file_version(*paths),
+                                              lambda: DatasetRegistry.content_hash(*paths))
+
+    def fingerprint(self, analysis, dataset_files, embedding_model=None, keyword_file=None, parameters=None,
+                    code_version=None):
+        """
+        Fingerprint an analysis run by everything that determines its reports.
+
+        Args:
+            analysis (str): Name of the analysis, e.g. 'topic_modeling'.
+            dataset_files (list): Paths of the dataset and embeddings files.
+            embedding_model (str): Name of the embedding model.
+            keyword_file (str): Path of the keyword JSON file, or None.
+            parameters (dict): JSON-serializable parameters of the run.
+            code_version (str): Version of the code, e.g. from `code_version`.
+
+        Returns:
+            str: Hex digest identifying the run.
+        """
+        inputs = {
+            'analysis': analysis,
+            'dataset': self.content_hash(*dataset_files),
+            'embedding_model': embedding_model,
+            'keywords': self.content_hash(keyword_file) if keyword_file else None,
+            'parameters': parameters or {},
+            'code_version': code_version if code_version is not None else CODE_VERSION,
+        }
+        return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+    @staticmethod
+    def folder_size(folder):
+        size = 0
+        for root, _, files in os.walk(folder):
+            for name in files:
+                try:
+                    size += os.path.getsize(os.path.join(root, name))
+                except OSError:
+                    pass
+        return size
+
+    def lookup(self, fingerprint):
+        """
+        Return the report folder of the most recent completed run with this fingerprint.
+
+        Entries whose folder was removed or emptied are dropped.
+
+        Args:
+            fingerprint (str): Fingerprint from `fingerprint`.
+
+        Returns:
+            str: The report folder, or None when there is no usable run.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT folder FROM runs WHERE fingerprint = ? ORDER BY created_at DESC",
+                                      (fingerprint,)).fetchall()
+            for row in rows:
+                folder = row['folder']
+                if os.path.isdir(folder) and os.listdir(folder):
+                    connection.execute("UPDATE runs SET last_used_at = ? WHERE folder = ?",
+                                       (datetime.now().isoformat(), folder))
+                    return folder
+                connection.execute("DELETE FROM runs WHERE folder = ?", (folder,))
+        return None
+
+    def record(self, fingerprint, analysis, folder, parameters=None):
+        """
+        Record the report folder of a completed run and evict old reports beyond the budget.
+
+        Args:
+            fingerprint (str): Fingerprint from `fingerprint`.
+            analysis (str): Name of the analysis.
+            folder (str): Report folder written by the run.
+            parameters (dict): Parameters of the run, kept for inspection.
+        """
+        now = datetime.now().isoformat()
+        folder = os.path.abspath(folder)
+        with closing(self._connect()) as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO runs (folder, fingerprint, analysis, parameters, bytes, created_at, last_used_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (folder, fingerprint, analysis, json.dumps(parameters or {}, sort_keys=True, default=str),
+                 self.folder_size(folder), now, now))
+        self.evict(keep=folder)
+
+    def evict(self, keep=None):
+        """
+        Delete the least recently used report folders until the recorded ones fit the budget.
+
+        Args:
+            keep (str): Folder that is never evicted, e.g. the one just recorded.
+
+        Returns:
+            list: The deleted report folders.
+        """
+        evicted = []
+        with closing(self._connect()) as connection:
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                total = connection.execute("SELECT COALESCE(SUM(bytes), 0) FROM runs").fetchone()[0]
+                for row in connection.execute("SELECT folder, bytes FROM runs ORDER BY last_used_at").fetchall():
+                    if total <= self.max_bytes:
+                        break
+                    if row['folder'] == keep:
+                        continue
+                    connection.execute("DELETE FROM runs WHERE folder = ?", (row['folder'],))
+                    total -= row['bytes']
+                    evicted.append(row['folder'])
+                connection.execute("COMMIT")
+            except Exception:
+                connection.execute("ROLLBACK")
+                raise
+        for folder in evicted:
+            shutil.rmtree(folder, ignore_errors=True)
+        return evicted
+
+    def run(self, fingerprint, analysis, compute, parameters=None, force_refresh=False):
+        """
+        Return the reports of a run, computing them only when no completed run matches.
+
+        Args:
+            fingerprint (str): Fingerprint from `fingerprint`.
+            analysis (str): Name of the analysis.
+            compute (callable): Runs the analysis and returns its report folder, or None on failure.
+            parameters (dict): Parameters of the run, kept for inspection.
+            force_refresh (bool): Run the analysis even when a matching run exists.
+
+        Returns:
+            tuple: (report folder, True when it was reused from an earlier run)
+        """
+        if not force_refresh:
+            folder = self.lookup(fingerprint)
+            if folder is not None:
+                print(f"Reusing the reports of an identical earlier run: {folder}")
+                return folder, True
+
+        folder = compute()
+        if folder is not None:
+            self.record(fingerprint, analysis, folder, parameters)
+        return folder, False
+
+    def runs(self):
+        """
+        List the recorded runs, most recently used first.
+
+        Returns:
+            list: One dict per run with 'folder', 'fingerprint', 'analysis', 'parameters',
+                'bytes', 'created_at' and 'last_used_at'.
+        """
+        with closing(self._connect()) as connection:
+            rows = connection.execute("SELECT * FROM runs ORDER BY last_used_at DESC").fetchall()
+        return [dict(row, parameters=json.loads(row['parameters'])) for row in rows]
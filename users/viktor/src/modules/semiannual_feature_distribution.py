@@ -4,6 +4,7 @@ import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime
 from interfaces import ISemiannualFeatureDistribution
+from .trend_cube import TrendCube
 
 class SemiannualFeatureDistributionPlotter(ISemiannualFeatureDistribution):
     """
@@ -28,13 +29,14 @@ class SemiannualFeatureDistributionPlotter(ISemiannualFeatureDistribution):
         self.output_subfolder = output_subfolder
         self.name_of_topics = name_of_topics
 
-    def plot_trends(self, trend_df: pd.DataFrame, monthly_trend_df: pd.DataFrame) -> str:
+    def plot_trends(self, trend_df: pd.DataFrame, monthly_trend_df: pd.DataFrame, cube: TrendCube = None) -> str:
         """
         Generate a semiannual feature distribution plot.
 
         Args:
             trend_df (pd.DataFrame): DataFrame containing trend data by year and month.
             monthly_trend_df (pd.DataFrame): DataFrame containing monthly adjustments.
+            cube (TrendCube): Precomputed aggregates; when given, trend_df and monthly_trend_df are not used.
 
         Returns:
             str: File path to the saved plot image.
@@ -43,14 +45,9 @@ class SemiannualFeatureDistributionPlotter(ISemiannualFeatureDistribution):
         # Ensure the output directory exists
         # os.makedirs(self.output_subfolder, exist_ok=True)
 
-        trend_df['month'] = trend_df['year_month'].dt.month
-        adjusted_trend_df = trend_df.merge(monthly_trend_df, on='month', suffixes=('', '_monthly'))
-
-        adjusted_trend_df['year_month'] = pd.to_datetime(adjusted_trend_df['year_month'])
-        adjusted_trend_df.set_index('year_month', inplace=True)
-
-        semiannual_trends_df = adjusted_trend_df[self.role_columns].resample('6ME').sum()
-        semiannual_trends_percent_df = semiannual_trends_df.div(semiannual_trends_df.sum(axis=1), axis=0) * 100
+        if cube is None:
+            cube = TrendCube.from_trends(trend_df, monthly_trend_df, self.role_columns)
+        semiannual_trends_percent_df = cube.semiannual_percentages()[self.role_columns]
 
         fig, ax = plt.subplots(figsize=(22, 14))
         semiannual_trends_percent_df.plot(kind='bar', stacked=True, width=0.9, colormap='tab20', ax=ax)
@@ -0,0 +1,265 @@
+import os
+import time
+import uuid
+import shutil
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from .embedding_utils import parse_embeddings
+from .dataset_storage import (to_typed_frame, read_dataset, read_embeddings, find_dataset_file, find_embeddings_file,
+                              embeddings_column, embeddings_matrix, EMBEDDINGS_COLUMN)
+
+# Postings are partitioned by the calendar month of this column
+PARTITION_COLUMN = 'original_listed_time'
+PARTITIONS_FOLDER = 'partitions'
+PARTITION_FILE = 'part-0.parquet'
+
+# File naming the published partitions version of a dataset folder
+PARTITIONS_POINTER = 'partitions.current'
+
+# Published versions kept, so readers of the previous version can finish reading it
+KEPT_PARTITION_VERSIONS = 2
+
+# Partition of the postings without a (parseable) timestamp
+UNDATED_MONTH = 'none'
+
+def in_date_range(timestamps, start=None, end=None) -> pd.Series:
+    """
+    Flag the timestamps within the half-open range [start, end).
+
+    Args:
+        timestamps (pd.Series): Timestamps to check; unparseable values are never in range.
+        start: First included time, or None for no lower bound.
+        end: First excluded time, or None for no upper bound.
+
+    Returns:
+        pd.Series: Boolean mask aligned with timestamps.
+    """
+    timestamps = pd.to_datetime(timestamps, errors='coerce')
+    mask = pd.Series(True, index=timestamps.index)
+    if start is not None:
+        mask &= timestamps >= pd.Timestamp(start)
+    if end is not None:
+        mask &= timestamps < pd.Timestamp(end)
+    return mask
+
+def month_labels(timestamps) -> pd.Series:
+    """
+    Label every timestamp with its partition month, e.g. '2024-03'.
+
+    Args:
+        timestamps (pd.Series): Timestamps of the postings.
+
+    Returns:
+        pd.Series: Month label per posting; UNDATED_MONTH for missing timestamps.
+    """
+    timestamps = pd.to_datetime(timestamps, errors='coerce')
+    return timestamps.dt.strftime('%Y-%m').fillna(UNDATED_MONTH).astype(object)
+
+def write_partitions(df, embeddings, folder, time_column=PARTITION_COLUMN):
+    """
+    Write postings and their embeddings as one Parquet file per month.
+
+    Every build is written to a new version folder,
+    '<folder>/partitions.<version>/month=YYYY-MM/part-0.parquet', each file holding the
+    postings of that month in their original order together with their embeddings. The
+    folder is built under a temporary name, renamed to its version name, and published by
+    atomically replacing the pointer file 'partitions.current'. Published versions are
+    never modified, so readers never see a partially written layout, and concurrent builds
+    do not interfere: the last one published wins. Older versions are then deleted,
+    keeping the previous one for readers that are still using it.
+
+    Args:
+        df (pd.DataFrame): Postings to partition.
+        embeddings: Embeddings aligned row by row with df, or None.
+        folder (str): Dataset folder.
+        time_column (str): Column holding the posting timestamps.
+
+    Returns:
+        str: Path of the published partitions folder.
+    """
+    df = to_typed_frame(df).reset_index(drop=True)
+    matrix = parse_embeddings(embeddings) if embeddings is not None else None
+    if matrix is not None and len(matrix) != len(df):
+        raise ValueError("The embeddings are not aligned with the postings.")
+
+    months = month_labels(df[time_column]) if time_column in df.columns else pd.Series(UNDATED_MONTH, index=df.index)
+    # Versions sort by the time their build started
+    version = f"{PARTITIONS_FOLDER}.{time.time_ns():020d}{uuid.uuid4().hex[:8]}"
+    target = os.path.join(folder, version)
+    temporary = f"{target}.tmp"
+    try:
+        os.makedirs(temporary)
+        for month, positions in df.groupby(months, sort=True).indices.items():
+            table = pa.Table.from_pandas(df.iloc[positions], preserve_index=False)
+            if matrix is not None:
+                table = table.append_column(EMBEDDINGS_COLUMN, embeddings_column(matrix[positions]))
+            partition = os.path.join(temporary, f"month={month}")
+            os.makedirs(partition)
+            pq.write_table(table, os.path.join(partition, PARTITION_FILE))
+        os.rename(temporary, target)
+    finally:
+        shutil.rmtree(temporary, ignore_errors=True)
+
+    pointer = os.path.join(folder, PARTITIONS_POINTER)
+    temporary_pointer = f"{pointer}.{uuid.uuid4().hex}.tmp"
+    with open(temporary_pointer, 'w') as f:
+        f.write(version)
+    os.replace(temporary_pointer, pointer)
+
+    remove_old_partitions(folder)
+    return target
+
+def current_partitions(folder):
+    """
+    Return the published partitions folder of a dataset folder.
+
+    Args:
+        folder (str): Dataset folder.
+
+    Returns:
+        str: Path of the published partitions folder, or None if there is none.
+    """
+    try:
+        with open(os.path.join(folder, PARTITIONS_POINTER)) as f:
+            target = os.path.join(folder, f.read().strip())
+    except FileNotFoundError:
+        return None
+    return target if os.path.isdir(target) else None
+
+def remove_old_partitions(folder, keep=KEPT_PARTITION_VERSIONS):
+    """
+    Delete all but the newest published partitions versions of a dataset folder.
+
+    The published version is never deleted, and neither are builds in progress. The
+    single 'partitions' folder written before versions existed is deleted as well.
+
+    Args:
+        folder (str): Dataset folder.
+        keep (int): Number of newest versions to keep.
+
+    Returns:
+        list: Paths of the deleted folders.
+    """
+    current = current_partitions(folder)
+    versions = sorted(name for name in os.listdir(folder)
+                      if name.startswith(f"{PARTITIONS_FOLDER}.") and name != PARTITIONS_POINTER
+                      and not name.endswith('.tmp') and os.path.isdir(os.path.join(folder, name)))
+    old = versions[:-keep] if keep else versions
+    if os.path.isdir(os.path.join(folder, PARTITIONS_FOLDER)):
+        old.append(PARTITIONS_FOLDER)
+
+    removed = []
+    for name in old:
+        path = os.path.join(folder, name)
+        if path != current:
+            shutil.rmtree(path, ignore_errors=True)
+            removed.append(path)
+    return removed
+
+def partitions_for_folder(folder, column_renames=None, time_column=PARTITION_COLUMN):
+    """
+    Return the published partitions folder of a registered dataset, creating it once.
+
+    The partitions are derived from the dataset and embeddings files, which remain the
+    source of truth, and rebuilt when those are newer. Sessions that find the partitions
+    outdated at the same time each build a version; the last one published is used.
+
+    Args:
+        folder (str): Dataset folder.
+        column_renames (dict): Renames applied before partitioning, so older datasets that
+            store the timestamps under a source column name are partitioned as well.
+        time_column (str): Column holding the posting timestamps.
+
+    Returns:
+        str: Path of the partitions folder.
+    """
+    target = current_partitions(folder)
+    dataset_file = find_dataset_file(folder)
+    try:
+        embeddings_file = find_embeddings_file(folder)
+    except FileNotFoundError:
+        embeddings_file = None
+    sources = [path for path in (dataset_file, embeddings_file) if path is not None]
+
+    if target is None or os.path.getmtime(target) < max(os.path.getmtime(path) for path in sources):
+        df = read_dataset(dataset_file).rename(columns=column_renames or {})
+        embeddings = read_embeddings(embeddings_file)[EMBEDDINGS_COLUMN] if embeddings_file else None
+        target = write_partitions(df, embeddings, folder, time_column=time_column)
+    return target
+
+def list_partitions(partitions_folder, start=None, end=None):
+    """
+    List the partition files whose month overlaps the range [start, end).
+
+    The undated partition is only listed when the range is unbounded.
+
+    Args:
+        partitions_folder (str): Folder written by `write_partitions`.
+        start: First included time, or None for no lower bound.
+        end: First excluded time, or None for no upper bound.
+
+    Returns:
+        list: Paths of the overlapping partition files, in month order.
+    """
+    files = []
+    for name in sorted(os.listdir(partitions_folder)):
+        if not name.startswith('month='):
+            continue
+        value = name[len('month='):]
+        if value == UNDATED_MONTH:
+            if start is not None or end is not None:
+                continue
+        else:
+            month = pd.Period(value, freq='M')
+            if start is not None and month.end_time < pd.Timestamp(start):
+                continue
+            if end is not None and month.start_time >= pd.Timestamp(end):
+                continue
+        files.append(os.path.join(partitions_folder, name, PARTITION_FILE))
+    return files
+
+def read_partitions(partitions_folder, start=None, end=None, columns=None, with_embeddings=False,
+                    time_column=PARTITION_COLUMN):
+    """
+    Read the postings (and embeddings) within a date range from a partitioned layout.
+
+    Only the partitions of the overlapping months are opened; rows of the boundary months
+    outside the range are dropped afterwards.
+
+    Args:
+        partitions_folder (str): Folder written by `write_partitions`.
+        start: First included time, or None for no lower bound.
+        end: First excluded time, or None for no upper bound.
+        columns (list): Posting columns to load; defaults to all columns. Columns missing
+            from the partitions are skipped.
+        with_embeddings (bool): Whether to also return the embeddings of the rows.
+        time_column (str): Column holding the posting timestamps.
+
+    Returns:
+        pd.DataFrame, or tuple: The postings, or (postings, float32 embedding matrix)
+            when with_embeddings is True.
+    """
+    frames, matrices = [], []
+    bounded = start is not None or end is not None
+    for path in list_partitions(partitions_folder, start, end):
+        available = pq.read_schema(path).names
+        wanted = [column for column in (columns or available) if column in available and column != EMBEDDINGS_COLUMN]
+        read_columns = wanted + ([time_column] if bounded and time_column not in wanted else [])
+        table = pq.read_table(path, columns=read_columns + ([EMBEDDINGS_COLUMN] if with_embeddings else []))
+
+        frame = table.select(read_columns).to_pandas()
+        matrix = embeddings_matrix(table.column(EMBEDDINGS_COLUMN)) if with_embeddings else None
+        if bounded:
+            mask = in_date_range(frame[time_column], start, end).to_numpy()
+            frame = frame[mask]
+            matrix = matrix[mask] if matrix is not None else None
+        frames.append(frame[wanted])
+        matrices.append(matrix)
+
+    df = to_typed_frame(pd.concat(frames, ignore_index=True)) if frames else pd.DataFrame(columns=columns or [])
+    if not with_embeddings:
+        return df
+    matrices = [matrix for matrix in matrices if len(matrix)]
+    return df, np.vstack(matrices) if matrices else np.empty((0, 0), dtype=np.float32)
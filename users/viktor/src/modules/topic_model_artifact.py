@@ -0,0 +1,213 @@
+import os
+import json
+import numpy as np
+from datetime import datetime
+from scipy.stats import ks_2samp
+from interfaces import ITopicModelArtifact
+from .embedding_utils import parse_embeddings
+from .embedding_reducer import EmbeddingReducer
+
+class TopicModelArtifact(ITopicModelArtifact):
+    """
+    A persisted, fitted topic model that can label new postings without refitting.
+
+    The artifact stores the KMeans centroids, the TF-IDF vocabulary and idf weights,
+    the topic keywords and a reference sample of the training assignment distances.
+    New embeddings are assigned to the nearest centroid, and the distribution of their
+    assignment distances is compared with the reference sample to flag drift.
+
+    Attributes:
+        centroids (np.ndarray): Array of shape (n_topics, embedding_dim).
+        keywords (dict): Dictionary mapping topic indices to lists of keywords.
+        vocabulary (dict): TF-IDF vocabulary mapping terms to column indices.
+        idf (np.ndarray): TF-IDF idf weights aligned with the vocabulary.
+        reference_distances (np.ndarray): Sorted sample of training assignment distances.
+        embedding_model (str): Name of the model used to create the embeddings.
+        model_version (str): Version tag of the artifact (creation timestamp).
+        reducer (EmbeddingReducer): Reduction applied to embeddings before assignment, if any.
+    """
+
+    FORMAT_VERSION = 1
+    METADATA_FILE = "topic_model.json"
+    ARRAYS_FILE = "topic_model.npz"
+    REDUCER_FILE = "reducer.npz"
+    MAX_REFERENCE_DISTANCES = 5000
+
+    def __init__(self, centroids, keywords, vocabulary=None, idf=None, reference_distances=None,
+                 embedding_model=None, model_version=None, reducer=None):
+        """
+        Initialize the TopicModelArtifact.
+
+        Args:
+            centroids (np.ndarray): Fitted cluster centers, one row per topic.
+            keywords (dict): Dictionary mapping topic indices to lists of keywords.
+            vocabulary (dict): TF-IDF vocabulary mapping terms to column indices (optional).
+            idf (np.ndarray): TF-IDF idf weights (optional).
+            reference_distances (np.ndarray): Training assignment distances (optional).
+            embedding_model (str): Name of the embedding model (optional).
+            model_version (str): Version tag; defaults to the current timestamp.
+            reducer (EmbeddingReducer): Fitted reducer used when the model was trained (optional).
+        """
+        self.centroids = np.asarray(centroids, dtype=np.float32)
+        self.keywords = {int(topic): list(words) for topic, words in keywords.items()}
+        self.vocabulary = {str(term): int(idx) for term, idx in (vocabulary or {}).items()}
+        self.idf = np.asarray(idf if idf is not None else [], dtype=np.float32)
+        self.reference_distances = self._sample_reference(reference_distances)
+        self.embedding_model = embedding_model
+        self.model_version = model_version or datetime.now().strftime("%Y%m%d_%H%M%S")
+        self.reducer = reducer
+        self._centroid_sq_norms = np.einsum("ij,ij->i", self.centroids, self.centroids)
+
+    def _sample_reference(self, distances):
+        """
+        Keep a bounded, sorted sample of the reference distances.
+
+        Args:
+            distances (np.ndarray): Assignment distances of the training data.
+
+        Returns:
+            np.ndarray: Sorted sample with at most MAX_REFERENCE_DISTANCES values.
+        """
+        if distances is None:
+            return np.empty(0, dtype=np.float32)
+        distances = np.sort(np.asarray(distances, dtype=np.float32))
+        if len(distances) > self.MAX_REFERENCE_DISTANCES:
+            # Evenly spaced order statistics preserve the shape of the distribution
+            idx = np.linspace(0, len(distances) - 1, self.MAX_REFERENCE_DISTANCES).astype(int)
+            distances = distances[idx]
+        return distances
+
+    def assign(self, embeddings, batch_size=65536):
+        """
+        Assign each embedding to its nearest centroid.
+
+        Distances are computed blockwise as ||x||^2 - 2 x.c + ||c||^2, so a batch needs
+        a single matrix product instead of a per-document loop.
+
+        Args:
+            embeddings: 2-D array or iterable of stored embeddings.
+            batch_size (int): Number of rows processed per block.
+
+        Returns:
+            tuple: (labels, distances) as 1-D arrays of length n_documents.
+        """
+        X = parse_embeddings(embeddings)
+        if X.shape[0] > 0 and self.reducer is not None:
+            X = self.reducer.transform(X)
+        if X.shape[0] == 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+        if X.shape[1] != self.centroids.shape[1]:
+            raise ValueError(
+                f"Embedding dimension {X.shape[1]} does not match the model dimension {self.centroids.shape[1]}."
+            )
+
+        labels = np.empty(X.shape[0], dtype=np.int64)
+        distances = np.empty(X.shape[0], dtype=np.float32)
+        for start in range(0, X.shape[0], batch_size):
+            block = X[start:start + batch_size]
+            sq_dist = (np.einsum("ij,ij->i", block, block)[:, None]
+                       - 2.0 * block @ self.centroids.T
+                       + self._centroid_sq_norms[None, :])
+            block_labels = np.argmin(sq_dist, axis=1)
+            labels[start:start + len(block)] = block_labels
+            distances[start:start + len(block)] = np.sqrt(
+                np.maximum(sq_dist[np.arange(len(block)), block_labels], 0.0))
+        return labels, distances
+
+    def detect_drift(self, distances, p_value_threshold=0.01):
+        """
+        Compare new assignment distances with the training distribution.
+
+        Uses a two-sample Kolmogorov-Smirnov test; a p-value below the threshold
+        flags that new postings no longer fit the fitted topics equally well.
+
+        Args:
+            distances (np.ndarray): Assignment distances returned by `assign`.
+            p_value_threshold (float): Significance level for flagging drift.
+
+        Returns:
+            dict: KS statistic, p-value, reference and current medians, and a drift flag.
+        """
+        distances = np.asarray(distances, dtype=np.float32)
+        if len(self.reference_distances) == 0 or len(distances) == 0:
+            raise ValueError("Both reference and new distances are required to detect drift.")
+
+        statistic, p_value = ks_2samp(self.reference_distances, distances)
+        return {
+            "ks_statistic": round(float(statistic), 4),
+            "p_value": float(p_value),
+            "reference_median_distance": round(float(np.median(self.reference_distances)), 4),
+            "current_median_distance": round(float(np.median(distances)), 4),
+            "drift_detected": bool(p_value < p_value_threshold),
+        }
+
+    def save(self, folder):
+        """
+        Save the artifact to a folder as a JSON metadata file and an NPZ array file.
+
+        Args:
+            folder (str): Directory to write the artifact to.
+
+        Returns:
+            str: The folder the artifact was written to.
+        """
+        os.makedirs(folder, exist_ok=True)
+        metadata = {
+            "format_version": self.FORMAT_VERSION,
+            "model_version": self.model_version,
+            "embedding_model": self.embedding_model,
+            "n_topics": int(self.centroids.shape[0]),
+            "embedding_dim": int(self.centroids.shape[1]),
+            "keywords": {str(topic): words for topic, words in self.keywords.items()},
+            "vocabulary": self.vocabulary,
+        }
+        with open(os.path.join(folder, self.METADATA_FILE), "w") as f:
+            json.dump(metadata, f, indent=4)
+        np.savez(
+            os.path.join(folder, self.ARRAYS_FILE),
+            centroids=self.centroids,
+            idf=self.idf,
+            reference_distances=self.reference_distances,
+        )
+        if self.reducer is not None:
+            self.reducer.save(os.path.join(folder, self.REDUCER_FILE))
+        return folder
+
+    @classmethod
+    def load(cls, folder):
+        """
+        Load an artifact previously written by `save`.
+
+        Args:
+            folder (str): Directory containing the artifact files.
+
+        Returns:
+            TopicModelArtifact: The loaded artifact.
+        """
+        metadata_file = os.path.join(folder, cls.METADATA_FILE)
+        arrays_file = os.path.join(folder, cls.ARRAYS_FILE)
+        if not os.path.isfile(metadata_file) or not os.path.isfile(arrays_file):
+            raise FileNotFoundError(f"No topic model artifact found in: {folder}")
+
+        with open(metadata_file, "r") as f:
+            metadata = json.load(f)
+        if metadata.get("format_version") != cls.FORMAT_VERSION:
+            raise ValueError(
+                f"Unsupported topic model format version {metadata.get('format_version')}, "
+                f"expected {cls.FORMAT_VERSION}."
+            )
+
+        reducer_file = os.path.join(folder, cls.REDUCER_FILE)
+        reducer = EmbeddingReducer.load(reducer_file) if os.path.isfile(reducer_file) else None
+
+        with np.load(arrays_file) as arrays:
+            return cls(
+                centroids=arrays["centroids"],
+                keywords=metadata["keywords"],
+                vocabulary=metadata["vocabulary"],
+                idf=arrays["idf"],
+                reference_distances=arrays["reference_distances"],
+                embedding_model=metadata["embedding_model"],
+                model_version=metadata["model_version"],
+                reducer=reducer,
+            )
@@ -5,22 +5,27 @@ from interfaces import ITopicModel
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.cluster import KMeans
 from sklearn.metrics import silhouette_score, adjusted_rand_score
-from sentence_transformers.util import cos_sim
 from external_systems import SSEMEmbedder
+from .topic_model_artifact import TopicModelArtifact
+from .embedding_utils import parse_embeddings
 
 class TopicModel(ITopicModel):
-    def __init__(self, embeddings, texts, n_topics, num_keywords, max_iter, model, output_subfolder):
+    def __init__(self, embeddings, texts, n_topics, num_keywords, max_iter, model, output_subfolder, reducer=None):
         """
         Initialize the TopicModel class.
 
         Args:
-            embeddings (list): List of precomputed embeddings for the text data.
+            embeddings (list or np.ndarray): Precomputed embeddings for the text data. A 2-D float32 matrix,
+                such as a read-only memory-mapped view, is used without copying; float16 and quantized int8
+                embeddings are converted to float32.
             texts (list): List of textual data for topic modeling.
             n_topics (int): Number of topics to extract.
             num_keywords (int): Number of top keywords per topic.
             max_iter (int): Maximum number of iterations for the KMeans algorithm.
             model (str): Pretrained model to use for generating embeddings.
             output_subfolder (str): Directory to save the output files.
+            reducer (EmbeddingReducer): Optional dimensionality reduction applied before clustering.
+                Silhouette, stability and the saved model then all work in the reduced space.
         """
         self.embeddings = embeddings
         self.texts = texts
@@ -31,7 +36,11 @@ class TopicModel(ITopicModel):
         self.model = model
         self.kmeans = KMeans(n_clusters=n_topics, max_iter=max_iter, random_state=42)
         self.embedder = SSEMEmbedder(model)
+        self.reducer = reducer
         self.desc_embeddings = []
+        self.tfidf_vectorizer = None
+        self.keyword_embedding_cache = {}
+        self.artifact_folder = None
         os.makedirs(self.output_subfolder, exist_ok=True)
 
     def fit_model(self):
@@ -39,11 +48,12 @@ class TopicModel(ITopicModel):
         Fit the KMeans clustering model to the embeddings.
 
         Processes the input embeddings and fits the KMeans clustering model to 
-        group the data into the specified number of topics.
+        group the data into the specified number of topics. If a reducer is set, the
+        embeddings are reduced first (reusing a cached reduction when available).
         """
-        for desc_embedding in self.embeddings:
-            desc_embedding = np.array(eval(desc_embedding), dtype=np.float32)
-            self.desc_embeddings.append(desc_embedding)
+        self.desc_embeddings = parse_embeddings(self.embeddings)
+        if self.reducer is not None:
+            self.desc_embeddings = self.reducer.fit_transform(self.desc_embeddings)
 
         self.kmeans.fit(self.desc_embeddings)
         self.labels = self.kmeans.labels_
@@ -62,6 +72,7 @@ class TopicModel(ITopicModel):
         """
         tfidf_vectorizer = TfidfVectorizer(stop_words='english')
         tfidf_matrix = tfidf_vectorizer.fit_transform(texts)
+        self.tfidf_vectorizer = tfidf_vectorizer
         
         keywords = {}
         for i in range(self.n_topics):
@@ -140,6 +151,10 @@ class TopicModel(ITopicModel):
         """
         Calculate the diversity of topics based on the top keywords.
 
+        The union of all topic keywords is embedded once (words already embedded in
+        an earlier call are taken from the cache), normalized into a single matrix, and
+        each topic's mean pairwise cosine distance is computed by indexing into it.
+
         Args:
             keywords (dict): Dictionary of top keywords for each topic.
             embedder (SSEMEmbedder): Embedder to generate word embeddings.
@@ -148,16 +163,48 @@ class TopicModel(ITopicModel):
         Returns:
             float: Average diversity score across all topics.
         """
+        topic_words = [list(words)[:num_keywords] for words in keywords.values()]
+        vocabulary = list(dict.fromkeys(word for words in topic_words for word in words))
+
+        missing_words = [word for word in vocabulary if word not in self.keyword_embedding_cache]
+        if missing_words:
+            new_embeddings = np.asarray(embedder.generate_embeddings(missing_words), dtype=np.float32)
+            self.keyword_embedding_cache.update(zip(missing_words, new_embeddings))
+
+        word_index = {word: idx for idx, word in enumerate(vocabulary)}
+        word_matrix = np.vstack([self.keyword_embedding_cache[word] for word in vocabulary])
+        norms = np.linalg.norm(word_matrix, axis=1, keepdims=True)
+        word_matrix = word_matrix / np.where(norms == 0, 1.0, norms)
+
         diversity_scores = []
-        for topic, words in keywords.items():
-            word_embeddings = embedder.generate_embeddings(words.tolist())
-            cosine_similarities = cos_sim(word_embeddings, word_embeddings)
-            if not isinstance(cosine_similarities, np.ndarray):
-                cosine_similarities = cosine_similarities.detach().cpu().numpy()
+        for words in topic_words:
+            if len(words) < 2:
+                continue
+            topic_matrix = word_matrix[[word_index[word] for word in words]]
+            cosine_similarities = topic_matrix @ topic_matrix.T
             upper_triangle_indices = np.triu_indices_from(cosine_similarities, k=1)
             pairwise_distances = 1 - cosine_similarities[upper_triangle_indices]
             diversity_scores.append(np.mean(pairwise_distances))
-        return round(np.mean(diversity_scores), 2)
+        return round(np.mean(diversity_scores), 2) if diversity_scores else 0.0
+
+    def calculate_unique_word_diversity(self, keywords, num_keywords=None):
+        """
+        Calculate the corpus-level topic diversity as the ratio of unique keywords.
+
+        This is the share of distinct words among the top keywords of all topics. It
+        needs no embedding model: 1.0 means no keyword is shared between topics.
+
+        Args:
+            keywords (dict): Dictionary of top keywords for each topic.
+            num_keywords (int): Number of top keywords per topic to consider (all if None).
+
+        Returns:
+            float: Ratio of unique keywords to total keywords.
+        """
+        all_words = [word for words in keywords.values() for word in list(words)[:num_keywords]]
+        if not all_words:
+            return 0.0
+        return round(len(set(all_words)) / len(all_words), 2)
 
     def calculate_topic_percentages(self):
         """
@@ -170,12 +217,47 @@ class TopicModel(ITopicModel):
         total_documents = len(self.labels)
         return {i: round((count / total_documents) * 100, 2) for i, count in enumerate(topic_counts)}
     
+    def save_model(self, keywords, folder=None):
+        """
+        Persist the fitted model so new postings can be labelled without refitting.
+
+        Saves the KMeans centroids, the TF-IDF vocabulary and idf weights, the topic
+        keywords and the training assignment distances (used as the drift reference).
+
+        Args:
+            keywords (dict): Dictionary of top keywords for each topic.
+            folder (str): Target directory. Defaults to 'topic_model' inside the output subfolder.
+
+        Returns:
+            str: The folder the artifact was written to.
+        """
+        folder = folder or os.path.join(self.output_subfolder, "topic_model")
+        distances = self.kmeans.transform(np.asarray(self.desc_embeddings, dtype=np.float32)).min(axis=1)
+
+        vocabulary, idf = None, None
+        if self.tfidf_vectorizer is not None:
+            vocabulary = self.tfidf_vectorizer.vocabulary_
+            idf = self.tfidf_vectorizer.idf_
+
+        artifact = TopicModelArtifact(
+            centroids=self.kmeans.cluster_centers_,
+            keywords={int(topic): list(words) for topic, words in keywords.items()},
+            vocabulary=vocabulary,
+            idf=idf,
+            reference_distances=distances,
+            embedding_model=self.model,
+            reducer=self.reducer,
+        )
+        self.artifact_folder = artifact.save(folder)
+        return self.artifact_folder
+
     def execute_topic_modeling(self):
         """
         Execute the topic modeling process, save topics and metrics to files, and print the results.
 
         Saves the topics to a JSON file and metrics to another JSON file. Calculates various metrics 
         including silhouette score, inertia, ARI, clustering stability, topic diversity, and topic percentages.
+        The fitted model is persisted as a TopicModelArtifact in the 'topic_model' subfolder.
         """
         keywords = self.extract_keywords(self.texts, self.labels, num_keywords=self.num_keywords)
         topics_file = os.path.join(self.output_subfolder, "topics.json")
@@ -192,6 +274,7 @@ class TopicModel(ITopicModel):
         ari_score = round(float(self.calculate_ari(self.labels, self.labels)), 2)
         stability_score = round(float(self.evaluate_clustering_stability(self.desc_embeddings, n_clusters=self.n_topics)), 2)
         diversity_score = round(float(self.calculate_topic_diversity(keywords, self.embedder, num_keywords=self.num_keywords)), 2)
+        unique_word_diversity = round(float(self.calculate_unique_word_diversity(keywords, num_keywords=self.num_keywords)), 2)
         topic_percentages = {int(topic): round(float(percentage), 2) for topic, percentage in self.calculate_topic_percentages().items()}
 
         metrics_data = {
@@ -200,13 +283,17 @@ class TopicModel(ITopicModel):
             "adjusted_rand_index": ari_score,
             "clustering_stability": stability_score,
             "topic_diversity_score": diversity_score,
+            "unique_word_diversity": unique_word_diversity,
             "topic_percentages": topic_percentages
         }
         with open(metrics_file, "w") as f:
             json.dump(metrics_data, f, indent=4)
 
+        self.save_model(keywords)
+
         print(f"Topics saved to: {topics_file}")
         print(f"Metrics saved to: {metrics_file}")
+        print(f"Topic model saved to: {self.artifact_folder}")
 
         desc_embeddings = self.desc_embeddings
         return metrics_data, keywords, desc_embeddings
\ No newline at end of file
@@ -1,16 +1,40 @@
 import os
+import multiprocessing
 import matplotlib.pyplot as plt
 from wordcloud import WordCloud
 import math
 
 import subprocess
+from concurrent.futures import ProcessPoolExecutor
 from interfaces import ITopicModelVisualizer
+from .wordcloud_layouts import render_wordcloud, use_agg_backend, TOPICS_PER_IMAGE
 from datetime import datetime
 from docx import Document
 
+def wordcloud_image(words, cache_folder=None, width=800, height=400, background_color='white'):
+    """
+    Render the word cloud of a keyword list, reusing the layout cached for the same words.
+
+    The keywords are counted the way `WordCloud.generate` does, and the cloud is drawn by
+    `render_wordcloud` from the cached layout of these counts.
+
+    Args:
+        words (list): Keywords of the topic, in order.
+        cache_folder (str): Folder of the cached layouts; None renders without caching.
+        width (int): Width of the image in pixels.
+        height (int): Height of the image in pixels.
+        background_color (str): Background color of the image.
+
+    Returns:
+        np.ndarray: RGB image of shape (height, width, 3).
+    """
+    frequencies = WordCloud().process_text(' '.join(str(word) for word in words))
+    return render_wordcloud(frequencies, cache_folder, width, height, background_color)
+
 class TopicModelVisualizer(ITopicModelVisualizer):
 
-    def __init__(self, model, output_subfolder, experiment_file):
+    def __init__(self, model, output_subfolder, experiment_file, max_workers=1, combined_metrics=False,
+                 wordcloud_cache_folder=None):
         """
         Initializes the TopicModelVisualizer with the provided model, output folder, and experiment file.
 
@@ -18,10 +42,23 @@ class TopicModelVisualizer(ITopicModelVisualizer):
             model: The topic modeling algorithm or object to be visualized.
             output_subfolder (str): The folder where the generated visualizations and reports will be saved.
             experiment_file (str): The file containing the experiment details or configuration.
+            max_workers (int): Number of processes rendering figures in `create_all_visualizations`;
+                1 renders them one after the other.
+            combined_metrics (bool): Plot the metric scores in one panel instead of one bar chart each.
+            wordcloud_cache_folder (str): Folder caching the word cloud layouts (optional).
         """
         self.model = model
         self.output_subfolder = output_subfolder
         self.experiment_file = experiment_file
+        self.max_workers = max_workers
+        self.combined_metrics = combined_metrics
+        self.wordcloud_cache_folder = wordcloud_cache_folder
+
+    def __getstate__(self):
+        # Figures are rendered from plain values, so worker processes get the visualizer without the model
+        state = self.__dict__.copy()
+        state['model'] = None
+        return state
     
     def plot_inertia_graph(self, inertia_value):
         """
@@ -69,43 +106,89 @@ class TopicModelVisualizer(ITopicModelVisualizer):
         Args:
             keywords (dict): Dictionary of top keywords for each topic.
         """
-        n_topics = len(keywords)
-        topics_per_image = 20  # Number of topics per image
-        n_images = math.ceil(n_topics / topics_per_image)
+        for img_idx, topics_subset in enumerate(self.wordcloud_grids(keywords)):
+            self.create_wordcloud_grid(img_idx, topics_subset)
+
+    def wordcloud_grids(self, keywords):
+        """
+        Split the topics into the groups shown together in one word cloud image.
+
+        Args:
+            keywords (dict): Dictionary of top keywords for each topic.
+
+        Returns:
+            list: One list of (topic, words) pairs per image.
+        """
+        items = list(keywords.items())
+        n_images = math.ceil(len(items) / TOPICS_PER_IMAGE)
+        return [items[i * TOPICS_PER_IMAGE:(i + 1) * TOPICS_PER_IMAGE] for i in range(n_images)]
+
+    def create_wordcloud_grid(self, img_idx, topics_subset):
+        """
+        Creates and saves one image with the word clouds of a group of topics.
+
+        Args:
+            img_idx (int): Index of the image, used in its file name.
+            topics_subset (list): (topic, words) pairs shown in the image.
+
+        Returns:
+            str: Path of the saved image.
+        """
+        # Create a figure to display the word clouds
+        n_cols = 5  # Number of columns for the grid layout
+        n_rows = math.ceil(len(topics_subset) / n_cols)
 
-        for img_idx in range(n_images):
-            # Determine the range of topics for this image
-            start_idx = img_idx * topics_per_image
-            end_idx = min(start_idx + topics_per_image, n_topics)
-            topics_subset = list(keywords.items())[start_idx:end_idx]
+        fig, axes = plt.subplots(n_rows, n_cols, figsize=(20, 4 * n_rows))
+        axes = axes.flatten()  # Flatten axes for easy indexing
 
-            # Create a figure to display the word clouds
-            n_cols = 5  # Number of columns for the grid layout
-            n_rows = math.ceil(len(topics_subset) / n_cols)
+        for i, (topic, words) in enumerate(topics_subset):
+            # Generate the word cloud, reusing the layout of the same keywords
+            wordcloud = wordcloud_image(words, self.wordcloud_cache_folder)
 
-            fig, axes = plt.subplots(n_rows, n_cols, figsize=(20, 4 * n_rows))
-            axes = axes.flatten()  # Flatten axes for easy indexing
+            # Display the word cloud in the subplot
+            axes[i].imshow(wordcloud, interpolation='bilinear')
+            axes[i].set_title(f"Topic {topic}", fontsize=14)
+            axes[i].axis('off')
 
-            for i, (topic, words) in enumerate(topics_subset):
-                # Generate the word cloud
-                wordcloud = WordCloud(width=800, height=400, background_color='white').generate(' '.join(words))
+        # Turn off any remaining empty subplots
+        for j in range(len(topics_subset), len(axes)):
+            axes[j].axis('off')
 
-                # Display the word cloud in the subplot
-                axes[i].imshow(wordcloud, interpolation='bilinear')
-                axes[i].set_title(f"Topic {topic}", fontsize=14)
-                axes[i].axis('off')
+        # Save the figure to the output folder
+        wordcloud_file = os.path.join(self.output_subfolder, f"wordclouds_part_{img_idx + 1}.png")
+        plt.tight_layout()
+        plt.savefig(wordcloud_file, dpi=300)
+        plt.close(fig)
+
+        print(f"Wordclouds saved to: {wordcloud_file}")
+        return wordcloud_file
 
-            # Turn off any remaining empty subplots
-            for j in range(len(topics_subset), len(axes)):
-                axes[j].axis('off')
+    def plot_metrics_panel(self, metrics):
+        """
+        Creates and saves one panel with a bar per metric, replacing the single-bar charts.
 
-            # Save the figure to the output folder
-            wordcloud_file = os.path.join(self.output_subfolder, f"wordclouds_part_{img_idx + 1}.png")
-            plt.tight_layout()
-            plt.savefig(wordcloud_file, dpi=300)
-            plt.close()
+        Every metric gets its own axis, since the scores have different ranges (e.g. inertia
+        and the silhouette score).
 
-            print(f"Wordclouds saved to: {wordcloud_file}")
+        Args:
+            metrics (dict): Metric names mapped to their values, in display order.
+
+        Returns:
+            str: Path of the saved panel.
+        """
+        colors = ['orange', 'purple', 'green', 'blue', 'red']
+        fig, axes = plt.subplots(1, len(metrics), figsize=(4 * len(metrics), 5), squeeze=False)
+        for i, (ax, (name, value)) in enumerate(zip(axes[0], metrics.items())):
+            ax.bar([name], [value], color=colors[i % len(colors)])
+            ax.set_title(name, fontsize=12)
+            ax.grid(axis='y', linestyle='--', alpha=0.7)
+        fig.suptitle("Topic Model Metrics", fontsize=14)
+        fig.tight_layout()
+        graph_path = os.path.join(self.output_subfolder, "metrics_panel.png")
+        fig.savefig(graph_path)
+        plt.close(fig)
+        print(f"Metrics panel saved to: {graph_path}")
+        return graph_path
 
     def visualize_topic_diversity(self, topic_diversity):
         """
@@ -195,6 +278,7 @@ class TopicModelVisualizer(ITopicModelVisualizer):
         plt.tight_layout()
         output_path = os.path.join(self.output_subfolder, 'topic_percentage_chart.png')
         plt.savefig(output_path)
+        plt.close()
         
         print(f"Topic percentage chart saved to {output_path}")
 
@@ -274,6 +358,10 @@ class TopicModelVisualizer(ITopicModelVisualizer):
         """
         Generates and saves all visualizations and then creates a report with the results.
 
+        The figures are independent of each other, so with max_workers > 1 and more than one
+        word cloud image they are rendered in a pool of worker processes. With
+        combined_metrics, the five single-bar metric charts are replaced by one metrics panel.
+
         Args:
             topic_diversity (float): The topic diversity score.
             silhouette_score (float): The silhouette score.
@@ -283,13 +371,42 @@ class TopicModelVisualizer(ITopicModelVisualizer):
             ari_score (float): The Adjusted Rand Index (ARI) score.
             keywords (dict): Dictionary of top keywords for each topic.
         """
-        self.visualize_silhouette_score(silhouette_score)
-        self.visualize_clustering_stability(clustering_stability)
-        self.plot_topic_percentage(topic_percentages)
-        self.create_wordclouds(keywords)
-        self.visualize_topic_diversity(topic_diversity)
-        self.plot_inertia_graph(inertia)
-        self.plot_ari_graph(ari_score)
+        if self.combined_metrics:
+            tasks = [(self.plot_metrics_panel, {
+                'Silhouette Score': silhouette_score,
+                'Clustering Stability': clustering_stability,
+                'Diversity Score': topic_diversity,
+                'Inertia': inertia,
+                'ARI': ari_score,
+            })]
+        else:
+            tasks = [
+                (self.visualize_silhouette_score, silhouette_score),
+                (self.visualize_clustering_stability, clustering_stability),
+                (self.visualize_topic_diversity, topic_diversity),
+                (self.plot_inertia_graph, inertia),
+                (self.plot_ari_graph, ari_score),
+            ]
+        tasks.append((self.plot_topic_percentage, topic_percentages))
+
+        # The word cloud images take longest, so they are submitted first
+        grids = self.wordcloud_grids(keywords)
+        tasks = [(self.create_wordcloud_grid, img_idx, topics_subset)
+                 for img_idx, topics_subset in enumerate(grids)] + tasks
+
+        # Starting workers costs more than the bar charts take, so the pool is only used
+        # once there are several word cloud images to share out over several CPUs
+        n_workers = min(self.max_workers, len(tasks), os.cpu_count() or 1)
+        if n_workers > 1 and len(grids) > 1:
+            with ProcessPoolExecutor(max_workers=n_workers,
+                                     mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=use_agg_backend) as pool:
+                futures = [pool.submit(*task) for task in tasks]
+                for future in futures:
+                    future.result()
+        else:
+            for function, *args in tasks:
+                function(*args)
 
         # Generate the final report
         self.generate_report(topic_diversity, silhouette_score, clustering_stability, topic_percentages)
\ No newline at end of file
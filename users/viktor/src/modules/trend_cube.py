@@ -0,0 +1,283 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from interfaces import ITrendCube
+
+# Number of embedding rows hashed at a time by TrendCube.rows_fingerprint
+FINGERPRINT_BLOCK_ROWS = 65536
+
+class TrendCube(ITrendCube):
+    """
+    Materialized period x topic x measure aggregate shared by the time-series plots.
+
+    The cube is computed once from the per-posting feature scores and stored as a tidy
+    table with the columns 'granularity', 'period', 'topic', 'measure' and 'value':
+
+        - granularity 'month': measures 'sum' (summed feature scores) and 'count'
+          (number of postings) per calendar month.
+        - granularity 'semiannual': measures 'sum' and 'percent' per 6-month period, as
+          shown by the box plots and the semiannual stacked bar plot.
+
+    The cube is persisted as Parquet, so re-plotting with a different style or ordering
+    reads the aggregates instead of the raw postings. Because the monthly
+    sums and counts are partial sums, a cube for newly appended postings can be merged into
+    an existing cube without touching the rows that were already aggregated.
+
+    Attributes:
+        table (pd.DataFrame): The tidy aggregate table.
+        role_columns (list): Topic names in plotting order.
+        metadata (dict): Dataset version information saved next to the cube.
+    """
+
+    COLUMNS = ['granularity', 'period', 'topic', 'measure', 'value']
+
+    def __init__(self, table, role_columns=None, metadata=None):
+        """
+        Initialize the TrendCube.
+
+        Args:
+            table (pd.DataFrame): Tidy aggregate table with the columns in COLUMNS.
+            role_columns (list): Topic names in plotting order; defaults to the order in the table.
+            metadata (dict): Dataset version information (optional).
+        """
+        self.table = table[self.COLUMNS].reset_index(drop=True)
+        self.role_columns = list(role_columns) if role_columns is not None else list(dict.fromkeys(table['topic']))
+        self.metadata = dict(metadata or {})
+
+    @staticmethod
+    def cache_key(project_name, dataset_name, keyword_file, temperature, date_range=None):
+        """
+        Identify a cube by its dataset, keyword file, softmax temperature and date range.
+
+        The dataset is identified by its project and name in the registry, not by its files:
+        the registry links the files of every upload to content-addressed storage, so an
+        upload that appends postings has new files but keeps the cube. The keyword file is
+        identified by its contents.
+
+        Args:
+            project_name (str): Project the dataset belongs to.
+            dataset_name (str): Name of the dataset in the project.
+            keyword_file (str): Path of the keyword JSON file.
+            temperature (float): Softmax temperature used for feature extraction.
+            date_range (tuple): (start, end) the postings were restricted to, or None.
+
+        Returns:
+            str: Hex digest identifying the cube.
+        """
+        digest = hashlib.sha1(repr(float(temperature)).encode())
+        if date_range is not None:
+            bounds = [None if bound is None else str(pd.Timestamp(bound)) for bound in date_range]
+            digest.update(repr(bounds).encode())
+        digest.update(repr((project_name, dataset_name)).encode())
+        with open(keyword_file, 'rb') as f:
+            digest.update(f.read())
+        return digest.hexdigest()
+
+    @staticmethod
+    def dataset_version(dataset_files):
+        """
+        Identify the current version of the dataset files by size and modification time.
+
+        Args:
+            dataset_files (list): Paths of the dataset and embeddings files.
+
+        Returns:
+            str: Hex digest that changes whenever one of the files changes.
+        """
+        digest = hashlib.sha1()
+        for path in dataset_files:
+            stat = os.stat(path)
+            digest.update(f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+        return digest.hexdigest()
+
+    @staticmethod
+    def rows_fingerprint(df, embeddings=None, block_size=FINGERPRINT_BLOCK_ROWS):
+        """
+        Hash the contents of a block of postings.
+
+        Used to check that the rows aggregated earlier are still the leading rows of the
+        dataset, so only the appended rows need to be processed. Every input of the feature
+        extraction is hashed: the posting columns and, row by row, their embeddings. The
+        embeddings are read in blocks, so a memory-mapped matrix is not loaded at once.
+
+        Args:
+            df (pd.DataFrame): Postings to hash.
+            embeddings (np.ndarray): Embedding matrix aligned row by row with df (optional).
+            block_size (int): Number of embedding rows hashed at a time.
+
+        Returns:
+            str: Hex digest of the rows.
+        """
+        digest = hashlib.sha1(str(len(df)).encode())
+        digest.update(pd.util.hash_pandas_object(df, index=False).to_numpy().tobytes())
+        if embeddings is not None:
+            if len(embeddings) != len(df):
+                raise ValueError("The embeddings must be aligned row by row with the postings.")
+            for start in range(0, len(df), block_size):
+                digest.update(np.ascontiguousarray(embeddings[start:start + block_size]).tobytes())
+        return digest.hexdigest()
+
+    @staticmethod
+    def _tidy(wide, granularity, measure):
+        tidy = wide.rename_axis(index='period', columns='topic').stack().rename('value').reset_index()
+        tidy['granularity'] = granularity
+        tidy['measure'] = measure
+        return tidy
+
+    @classmethod
+    def _from_monthly(cls, monthly_sums, monthly_counts, role_columns):
+        # The single place where the semiannual resampling and normalization happen
+        semiannual_sums = monthly_sums[role_columns].resample('6ME').sum()
+        semiannual_percent = semiannual_sums.div(semiannual_sums.sum(axis=1), axis=0) * 100
+
+        parts = [
+            cls._tidy(monthly_sums[role_columns], 'month', 'sum'),
+            cls._tidy(semiannual_sums, 'semiannual', 'sum'),
+            cls._tidy(semiannual_percent, 'semiannual', 'percent'),
+        ]
+        if monthly_counts is not None:
+            counts = pd.DataFrame({topic: monthly_counts for topic in role_columns}, index=monthly_counts.index)
+            parts.append(cls._tidy(counts.astype(float), 'month', 'count'))
+        table = pd.concat(parts, ignore_index=True)
+        table['value'] = table['value'].astype(float)
+        return cls(table, role_columns)
+
+    @classmethod
+    def from_features(cls, df_features, role_columns, time_column='original_listed_time'):
+        """
+        Aggregate per-posting feature scores into a cube.
+
+        Args:
+            df_features (pd.DataFrame): One row per posting with a score column per topic.
+            role_columns (list): Topic score columns.
+            time_column (str): Column with the posting date.
+
+        Returns:
+            TrendCube: The aggregated cube.
+        """
+        listed_time = pd.to_datetime(df_features[time_column], errors='coerce')
+        if listed_time.isnull().all():
+            raise ValueError(f"All '{time_column}' values are invalid or missing.")
+
+        year_month = listed_time.dt.to_period('M').dt.to_timestamp()
+        grouped = df_features[role_columns].groupby(year_month.rename('year_month'))
+        return cls._from_monthly(grouped.sum(), grouped.size(), role_columns)
+
+    @classmethod
+    def from_trends(cls, trend_df, monthly_trend_df, role_columns):
+        """
+        Build a cube from the legacy trend tables.
+
+        Months without a row in monthly_trend_df are left out, as in the previous merge.
+
+        Args:
+            trend_df (pd.DataFrame): Summed scores per 'year_month'.
+            monthly_trend_df (pd.DataFrame): Mean scores per calendar 'month'.
+            role_columns (list): Topic score columns.
+
+        Returns:
+            TrendCube: The aggregated cube without posting counts.
+        """
+        months = pd.to_datetime(trend_df['year_month']).dt.month
+        kept = months.isin(monthly_trend_df['month'].astype(int))
+        monthly_sums = trend_df.loc[kept, role_columns].set_index(pd.DatetimeIndex(pd.to_datetime(trend_df.loc[kept, 'year_month']), name='year_month'))
+        return cls._from_monthly(monthly_sums, None, role_columns)
+
+    def merge(self, other):
+        """
+        Add the monthly partial sums of another cube, e.g. one built from new postings.
+
+        Args:
+            other (TrendCube): Cube with the same topics and posting counts.
+
+        Returns:
+            TrendCube: A new cube covering both inputs, carrying this cube's metadata.
+        """
+        if set(other.role_columns) != set(self.role_columns):
+            raise ValueError("Only cubes with the same topics can be merged.")
+        sums = self.select('month', 'sum').add(other.select('month', 'sum')[self.role_columns], fill_value=0)
+        counts = self.select('month', 'count').add(other.select('month', 'count')[self.role_columns], fill_value=0)
+        merged = self._from_monthly(sums.sort_index(), counts.sort_index().iloc[:, 0], self.role_columns)
+        merged.metadata = dict(self.metadata)
+        return merged
+
+    def select(self, granularity, measure):
+        """
+        Select one slice of the cube as a wide table.
+
+        Args:
+            granularity (str): 'month' or 'semiannual'.
+            measure (str): Measure name, e.g. 'sum', 'count' or 'percent'.
+
+        Returns:
+            pd.DataFrame: Values indexed by period with one column per topic.
+        """
+        rows = self.table[(self.table['granularity'] == granularity) & (self.table['measure'] == measure)]
+        if rows.empty:
+            raise KeyError(f"The cube has no '{measure}' values at '{granularity}' granularity.")
+        wide = rows.pivot(index='period', columns='topic', values='value')[self.role_columns]
+        wide.columns.name = None
+        wide.index = pd.DatetimeIndex(wide.index, name='year_month')
+        return wide
+
+    def semiannual_percentages(self):
+        """Percentage of the summed scores per topic in each 6-month period."""
+        return self.select('semiannual', 'percent')
+
+    def trend_df(self):
+        """Summed scores per month, in the layout of the former `trend_df`."""
+        return self.select('month', 'sum').reset_index()
+
+    def monthly_trend_df(self):
+        """Mean score per calendar month, in the layout of the former `monthly_trend_df`."""
+        sums = self.select('month', 'sum')
+        counts = self.select('month', 'count')
+        calendar_month = sums.index.month
+        monthly = sums.groupby(calendar_month).sum() / counts.groupby(calendar_month).sum()
+        monthly = monthly.rename_axis('month').reset_index()
+        monthly['month'] = monthly['month'].astype('category')
+        return monthly
+
+    def save(self, path):
+        """
+        Save the cube as a Parquet file.
+
+        Args:
+            path (str): Target file path.
+
+        Returns:
+            str: The path written to.
+        """
+        table = self.table.copy()
+        table['topic'] = pd.Categorical(table['topic'], categories=self.role_columns)
+        table.to_parquet(path, index=False)
+        with open(self.metadata_path(path), 'w') as f:
+            json.dump(self.metadata, f, indent=4)
+        return path
+
+    @staticmethod
+    def metadata_path(path):
+        """Path of the JSON file holding the metadata of the cube saved at `path`."""
+        return os.path.splitext(path)[0] + '.json'
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load a cube previously written by `save`.
+
+        Args:
+            path (str): Path to the Parquet file.
+
+        Returns:
+            TrendCube: The loaded cube.
+        """
+        table = pd.read_parquet(path)
+        role_columns = list(table['topic'].cat.categories) if isinstance(table['topic'].dtype, pd.CategoricalDtype) else None
+        table['topic'] = table['topic'].astype(str)
+        metadata = {}
+        if os.path.isfile(cls.metadata_path(path)):
+            with open(cls.metadata_path(path), 'r') as f:
+                metadata = json.load(f)
+        return cls(table, role_columns, metadata)
@@ -0,0 +1,157 @@
+import os
+import hashlib
+import numpy as np
+from joblib import Parallel, delayed, effective_n_jobs
+from scipy.interpolate import make_smoothing_spline
+from sklearn.gaussian_process import GaussianProcessRegressor
+from sklearn.gaussian_process.kernels import RBF, ConstantKernel as C
+from interfaces import ITrendSmoother
+
+def _fit_gp(x, y, x_smooth, length_scale, alpha, n_restarts_optimizer, random_state):
+    """Fit one Gaussian process with optimized hyperparameters and predict on the smooth grid."""
+    kernel = C(1.0, (1e-3, 1e3)) * RBF(length_scale, (1e-2, 1e2))
+    gp = GaussianProcessRegressor(kernel=kernel, n_restarts_optimizer=n_restarts_optimizer, alpha=alpha,
+                                  random_state=random_state)
+    gp.fit(x.reshape(-1, 1), y)
+    return gp.predict(x_smooth.reshape(-1, 1))
+
+class TrendSmoother(ITrendSmoother):
+    """
+    Smooths keyword trend series that share the same x grid.
+
+    Supported methods:
+        - 'gp': one Gaussian process per series with optimized hyperparameters, fitted in
+          parallel with joblib. Matches the original per-keyword smoothing.
+        - 'gp_shared': a single Gaussian process with fixed hyperparameters fitted on all
+          series at once, so the kernel matrix is factorized only once.
+        - 'spline': closed-form penalized smoothing spline per series; the fastest option.
+
+    Smoothed curves are cached in memory and, if a cache folder is given, on disk, keyed by
+    a hash of the series values and the smoothing settings.
+
+    Attributes:
+        method (str): Default smoothing method.
+        n_jobs (int): Number of parallel jobs for the 'gp' method.
+        n_restarts_optimizer (int): Optimizer restarts per Gaussian process.
+        alpha (float): Noise level added to the kernel diagonal.
+        spline_lam (float): Smoothing penalty of the spline method; None selects it by GCV.
+        cache_folder (str): Folder for cached curves, or None for an in-memory cache only.
+    """
+
+    METHODS = ("gp", "gp_shared", "spline")
+
+    def __init__(self, method="gp", n_jobs=-1, n_restarts_optimizer=10, alpha=1e-2, spline_lam=None,
+                 cache_folder=None, random_state=0):
+        """
+        Initialize the TrendSmoother.
+
+        Args:
+            method (str): One of 'gp', 'gp_shared' or 'spline'.
+            n_jobs (int): Number of parallel jobs; -1 uses all CPUs.
+            n_restarts_optimizer (int): Optimizer restarts per Gaussian process.
+            alpha (float): Noise level added to the kernel diagonal.
+            spline_lam (float): Smoothing penalty of the spline method (optional).
+            cache_folder (str): Folder to cache smoothed curves in (optional).
+            random_state (int): Seed for the optimizer restarts.
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}, got '{method}'.")
+        self.method = method
+        self.n_jobs = n_jobs
+        self.n_restarts_optimizer = n_restarts_optimizer
+        self.alpha = alpha
+        self.spline_lam = spline_lam
+        self.cache_folder = cache_folder
+        self.random_state = random_state
+        self._cache = {}
+
+    def cache_key(self, y, method, length_scale, n_points):
+        """
+        Hash a series together with the settings that determine its smoothed curve.
+
+        Args:
+            y (np.ndarray): Series values.
+            method (str): Smoothing method.
+            length_scale (float): Initial RBF length scale.
+            n_points (int): Number of points on the smooth grid.
+
+        Returns:
+            str: Hex digest identifying the smoothed curve.
+        """
+        y = np.ascontiguousarray(y, dtype=np.float64)
+        settings = (method, length_scale, n_points, self.alpha, self.n_restarts_optimizer, self.spline_lam,
+                    self.random_state)
+        digest = hashlib.sha1(repr(settings).encode())
+        digest.update(y.data)
+        return digest.hexdigest()
+
+    def _cache_file(self, key):
+        return os.path.join(self.cache_folder, f"smoothed_{key[:16]}.npy")
+
+    def _load_cached(self, key):
+        if key in self._cache:
+            return self._cache[key]
+        if self.cache_folder is not None and os.path.isfile(self._cache_file(key)):
+            self._cache[key] = np.load(self._cache_file(key))
+            return self._cache[key]
+        return None
+
+    def _store_cached(self, key, curve):
+        self._cache[key] = curve
+        if self.cache_folder is not None:
+            os.makedirs(self.cache_folder, exist_ok=True)
+            np.save(self._cache_file(key), curve)
+
+    def _smooth_shared_gp(self, x, Y, x_smooth, length_scale):
+        # Fixed hyperparameters: one Cholesky factorization serves every column of Y
+        kernel = C(1.0, "fixed") * RBF(length_scale, "fixed")
+        gp = GaussianProcessRegressor(kernel=kernel, optimizer=None, alpha=self.alpha, normalize_y=True)
+        gp.fit(x.reshape(-1, 1), Y)
+        return gp.predict(x_smooth.reshape(-1, 1)).reshape(len(x_smooth), -1).T
+
+    def _smooth_spline(self, x, y, x_smooth):
+        if len(x) < 5:
+            return np.interp(x_smooth, x, y)
+        return make_smoothing_spline(x, y, lam=self.spline_lam)(x_smooth)
+
+    def smooth(self, trend_data, n_points=500, length_scale=10, method=None):
+        """
+        Smooth every column of a trend table on a shared dense grid.
+
+        Args:
+            trend_data (pd.DataFrame): One row per period and one column per series.
+            n_points (int): Number of points on the smooth grid.
+            length_scale (float): Initial (or, for 'gp_shared', fixed) RBF length scale.
+            method (str): Smoothing method for this run; defaults to the configured method.
+
+        Returns:
+            tuple: (x_smooth, curves) where x_smooth has shape (n_points,) and curves maps
+                each column name to its smoothed values.
+        """
+        method = method or self.method
+        if method not in self.METHODS:
+            raise ValueError(f"method must be one of {self.METHODS}, got '{method}'.")
+        x = np.arange(len(trend_data), dtype=float)
+        x_smooth = np.linspace(0, len(x) - 1, n_points)
+        values = trend_data.to_numpy(dtype=float)
+
+        keys = [self.cache_key(values[:, i], method, length_scale, n_points) for i in range(values.shape[1])]
+        curves = [self._load_cached(key) for key in keys]
+        missing = [i for i, curve in enumerate(curves) if curve is None]
+
+        if missing:
+            if method == "gp":
+                # One process per series at most, and never more than the CPUs (-1) or n_jobs allow
+                fitted = Parallel(n_jobs=min(effective_n_jobs(self.n_jobs), len(missing)))(
+                    delayed(_fit_gp)(x, values[:, i], x_smooth, length_scale, self.alpha,
+                                     self.n_restarts_optimizer, self.random_state)
+                    for i in missing)
+            elif method == "gp_shared":
+                fitted = list(self._smooth_shared_gp(x, values[:, missing], x_smooth, length_scale))
+            else:
+                fitted = [self._smooth_spline(x, values[:, i], x_smooth) for i in missing]
+            for i, curve in zip(missing, fitted):
+                curves[i] = np.asarray(curve, dtype=float)
+                self._store_cached(keys[i], curves[i])
+
+        return x_smooth, dict(zip(trend_data.columns, curves))
@@ -1,18 +1,17 @@
 from interfaces import IWord2VecEmbeddingTrendAnalysis
 import pandas as pd
 import numpy as np
-import re
 import json
 import os
-from nltk.stem import WordNetLemmatizer
 from gensim.models import Word2Vec
-from sklearn.gaussian_process import GaussianProcessRegressor
-from sklearn.gaussian_process.kernels import RBF, ConstantKernel as C
 import matplotlib.pyplot as plt
 import matplotlib.ticker as mtick
 from collections import defaultdict
-from nltk.util import ngrams
 import ruptures as rpt
+from .word2vec_preprocessing import Word2VecPreprocessor
+from .trend_smoother import TrendSmoother
+from .keyword_trend_tracker import KeywordTrendTracker
+from .time_partitions import in_date_range
 
 class Word2Vec_Embedding_Analysis(IWord2VecEmbeddingTrendAnalysis):
     """
@@ -20,42 +19,164 @@ class Word2Vec_Embedding_Analysis(IWord2VecEmbeddingTrendAnalysis):
     and visualizing keyword trends over time using various techniques like Gaussian process regression and rupture detection.
     """
 
-    def __init__(self, input_file, output_subfolder, keywords_list_file, stopwords_list):
+    MODEL_FILE = 'word2vec_model'
+    CORPUS_FILE = 'word2vec_corpus.txt'
+    # Job descriptions tokenized at a time while writing the training corpus
+    CHUNK_SIZE = 50000
+    VERSIONS_FILE = 'word2vec_model_versions.json'
+
+    # Default keyword dictionary tracked by the trend plots, grouped under the label they are plotted as
+    DEFAULT_DICTIONARY = 'Marketing Related'
+    TRACKED_KEYWORDS = {
+        "digital_marketing": ["digital_marketing"],
+        "media": ["media", "social_media", "digital_media"],
+        "advertiser": ["advertiser", "advertisers"],
+        "brand_management": ["brand_management"],
+        "social_media": ["social_media"],
+        "advertising": ["advertisement", "advertising", "marketing", "marketing_campaigns", "marketing_campaign",
+                        "ads", "advertisement_campaign"],
+        "pr": ["pr"],
+        "digital_media": ["digital_media"],
+        "content": ["content"],
+        "customer_engagement": ["customer_engagement"],
+        "brand": ["brands", "branding"],
+        "branding": ["branding"],
+        "market_research": ["market_research"],
+        "marketing_analytics": ["marketing_analytics"]
+    }
+
+    def __init__(self, input_file, output_subfolder, keywords_list_file, stopwords_list, n_jobs=1, cache_folder=None,
+                 smoother=None, trend_dictionaries=None, date_range=None, normalize_tokens=False):
         """
         Initializes the Word2Vec_Embedding_Analysis object with input data, output folder, keywords list, and stopwords.
 
+        The descriptions are tokenized when the keyword trends are first computed. Those tokens are
+        cached on disk, so re-instantiating the class for the same input file, stopwords and keywords
+        skips preprocessing. Training streams its own corpus from the input file instead.
+
         Args:
             input_file (str): Path to the CSV file containing job descriptions.
             output_subfolder (str): Directory where the output files and plots will be saved.
-            keywords_list_file (str): Path to the JSON file containing the list of job keywords.
-            stopwords_list (list): List of stopwords to remove during text processing.
+            keywords_list_file (str): Path to the JSON file containing the list of job keywords (optional).
+            stopwords_list (list): List of stopwords to remove during text processing with normalize_tokens.
+            n_jobs (int): Number of processes used for preprocessing and trend smoothing; -1 uses all CPUs.
+            cache_folder (str): Folder for the tokenized-text cache; defaults to
+                '<output_subfolder>/token_cache'.
+            smoother (TrendSmoother): Smoother for the trend plots; defaults to Gaussian-process
+                smoothing cached in '<output_subfolder>/smoothing_cache'.
+            trend_dictionaries (dict): Keyword dictionaries to track, mapping dictionary names to
+                {keyword: [terms]} dicts (see `load_keyword_dictionaries`); defaults to TRACKED_KEYWORDS.
+            date_range (tuple): (start, end) restricting the job descriptions to start <= 'CreatedAt' < end;
+                either bound may be None. Descriptions outside the range are skipped while reading.
+            normalize_tokens (bool): Remove stopwords and lemmatize the tokens before training and
+                counting keywords; by default the cleaned tokens are used as they are.
         """
         self.input_file = input_file
         self.output_subfolder = output_subfolder
+        self.date_range = date_range
 
         os.makedirs(self.output_subfolder, exist_ok=True)
 
         # Load the keyword list
-        with open(keywords_list_file, 'r') as file:
-            self.job_keywords = json.load(file)
+        self.job_keywords = []
+        if keywords_list_file is not None:
+            with open(keywords_list_file, 'r') as file:
+                self.job_keywords = json.load(file)
         self.job_keywords = [keyword.replace(" ", "_") for keyword in self.job_keywords]
 
         # Initialize trend data and stop words
         self.trends = defaultdict(list)
         self.stop_words = stopwords_list
-        self.lemmatizer = WordNetLemmatizer()
+        self.trend_dictionaries = trend_dictionaries or {self.DEFAULT_DICTIONARY: self.TRACKED_KEYWORDS}
+
+        # Multi-word trend terms must be joined during tokenization to be countable
+        trend_phrases = [term.lower().replace(" ", "_") for keyword_dict in self.trend_dictionaries.values()
+                         for terms in keyword_dict.values() for term in terms if " " in term or "_" in term]
+        self.preprocessor = Word2VecPreprocessor(
+            self.stop_words, list(dict.fromkeys(self.job_keywords + trend_phrases)), n_jobs=n_jobs,
+            cache_folder=cache_folder or os.path.join(self.output_subfolder, 'token_cache'),
+            normalize=normalize_tokens)
+        self.trend_tracker = KeywordTrendTracker(self.trend_dictionaries, normalize_term=self.preprocessor.normalize_term)
+
+        self.smoother = smoother or TrendSmoother(
+            method='gp', n_jobs=n_jobs, cache_folder=os.path.join(self.output_subfolder, 'smoothing_cache'))
 
-        # Load dataset
-        self.df = pd.read_csv(input_file)
-        self.df['cleaned_text'] = self.df['Description'].apply(self.preprocess)
+        # Only the dates are loaded; the descriptions are streamed from the file when tokenized
+        self.df = self.load_descriptions(input_file, date_range, columns=['CreatedAt'])
 
         # Initialize the Word2Vec model
         self.word2vec_model = None
 
+        # Trend table shared by the trend plots, computed on first use
+        self._trend_table = None
+
+    @staticmethod
+    def load_descriptions(input_file, date_range=None, columns=None):
+        """
+        Read the job descriptions, restricted to a date range.
+
+        With a date range, only the 'CreatedAt' column is read first; the rows outside the
+        range are then skipped by the CSV parser, so their descriptions are never loaded.
+
+        Args:
+            input_file (str): Path to the CSV file containing job descriptions.
+            date_range (tuple): (start, end) with start <= 'CreatedAt' < end, or None for all rows.
+            columns (list): Columns to read; defaults to all columns.
+
+        Returns:
+            pd.DataFrame: The job descriptions within the range.
+        """
+        if date_range is None:
+            return pd.read_csv(input_file, usecols=columns)
+
+        created_at = pd.read_csv(input_file, usecols=['CreatedAt'])['CreatedAt']
+        outside = np.flatnonzero(~in_date_range(created_at, *date_range).to_numpy())
+        if columns is not None and set(columns) <= {'CreatedAt'}:
+            # The dates were already read
+            return created_at.drop(index=outside).reset_index(drop=True).to_frame()
+        # Row i of the data is record i + 1 of the file, after the header
+        return pd.read_csv(input_file, usecols=columns, skiprows=set((outside + 1).tolist()))
+
+    @staticmethod
+    def read_description_chunks(input_file, date_range=None, chunk_size=CHUNK_SIZE):
+        """
+        Read the job descriptions chunk by chunk, restricted to a date range.
+
+        Args:
+            input_file (str): Path to the CSV file containing job descriptions.
+            date_range (tuple): (start, end) with start <= 'CreatedAt' < end, or None for all rows.
+            chunk_size (int): Number of rows read at a time.
+
+        Yields:
+            pd.DataFrame: The next rows within the range.
+        """
+        for chunk in pd.read_csv(input_file, chunksize=chunk_size):
+            if date_range is not None:
+                chunk = chunk[in_date_range(chunk['CreatedAt'], *date_range)]
+            yield chunk
+
+    def get_cleaned_text(self):
+        """
+        Tokenize the job descriptions on first use, reusing the on-disk token cache.
+
+        The descriptions are read from the input file chunk by chunk, so only their tokens
+        are kept.
+
+        Returns:
+            pd.Series: Token list per job description.
+        """
+        if 'cleaned_text' not in self.df:
+            subset = None if self.date_range is None else repr([str(bound) for bound in self.date_range])
+            descriptions = (description
+                            for chunk in self.read_description_chunks(self.input_file, self.date_range, self.CHUNK_SIZE)
+                            for description in chunk['Description'])
+            self.df['cleaned_text'] = self.preprocessor.preprocess_file(self.input_file, descriptions, subset=subset)
+        return self.df['cleaned_text']
+
     def preprocess(self, text: str) -> list:
         """
         Preprocesses the given job description text by converting it to lowercase, removing non-alphanumeric characters,
-        lemmatizing words, and removing stopwords.
+        lemmatizing words, and removing stopwords. Multi-word keywords found in the text are appended as tokens.
 
         Args:
             text (str): The text of the job description to be preprocessed.
@@ -63,87 +184,187 @@ class Word2Vec_Embedding_Analysis(IWord2VecEmbeddingTrendAnalysis):
         Returns:
             list: A list of preprocessed words from the text.
         """
-        text = text.lower()
-        text = re.sub(r'\W+', ' ', text)
-        text = re.sub(r'\d+', '', text)
+        return self.preprocessor.preprocess(text)
 
-        words = text.split()
-        words = [self.lemmatizer.lemmatize(word) for word in words if word not in self.stop_words]
+    def get_half_years(self):
+        """
+        Compute the half-year period of every job description, e.g. '2020 H1'.
 
-        words = [word.replace(" ", "_") for word in words]
+        Returns:
+            pd.Series: Half-year label per job description.
+        """
+        if 'half_year' not in self.df:
+            created_at = pd.to_datetime(self.df['CreatedAt'])
+            self.df['half_year'] = created_at.dt.year.astype(str) + " H" + ((created_at.dt.month - 1) // 6 + 1).astype(str)
+        return self.df['half_year']
 
-        # Check for multi-word keywords and replace
-        for keyword in self.job_keywords:
-            if " " in keyword:
-                spaced_keyword = keyword.replace("_", " ")
-                text = text.replace(spaced_keyword, keyword)
+    def get_trend_table(self):
+        """
+        Compute the prevalence of every tracked keyword per half-year in one pass and cache it.
 
-        words = text.split()
+        Returns:
+            pd.DataFrame: Tidy table with columns 'period', 'dictionary', 'keyword' and 'share'.
+        """
+        if self._trend_table is None:
+            periods = self.get_half_years().where(pd.to_datetime(self.df['CreatedAt']).notna())
+            self._trend_table = self.trend_tracker.compute(self.get_cleaned_text(), periods)
+        return self._trend_table
+
+    def compute_trend_data(self, dictionary=None):
+        """
+        Compute the percentage of job descriptions mentioning each keyword of a dictionary per half-year.
 
-        # Identify bigrams
-        bigrams = list(ngrams(words, 2))
-        bigram_tokens = ['_'.join(bigram) for bigram in bigrams]
+        Args:
+            dictionary (str): Name of the tracked dictionary; defaults to the first one.
+
+        Returns:
+            pd.DataFrame: Percentages indexed by half-year with one column per keyword.
+        """
+        dictionary = dictionary or next(iter(self.trend_dictionaries))
+        trend_data = self.trend_tracker.to_wide(self.get_trend_table(), dictionary)
+        trend_data.index.name = 'half_year'
+        return trend_data
+
+    def _output_file(self, dictionary, file_name):
+        # The default dictionary keeps the original file names
+        if dictionary == self.DEFAULT_DICTIONARY:
+            return os.path.join(self.output_subfolder, f'tech_keywords_{file_name}')
+        slug = ''.join(c if c.isalnum() else '_' for c in dictionary.lower())
+        return os.path.join(self.output_subfolder, f'{slug}_keywords_{file_name}')
+
+    def write_token_file(self, path, documents=None, created_after=None):
+        """
+        Write tokenized documents to a LineSentence-style file (one space-separated document per line).
+
+        Without explicit documents, the descriptions are read from the input file chunk by chunk
+        and each chunk is tokenized straight into the file, so the tokens of the whole corpus are
+        never held in memory. The file is written under a temporary name and moved into place.
+
+        Args:
+            path (str): Target file path.
+            documents (iterable): Token lists to write; defaults to the tokenized input file.
+            created_after (pd.Timestamp): Only write the descriptions created after this time.
+
+        Returns:
+            int: The number of documents written.
+        """
+        n_documents = 0
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            if documents is None:
+                for chunk in self.read_description_chunks(self.input_file, self.date_range, self.CHUNK_SIZE):
+                    if created_after is not None:
+                        chunk = chunk[pd.to_datetime(chunk['CreatedAt']) > created_after]
+                    for tokens in self.preprocessor.preprocess_many(chunk['Description']):
+                        f.write(' '.join(tokens) + '\n')
+                    n_documents += len(chunk)
+            else:
+                for tokens in documents:
+                    f.write(' '.join(tokens) + '\n')
+                    n_documents += 1
+        os.replace(temp_path, path)
+        return n_documents
 
-        for bigram in bigram_tokens:
-            if bigram in self.job_keywords:
-                words.append(bigram)
+    def load_model_versions(self):
+        """
+        Load the version history of the saved Word2Vec model.
 
-        return words
+        Returns:
+            list: One dict per trained version with its data range, oldest first.
+        """
+        versions_file = os.path.join(self.output_subfolder, self.VERSIONS_FILE)
+        if not os.path.isfile(versions_file):
+            return []
+        with open(versions_file, 'r') as f:
+            return json.load(f)
 
-    def tokenize_and_train(self):
+    def tokenize_and_train(self, incremental=False, workers=None, epochs=30):
         """
         Tokenizes the job descriptions and trains a Word2Vec model on the preprocessed text data.
         The trained model is saved to the specified output folder.
 
+        The corpus is tokenized chunk by chunk into an on-disk token file, which the model
+        is trained from. In incremental mode the saved model
+        is loaded, its vocabulary is extended with the documents created after the end of the
+        data range it already covers, and it is trained on those documents only. Every saved
+        model version is recorded in 'word2vec_model_versions.json' with the data range it covers.
+        Without a saved model, incremental mode falls back to full training.
+
+        Args:
+            incremental (bool): Update the saved model with new documents instead of retraining.
+            workers (int): Number of training threads; defaults to the number of CPU cores.
+            epochs (int): Number of training epochs for a full training run.
+
         Returns:
             None
         """
-        sentences = self.df['cleaned_text']
-        self.word2vec_model = Word2Vec(sentences, vector_size=300, window=10, min_count=1, workers=4, epochs=30)
-        
-        model_path = os.path.join(self.output_subfolder, 'word2vec_model')
-        self.word2vec_model.save(model_path)
-        print(f"Word2Vec model saved to {model_path}")
+        workers = workers or os.cpu_count() or 1
+        model_path = os.path.join(self.output_subfolder, self.MODEL_FILE)
+        created_at = pd.to_datetime(self.df['CreatedAt'])
+        versions = self.load_model_versions()
+        incremental = incremental and bool(versions) and os.path.isfile(model_path)
+
+        covered_until = None
+        if incremental:
+            covered_until = pd.Timestamp(versions[-1]['data_end'])
+            is_new = created_at > covered_until
+            if not is_new.any():
+                self.word2vec_model = Word2Vec.load(model_path)
+                print(f"No postings after {covered_until.date()}; Word2Vec model is up to date.")
+                return
+            dates = created_at[is_new]
+        else:
+            dates = created_at
+
+        corpus_file = os.path.join(self.output_subfolder, self.CORPUS_FILE)
+        n_documents = self.write_token_file(corpus_file, created_after=covered_until)
+
+        if incremental:
+            self.word2vec_model = Word2Vec.load(model_path)
+            self.word2vec_model.workers = workers
+            self.word2vec_model.build_vocab(corpus_file=corpus_file, update=True)
+            self.word2vec_model.train(corpus_file=corpus_file, total_examples=self.word2vec_model.corpus_count,
+                                      total_words=self.word2vec_model.corpus_total_words,
+                                      epochs=self.word2vec_model.epochs)
+            data_start = versions[-1]['data_start']
+        else:
+            self.word2vec_model = Word2Vec(corpus_file=corpus_file, vector_size=300, window=10, min_count=1,
+                                           workers=workers, epochs=epochs)
+            data_start = str(dates.min())
+            versions = []
 
-    def produce_scatter_plot(self):
+        self.word2vec_model.save(model_path)
+        versions.append({
+            'version': len(versions) + 1,
+            'mode': 'incremental' if incremental else 'full',
+            'data_start': data_start,
+            'data_end': str(dates.max()),
+            'n_documents': n_documents,
+            'trained_at': pd.Timestamp.now().isoformat(timespec='seconds'),
+        })
+        with open(os.path.join(self.output_subfolder, self.VERSIONS_FILE), 'w') as f:
+            json.dump(versions, f, indent=4)
+        print(f"Word2Vec model saved to {model_path} (version {versions[-1]['version']}, "
+              f"data {versions[-1]['data_start']} to {versions[-1]['data_end']})")
+
+    def produce_scatter_plot(self, smoothing_method=None, dictionary=None):
         """
         Generates a scatter plot of trends in keywords over time, using Gaussian process
         regression to smooth the trends, and marks significant events with vertical lines.
 
         The plot will be saved to the specified output folder.
 
+        Args:
+            smoothing_method (str): Smoothing method for this run ('gp', 'gp_shared' or 'spline');
+                defaults to the smoother's configured method.
+            dictionary (str): Name of the tracked keyword dictionary to plot; defaults to the first one.
+
         Returns:
             None
         """
-        # List of tech keywords to track
-        tech_keywords = {
-            "digital_marketing": ["digital_marketing"],
-            "media": ["media", "social_media", "digital_media"],
-            "advertiser": ["advertiser", "advertisers"],
-            "brand_management": ["brand_management"],
-            "social_media": ["social_media"],
-            "advertising": ["advertisement", "advertising", "marketing", "marketing_campaigns", "marketing_campaign",
-                            "ads", "advertisement_campaign", "advertisement_campaign"],
-            "pr": ["pr"],
-            "digital_media": ["digital_media"],
-            "content": ["content"],
-            "customer_engagement": ["customer_engagement"],
-            "brand": ["brands", "brands", "branding"],
-            "branding": ["branding"],
-            "market_research": ["market_research"],
-            "marketing_analytics": ["marketing_analytics"]
-        }
-
-        # Convert 'CreatedAt' column to datetime and extract half-year period
-        self.df['CreatedAt'] = pd.to_datetime(self.df['CreatedAt'])
-        self.df['half_year'] = self.df['CreatedAt'].dt.year.astype(str) + " H" + ((self.df['CreatedAt'].dt.month - 1) // 6 + 1).astype(str)
-
-        # Check if any of the tech keywords are in the cleaned text
-        for keyword in tech_keywords:
-            self.df[keyword] = self.df['cleaned_text'].apply(lambda x: any(term in x for term in tech_keywords[keyword]))
-
-        # Aggregate trends by half-year
-        trend_data = self.df.groupby('half_year')[list(tech_keywords.keys())].mean() * 100  # Convert to percentages
+        # Share of job descriptions mentioning each tracked keyword per half-year
+        dictionary = dictionary or next(iter(self.trend_dictionaries))
+        trend_data = self.compute_trend_data(dictionary)
 
         # Filter out keywords that never exceed 10% at any time
         max_values = trend_data.max()
@@ -153,23 +374,15 @@ class Word2Vec_Embedding_Analysis(IWord2VecEmbeddingTrendAnalysis):
         # Plot linear graph with Gaussian process regression for smoothing
         plt.figure(figsize=(14, 7))
 
+        # Smooth all keyword series in one batch
+        x = np.arange(len(trend_data))
+        x_smooth, curves = self.smoother.smooth(trend_data, n_points=500, length_scale=10, method=smoothing_method)
+
         for column in trend_data.columns:
-            x = np.arange(len(trend_data))
             y = trend_data[column].values
 
-            # Define Gaussian process with RBF kernel
-            kernel = C(1.0, (1e-3, 1e3)) * RBF(10, (1e-2, 1e2))
-            gp = GaussianProcessRegressor(kernel=kernel, n_restarts_optimizer=10, alpha=1e-2)
-
-            # Fit the Gaussian process
-            gp.fit(x.reshape(-1, 1), y)
-
-            # Generate smooth predictions
-            x_smooth = np.linspace(0, len(x) - 1, 500).reshape(-1, 1)
-            y_smooth, sigma = gp.predict(x_smooth, return_std=True)
-
             # Plot the smooth curve
-            line, = plt.plot(x_smooth, y_smooth, label=column)
+            line, = plt.plot(x_smooth, curves[column], label=column)
 
             # Plot scatter points for the actual data
             plt.scatter(x, y, color=line.get_color(), alpha=0.7)
@@ -187,7 +400,7 @@ class Word2Vec_Embedding_Analysis(IWord2VecEmbeddingTrendAnalysis):
                 plt.axvline(event_idx, color='red' if 'COVID' in event else 'green', linestyle='--', label=event)
 
         # Customize plot
-        plt.title('Trends of Marketing Related Keywords Over Time', pad=20, fontsize=16)
+        plt.title(f'Trends of {dictionary} Keywords Over Time', pad=20, fontsize=16)
         plt.xlabel('Time Period (Half-Year)', fontsize=14)
         plt.ylabel('Percentage of Jobs Mentioning Keyword', fontsize=14)
         plt.ylim(0, None)
@@ -204,48 +417,27 @@ class Word2Vec_Embedding_Analysis(IWord2VecEmbeddingTrendAnalysis):
         plt.legend(title='Keywords', bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=12)
 
         # Save the plot
-        output_file = os.path.join(self.output_subfolder, 'tech_keywords_trends_filtered_gaussian_scatter_plot_half_years.png')
+        output_file = self._output_file(dictionary, 'trends_filtered_gaussian_scatter_plot_half_years.png')
         plt.tight_layout()
         plt.savefig(output_file)
         print(f"Saved figure to {output_file}")
 
-    def track_trends2(self):
+    def track_trends2(self, smoothing_method=None, dictionary=None):
         """
         Generates a trend plot similar to `produce_scatter_plot`, but focuses on a smoothed line using Gaussian process
         regression. Filters and plots keywords that have exceeded 10% mentions over time.
 
+        Args:
+            smoothing_method (str): Smoothing method for this run ('gp', 'gp_shared' or 'spline');
+                defaults to the smoother's configured method.
+            dictionary (str): Name of the tracked keyword dictionary to plot; defaults to the first one.
+
         Returns:
             None
         """
-        # List of tech keywords to track
-        tech_keywords = {
-            "digital_marketing": ["digital_marketing"],
-            "media": ["media", "social_media", "digital_media"],
-            "advertiser": ["advertiser", "advertisers"],
-            "brand_management": ["brand_management"],
-            "social_media": ["social_media"],
-            "advertising": ["advertisement", "advertising", "marketing", "marketing_campaigns", "marketing_campaign",
-                            "ads", "advertisement_campaign", "advertisement_campaign"],
-            "pr": ["pr"],
-            "digital_media": ["digital_media"],
-            "content": ["content"],
-            "customer_engagement": ["customer_engagement"],
-            "brand": ["brands", "brands", "branding"],
-            "branding": ["branding"],
-            "market_research": ["market_research"],
-            "marketing_analytics": ["marketing_analytics"]
-        }
-
-        # Convert 'CreatedAt' column to datetime and extract half-year period
-        self.df['CreatedAt'] = pd.to_datetime(self.df['CreatedAt'])
-        self.df['half_year'] = self.df['CreatedAt'].dt.year.astype(str) + " H" + ((self.df['CreatedAt'].dt.month - 1) // 6 + 1).astype(str)
-
-        # Check if any of the tech keywords are in the cleaned text
-        for keyword in tech_keywords:
-            self.df[keyword] = self.df['cleaned_text'].apply(lambda x: any(term in x for term in tech_keywords[keyword]))
-
-        # Aggregate trends by half-year
-        trend_data = self.df.groupby('half_year')[list(tech_keywords.keys())].mean() * 100  # Convert to percentages
+        # Share of job descriptions mentioning each tracked keyword per half-year
+        dictionary = dictionary or next(iter(self.trend_dictionaries))
+        trend_data = self.compute_trend_data(dictionary)
 
         # Filter out keywords that never exceed 10% at any time
         max_values = trend_data.max()
@@ -260,23 +452,12 @@ class Word2Vec_Embedding_Analysis(IWord2VecEmbeddingTrendAnalysis):
         # Plot linear graph with smooth curves
         plt.figure(figsize=(16, 8))  # Increased figure size for better spacing
 
-        for column in trend_data.columns:
-            x = np.arange(len(trend_data))  # Use sequential numbers for x-axis positions
-            y = trend_data[column].values  # Percentage trends
-
-            # Define kernel: RBF kernel with length scale 1.0
-            kernel = C(1.0, (1e-3, 1e3)) * RBF(10, (1e-2, 1e2))
-            gp = GaussianProcessRegressor(kernel=kernel, n_restarts_optimizer=10, alpha=1e-2)
-
-            # Fit the Gaussian Process
-            gp.fit(x.reshape(-1, 1), y)
-
-            # Predict with some smoothness control
-            x_pred = np.linspace(0, len(x) - 1, 300).reshape(-1, 1)  # Generate smooth x values with more points
-            y_pred, y_std = gp.predict(x_pred, return_std=True)
+        # Smooth all keyword series in one batch
+        x_pred, curves = self.smoother.smooth(trend_data, n_points=300, length_scale=10, method=smoothing_method)
 
+        for column in trend_data.columns:
             # Plot the predicted line
-            plt.plot(x_pred, y_pred, label=column)
+            plt.plot(x_pred, curves[column], label=column)
 
         # Add vertical lines in different colors (marking specific events)
         event_positions = {
@@ -288,7 +469,7 @@ class Word2Vec_Embedding_Analysis(IWord2VecEmbeddingTrendAnalysis):
                 plt.axvline(x=list(trend_data.index).index(half_year), color='red' if 'COVID' in event else 'green', linestyle='--', label=event)
 
         # Customize plot
-        plt.title('Trends of Marketing Related Keywords Over Time', pad=20, fontsize=18)  # Increased title size
+        plt.title(f'Trends of {dictionary} Keywords Over Time', pad=20, fontsize=18)  # Increased title size
         plt.xlabel('Time Period (Half-Year)', fontsize=16)  # Increased label size
         plt.ylabel('Percentage of Jobs Mentioning Keyword', fontsize=16)  # Increased label size
         plt.ylim(0, None)  # Start y-axis at 0
@@ -305,47 +486,26 @@ class Word2Vec_Embedding_Analysis(IWord2VecEmbeddingTrendAnalysis):
         plt.legend(title='Keywords', bbox_to_anchor=(1.05, 1), loc='upper left', fontsize=14)  # Increased legend font size
 
         # Save the plot
-        output_file = os.path.join(self.output_subfolder, 'tech_keywords_trends_gaussian_plot_halfyear.png')
+        output_file = self._output_file(dictionary, 'trends_gaussian_plot_halfyear.png')
         plt.tight_layout()
         plt.savefig(output_file)
 
-    def track_trends3(self):
+    def track_trends3(self, smoothing_method=None, dictionary=None):
         """
         Similar to `track_trends2` but with the addition of detecting rupture points using the `ruptures` package. 
         This allows identifying significant changes in the trend over time.
 
+        Args:
+            smoothing_method (str): Smoothing method for this run ('gp', 'gp_shared' or 'spline');
+                defaults to the smoother's configured method.
+            dictionary (str): Name of the tracked keyword dictionary to plot; defaults to the first one.
+
         Returns:
             None
         """
-        # List of tech keywords to track
-        tech_keywords = {
-            "digital_marketing": ["digital_marketing"],
-            "media": ["media", "social_media", "digital_media"],
-            "advertiser": ["advertiser", "advertisers"],
-            "brand_management": ["brand_management"],
-            "social_media": ["social_media"],
-            "advertising": ["advertisement", "advertising", "marketing", "marketing_campaigns", "marketing_campaign",
-                            "ads", "advertisement_campaign", "advertisement_campaign"],
-            "pr": ["pr"],
-            "digital_media": ["digital_media"],
-            "content": ["content"],
-            "customer_engagement": ["customer_engagement"],
-            "brand": ["brands", "brands", "branding"],
-            "branding": ["branding"],
-            "market_research": ["market_research"],
-            "marketing_analytics": ["marketing_analytics"]
-        }
-
-        # Convert 'CreatedAt' column to datetime and extract half-year period
-        self.df['CreatedAt'] = pd.to_datetime(self.df['CreatedAt'])
-        self.df['half_year'] = self.df['CreatedAt'].dt.year.astype(str) + " H" + ((self.df['CreatedAt'].dt.month - 1) // 6 + 1).astype(str)
-
-        # Check if any of the tech keywords are in the cleaned text
-        for keyword in tech_keywords:
-            self.df[keyword] = self.df['cleaned_text'].apply(lambda x: any(term in x for term in tech_keywords[keyword]))
-
-        # Aggregate trends by half-year
-        trend_data = self.df.groupby('half_year')[list(tech_keywords.keys())].mean() * 100  # Convert to percentages
+        # Share of job descriptions mentioning each tracked keyword per half-year
+        dictionary = dictionary or next(iter(self.trend_dictionaries))
+        trend_data = self.compute_trend_data(dictionary)
 
         # Filter out keywords that never exceed 10% at any time
         max_values = trend_data.max()
@@ -367,21 +527,13 @@ class Word2Vec_Embedding_Analysis(IWord2VecEmbeddingTrendAnalysis):
         # Initialize a handle for the ruptures in the legend
         rupture_line_handle = None
 
+        # Smooth all keyword series in one batch
+        x_smooth, curves = self.smoother.smooth(trend_data, n_points=500, length_scale=5, method=smoothing_method)
+
         for idx, column in enumerate(trend_data.columns):
             ax = plt.subplot(n_rows, n_cols, idx + 1)  # Create individual subplot
             x = np.arange(len(trend_data))
-            y = trend_data[column].values
-
-            # Define Gaussian Process with RBF kernel
-            kernel = C(1.0, (1e-3, 1e3)) * RBF(5, (1e-2, 1e2))
-            gp = GaussianProcessRegressor(kernel=kernel, n_restarts_optimizer=10, alpha=1e-2)
-
-            # Fit the Gaussian process
-            gp.fit(x.reshape(-1, 1), y)
-
-            # Generate smooth predictions
-            x_smooth = np.linspace(0, len(x) - 1, 500).reshape(-1, 1)
-            y_smooth, sigma = gp.predict(x_smooth, return_std=True)
+            y_smooth = curves[column]
 
             # Plot the smooth curve
             ax.plot(x_smooth, y_smooth, label=column)
@@ -444,7 +596,7 @@ class Word2Vec_Embedding_Analysis(IWord2VecEmbeddingTrendAnalysis):
         # Adjust layout to prevent overlapping
         plt.tight_layout(pad=3)
 
-        output_file = os.path.join(self.output_subfolder, 'tech_keywords_trends_half_years.png')
+        output_file = self._output_file(dictionary, 'trends_half_years.png')
 
         try:
             plt.savefig(output_file)
@@ -0,0 +1,235 @@
+import os
+import re
+import json
+import hashlib
+from itertools import islice
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from nltk.stem import WordNetLemmatizer
+from interfaces import IWord2VecPreprocessor
+
+NON_WORD_PATTERN = re.compile(r'\W+')
+DIGIT_PATTERN = re.compile(r'\d+')
+
+# Number of texts tokenized at a time by Word2VecPreprocessor.preprocess_file
+BATCH_SIZE = 50000
+
+class Word2VecPreprocessor(IWord2VecPreprocessor):
+    """
+    Tokenizes job descriptions for Word2Vec training and keyword trend tracking.
+
+    Each text is lowercased, stripped of non-word characters and digits, and split into
+    tokens. Multi-word keywords (stored with underscores, e.g. 'digital_marketing') are
+    detected in a single pass over the tokens with a token trie and appended as extra
+    tokens. With `normalize`, stopwords are also removed and the remaining tokens are
+    lemmatized; keywords are kept verbatim. Lemmas are memoized, since the vocabulary is
+    tiny compared with the number of tokens.
+
+    Tokenized corpora can be cached on disk, keyed by a hash of the input file, the
+    stopwords and the keywords, so re-tokenizing the same dataset is a single file read.
+
+    Attributes:
+        stop_words (set): Stopwords removed from the token stream when normalizing.
+        job_keywords (list): Keywords with spaces replaced by underscores.
+        n_jobs (int): Number of worker processes used by `preprocess_many`.
+        cache_folder (str): Folder for cached tokenized corpora, or None to disable caching.
+        normalize (bool): Whether stopwords are removed and tokens lemmatized.
+    """
+
+    CACHE_VERSION = 1
+
+    def __init__(self, stop_words, job_keywords, n_jobs=1, cache_folder=None, lemma_cache_size=200000,
+                 normalize=False):
+        """
+        Initialize the Word2VecPreprocessor.
+
+        Args:
+            stop_words (iterable): Stopwords to remove when normalizing.
+            job_keywords (list): Keywords to detect; spaces are replaced by underscores.
+            n_jobs (int): Number of worker processes; -1 uses all CPUs.
+            cache_folder (str): Folder to cache tokenized corpora in (optional).
+            lemma_cache_size (int): Maximum number of memoized lemmas.
+            normalize (bool): Remove stopwords and lemmatize the tokens; by default the
+                cleaned tokens are kept as they are.
+        """
+        self.stop_words = set(stop_words)
+        self.job_keywords = [keyword.replace(" ", "_") for keyword in job_keywords]
+        self.keyword_set = set(self.job_keywords)
+        self.n_jobs = os.cpu_count() if n_jobs == -1 else max(1, int(n_jobs))
+        self.cache_folder = cache_folder
+        self.lemma_cache_size = lemma_cache_size
+        self.normalize = normalize
+        self.keyword_trie = self.build_keyword_trie(self.job_keywords)
+        self.lemmatize = lru_cache(maxsize=lemma_cache_size)(WordNetLemmatizer().lemmatize)
+
+    @staticmethod
+    def build_keyword_trie(keywords):
+        """
+        Build a token trie over the multi-word keywords.
+
+        Args:
+            keywords (list): Keywords with words joined by underscores.
+
+        Returns:
+            dict: Nested dict keyed by token; the key None marks the end of a keyword.
+        """
+        trie = {}
+        for keyword in keywords:
+            parts = keyword.split("_")
+            if len(parts) < 2 or not all(parts):
+                continue
+            node = trie
+            for part in parts:
+                node = node.setdefault(part, {})
+            node[None] = keyword
+        return trie
+
+    def match_keywords(self, tokens):
+        """
+        Find every multi-word keyword occurring in a token sequence.
+
+        Args:
+            tokens (list): Raw tokens of a text.
+
+        Returns:
+            list: Matched keywords in order of their start position.
+        """
+        matches = []
+        for start in range(len(tokens)):
+            node = self.keyword_trie.get(tokens[start])
+            position = start + 1
+            while node is not None:
+                if None in node:
+                    matches.append(node[None])
+                if position == len(tokens):
+                    break
+                node = node.get(tokens[position])
+                position += 1
+        return matches
+
+    def preprocess(self, text: str) -> list:
+        """
+        Preprocess a job description into a list of tokens.
+
+        Args:
+            text (str): The text of the job description.
+
+        Returns:
+            list: The tokens (lemmatized and without stopwords with `normalize`), followed by
+                matched multi-word keywords.
+        """
+        text = DIGIT_PATTERN.sub('', NON_WORD_PATTERN.sub(' ', str(text).lower()))
+        tokens = text.split()
+        if not self.normalize:
+            return tokens + self.match_keywords(tokens)
+        words = [token if token in self.keyword_set else self.lemmatize(token)
+                 for token in tokens if token not in self.stop_words]
+        return words + self.match_keywords(tokens)
+
+    def normalize_term(self, term):
+        """
+        Map a tracked term onto the token form produced by `preprocess`.
+
+        Args:
+            term (str): A keyword or word to look up in tokenized texts.
+
+        Returns:
+            str: The term as it appears in preprocessed token lists.
+        """
+        term = term.lower().replace(" ", "_")
+        if not self.normalize or term in self.keyword_set or "_" in term:
+            return term
+        return self.lemmatize(term)
+
+    def preprocess_many(self, texts):
+        """
+        Preprocess a collection of texts, in a process pool when n_jobs > 1.
+
+        Args:
+            texts (iterable): Texts to preprocess.
+
+        Returns:
+            list: One token list per text, in input order.
+        """
+        texts = list(texts)
+        if self.n_jobs == 1 or len(texts) < 2 * self.n_jobs:
+            return [self.preprocess(text) for text in texts]
+
+        chunk_size = -(-len(texts) // (self.n_jobs * 4))
+        chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+        with ProcessPoolExecutor(max_workers=self.n_jobs, initializer=_init_worker,
+                                 initargs=(self.stop_words, self.job_keywords, self.lemma_cache_size, self.normalize)) as executor:
+            return [tokens for chunk in executor.map(_preprocess_chunk, chunks) for tokens in chunk]
+
+    def cache_key(self, input_file, subset=None):
+        """
+        Hash the input file contents together with the preprocessing settings.
+
+        Args:
+            input_file (str): Path to the input file.
+            subset (str): Identifies the subset of rows that was read, if not all of them.
+
+        Returns:
+            str: Hex digest identifying the tokenized output.
+        """
+        digest = hashlib.sha1()
+        with open(input_file, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+        settings = {
+            'version': self.CACHE_VERSION,
+            'stop_words': sorted(self.stop_words),
+            'job_keywords': sorted(self.keyword_set),
+            'normalize': self.normalize,
+        }
+        if subset is not None:
+            settings['subset'] = subset
+        digest.update(json.dumps(settings).encode('utf-8'))
+        return digest.hexdigest()
+
+    def preprocess_file(self, input_file, texts, subset=None, batch_size=BATCH_SIZE):
+        """
+        Preprocess the texts of an input file, reusing the on-disk cache when possible.
+
+        The texts are consumed batch by batch, so a generator reading the input file in
+        chunks is never materialized; with a cached result they are not read at all.
+
+        Args:
+            input_file (str): Path to the file the texts were read from (used as cache key).
+            texts (iterable): Texts to preprocess.
+            subset (str): Identifies the subset of rows the texts were read from, if not all of them.
+            batch_size (int): Number of texts tokenized at a time.
+
+        Returns:
+            list: One token list per text, in input order.
+        """
+        texts = iter(texts)
+        batches = iter(lambda: list(islice(texts, batch_size)), [])
+        if self.cache_folder is None:
+            return [tokens for batch in batches for tokens in self.preprocess_many(batch)]
+
+        cache_file = os.path.join(self.cache_folder, f'tokens_{self.cache_key(input_file, subset)[:16]}.jsonl')
+        if os.path.isfile(cache_file):
+            with open(cache_file, 'r', encoding='utf-8') as f:
+                return [json.loads(line) for line in f]
+
+        tokenized = []
+        os.makedirs(self.cache_folder, exist_ok=True)
+        temp_file = cache_file + '.tmp'
+        with open(temp_file, 'w', encoding='utf-8') as f:
+            for batch in batches:
+                for tokens in self.preprocess_many(batch):
+                    f.write(json.dumps(tokens) + '\n')
+                    tokenized.append(tokens)
+        os.replace(temp_file, cache_file)
+        return tokenized
+
+_worker_preprocessor = None
+
+def _init_worker(stop_words, job_keywords, lemma_cache_size, normalize):
+    global _worker_preprocessor
+    _worker_preprocessor = Word2VecPreprocessor(stop_words, job_keywords, lemma_cache_size=lemma_cache_size,
+                                                normalize=normalize)
+
+def _preprocess_chunk(texts):
+    return [_worker_preprocessor.preprocess(text) for text in texts]
@@ -1,30 +1,38 @@
 import pandas as pd
 import os
 from external_systems import SSEMEmbedder
-from wordcloud import WordCloud
 import matplotlib.pyplot as plt
 from datetime import datetime
 from typing import List, Dict
 from interfaces import IWordCloudGenerator
-from sentence_transformers.util import cos_sim
 from collections import defaultdict
 import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from .embedding_utils import parse_embeddings
+from .wordcloud_layouts import render_wordcloud, use_agg_backend, TOPICS_PER_IMAGE
 
 # from .text_preprocessor import TextPreprocessor
 
 class WordCloudGenerator(IWordCloudGenerator):
+
     def __init__(self, embeddings_data: pd.DataFrame, keyword_dict: Dict[str, List[str]], output_folder: str, name_of_topics: str, 
-                 stopword_files: List[str], column: str):
+                 stopword_files: List[str], column: str, max_workers: int = 1, layout_cache_folder: str = None):
         """
         Initialize the WordCloudGenerator.
 
         Parameters:
-        embeddings_data (pd.DataFrame): DataFrame containing job descriptions and other relevant data.
+        embeddings_data (pd.DataFrame or np.ndarray): DataFrame with a column of stored embeddings, or a 2-D
+            embedding matrix such as a read-only memory-mapped view or QuantizedEmbeddings, which is read block
+            by block without copying.
         keyword_dict (dict): Dictionary where keys are topic names and values are lists of associated keywords.
         output_folder (str): Folder where the generated WordCloud images will be saved.
         name_of_topics (str): Common title for the WordCloud topics.
         stopword_files (list): List of paths to stopword files for text preprocessing.
         column (str): Name of the column containing job descriptions in the DataFrame.
+        max_workers (int): Number of processes rendering the images of the topic groups; 1 renders them
+            one after the other.
+        layout_cache_folder (str): Folder caching the WordCloud layouts per keyword frequencies (optional).
         """
         self.embeddings_data = embeddings_data
         self.keyword_dict = keyword_dict
@@ -32,105 +40,158 @@ class WordCloudGenerator(IWordCloudGenerator):
         self.name_of_topics = name_of_topics
         self.stopword_files = stopword_files
         self.column = column
+        self.max_workers = max_workers
+        self.layout_cache_folder = layout_cache_folder
+
+    def __getstate__(self):
+        # The images are rendered from the keyword frequencies, so worker processes get the generator
+        # without the embeddings
+        state = self.__dict__.copy()
+        state['embeddings_data'] = None
+        return state
+
+    @staticmethod
+    def _normalized_sum(embeddings, batch_size=65536):
+        """
+        Sum the L2-normalized document embeddings, reading the embeddings block by block.
+
+        Parameters:
+        embeddings: 2-D embedding matrix (possibly memory-mapped or quantized) or a Series of stored embeddings.
+        batch_size (int): Number of documents per block.
+
+        Returns:
+        np.ndarray: The summed normalized embeddings (float64).
+        """
+        total = 0.0
+        for start in range(0, len(embeddings), batch_size):
+            rows = embeddings.iloc[start:start + batch_size] if isinstance(embeddings, pd.Series) \
+                else embeddings[start:start + batch_size]
+            block = parse_embeddings(rows)
+            norms = np.maximum(np.linalg.norm(block, axis=1, keepdims=True), 1e-8)
+            total = total + (block / norms).sum(axis=0, dtype=np.float64)
+        return total
 
     def generate_wordcloud_for_topic(self) -> List[str]:
         """
         Generate WordCloud images for each topic based on embedding similarities in job descriptions.
 
+        The keyword frequencies are computed in this process, and the images of the topic groups
+        are rendered in up to `max_workers` worker processes.
+
         Returns:
         list: Paths to the generated WordCloud images.
         """
         # Ensure the output folder exists
         os.makedirs(self.output_folder, exist_ok=True)
 
-        if self.embeddings_data.empty or self.embeddings_data[self.column].dropna().empty:
+        if not isinstance(self.embeddings_data, pd.DataFrame):
+            embeddings = self.embeddings_data
+        elif self.embeddings_data.empty:
+            embeddings = []
+        else:
+            embeddings = self.embeddings_data[self.column].dropna()
+
+        if len(embeddings) == 0:
             print("No embeddings available in the DataFrame. Skipping WordCloud generation.")
             return []
 
+        # Every keyword frequency is a sum of cosine similarities over all documents, which equals the
+        # dot product of the normalized keyword with the sum of the normalized document embeddings
+        document_sum = self._normalized_sum(embeddings)
+
         # Initialize the embedder (ensure the model matches the one used for embeddings)
         embedder = SSEMEmbedder("all-mpnet-base-v2")  # Adjust the model name if necessary
 
         # Divide topics into manageable subgroups
         topic_groups = list(self.keyword_dict.items())
-        group_size = 20
-        topic_sublists = [topic_groups[i:i + group_size] for i in range(0, len(topic_groups), group_size)]
-        image_paths = []
+        topic_sublists = [topic_groups[i:i + TOPICS_PER_IMAGE]
+                          for i in range(0, len(topic_groups), TOPICS_PER_IMAGE)]
 
+        tasks = []
         for group_idx, topic_group in enumerate(topic_sublists):
-            n_topics = len(topic_group)
-            n_cols = 3
-            n_rows = (n_topics + n_cols - 1) // n_cols
-            fig_width = 6 * n_cols
-            fig_height = 6 * n_rows + 2  # Added height for the common title
-
-            # Create a figure with subplots
-            fig, axes = plt.subplots(n_rows, n_cols, figsize=(fig_width, fig_height))
-            axes = axes.flatten()
-
-            # Add a common title to the figure
-            fig.suptitle(
-                f"WordClouds for {self.name_of_topics} - Group {group_idx + 1}",
-                fontsize=24, fontweight='bold', y=0.98  # Adjusted y position for more space
-            )
-
-            subplot_idx = 0  # Track the number of used subplots
-
+            topic_frequencies = []
             for topic, keywords in topic_group:
                 if not keywords:
                     continue  # Skip topics with an empty keyword list
 
                 # Generate embeddings for keywords
-                keyword_embeddings = embedder.generate_embeddings(keywords)
-                keyword_frequency = defaultdict(float)  # Initialize with float for frequencies
-
-                # Ensure all embeddings are numpy arrays with the same dtype
-                keyword_embeddings = np.array(keyword_embeddings, dtype=np.float32)
+                keyword_embeddings = np.array(embedder.generate_embeddings(keywords), dtype=np.float32)
+                keyword_embeddings /= np.maximum(np.linalg.norm(keyword_embeddings, axis=1, keepdims=True), 1e-8)
 
-                # Calculate keyword relevance based on cosine similarity
-                for desc_embedding in self.embeddings_data[self.column]:
-                    desc_embedding = np.array(eval(desc_embedding), dtype=np.float32)  # Ensure embeddings are in array format and dtype is consistent
-
-                    for keyword, keyword_embedding in zip(keywords, keyword_embeddings):
-                        similarity = cos_sim(keyword_embedding, desc_embedding).item()
-                        keyword_frequency[keyword] += similarity
+                # Calculate keyword relevance as the summed cosine similarity over all documents
+                keyword_frequency = defaultdict(float)  # Initialize with float for frequencies
+                for keyword, frequency in zip(keywords, keyword_embeddings @ document_sum):
+                    keyword_frequency[keyword] += float(frequency)
 
                 # Skip topics without meaningful similarity
                 if all(freq == 0 for freq in keyword_frequency.values()):
                     continue
 
-                ax = axes[subplot_idx]
-                subplot_idx += 1
-
-                # Generate the WordCloud
-                wordcloud = WordCloud(
-                    width=1000,
-                    height=600,
-                    background_color='white',
-                    colormap='viridis'
-                ).generate_from_frequencies(dict(keyword_frequency))  # Ensure it's a dict
+                topic_frequencies.append((topic, dict(keyword_frequency)))
 
-                # Display the WordCloud
-                ax.imshow(wordcloud, interpolation='bilinear')
-                ax.axis('off')
-                ax.set_title(f"{topic}", fontsize=18, pad=20)  # Increased padding for more space above title
+            # Only groups with at least one word cloud get an image
+            if topic_frequencies:
+                tasks.append((group_idx, topic_frequencies))
 
-            # Remove any unused subplots
-            for j in range(subplot_idx, len(axes)):
-                fig.delaxes(axes[j])
+        n_workers = min(self.max_workers, len(tasks), os.cpu_count() or 1)
+        if n_workers > 1:
+            with ProcessPoolExecutor(max_workers=n_workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=use_agg_backend) as pool:
+                futures = [pool.submit(self.create_wordcloud_group, *task) for task in tasks]
+                return [future.result() for future in futures]
+        return [self.create_wordcloud_group(*task) for task in tasks]
 
-            # Adjust layout for better spacing
-            if subplot_idx > 0:  # Only save if at least one subplot was used
-                plt.subplots_adjust(top=0.92)  # Adjusted to move everything lower
-
-                # Generate a unique filename with a timestamp
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"wordcloud_group_{group_idx + 1}_{timestamp}.png"
-                filepath = os.path.join(self.output_folder, filename)
-
-                # Save the figure and close it
-                plt.savefig(filepath)
-                image_paths.append(filepath)
+    def create_wordcloud_group(self, group_idx, topic_frequencies):
+        """
+        Create and save one image with the WordClouds of a group of topics.
 
-            plt.close()
+        Parameters:
+        group_idx (int): Index of the group, used in the title and file name.
+        topic_frequencies (list): (topic, keyword frequencies) pairs shown in the image.
 
-        return image_paths
\ No newline at end of file
+        Returns:
+        str: Path of the saved image.
+        """
+        n_topics = len(topic_frequencies)
+        n_cols = 3
+        n_rows = (n_topics + n_cols - 1) // n_cols
+        fig_width = 6 * n_cols
+        fig_height = 6 * n_rows + 2  # Added height for the common title
+
+        # Create a figure with subplots
+        fig, axes = plt.subplots(n_rows, n_cols, figsize=(fig_width, fig_height))
+        axes = axes.flatten()
+
+        # Add a common title to the figure
+        fig.suptitle(
+            f"WordClouds for {self.name_of_topics} - Group {group_idx + 1}",
+            fontsize=24, fontweight='bold', y=0.98  # Adjusted y position for more space
+        )
+
+        for ax, (topic, keyword_frequency) in zip(axes, topic_frequencies):
+            # Generate the WordCloud, reusing the layout of the same frequencies
+            wordcloud = render_wordcloud(keyword_frequency, self.layout_cache_folder, width=1000, height=600,
+                                         background_color='white', colormap='viridis')
+
+            # Display the WordCloud
+            ax.imshow(wordcloud, interpolation='bilinear')
+            ax.axis('off')
+            ax.set_title(f"{topic}", fontsize=18, pad=20)  # Increased padding for more space above title
+
+        # Remove any unused subplots
+        for j in range(n_topics, len(axes)):
+            fig.delaxes(axes[j])
+
+        # Adjust layout for better spacing
+        plt.subplots_adjust(top=0.92)  # Adjusted to move everything lower
+
+        # Generate a unique filename with a timestamp
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"wordcloud_group_{group_idx + 1}_{timestamp}.png"
+        filepath = os.path.join(self.output_folder, filename)
+
+        # Save the figure and close it
+        plt.savefig(filepath)
+        plt.close()
+
+        return filepath
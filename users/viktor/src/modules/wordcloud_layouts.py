@@ -0,0 +1,135 @@
+import os
+import json
+import uuid
+import hashlib
+import numpy as np
+import matplotlib.pyplot as plt
+from wordcloud import WordCloud
+
+# Number of word clouds drawn in one figure by the topic model reports and the keyword word clouds
+TOPICS_PER_IMAGE = 20
+
+def use_agg_backend():
+    # Worker processes only write files, so they render with the non-interactive backend
+    plt.switch_backend('Agg')
+
+def layout_key(frequencies, width, height, colormap):
+    """
+    Hash identifying the layout of a word cloud.
+
+    Args:
+        frequencies (dict): Words mapped to their frequencies.
+        width (int): Width of the word cloud in pixels.
+        height (int): Height of the word cloud in pixels.
+        colormap (str): Matplotlib colormap the words are colored with.
+
+    Returns:
+        str: Hex digest over the sorted frequencies, the size and the colormap.
+    """
+    items = sorted((str(word), float(frequency)) for word, frequency in frequencies.items())
+    return hashlib.sha1(repr((items, width, height, colormap)).encode()).hexdigest()
+
+def wordcloud_layout(frequencies, cache_folder=None, width=800, height=400, colormap='viridis'):
+    """
+    Place the words of a word cloud, reusing the layout cached for the same frequencies.
+
+    Placing the words is the expensive step of a word cloud, while drawing a placed layout
+    is cheap, so the layouts are cached instead of the images and shared by every caller
+    (the topic model reports and the keyword word clouds). Cached layouts are JSON files
+    named by `layout_key`, written under a temporary name and moved into place, so
+    concurrent workers never read a partially written layout. Reading a layout updates the
+    modification time of its file, which `evict_layouts` uses to keep the cache bounded.
+
+    Args:
+        frequencies (dict): Words mapped to their frequencies.
+        cache_folder (str): Folder of the cached layouts; None computes without caching.
+        width (int): Width of the word cloud in pixels.
+        height (int): Height of the word cloud in pixels.
+        colormap (str): Matplotlib colormap the words are colored with.
+
+    Returns:
+        list: The `WordCloud.layout_` entries ((word, frequency), font size, position, orientation, color).
+    """
+    path = None
+    if cache_folder is not None:
+        path = os.path.join(cache_folder, f"{layout_key(frequencies, width, height, colormap)}.json")
+        try:
+            with open(path) as f:
+                layout = [((word, frequency), font_size, tuple(position), orientation, color)
+                          for (word, frequency), font_size, position, orientation, color in json.load(f)]
+            # The modification time records the last use for `evict_layouts`
+            os.utime(path)
+            return layout
+        except FileNotFoundError:
+            # Not cached yet, or evicted since
+            pass
+
+    wordcloud = WordCloud(width=width, height=height, colormap=colormap).generate_from_frequencies(frequencies)
+    layout = [((word, float(frequency)), int(font_size), (int(position[0]), int(position[1])),
+               None if orientation is None else int(orientation), color)
+              for (word, frequency), font_size, position, orientation, color in wordcloud.layout_]
+    if path is not None:
+        os.makedirs(cache_folder, exist_ok=True)
+        temporary_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temporary_path, 'w') as f:
+            json.dump(layout, f)
+        os.replace(temporary_path, path)
+    return layout
+
+def evict_layouts(cache_folder, max_bytes):
+    """
+    Delete the least recently used cached layouts until the cache fits its byte budget.
+
+    Args:
+        cache_folder (str): Folder of the cached layouts.
+        max_bytes (int): Disk budget of the cached layouts.
+
+    Returns:
+        list: Paths of the deleted layouts.
+    """
+    layouts = []
+    try:
+        entries = os.scandir(cache_folder)
+    except FileNotFoundError:
+        return []
+    with entries:
+        for entry in entries:
+            if entry.name.endswith('.json'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue
+                layouts.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in layouts)
+    evicted = []
+    for _, size, path in sorted(layouts):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        evicted.append(path)
+    return evicted
+
+def render_wordcloud(frequencies, cache_folder=None, width=800, height=400, background_color='white',
+                     colormap='viridis'):
+    """
+    Draw a word cloud from its cached (or newly computed) layout.
+
+    Args:
+        frequencies (dict): Words mapped to their frequencies.
+        cache_folder (str): Folder of the cached layouts; None computes without caching.
+        width (int): Width of the image in pixels.
+        height (int): Height of the image in pixels.
+        background_color (str): Background color of the image.
+        colormap (str): Matplotlib colormap the words are colored with.
+
+    Returns:
+        np.ndarray: RGB image of shape (height, width, 3).
+    """
+    wordcloud = WordCloud(width=width, height=height, background_color=background_color, colormap=colormap)
+    wordcloud.layout_ = wordcloud_layout(frequencies, cache_folder, width, height, colormap)
+    return np.asarray(wordcloud.to_image())
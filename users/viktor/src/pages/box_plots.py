@@ -3,24 +3,20 @@ import os
 
 # Import the Box_Plots_Manager function
 from managers import Box_Plots_Manager, get_json_files_for_box_plots
+from managers import get_projects, get_dataset_folders, render_dataset_cache_stats
 
 # Streamlit app setup
 st.title('Box Plot Generator for Keyword Features')
 
 # Input for selecting project and subfolder
 base_dir = os.path.join('data', 'registry')
-projects = [f for f in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, f))]
+projects = get_projects(base_dir)
 
 if projects:
     selected_project = st.selectbox("Select a Project", projects)
     project_path = os.path.join(base_dir, selected_project)
 
-    subfolders = [
-        os.path.relpath(os.path.join(dp, f), project_path)
-        for dp, dn, filenames in os.walk(project_path)
-        for f in filenames if f.endswith('.csv')
-    ]
-    valid_subfolders = [os.path.dirname(f) for f in subfolders]
+    valid_subfolders = get_dataset_folders(project_path)
 
     if valid_subfolders:
         selected_subfolder = st.selectbox("Select a Subfolder", sorted(set(valid_subfolders)))
@@ -28,8 +24,15 @@ if projects:
 
         output_folder = st.text_input("Enter the output folder path for the Box Plots", 'boxplot_images')
 
+        # Optionally restrict the postings to a date range; only the overlapping months are read
+        date_range = None
+        if st.checkbox("Restrict to a date range"):
+            start_date = st.date_input("Start date (inclusive)")
+            end_date = st.date_input("End date (exclusive)")
+            date_range = (start_date, end_date)
+
         # Call the Box_Plots_Manager function
-        box_plots_manager = Box_Plots_Manager(folder_path, output_folder)
+        box_plots_manager = Box_Plots_Manager(folder_path, output_folder, date_range=date_range)
 
         files = get_json_files_for_box_plots()  # Get the list of files
 
@@ -44,12 +47,16 @@ if projects:
             selected_file = None
             st.warning("No JSON files available for box plots.")
 
+        # Identical earlier runs are reused unless a refresh is forced
+        force_refresh = st.checkbox("Force refresh", help="Recreate the plots even if an identical run already has reports.")
+
         if st.button('Generate Box Plots'):
             try:
                 if selected_file:
-                    box_plots_manager.main()
+                    report_folder = box_plots_manager.main(force_refresh=force_refresh)
                     # Display success message
                     st.success(f"Box plots successfully generated using data from: {folder_path}")
+                    st.info(f"Reports: {report_folder}")
                 else:
                     st.warning("Please select a valid JSON file.")
             except Exception as e:
@@ -58,4 +65,7 @@ if projects:
     else:
         st.warning("No valid subfolders with CSV files found in the selected project.")
 else:
-    st.warning("No projects found in the registry.")
\ No newline at end of file
+    st.warning("No projects found in the registry.")
+
+# The box plots load their datasets in this process, so its cache counters apply
+render_dataset_cache_stats()
@@ -1,5 +1,5 @@
 import streamlit as st
-from managers import DataRegistryManager
+from managers import DataRegistryManager, submit_dataset, render_jobs
 
 st.title("Dataset and Database Registry Manager")
 
@@ -39,13 +39,11 @@ if input_type == "Dataset File":
         elif not dataset_type:
             st.error("Unable to determine dataset type.")
         else:
-            data_registry_manager = DataRegistryManager(dataset, file_name, project_name)
-            # message = data_registry_manager.save_dataset(dataset, project_name, dataset_type=dataset_type)
-            message = data_registry_manager.save_dataset(dataset, project_name)
-            if "Error" in message:
-                st.error(message)
-            else:
-                st.success(message)
+            # Reading and embedding a dataset runs in a background worker
+            submit_dataset(dataset, file_name, project_name)
+            st.success("Dataset queued for registration; its progress is shown under Background jobs.")
+
+    render_jobs('dataset_registration')
 
 # Handling Database Connections
 elif input_type == "Database Connection":
@@ -98,6 +96,25 @@ elif input_type == "Database Connection":
             else:
                 st.success(message)
 
+# Section: Embedding Storage Precision
+st.header("Embedding Storage Precision")
+
+if existing_projects:
+    report_project = st.selectbox("Select a project", options=existing_projects, key="report_project")
+    report_datasets = data_registry_manager_example.get_datasets_in_project(report_project)
+    report_dataset = st.selectbox("Select a dataset", options=[""] + report_datasets, key="report_dataset")
+    top_k = st.number_input("Top-k for the overlap", min_value=1, value=10, step=1)
+
+    if st.button("Compare Storage Types") and report_dataset:
+        report = data_registry_manager_example.get_quantization_report(report_project, report_dataset, k=int(top_k))
+        if report is None:
+            st.error("No embeddings are stored for this dataset.")
+        else:
+            st.dataframe(report)
+            st.caption("The analyses use the storage type set in the configuration (embedding_storage_dtype).")
+else:
+    st.info("No existing projects found.")
+
 # Section: Remove Dataset
 st.header("Remove a Dataset")
 
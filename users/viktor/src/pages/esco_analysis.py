@@ -1,7 +1,7 @@
 import streamlit as st
 import os
 import pandas as pd
-from managers import ESCOManager
+from managers import submit_esco_analysis, render_jobs
 from io import StringIO
 
 # Streamlit app setup
@@ -28,12 +28,11 @@ if uploaded_file is not None:
                 f.write(uploaded_file.getbuffer())
 
             output_subfolder = "esco_subfolder"
-            # Create an instance of the manager
-            manager = ESCOManager(input_file_path, output_subfolder)
-            result_message = manager.run_analysis()
+            # Run in a background worker; one ESCO analysis runs at a time
+            submit_esco_analysis(input_file_path, output_subfolder)
 
             # Display success message
-            st.success(result_message)
+            st.success("ESCO analysis queued; its progress is shown below.")
 
             ''' # Optionally, allow users to download the output CSV
             st.download_button(
@@ -47,4 +46,7 @@ if uploaded_file is not None:
             # Display error message
             st.error(f"An error occurred: {e}")
 else:
-    st.warning("Please upload a CSV file to begin.")
\ No newline at end of file
+    st.warning("Please upload a CSV file to begin.")
+
+# Background jobs of this page; every rerun, e.g. through Refresh, polls their progress
+render_jobs('esco_analysis')
\ No newline at end of file
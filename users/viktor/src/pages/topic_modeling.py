@@ -3,6 +3,8 @@ import os
 
 # Import the Topic_Modeling_Manager function
 from managers import Topic_Modeling_Manager
+from managers import get_projects, get_dataset_folders
+from managers import render_jobs
 
 from config import Config
 
@@ -14,7 +16,7 @@ st.title('Topic Modeling')
 
 # Input for selecting project and subfolder
 base_dir = os.path.join('data', 'registry')
-projects = [f for f in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, f))]
+projects = get_projects(base_dir)
 
 # Input parameters
 n_topics = st.number_input("Number of Topics", min_value=2, value=n_topics)
@@ -25,12 +27,7 @@ if projects:
     selected_project = st.selectbox("Select a Project", projects)
     project_path = os.path.join(base_dir, selected_project)
 
-    subfolders = [
-        os.path.relpath(os.path.join(dp, f), project_path)
-        for dp, dn, filenames in os.walk(project_path)
-        for f in filenames if f.endswith('.csv')
-    ]
-    valid_subfolders = [os.path.dirname(f) for f in subfolders]
+    valid_subfolders = get_dataset_folders(project_path)
 
     if valid_subfolders:
         selected_subfolder = st.selectbox("Select a Subfolder", sorted(set(valid_subfolders)))
@@ -42,15 +39,21 @@ if projects:
         topic_modeling_manager = Topic_Modeling_Manager(folder_path, output_folder, n_topics, num_top_words, epochs)
 
 
+        # Identical earlier runs are reused unless a refresh is forced
+        force_refresh = st.checkbox("Force refresh", help="Refit even if an identical run already has reports.")
+
         if st.button('Generate Topics'):
             try:
-                topic_modeling_manager.main()
-                # Display success message
-                st.success(f"Topics successfully generated using data from: {folder_path}")
+                # Run in a background worker, so the page stays responsive and reruns do not stop it
+                topic_modeling_manager.submit(force_refresh=force_refresh)
+                st.success(f"Topic modeling queued for data from: {folder_path}")
             except Exception as e:
                 # Display error message
-                st.error(f"An error occurred while generating topics: {e}")
+                st.error(f"An error occurred while queueing topic modeling: {e}")
     else:
         st.warning("No valid subfolders with CSV files found in the selected project.")
 else:
-    st.warning("No projects found in the registry.")
\ No newline at end of file
+    st.warning("No projects found in the registry.")
+
+# Background jobs of this page; every rerun, e.g. through Refresh, polls their progress
+render_jobs('topic_modeling')
@@ -3,24 +3,20 @@ import os
 
 # Import the Word_Clouds_Manager function
 from managers import Word_Clouds_Manager, get_json_files_for_word_clouds
+from managers import get_projects, get_dataset_folders, render_dataset_cache_stats
 
 # Streamlit app setup
 st.title('Word Cloud Plot Generator for Keyword Features')
 
 # Input for selecting project and subfolder
 base_dir = os.path.join('data', 'registry')
-projects = [f for f in os.listdir(base_dir) if os.path.isdir(os.path.join(base_dir, f))]
+projects = get_projects(base_dir)
 
 if projects:
     selected_project = st.selectbox("Select a Project", projects)
     project_path = os.path.join(base_dir, selected_project)
 
-    subfolders = [
-        os.path.relpath(os.path.join(dp, f), project_path)
-        for dp, dn, filenames in os.walk(project_path)
-        for f in filenames if f.endswith('.csv')
-    ]
-    valid_subfolders = [os.path.dirname(f) for f in subfolders]
+    valid_subfolders = get_dataset_folders(project_path)
 
     if valid_subfolders:
         selected_subfolder = st.selectbox("Select a Subfolder", sorted(set(valid_subfolders)))
@@ -44,12 +40,16 @@ if projects:
             selected_file = None
             st.warning("No JSON files available for Word Cloud plots.")
 
+        # Identical earlier runs are reused unless a refresh is forced
+        force_refresh = st.checkbox("Force refresh", help="Regenerate the word clouds even if an identical run already has reports.")
+
         if st.button('Generate Word Cloud Plots'):
             try:
                 if selected_file:
-                    word_cloud_manager.main()
+                    report_folder = word_cloud_manager.main(force_refresh=force_refresh)
                     # Display success message
                     st.success(f"Word Cloud plots successfully generated using data from: {folder_path}")
+                    st.info(f"Reports: {report_folder}")
                 else:
                     st.warning("Please select a valid JSON file.")
             except Exception as e:
@@ -58,4 +58,7 @@ if projects:
     else:
         st.warning("No valid subfolders with CSV files found in the selected project.")
 else:
-    st.warning("No projects found in the registry.")
\ No newline at end of file
+    st.warning("No projects found in the registry.")
+
+# The word clouds load their datasets in this process, so its cache counters apply
+render_dataset_cache_stats()
@@ -133,7 +133,7 @@ def test_extract_features_column_not_found():
     extractor = KeywordFeatureExtractorBoxPlots(
         df=pd.DataFrame({'text': ['sample text']}), column='invalid_column', keyword_dict={}
     )
-    with pytest.raises(SystemExit):  # Should exit due to missing column
+    with pytest.raises(KeyError):  # Missing embeddings column
         extractor.extract_features()
 
 # Integration Tests
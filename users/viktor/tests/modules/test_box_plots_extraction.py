@@ -0,0 +1,98 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+from scipy.special import softmax
+from sklearn.metrics.pairwise import cosine_similarity
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules import KeywordFeatureExtractorBoxPlots
+
+KEYWORD_DICT = {
+    'Software Engineer': ['python', 'java', 'c++'],
+    'Data Scientist': ['machine learning'],
+    'Marketing': ['seo', 'branding'],
+}
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(0)
+    embeddings = rng.normal(size=(25, 8))
+    keyword_embeddings = {
+        feature_name: rng.normal(size=(len(keywords), 8))
+        for feature_name, keywords in KEYWORD_DICT.items()
+    }
+    df = pd.DataFrame({'original_listed_time': pd.date_range('2023-01-01', periods=25, freq='D'),
+                       'title': [f'job {i}' for i in range(25)]})
+    embeddings_df = pd.DataFrame({'description_embeddings': [str(e.tolist()) for e in embeddings]})
+    return df, embeddings_df, embeddings, keyword_embeddings
+
+def reference_scores(embeddings, keyword_embeddings, temp):
+    """Per-document scores computed the straightforward way, for comparison."""
+    rows = []
+    for embedding in embeddings:
+        scores = {name: cosine_similarity([embedding], kw).max() for name, kw in keyword_embeddings.items()}
+        scores['Other'] = 1 - max(scores.values())
+        rows.append(softmax(np.array(list(scores.values())) / temp))
+    return np.array(rows)
+
+def make_extractor(data, batch_size, temp=0.5):
+    df, embeddings_df, _, keyword_embeddings = data
+    return KeywordFeatureExtractorBoxPlots(df, embeddings_df, 'description_embeddings', KEYWORD_DICT,
+                                           keyword_embeddings, temp=temp, batch_size=batch_size)
+
+# Unit Tests
+@pytest.mark.parametrize('batch_size', [1, 7, 25, 4096])
+def test_chunked_scores_match_reference(data, batch_size):
+    _, _, embeddings, keyword_embeddings = data
+    scores = make_extractor(data, batch_size, temp=0.3).compute_scores()
+    np.testing.assert_allclose(scores, reference_scores(embeddings, keyword_embeddings, 0.3), atol=1e-5)
+
+def test_scores_are_float32_probabilities(data):
+    scores = make_extractor(data, batch_size=10).compute_scores()
+    assert scores.dtype == np.float32
+    assert scores.shape == (25, len(KEYWORD_DICT) + 1)
+    np.testing.assert_allclose(scores.sum(axis=1), 1.0, atol=1e-5)
+
+def test_extract_features_keeps_selected_columns(data):
+    features = make_extractor(data, batch_size=10).extract_features(columns_to_keep=['original_listed_time'])
+    assert list(features.columns) == ['original_listed_time'] + list(KEYWORD_DICT) + ['Other']
+    assert (features[list(KEYWORD_DICT)].dtypes == np.float32).all()
+
+def test_extract_features_keeps_all_columns_by_default(data):
+    features = make_extractor(data, batch_size=10).extract_features()
+    assert {'original_listed_time', 'title', 'Other'} <= set(features.columns)
+    assert len(features) == 25
+
+def test_missing_embeddings_column_raises(data):
+    df, _, _, keyword_embeddings = data
+    extractor = KeywordFeatureExtractorBoxPlots(df, pd.DataFrame({'other': [1]}), 'description_embeddings',
+                                                KEYWORD_DICT, keyword_embeddings)
+    with pytest.raises(KeyError):
+        extractor.extract_features()
+
+def test_feature_without_keyword_embeddings_raises(data):
+    df, embeddings_df, _, keyword_embeddings = data
+    keyword_embeddings = dict(keyword_embeddings, Marketing=np.empty((0, 8)))
+    extractor = KeywordFeatureExtractorBoxPlots(df, embeddings_df, 'description_embeddings',
+                                                KEYWORD_DICT, keyword_embeddings)
+    with pytest.raises(ValueError):
+        extractor.extract_features()
+
+def test_memory_mapped_embeddings_match_dataframe(data, tmp_path):
+    df, _, embeddings, keyword_embeddings = data
+    path = tmp_path / 'embeddings.npy'
+    np.save(path, embeddings.astype(np.float32))
+    extractor = KeywordFeatureExtractorBoxPlots(df, np.load(path, mmap_mode='r'), 'description_embeddings',
+                                                KEYWORD_DICT, keyword_embeddings, temp=0.3, batch_size=7)
+    np.testing.assert_allclose(extractor.compute_scores(), make_extractor(data, 7, temp=0.3).compute_scores(),
+                               atol=1e-6)
@@ -1,10 +1,14 @@
+import io
 import os
 import sys
+import shutil
+import sqlite3
 import pytest
 import pandas as pd
 import unittest
 from datetime import datetime
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # Add the src folder to the Python path
 current_dir = os.path.dirname(__file__)
@@ -16,10 +20,13 @@ src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
 sys.path.insert(0, src_dir)
 
 from modules import DatasetRegistry  # Make sure to import the class correctly
+from modules import read_dataset
 
 # Constants for testing
 BASE_FOLDER = './test_base_folder'
-REGISTRY_FILE = Path(BASE_FOLDER) / 'registry.csv'
+REGISTRY_FILE = Path(BASE_FOLDER) / 'registry.db'
+
+EMBEDDINGS = pd.DataFrame({"description_embeddings": [[0.1, 0.2], [0.3, 0.4]]})
 
 # Utility function to create a temporary project folder
 def setup_module():
@@ -28,15 +35,8 @@ def setup_module():
 
 def teardown_module():
     if os.path.exists(BASE_FOLDER):
-        # Iterate over the directory to remove files and subdirectories
-        for folder in Path(BASE_FOLDER).iterdir():
-            if folder.is_dir():
-                for file in folder.iterdir():
-                    file.unlink()  # Remove each file
-                folder.rmdir()  # Remove the subdirectory
-            else:
-                folder.unlink()  # If it's a file, remove it
-        os.rmdir(BASE_FOLDER)  # Finally, remove the base folder
+        # Remove the project folders and the registry database
+        shutil.rmtree(BASE_FOLDER)
 
 # Unit tests using pytest
 @pytest.fixture
@@ -48,7 +48,7 @@ def test_save_dataset_new(dataset_registry):
     df = pd.DataFrame({"col1": [1, 2], "col2": [3, 4]})
     
     # Save dataset
-    result = dataset_registry.save_dataset(df, "test_dataset.csv", "test_project")
+    result = dataset_registry.save_dataset(df, EMBEDDINGS, "test_dataset.csv", "test_project")
     
     assert "Dataset or connection saved successfully" in result
     assert (Path(BASE_FOLDER) / "test_project" / "test_dataset.csv").exists()
@@ -58,26 +58,26 @@ def test_save_existing_dataset(dataset_registry):
     df = pd.DataFrame({"col1": [1, 2], "col2": [3, 4]})
     
     # Save dataset first time
-    dataset_registry.save_dataset(df, "test_dataset.csv", "test_project")
+    dataset_registry.save_dataset(df, EMBEDDINGS, "test_dataset.csv", "test_project")
     
     # Try saving the same dataset again
-    result = dataset_registry.save_dataset(df, "test_dataset.csv", "test_project")
+    result = dataset_registry.save_dataset(df, EMBEDDINGS, "test_dataset.csv", "test_project")
     
-    assert "Error: A dataset with the name test_dataset.csv already exists." in result
+    assert "Error: A dataset with the name test_dataset.csv already exists" in result
 
 def test_save_connection(dataset_registry):
     db_connection = {"host": "localhost", "port": 5432, "dbname": "test_db"}
     
     # Ensure that the connection file does not exist
-    connection_file = Path(BASE_FOLDER) / "test_project" / "test_db_connection_connection.json"
+    connection_file = Path(BASE_FOLDER) / "test_project" / "test_db_connection" / "test_db_connection_connection.json"
     if connection_file.exists():
-        connection_file.unlink()
+        dataset_registry.remove_dataset("test_project", "test_db_connection")
 
     # Save database connection
-    result = dataset_registry.save_dataset(None, "test_db_connection", "test_project", db_connection=db_connection)
+    result = dataset_registry.save_dataset(None, None, "test_db_connection", "test_project", db_connection=db_connection)
     
     assert "Dataset or connection saved successfully" in result
-    assert (Path(BASE_FOLDER) / "test_project" / "test_db_connection_connection.json").exists()
+    assert (Path(BASE_FOLDER) / "test_project" / "test_db_connection" / "test_db_connection_connection.json").exists()
 
 def test_save_connection_unique_filename(dataset_registry):
     db_connection = {"host": "localhost", "port": 5432, "dbname": "test_db"}
@@ -86,17 +86,17 @@ def test_save_connection_unique_filename(dataset_registry):
     connection_name = f"test_db_connection_{datetime.now().strftime('%Y%m%d%H%M%S')}"
     
     # Save database connection
-    result = dataset_registry.save_dataset(None, connection_name, "test_project", db_connection=db_connection)
+    result = dataset_registry.save_dataset(None, None, connection_name, "test_project", db_connection=db_connection)
     
     assert "Dataset or connection saved successfully" in result
-    assert (Path(BASE_FOLDER) / "test_project" / f"{connection_name}_connection.json").exists()
+    assert (Path(BASE_FOLDER) / "test_project" / connection_name / f"{connection_name}_connection.json").exists()
 
 def test_remove_dataset(dataset_registry):
     # Create a simple DataFrame
     df = pd.DataFrame({"col1": [1, 2], "col2": [3, 4]})
     
     # Save dataset
-    dataset_registry.save_dataset(df, "test_dataset.csv", "test_project")
+    dataset_registry.save_dataset(df, EMBEDDINGS, "test_dataset.csv", "test_project")
     
     # Remove dataset
     result = dataset_registry.remove_dataset("test_project", "test_dataset.csv")
@@ -109,28 +109,139 @@ def test_remove_non_existing_dataset(dataset_registry):
     assert "Error: Dataset non_existing_dataset.csv not found in project test_project." in result
 
 def test_get_existing_projects(dataset_registry):
-    # Create a project folder manually for testing
-    project_folder = Path(BASE_FOLDER) / "existing_project"
-    project_folder.mkdir(parents=True, exist_ok=True)
-    
-    # Retrieve existing projects
+    df = pd.DataFrame({"col1": [1, 2], "col2": [3, 4]})
+    dataset_registry.save_dataset(df, EMBEDDINGS, "existing_dataset", "existing_project")
+
+    # Retrieve existing projects from the registry
     projects = dataset_registry.get_existing_projects()
-    
+
     assert "existing_project" in projects
-    project_folder.rmdir()
+    dataset_registry.remove_dataset("existing_project", "existing_dataset")
 
 def test_get_datasets_in_project(dataset_registry):
-    # Create a project folder and dataset file manually for testing
-    project_folder = Path(BASE_FOLDER) / "existing_project"
-    project_folder.mkdir(parents=True, exist_ok=True)
-    dataset_file = project_folder / "existing_dataset.csv"
-    dataset_file.write_text("col1,col2\n1,2\n3,4\n")
-    
+    df = pd.DataFrame({"col1": [1, 2], "col2": [3, 4]})
+    dataset_registry.save_dataset(df, EMBEDDINGS, "existing_dataset.csv", "existing_project")
+
     datasets = dataset_registry.get_datasets_in_project("existing_project")
-    
+
     assert "existing_dataset.csv" in datasets
-    dataset_file.unlink()
-    project_folder.rmdir()
+    dataset_registry.remove_dataset("existing_project", "existing_dataset.csv")
+    assert dataset_registry.get_datasets_in_project("existing_project") == []
+
+def test_registry_records_dataset_metadata(tmp_path):
+    registry = DatasetRegistry(None, "p", "d", str(tmp_path), tmp_path / "registry.db")
+    df = pd.DataFrame({"col1": [1, 2, 3]})
+    registry.save_dataset(df, EMBEDDINGS, "sized", "p", embedding_model="all-mpnet-base-v2")
+
+    info = registry.get_dataset_info("p", "sized")
+    dataset_file = tmp_path / "p" / "sized" / "sized.parquet"
+
+    assert info["n_rows"] == 3
+    assert info["n_bytes"] == dataset_file.stat().st_size + (tmp_path / "p" / "sized" / "embeddings.parquet").stat().st_size
+    assert info["embedding_model"] == "all-mpnet-base-v2"
+    assert info["content_hash"] == DatasetRegistry.content_hash(dataset_file)
+    assert info["is_database"] is False
+    assert registry.get_dataset_info("p", "missing") is None
+
+def test_registry_uses_wal_mode(tmp_path):
+    DatasetRegistry(None, "p", "d", str(tmp_path), tmp_path / "registry.db")
+    with sqlite3.connect(tmp_path / "registry.db") as connection:
+        assert connection.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+def test_failed_save_rolls_back_entry(tmp_path):
+    registry = DatasetRegistry(None, "p", "d", str(tmp_path), tmp_path / "registry.db")
+    result = registry.save_dataset(pd.DataFrame({"col1": [1]}), None, "broken", "p")
+
+    assert "Error" in result
+    assert registry.get_datasets_in_project("p") == []
+    assert not (tmp_path / "p" / "broken" / "broken.parquet").exists()
+
+def test_concurrent_saves_keep_all_entries(tmp_path):
+    df = pd.DataFrame({"col1": [1, 2]})
+
+    def save(i):
+        # Every session uses its own registry instance, as separate Streamlit sessions do
+        registry = DatasetRegistry(None, "p", "d", str(tmp_path), tmp_path / "registry.db")
+        return registry.save_dataset(df, EMBEDDINGS, f"dataset_{i}", "p")
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(save, range(16)))
+
+    registry = DatasetRegistry(None, "p", "d", str(tmp_path), tmp_path / "registry.db")
+    assert all("saved successfully" in result for result in results)
+    assert registry.get_datasets_in_project("p") == sorted(f"dataset_{i}" for i in range(16))
+
+def test_new_registry_registers_existing_folders(tmp_path):
+    (tmp_path / "legacy_project" / "legacy_dataset").mkdir(parents=True)
+    (tmp_path / "legacy_project" / "legacy_dataset" / "legacy_dataset.csv").write_text("col1\n1\n")
+
+    registry = DatasetRegistry(None, "p", "d", str(tmp_path), tmp_path / "registry.db")
+
+    assert registry.get_existing_projects() == ["legacy_project"]
+    assert registry.get_datasets_in_project("legacy_project") == ["legacy_dataset"]
+
+def test_identical_content_is_stored_once(tmp_path):
+    registry = DatasetRegistry(None, "p", "d", str(tmp_path), tmp_path / "registry.db")
+    df = pd.DataFrame({"col1": [1, 2]})
+    registry.save_dataset(df, EMBEDDINGS, "first", "project_a")
+    registry.save_dataset(df, EMBEDDINGS, "second", "project_b")
+
+    first = registry.get_dataset_info("project_a", "first")
+    second = registry.get_dataset_info("project_b", "second")
+    blobs = [path for path in (tmp_path / DatasetRegistry.BLOBS_FOLDER).rglob("*") if path.is_file()]
+
+    assert first["content_hash"] == second["content_hash"]
+    assert len(blobs) == 2  # one dataset blob and one embeddings blob
+    pd.testing.assert_frame_equal(read_dataset(str(tmp_path / "project_b" / "second" / "second.parquet")), df)
+
+def test_known_upload_reuses_stored_content(tmp_path):
+    registry = DatasetRegistry(None, "p", "d", str(tmp_path), tmp_path / "registry.db")
+    upload = io.BytesIO(b"col1\n1\n2\n")
+    source_hash = DatasetRegistry.hash_upload(upload)
+    registry.save_dataset(pd.DataFrame({"col1": [1, 2]}), EMBEDDINGS, "upload.csv", "project_a",
+                          embedding_model="all-mpnet-base-v2", source_hash=source_hash)
+
+    assert upload.read() == b"col1\n1\n2\n"  # hashing does not consume the upload
+    assert registry.find_content(source_hash)["dataset_name"] == "upload.csv"
+
+    result = registry.save_dataset(None, None, "upload.csv", "project_b", source_hash=source_hash)
+    info = registry.get_dataset_info("project_b", "upload.csv")
+
+    assert "saved successfully" in result
+    assert info["n_rows"] == 2
+    assert info["embedding_model"] == "all-mpnet-base-v2"
+    assert (tmp_path / "project_b" / "upload.csv" / "embeddings.parquet").exists()
+
+def test_unknown_upload_without_content_fails(tmp_path):
+    registry = DatasetRegistry(None, "p", "d", str(tmp_path), tmp_path / "registry.db")
+    result = registry.save_dataset(None, None, "upload.csv", "p", source_hash="unknown")
+    assert "Error" in result
+    assert registry.get_datasets_in_project("p") == []
+
+def test_blobs_are_collected_when_unreferenced(tmp_path):
+    registry = DatasetRegistry(None, "p", "d", str(tmp_path), tmp_path / "registry.db")
+    df = pd.DataFrame({"col1": [1, 2]})
+    registry.save_dataset(df, EMBEDDINGS, "first", "project_a")
+    registry.save_dataset(df, EMBEDDINGS, "second", "project_b")
+    blob = registry.blob_path(registry.get_dataset_info("project_a", "first")["content_hash"])
+
+    registry.remove_dataset("project_a", "first")
+    assert blob.exists()
+    assert (tmp_path / "project_b" / "second" / "second.parquet").exists()
+
+    registry.remove_dataset("project_b", "second")
+    assert not blob.exists()
+    assert not [path for path in (tmp_path / DatasetRegistry.BLOBS_FOLDER).rglob("*") if path.is_file()]
+
+def test_export_dataset_csv(tmp_path):
+    registry = DatasetRegistry(None, "p", "d", str(tmp_path), tmp_path / "registry.db")
+    df = pd.DataFrame({"col1": [1, 2]})
+    registry.save_dataset(df, EMBEDDINGS, "exported", "p")
+
+    dataset_file, embeddings_file = registry.export_dataset_csv("p", "exported", str(tmp_path / "export"))
+
+    pd.testing.assert_frame_equal(pd.read_csv(dataset_file), df)
+    assert pd.read_csv(embeddings_file)["description_embeddings"].tolist() == ["[0.1, 0.2]", "[0.3, 0.4]"]
 
 # Integration tests using unittest
 import unittest
@@ -151,7 +262,7 @@ class TestDatasetRegistry(unittest.TestCase):
     def test_save_and_remove_dataset(self):
         # Create a DataFrame and save it
         df = pd.DataFrame({"col1": [1, 2], "col2": [3, 4]})
-        save_result = self.registry.save_dataset(df, "test_dataset.csv", "test_project")
+        save_result = self.registry.save_dataset(df, EMBEDDINGS, "test_dataset.csv", "test_project")
         self.assertIn("Dataset or connection saved successfully", save_result)
         self.assertTrue((Path(BASE_FOLDER) / "test_project" / "test_dataset.csv").exists())
 
@@ -164,27 +275,25 @@ class TestDatasetRegistry(unittest.TestCase):
         db_connection = {"host": "localhost", "port": 5432, "dbname": "test_db"}
         
         # Ensure that the connection file does not exist before saving
-        connection_file = Path(BASE_FOLDER) / "test_project" / "test_db_connection_connection.json"
+        connection_file = Path(BASE_FOLDER) / "test_project" / "test_db_connection" / "test_db_connection_connection.json"
         if connection_file.exists():
-            connection_file.unlink()
+            self.registry.remove_dataset("test_project", "test_db_connection")
 
-        save_result = self.registry.save_dataset(None, "test_db_connection", "test_project", db_connection=db_connection)
+        save_result = self.registry.save_dataset(None, None, "test_db_connection", "test_project", db_connection=db_connection)
         self.assertIn("Dataset or connection saved successfully", save_result)
         
         # Check if the connection file is created
-        connection_file = Path(BASE_FOLDER) / "test_project" / "test_db_connection_connection.json"
+        connection_file = Path(BASE_FOLDER) / "test_project" / "test_db_connection" / "test_db_connection_connection.json"
         self.assertTrue(connection_file.exists())
         
         # Check if the registry is updated
-        registry_df = pd.read_csv(REGISTRY_FILE)
-        self.assertGreater(len(registry_df), 0)
+        self.assertIn("test_db_connection", self.registry.get_datasets_in_project("test_project"))
+        self.assertTrue(self.registry.get_dataset_info("test_project", "test_db_connection")["is_database"])
 
     def test_get_projects_and_datasets(self):
-        # Manually create a project and dataset
-        project_folder = Path(BASE_FOLDER) / "new_project"
-        project_folder.mkdir(parents=True, exist_ok=True)
-        dataset_file = project_folder / "new_dataset.csv"
-        dataset_file.write_text("col1,col2\n1,2\n3,4\n")
+        # Register a project and dataset
+        df = pd.DataFrame({"col1": [1, 2], "col2": [3, 4]})
+        self.registry.save_dataset(df, EMBEDDINGS, "new_dataset.csv", "new_project")
         
         # Test get existing projects
         projects = self.registry.get_existing_projects()
@@ -195,8 +304,7 @@ class TestDatasetRegistry(unittest.TestCase):
         self.assertIn("new_dataset.csv", datasets)
 
         # Cleanup
-        dataset_file.unlink()
-        project_folder.rmdir()
+        self.registry.remove_dataset("new_project", "new_dataset.csv")
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,123 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+from unittest import mock
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.dataset_cache import DatasetCache
+from modules.dataset_storage import write_dataset, write_embeddings, read_dataset
+
+@pytest.fixture
+def dataset_file(tmp_path):
+    path = str(tmp_path / 'jobs.parquet')
+    write_dataset(pd.DataFrame({'job_id': ['1', '2', '3'], 'description': ['a', 'b', 'c']}), path)
+    return path
+
+def frame(n_bytes):
+    return pd.DataFrame({'x': np.zeros(n_bytes // 8)})
+
+# Unit Tests
+def test_hit_after_miss():
+    cache = DatasetCache()
+    calls = []
+    load = lambda: calls.append(1) or 'value'
+    assert cache.get_or_load(('a',), 1, load) == 'value'
+    assert cache.get_or_load(('a',), 1, load) == 'value'
+    assert len(calls) == 1
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (1, 1)
+
+def test_new_version_replaces_entry():
+    cache = DatasetCache()
+    cache.get_or_load(('a',), 1, lambda: frame(800))
+    assert cache.get_or_load(('a',), 2, lambda: 'new') == 'new'
+    assert cache.stats()['entries'] == 1
+    assert cache.bytes == DatasetCache.size_of('new')
+
+def test_lru_eviction_within_budget():
+    cache = DatasetCache(max_bytes=DatasetCache.size_of(frame(800)) * 2)
+    cache.get_or_load(('a',), 1, lambda: frame(800))
+    cache.get_or_load(('b',), 1, lambda: frame(800))
+    cache.get_or_load(('a',), 1, lambda: None)  # 'a' is now the most recently used
+    cache.get_or_load(('c',), 1, lambda: frame(800))
+
+    assert cache.stats()['evictions'] == 1
+    assert isinstance(cache.get_or_load(('a',), 1, lambda: 'reloaded'), pd.DataFrame)
+    assert cache.get_or_load(('b',), 1, lambda: 'reloaded') == 'reloaded'
+    assert cache.bytes <= cache.max_bytes
+
+def test_value_larger_than_budget_is_not_cached():
+    cache = DatasetCache(max_bytes=100)
+    cache.get_or_load(('a',), 1, lambda: frame(8000))
+    assert cache.stats()['entries'] == 0
+    assert cache.bytes == 0
+
+def test_memmap_counts_as_zero_bytes(tmp_path):
+    path = tmp_path / 'matrix.npy'
+    np.save(path, np.zeros((100, 8), dtype=np.float32))
+    assert DatasetCache.size_of(np.load(path, mmap_mode='r')) == 0
+    assert DatasetCache.size_of(np.zeros((100, 8), dtype=np.float32)) == 3200
+
+def test_shared_instance():
+    assert DatasetCache.shared() is DatasetCache.shared()
+
+# Integration Tests
+def test_read_dataset_is_cached_until_the_file_changes(dataset_file):
+    cache = DatasetCache()
+    first = cache.read_dataset(dataset_file, columns=['job_id'])
+    first['extra'] = 1
+    second = cache.read_dataset(dataset_file, columns=['job_id'])
+    assert list(second.columns) == ['job_id']
+    assert cache.stats()['hits'] == 1
+
+    write_dataset(pd.DataFrame({'job_id': ['4'], 'description': ['d']}), dataset_file)
+    os.utime(dataset_file, ns=(0, os.stat(dataset_file).st_mtime_ns + 10 ** 9))
+    assert cache.read_dataset(dataset_file, columns=['job_id'])['job_id'].tolist() == ['4']
+
+def test_read_dataset_shares_columns_between_projections(dataset_file):
+    cache = DatasetCache()
+    with mock.patch('modules.dataset_cache.read_dataset', wraps=read_dataset) as read:
+        cache.read_dataset(dataset_file, columns=['description'])
+        both = cache.read_dataset(dataset_file, columns=['job_id', 'description', 'not_a_column'])
+        full = cache.read_dataset(dataset_file)
+        assert cache.read_dataset(dataset_file, columns=['job_id'])['job_id'].tolist() == ['1', '2', '3']
+
+    # Each column is read from the file once
+    assert [call.kwargs['columns'] for call in read.call_args_list] == [['description'], ['job_id']]
+    assert list(both.columns) == ['job_id', 'description']
+    pd.testing.assert_frame_equal(full, read_dataset(dataset_file))
+    assert (cache.stats()['hits'], cache.stats()['misses']) == (2, 2)
+
+def test_read_dataset_of_csv(tmp_path):
+    path = str(tmp_path / 'jobs.csv')
+    pd.DataFrame({'job_id': [1, 2], 'description': ['a', 'b']}).to_csv(path, index=False)
+    cache = DatasetCache()
+    cache.read_dataset(path, columns=['description'])
+    pd.testing.assert_frame_equal(cache.read_dataset(path), pd.read_csv(path))
+
+def test_listdir_refreshes_when_entries_change(tmp_path):
+    cache = DatasetCache()
+    (tmp_path / 'a').mkdir()
+    assert cache.listdir(str(tmp_path)) == ['a']
+    assert cache.listdir(str(tmp_path)) == ['a']
+    (tmp_path / 'b').mkdir()
+    os.utime(tmp_path, ns=(0, os.stat(tmp_path).st_mtime_ns + 10 ** 9))
+    assert cache.listdir(str(tmp_path)) == ['a', 'b']
+    assert cache.stats()['hits'] == 1
+
+def test_embedding_store_is_shared(tmp_path):
+    write_embeddings(pd.DataFrame({'description_embeddings': list(np.eye(3, dtype=np.float32))}),
+                     str(tmp_path / 'embeddings.parquet'))
+    cache = DatasetCache()
+    store = cache.embedding_store(str(tmp_path), str(tmp_path / 'embeddings.parquet'))
+    assert cache.embedding_store(str(tmp_path), str(tmp_path / 'embeddings.parquet')) is store
+    assert cache.embedding_store(str(tmp_path), str(tmp_path / 'embeddings.parquet'), dtype='float16') is not store
@@ -0,0 +1,108 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.dataset_storage import (to_typed_frame, write_dataset, write_embeddings, read_dataset, read_embeddings,
+                                     find_dataset_file, find_embeddings_file, export_csv)
+from modules.embedding_utils import parse_embeddings
+
+@pytest.fixture
+def postings():
+    return pd.DataFrame({
+        'job_id': [1, 2, 3],
+        'description': ['python developer', 'sales manager', 'data engineer'],
+        'language': ['en', 'nl', 'en'],
+        'location': ['Amsterdam', 'Utrecht', 'Amsterdam'],
+        'company_name': ['A', 'B', 'A'],
+        'original_listed_time': ['2023-01-05', '2023-02-10', 'not a date'],
+    })
+
+@pytest.fixture
+def embeddings_df():
+    return pd.DataFrame({'description_embeddings': [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6], [0.7, 0.8, 0.9]]})
+
+# Unit Tests
+def test_to_typed_frame_casts_known_columns(postings):
+    typed = to_typed_frame(postings)
+    assert isinstance(typed['language'].dtype, pd.CategoricalDtype)
+    assert isinstance(typed['company_name'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(typed['original_listed_time'])
+    assert pd.isna(typed['original_listed_time'].iloc[2])
+    assert not isinstance(postings['language'].dtype, pd.CategoricalDtype)  # input is left untouched
+
+def test_parquet_roundtrip_keeps_types(tmp_path, postings):
+    path = write_dataset(postings, str(tmp_path / 'postings.parquet'))
+    loaded = read_dataset(path)
+    assert list(loaded.columns) == list(postings.columns)
+    assert isinstance(loaded['location'].dtype, pd.CategoricalDtype)
+    assert loaded['original_listed_time'].iloc[1] == pd.Timestamp('2023-02-10')
+
+@pytest.mark.parametrize('extension', ['.parquet', '.csv'])
+def test_read_dataset_projects_columns(tmp_path, postings, extension):
+    path = str(tmp_path / f'postings{extension}')
+    if extension == '.parquet':
+        write_dataset(postings, path)
+    else:
+        postings.to_csv(path, index=False)
+    loaded = read_dataset(path, columns=['description', 'CreatedAt'])
+    assert list(loaded.columns) == ['description']
+    assert loaded['description'].tolist() == postings['description'].tolist()
+
+@pytest.mark.parametrize('extension', ['.parquet', '.csv'])
+def test_embeddings_roundtrip(tmp_path, embeddings_df, extension):
+    path = str(tmp_path / f'embeddings{extension}')
+    if extension == '.parquet':
+        write_embeddings(embeddings_df, path)
+    else:
+        embeddings_df.to_csv(path, index=False)
+    matrix = parse_embeddings(read_embeddings(path)['description_embeddings'])
+    np.testing.assert_allclose(matrix, np.array(embeddings_df['description_embeddings'].tolist()), rtol=1e-6)
+    assert matrix.dtype == np.float32
+
+def test_find_files_prefer_parquet(tmp_path, postings, embeddings_df):
+    folder = tmp_path / 'jobs.csv'
+    folder.mkdir()
+    postings.to_csv(folder / 'jobs.csv.csv', index=False)
+    embeddings_df.to_csv(folder / 'embeddings.csv', index=False)
+    assert find_dataset_file(str(folder)).endswith('jobs.csv.csv')
+    assert find_embeddings_file(str(folder)).endswith('embeddings.csv')
+
+    write_dataset(postings, str(folder / 'jobs.csv.parquet'))
+    write_embeddings(embeddings_df, str(folder / 'embeddings.parquet'))
+    assert find_dataset_file(str(folder)).endswith('jobs.csv.parquet')
+    assert find_embeddings_file(str(folder)).endswith('embeddings.parquet')
+
+def test_find_dataset_file_falls_back_to_any_csv(tmp_path, postings):
+    postings.to_csv(tmp_path / 'legacy_export.csv', index=False)
+    assert find_dataset_file(str(tmp_path)).endswith('legacy_export.csv')
+
+def test_find_files_missing(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        find_dataset_file(str(tmp_path))
+    with pytest.raises(FileNotFoundError):
+        find_embeddings_file(str(tmp_path))
+
+# Integration Tests
+def test_export_csv(tmp_path, postings, embeddings_df):
+    folder = tmp_path / 'jobs'
+    folder.mkdir()
+    write_dataset(postings, str(folder / 'jobs.parquet'))
+    write_embeddings(embeddings_df, str(folder / 'embeddings.parquet'))
+
+    dataset_file, embeddings_file = export_csv(str(folder), str(tmp_path / 'export'))
+
+    exported = pd.read_csv(dataset_file)
+    assert exported['description'].tolist() == postings['description'].tolist()
+    matrix = parse_embeddings(pd.read_csv(embeddings_file)['description_embeddings'])
+    np.testing.assert_allclose(matrix, np.array(embeddings_df['description_embeddings'].tolist()), rtol=1e-6)
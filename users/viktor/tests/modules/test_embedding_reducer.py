@@ -0,0 +1,74 @@
+import pytest
+from unittest import mock
+import numpy as np
+import os
+import sys
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules import EmbeddingReducer
+
+@pytest.fixture
+def embeddings():
+    return np.random.default_rng(0).normal(size=(200, 32)).astype(np.float32)
+
+# Unit Tests
+def test_invalid_method():
+    with pytest.raises(ValueError):
+        EmbeddingReducer(method='tsne')
+
+def test_invalid_components():
+    with pytest.raises(ValueError):
+        EmbeddingReducer(n_components=0)
+
+@pytest.mark.parametrize('method', ['pca', 'svd', 'matryoshka'])
+def test_fit_transform_shape(embeddings, method):
+    reduced = EmbeddingReducer(method=method, n_components=8).fit_transform(embeddings)
+    assert reduced.shape == (200, 8)
+
+def test_transform_matches_fit_transform(embeddings):
+    reducer = EmbeddingReducer('pca', 8)
+    reduced = reducer.fit_transform(embeddings)
+    assert np.allclose(reducer.transform(embeddings[:5]), reduced[:5], atol=1e-4)
+
+def test_transform_before_fit(embeddings):
+    with pytest.raises(ValueError):
+        EmbeddingReducer('pca', 8).transform(embeddings)
+
+def test_matryoshka_rows_are_normalized(embeddings):
+    reduced = EmbeddingReducer('matryoshka', 8).fit_transform(embeddings)
+    assert np.allclose(np.linalg.norm(reduced, axis=1), 1.0, atol=1e-5)
+
+# Integration Tests
+def test_cached_reduction_is_reused(embeddings, tmp_path):
+    first = EmbeddingReducer('pca', 8, cache_folder=str(tmp_path)).fit_transform(embeddings)
+    assert os.path.isfile(tmp_path / 'reduced_embeddings_pca_8.npz')
+
+    reducer = EmbeddingReducer('pca', 8, cache_folder=str(tmp_path))
+    with mock.patch.object(EmbeddingReducer, 'fit') as mocked_fit:
+        second = reducer.fit_transform(embeddings)
+        mocked_fit.assert_not_called()
+    assert np.allclose(first, second)
+    assert reducer.components_ is not None
+
+def test_cache_refreshed_for_different_data(embeddings, tmp_path):
+    EmbeddingReducer('pca', 8, cache_folder=str(tmp_path)).fit_transform(embeddings)
+    reduced = EmbeddingReducer('pca', 8, cache_folder=str(tmp_path)).fit_transform(embeddings[:100])
+    assert reduced.shape == (100, 8)
+    with np.load(tmp_path / 'reduced_embeddings_pca_8.npz') as cached:
+        assert cached['reduced'].shape == (100, 8)
+
+def test_save_and_load(embeddings, tmp_path):
+    reducer = EmbeddingReducer('svd', 8)
+    reducer.fit(embeddings)
+    path = reducer.save(str(tmp_path / 'reducer.npz'))
+    loaded = EmbeddingReducer.load(path)
+    assert loaded.method == 'svd'
+    assert np.allclose(loaded.transform(embeddings), reducer.transform(embeddings))
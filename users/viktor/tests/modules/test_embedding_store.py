@@ -0,0 +1,139 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.embedding_store import EmbeddingStore, normalize_job_ids
+from modules.embedding_utils import parse_embeddings
+from modules.dataset_storage import write_dataset, write_embeddings
+from modules.word_clouds import WordCloudGenerator
+from modules.quantization import QuantizedEmbeddings
+
+@pytest.fixture
+def matrix():
+    return np.random.default_rng(0).normal(size=(50, 8)).astype(np.float32)
+
+@pytest.fixture
+def store(tmp_path, matrix):
+    path = EmbeddingStore.write(str(tmp_path / 'embeddings.npy'), matrix, job_ids=[f'job{i}' for i in range(50)])
+    return EmbeddingStore(path, EmbeddingStore.job_ids_path(path))
+
+# Unit Tests
+def test_store_is_read_only_memmap(store, matrix):
+    assert isinstance(store.matrix, np.memmap)
+    assert not store.matrix.flags.writeable
+    assert store.shape == (50, 8)
+    np.testing.assert_array_equal(store.matrix, matrix)
+
+def test_parse_embeddings_does_not_copy_memmap(store):
+    assert parse_embeddings(store.matrix) is store.matrix
+
+def test_iter_blocks_are_page_aligned_views(store, matrix):
+    blocks = list(store.iter_blocks(batch_size=10))
+    row_bytes = matrix.shape[1] * matrix.itemsize
+    assert all(start * row_bytes % 4096 == 0 for start, _ in blocks)
+    assert all(np.shares_memory(block, store.matrix) for _, block in blocks)
+    np.testing.assert_array_equal(np.vstack([block for _, block in blocks]), matrix)
+
+def test_gather_by_job_id(store, matrix):
+    np.testing.assert_array_equal(store.gather(['job7', 'job2']), matrix[[7, 2]])
+    with pytest.raises(KeyError):
+        store.gather(['unknown'])
+
+def test_gather_without_job_ids(tmp_path, matrix):
+    store = EmbeddingStore(EmbeddingStore.write(str(tmp_path / 'embeddings.npy'), matrix))
+    with pytest.raises(KeyError):
+        store.gather(['job1'])
+
+def test_normalize_job_ids():
+    expected = ['1', '2', '3']
+    assert normalize_job_ids([1, 2, 3]).tolist() == expected
+    assert normalize_job_ids([1.0, 2.0, 3.0]).tolist() == expected
+    assert normalize_job_ids(np.array(['1', 2, 3.0], dtype=object)).tolist() == expected
+    assert normalize_job_ids([1.5, np.nan]).tolist() == ['1.5', 'nan']
+
+def test_gather_with_float_job_ids(tmp_path, matrix):
+    # A job_id column read as float, e.g. because of missing values
+    path = EmbeddingStore.write(str(tmp_path / 'embeddings.npy'), matrix, job_ids=np.arange(50, dtype=float))
+    store = EmbeddingStore(path, EmbeddingStore.job_ids_path(path))
+    np.testing.assert_array_equal(store.gather([1, '2', 3.0]), matrix[[1, 2, 3]])
+
+def test_duplicate_job_ids_are_rejected(tmp_path, matrix):
+    job_ids = [f'job{i}' for i in range(49)] + ['job0']
+    with pytest.raises(ValueError):
+        EmbeddingStore.write(str(tmp_path / 'embeddings.npy'), matrix, job_ids=job_ids)
+
+    # Stores written before duplicates were rejected raise KeyError
+    path = EmbeddingStore.write(str(tmp_path / 'embeddings.npy'), matrix)
+    np.save(EmbeddingStore.job_ids_path(path), np.array(job_ids))
+    with pytest.raises(KeyError):
+        EmbeddingStore(path, EmbeddingStore.job_ids_path(path)).gather(['job1'])
+
+def test_wordcloud_normalized_sum_matches_cosine_sum(matrix):
+    keyword = np.random.default_rng(1).normal(size=8)
+    cosine_sum = sum(row @ keyword / (np.linalg.norm(row) * np.linalg.norm(keyword)) for row in matrix)
+    document_sum = WordCloudGenerator._normalized_sum(matrix, batch_size=7)
+    assert keyword / np.linalg.norm(keyword) @ document_sum == pytest.approx(cosine_sum, rel=1e-5)
+
+# Integration Tests
+def test_for_folder_builds_matrix_from_parquet(tmp_path, matrix):
+    folder = tmp_path / 'jobs'
+    folder.mkdir()
+    write_dataset(pd.DataFrame({'job_id': [f'job{i}' for i in range(50)]}), str(folder / 'jobs.parquet'))
+    write_embeddings(pd.DataFrame({'description_embeddings': list(matrix)}), str(folder / 'embeddings.parquet'))
+
+    store = EmbeddingStore.for_folder(str(folder))
+
+    assert os.path.isfile(folder / EmbeddingStore.MATRIX_FILE)
+    np.testing.assert_array_equal(store.matrix, matrix)
+    np.testing.assert_array_equal(store.gather(['job3']), matrix[[3]])
+
+def test_for_folder_skips_duplicate_job_ids(tmp_path, matrix):
+    folder = tmp_path / 'jobs'
+    folder.mkdir()
+    write_dataset(pd.DataFrame({'job_id': [i % 25 for i in range(50)]}), str(folder / 'jobs.parquet'))
+    write_embeddings(pd.DataFrame({'description_embeddings': list(matrix)}), str(folder / 'embeddings.parquet'))
+
+    store = EmbeddingStore.for_folder(str(folder))
+
+    np.testing.assert_array_equal(store.matrix, matrix)
+    with pytest.raises(KeyError):
+        store.gather([3])
+
+def test_for_folder_rebuilds_when_embeddings_change(tmp_path, matrix):
+    folder = tmp_path / 'jobs'
+    folder.mkdir()
+    pd.DataFrame({'description_embeddings': [str(row.tolist()) for row in matrix]}).to_csv(
+        folder / 'embeddings.csv', index=False)
+    EmbeddingStore.for_folder(str(folder))
+
+    pd.DataFrame({'description_embeddings': [str(row.tolist()) for row in matrix[:5]]}).to_csv(
+        folder / 'embeddings.csv', index=False)
+    os.utime(folder / 'embeddings.csv', (os.path.getmtime(folder / 'embeddings.npy') + 10,) * 2)
+
+    assert len(EmbeddingStore.for_folder(str(folder))) == 5
+
+def test_int8_store_scores_on_stored_form(tmp_path, matrix):
+    store = EmbeddingStore(EmbeddingStore.write(str(tmp_path / 'embeddings.npy'), matrix, dtype='int8'))
+    queries = matrix[:3]
+    expected = (matrix / np.linalg.norm(matrix, axis=1, keepdims=True)) @ (queries / np.linalg.norm(queries, axis=1, keepdims=True)).T
+    assert store.dtype == np.int8
+    assert isinstance(store.embeddings, QuantizedEmbeddings)
+    np.testing.assert_allclose(store.cosine_scores(queries, batch_size=7), expected, atol=0.02)
+
+def test_for_folder_rebuilds_for_other_dtype(tmp_path, matrix):
+    folder = tmp_path / 'jobs'
+    folder.mkdir()
+    write_embeddings(pd.DataFrame({'description_embeddings': list(matrix)}), str(folder / 'embeddings.parquet'))
+    assert EmbeddingStore.for_folder(str(folder)).dtype == np.float32
+    assert EmbeddingStore.for_folder(str(folder), dtype='float16').dtype == np.float16
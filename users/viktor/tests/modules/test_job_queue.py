@@ -0,0 +1,161 @@
+import pytest
+import time
+import sys
+import os
+import sqlite3
+from contextlib import closing
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.job_queue import JobQueue, report_progress
+
+# Jobs are pickled by reference, so they are module-level functions the workers can import
+def add(a, b):
+    return a + b
+
+def fail():
+    raise ValueError("boom")
+
+def report_until_cancelled():
+    for i in range(600):
+        report_progress(i / 600, f"step {i}")
+        time.sleep(0.1)
+    return "not cancelled"
+
+def kill_worker():
+    os._exit(1)
+
+@pytest.fixture
+def queue(tmp_path):
+    """A queue whose dispatcher is never started, to inspect the queue itself."""
+    queue = JobQueue(str(tmp_path / 'jobs.db'), max_workers=2, concurrency_limits={'esco_analysis': 1})
+    queue.start = lambda: None
+    return queue
+
+@pytest.fixture
+def running_queue(tmp_path):
+    queue = JobQueue(str(tmp_path / 'jobs.db'), max_workers=1, poll_interval=0.1)
+    yield queue
+    queue.shutdown(wait=False)
+
+# Unit Tests
+def test_submitted_job_is_queued(queue):
+    job_id = queue.submit('topic_modeling', add, 1, b=2)
+    job = queue.status(job_id)
+    assert (job['status'], job['progress'], job['job_type']) == ('queued', 0.0, 'topic_modeling')
+    assert job['description'] == 'add'
+    assert queue.status('unknown') is None
+
+def test_claims_respect_concurrency_limits(queue):
+    first = queue.submit('esco_analysis', add, 1, 2)
+    queue.submit('esco_analysis', add, 3, 4)
+    other = queue.submit('topic_modeling', add, 5, 6)
+    assert queue._claim() == first
+    assert queue._claim() == other
+    assert queue._claim() is None
+
+def test_cancel_queued_job(queue):
+    job_id = queue.submit('topic_modeling', add, 1, 2)
+    assert queue.cancel(job_id)
+    assert queue.status(job_id)['status'] == 'cancelled'
+    assert queue._claim() is None
+    assert not queue.cancel(job_id)
+
+def test_cancel_running_job_requests_cancellation(queue):
+    job_id = queue.submit('topic_modeling', add, 1, 2)
+    queue._claim()
+    assert queue.cancel(job_id)
+    job = queue.status(job_id)
+    assert (job['status'], job['cancel_requested']) == ('running', True)
+
+def test_eta_is_extrapolated_from_progress(queue):
+    job_id = queue.submit('topic_modeling', add, 1, 2)
+    started = (datetime.now() - timedelta(seconds=10)).isoformat()
+    with closing(queue._connect()) as connection:
+        connection.execute("UPDATE jobs SET status = 'running', started_at = ?, progress = 0.25 WHERE id = ?",
+                           (started, job_id))
+    assert queue.status(job_id)['eta'] == pytest.approx(30, abs=2)
+
+def test_eta_falls_back_to_earlier_durations(queue):
+    done = queue.submit('topic_modeling', add, 1, 2)
+    start = datetime.now() - timedelta(minutes=5)
+    with closing(queue._connect()) as connection:
+        connection.execute("UPDATE jobs SET status = 'completed', started_at = ?, finished_at = ? WHERE id = ?",
+                           (start.isoformat(), (start + timedelta(seconds=60)).isoformat(), done))
+    queued = queue.submit('topic_modeling', add, 1, 2)
+    assert queue.status(queued)['eta'] == pytest.approx(60, abs=1)
+    assert queue.status(queue.submit('esco_analysis', add, 1, 2))['eta'] is None
+
+def test_interrupted_jobs_are_marked_failed(queue):
+    job_id = queue.submit('topic_modeling', add, 1, 2)
+    queue._claim()
+    with closing(queue._connect()) as connection:
+        connection.execute("UPDATE jobs SET runner_pid = ? WHERE id = ?", (2 ** 22 + 1, job_id))
+    queue._recover_interrupted()
+    job = queue.status(job_id)
+    assert job['status'] == 'failed' and 'Interrupted' in job['error']
+
+def test_jobs_with_live_futures_are_not_recovered(queue):
+    running = queue.submit('topic_modeling', add, 1, 2)
+    orphaned = queue.submit('topic_modeling', add, 3, 4)
+    queue._claim()
+    queue._claim()
+    queue._futures = {running: Future()}
+    queue._recover_interrupted()
+    assert queue.status(running)['status'] == 'running'
+    assert queue.status(orphaned)['status'] == 'failed'
+
+def test_report_progress_outside_a_job_does_nothing():
+    report_progress(0.5, "not in a job")
+
+def test_shared_queue_per_file(tmp_path):
+    path = str(tmp_path / 'jobs.db')
+    assert JobQueue.shared(path) is JobQueue.shared(path)
+
+# Integration Tests
+def test_job_runs_in_worker(running_queue):
+    job = running_queue.wait(running_queue.submit('topic_modeling', add, 1, b=2), timeout=120)
+    assert (job['status'], job['result'], job['progress']) == ('completed', '3', 1.0)
+
+def test_failing_job_records_error(running_queue):
+    job = running_queue.wait(running_queue.submit('topic_modeling', fail), timeout=120)
+    assert job['status'] == 'failed'
+    assert job['error'] == 'ValueError: boom'
+
+def test_running_job_stops_at_progress_report(running_queue):
+    job_id = running_queue.submit('topic_modeling', report_until_cancelled)
+    deadline = time.monotonic() + 120
+    while running_queue.status(job_id)['progress'] == 0 and time.monotonic() < deadline:
+        time.sleep(0.1)
+    assert running_queue.status(job_id)['message'].startswith('step')
+    assert running_queue.cancel(job_id)
+    assert running_queue.wait(job_id, timeout=30)['status'] == 'cancelled'
+
+def test_dispatcher_survives_claim_errors(running_queue):
+    claim = running_queue._claim
+    errors = [sqlite3.OperationalError("database is locked")]
+
+    def flaky_claim():
+        if errors:
+            raise errors.pop()
+        return claim()
+
+    running_queue._claim = flaky_claim
+    job = running_queue.wait(running_queue.submit('topic_modeling', add, 1, 2), timeout=120)
+    assert job['status'] == 'completed' and not errors
+    assert running_queue._dispatcher.is_alive()
+
+def test_broken_pool_is_replaced(running_queue):
+    crashed = running_queue.wait(running_queue.submit('topic_modeling', kill_worker), timeout=120)
+    assert crashed['status'] == 'failed' and 'BrokenProcessPool' in crashed['error']
+    job = running_queue.wait(running_queue.submit('topic_modeling', add, 1, 2), timeout=120)
+    assert (job['status'], job['result']) == ('completed', '3')
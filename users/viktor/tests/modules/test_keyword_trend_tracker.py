@@ -0,0 +1,74 @@
+import pytest
+import json
+import os
+import sys
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules import KeywordTrendTracker, load_keyword_dictionaries
+
+@pytest.fixture
+def dictionaries():
+    return {
+        'Data': {'ml': ['machine learning', 'deep learning'], 'python': ['python']},
+        'Marketing': {'media': ['social media', 'media'], 'brand': ['brand']},
+    }
+
+@pytest.fixture
+def tokens():
+    return [
+        ['python', 'machine_learning'],
+        ['social_media', 'brand', 'media'],
+        ['python'],
+        ['java'],
+    ]
+
+# Unit Tests
+def test_compile(dictionaries):
+    tracker = KeywordTrendTracker(dictionaries)
+    assert tracker.columns == [('Data', 'ml'), ('Data', 'python'), ('Marketing', 'media'), ('Marketing', 'brand')]
+    assert tracker.membership.shape == (len(tracker.term_index), 4)
+    assert tracker.multi_word_terms == ['deep_learning', 'machine_learning', 'social_media']
+
+def test_empty_dictionaries():
+    with pytest.raises(ValueError):
+        KeywordTrendTracker({})
+
+def test_compute_tidy_table(dictionaries, tokens):
+    table = KeywordTrendTracker(dictionaries).compute(tokens, ['2020 H1', '2020 H1', '2020 H2', '2020 H2'])
+    assert list(table.columns) == ['period', 'dictionary', 'keyword', 'share']
+    assert len(table) == 2 * 4
+    share = table.set_index(['period', 'dictionary', 'keyword'])['share']
+    assert share[('2020 H1', 'Data', 'ml')] == pytest.approx(0.5)
+    assert share[('2020 H1', 'Marketing', 'media')] == pytest.approx(0.5)
+    assert share[('2020 H2', 'Data', 'python')] == pytest.approx(0.5)
+    assert share[('2020 H2', 'Marketing', 'brand')] == 0
+
+def test_missing_periods_are_ignored(dictionaries, tokens):
+    table = KeywordTrendTracker(dictionaries).compute(tokens, ['2020 H1', None, '2020 H1', None])
+    share = table.set_index(['period', 'dictionary', 'keyword'])['share']
+    assert set(table['period']) == {'2020 H1'}
+    assert share[('2020 H1', 'Data', 'python')] == pytest.approx(1.0)
+
+def test_to_wide(dictionaries, tokens):
+    table = KeywordTrendTracker(dictionaries).compute(tokens, ['2020 H1', '2020 H1', '2020 H2', '2020 H2'])
+    wide = KeywordTrendTracker.to_wide(table, 'Marketing')
+    assert list(wide.columns) == ['media', 'brand']
+    assert wide.loc['2020 H1', 'brand'] == pytest.approx(50.0)
+    with pytest.raises(KeyError):
+        KeywordTrendTracker.to_wide(table, 'Unknown')
+
+def test_load_keyword_dictionaries(tmp_path, dictionaries):
+    for name, keyword_dict in dictionaries.items():
+        (tmp_path / f'{name}.json').write_text(json.dumps(keyword_dict))
+    assert load_keyword_dictionaries(str(tmp_path)) == dictionaries
+    assert list(load_keyword_dictionaries(str(tmp_path), ['Marketing'])) == ['Marketing']
+    with pytest.raises(FileNotFoundError):
+        load_keyword_dictionaries(str(tmp_path), ['Finance'])
@@ -0,0 +1,46 @@
+import pytest
+import subprocess
+import sys
+import os
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+import modules
+
+HEAVY_PACKAGES = ['torch', 'transformers', 'sentence_transformers', 'gensim', 'ruptures', 'networkx',
+                  'wordcloud', 'seaborn', 'docx', 'langdetect', 'sklearn']
+
+def loaded_packages(statements):
+    """Import in a fresh interpreter and return the heavy packages that got loaded."""
+    code = (f"import sys; sys.path.insert(0, {src_dir!r})\n{statements}\n"
+            f"print(','.join(p for p in {HEAVY_PACKAGES!r} if p in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=src_dir, capture_output=True, text=True, check=True)
+    return [package for package in result.stdout.strip().split(',') if package]
+
+# Unit Tests
+def test_exports_resolve_on_access():
+    assert modules.parse_embeddings is modules.embedding_utils.parse_embeddings
+    assert 'TopicModel' in dir(modules)
+
+def test_unknown_attribute_raises():
+    with pytest.raises(AttributeError):
+        modules.DoesNotExist
+
+# Integration Tests
+@pytest.mark.parametrize('statements', [
+    'import modules, managers',
+    'from managers import Topic_Modeling_Manager, get_projects, get_dataset_folders, render_jobs',
+    'from managers import Box_Plots_Manager, get_json_files_for_box_plots, render_dataset_cache_stats',
+    'from managers import Word_Clouds_Manager, get_json_files_for_word_clouds',
+    'from managers import DataRegistryManager, submit_dataset, submit_esco_analysis',
+    'from managers import Word2Vec_Trends_Manager',
+])
+def test_pages_do_not_load_heavy_packages(statements):
+    assert loaded_packages(statements) == []
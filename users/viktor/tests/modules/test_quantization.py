@@ -0,0 +1,65 @@
+import pytest
+import numpy as np
+import sys
+import os
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.quantization import quantize, dequantize, cosine_scores, QuantizedEmbeddings, quantization_report
+from modules.embedding_utils import parse_embeddings
+
+@pytest.fixture
+def matrix():
+    rng = np.random.default_rng(0)
+    # Dimensions with very different ranges, as in sentence embeddings
+    return (rng.normal(size=(200, 16)) * rng.uniform(0.01, 1.0, size=16)).astype(np.float32)
+
+def normalized(matrix):
+    return matrix / np.linalg.norm(matrix, axis=1, keepdims=True)
+
+# Unit Tests
+@pytest.mark.parametrize('dtype, itemsize', [('float32', 4), ('float16', 2), ('int8', 1)])
+def test_quantize_storage_types(matrix, dtype, itemsize):
+    data, scales = quantize(matrix, dtype)
+    assert data.dtype.itemsize == itemsize
+    assert (scales is not None) == (dtype == 'int8')
+    np.testing.assert_allclose(dequantize(data, scales), matrix, atol=0.02)
+
+def test_int8_scales_per_dimension(matrix):
+    data, scales = quantize(matrix, 'int8')
+    assert scales.shape == (16,)
+    assert (np.abs(data).max(axis=0) == 127).all()
+
+def test_quantize_rejects_unknown_dtype(matrix):
+    with pytest.raises(ValueError):
+        quantize(matrix, 'int4')
+
+def test_cosine_scores_on_int8_match_float32(matrix):
+    data, scales = quantize(matrix, 'int8')
+    expected = normalized(matrix) @ normalized(matrix[:5]).T
+    np.testing.assert_allclose(cosine_scores(data, matrix[:5], scales), expected, atol=0.02)
+
+def test_quantized_embeddings_slice_and_parse(matrix):
+    embeddings = QuantizedEmbeddings(*quantize(matrix, 'int8'))
+    block = embeddings[10:20]
+    assert isinstance(block, QuantizedEmbeddings)
+    assert len(block) == 10
+    assert np.shares_memory(block.data, embeddings.data)
+    np.testing.assert_allclose(parse_embeddings(block), matrix[10:20], atol=0.02)
+
+def test_quantization_report(matrix):
+    report = quantization_report(matrix, k=5, n_queries=20, batch_size=64)
+    assert list(report['dtype']) == ['float32', 'float16', 'int8']
+    assert list(report['compression']) == [1.0, 2.0, 4.0]
+    float32 = report.iloc[0]
+    assert float32['top_k_overlap'] == 1.0
+    assert float32['max_cosine_error'] == pytest.approx(0.0, abs=1e-6)
+    assert (report['top_k_overlap'] > 0.8).all()
+    assert (report['mean_cosine_error'] < 1e-3).all()
@@ -0,0 +1,136 @@
+import pytest
+import sys
+import os
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.run_cache import RunCache
+from modules.dataset_cache import DatasetCache
+
+@pytest.fixture
+def inputs(tmp_path):
+    dataset = tmp_path / 'jobs.parquet'
+    dataset.write_bytes(b'postings')
+    keywords = tmp_path / 'keywords.json'
+    keywords.write_text('{"Data": ["python"]}')
+    return str(dataset), str(keywords)
+
+@pytest.fixture
+def cache(tmp_path):
+    return RunCache(str(tmp_path / 'reports'), max_bytes=10 ** 6)
+
+def write_report(cache, name, n_bytes=100):
+    folder = os.path.join(cache.reports_folder_path, name)
+    os.makedirs(folder, exist_ok=True)
+    with open(os.path.join(folder, 'metrics.json'), 'wb') as f:
+        f.write(b'x' * n_bytes)
+    return folder
+
+# Unit Tests
+def test_fingerprint_is_stable(cache, inputs):
+    dataset, keywords = inputs
+    first = cache.fingerprint('topics', [dataset], 'model', keywords, {'n_topics': 5})
+    assert first == cache.fingerprint('topics', [dataset], 'model', keywords, {'n_topics': 5})
+
+@pytest.mark.parametrize('change', ['dataset', 'keywords', 'model', 'parameters', 'code'])
+def test_fingerprint_changes_with_inputs(cache, inputs, change):
+    dataset, keywords = inputs
+    first = cache.fingerprint('topics', [dataset], 'model', keywords, {'n_topics': 5}, code_version='a')
+    model, parameters, code = 'model', {'n_topics': 5}, 'a'
+    if change == 'dataset':
+        with open(dataset, 'ab') as f:
+            f.write(b' appended')
+    elif change == 'keywords':
+        with open(keywords, 'w') as f:
+            f.write('{"Data": ["sql"]}')
+    elif change == 'model':
+        model = 'other-model'
+    elif change == 'parameters':
+        parameters = {'n_topics': 6}
+    else:
+        code = 'b'
+    assert first != cache.fingerprint('topics', [dataset], model, keywords, parameters, code_version=code)
+
+def test_content_hash_is_memoized_per_file_version(tmp_path, inputs):
+    dataset, _ = inputs
+    dataset_cache = DatasetCache()
+    cache = RunCache(str(tmp_path / 'reports'), dataset_cache=dataset_cache)
+    assert cache.content_hash(dataset) == cache.content_hash(dataset)
+    assert dataset_cache.stats()['hits'] == 1
+
+def test_code_version_follows_source_files():
+    assert RunCache.code_version(RunCache) == RunCache.code_version(RunCache)
+    assert RunCache.code_version(RunCache) != RunCache.code_version(DatasetCache)
+
+def test_run_reuses_completed_reports(cache):
+    calls = []
+    def compute():
+        calls.append(1)
+        return write_report(cache, f'report_{len(calls)}')
+
+    first, reused_first = cache.run('abc', 'topics', compute)
+    second, reused_second = cache.run('abc', 'topics', compute)
+    assert (reused_first, reused_second) == (False, True)
+    assert first == second
+    assert len(calls) == 1
+
+def test_force_refresh_recomputes(cache):
+    calls = []
+    def compute():
+        calls.append(1)
+        return write_report(cache, f'report_{len(calls)}')
+
+    first, _ = cache.run('abc', 'topics', compute)
+    second, reused = cache.run('abc', 'topics', compute, force_refresh=True)
+    assert not reused and first != second
+    assert cache.lookup('abc') == second
+
+def test_failed_run_is_not_recorded(cache):
+    assert cache.run('abc', 'topics', lambda: None) == (None, False)
+    assert cache.lookup('abc') is None
+
+def test_removed_report_folder_is_dropped(cache):
+    folder = write_report(cache, 'report')
+    cache.record('abc', 'topics', folder)
+    os.remove(os.path.join(folder, 'metrics.json'))
+    assert cache.lookup('abc') is None
+    assert cache.runs() == []
+
+def test_eviction_removes_least_recently_used(tmp_path):
+    cache = RunCache(str(tmp_path / 'reports'), max_bytes=250)
+    old = write_report(cache, 'old')
+    cache.record('old', 'topics', old)
+    used = write_report(cache, 'used')
+    cache.record('used', 'topics', used)
+    cache.lookup('old')
+
+    new = write_report(cache, 'new')
+    cache.record('new', 'topics', new)
+    assert not os.path.exists(used)
+    assert os.path.isdir(old) and os.path.isdir(new)
+    assert {run['folder'] for run in cache.runs()} == {os.path.abspath(old), os.path.abspath(new)}
+
+def test_unrecorded_report_folders_are_never_evicted(tmp_path):
+    cache = RunCache(str(tmp_path / 'reports'), max_bytes=0)
+    manual = write_report(cache, 'manual')
+    recorded = write_report(cache, 'recorded')
+    cache.record('abc', 'topics', recorded)
+    assert os.path.isdir(manual)
+    assert os.path.isdir(recorded)
+
+# Integration Tests
+def test_index_is_shared_between_instances(tmp_path):
+    reports = str(tmp_path / 'reports')
+    first = RunCache(reports)
+    folder = write_report(first, 'report')
+    first.record('abc', 'topics', folder, {'n_topics': 5})
+    second = RunCache(reports)
+    assert second.lookup('abc') == os.path.abspath(folder)
+    assert second.runs()[0]['parameters'] == {'n_topics': 5}
@@ -0,0 +1,122 @@
+import pytest
+import numpy as np
+import pandas as pd
+import sys
+import os
+from unittest import mock
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.time_partitions import (write_partitions, list_partitions, read_partitions, partitions_for_folder,
+                                     current_partitions, in_date_range, PARTITIONS_FOLDER)
+from modules.dataset_storage import write_dataset, write_embeddings
+
+@pytest.fixture
+def postings():
+    df = pd.DataFrame({
+        'job_id': [str(i) for i in range(8)],
+        'original_listed_time': ['2023-11-20', '2023-12-05', '2024-01-10', None,
+                                 '2024-01-31', '2024-02-14', '2024-03-01', '2023-12-31'],
+        'language': ['en', 'nl'] * 4,
+    })
+    embeddings = np.arange(16, dtype=np.float32).reshape(8, 2)
+    return df, embeddings
+
+@pytest.fixture
+def partitions(tmp_path, postings):
+    return write_partitions(*postings, str(tmp_path))
+
+# Unit Tests
+def test_in_date_range_is_half_open():
+    times = pd.Series(['2024-01-01', '2024-02-01', None, 'not a date'])
+    assert in_date_range(times, '2024-01-01', '2024-02-01').tolist() == [True, False, False, False]
+    assert in_date_range(times).tolist() == [True, True, True, True]
+
+def test_one_partition_per_month(partitions):
+    assert sorted(os.listdir(partitions)) == ['month=2023-11', 'month=2023-12', 'month=2024-01', 'month=2024-02',
+                                              'month=2024-03', 'month=none']
+
+def test_list_partitions_prunes_months(partitions):
+    names = [os.path.basename(os.path.dirname(path)) for path in list_partitions(partitions, '2023-12-15', '2024-02-01')]
+    assert names == ['month=2023-12', 'month=2024-01']
+    assert len(list_partitions(partitions)) == 6
+    assert 'month=none' not in str(list_partitions(partitions, start='2000-01-01'))
+
+def test_read_partitions_filters_boundary_rows(partitions, postings):
+    df, embeddings = read_partitions(partitions, '2023-12-15', '2024-02-01', columns=['job_id'], with_embeddings=True)
+    assert df['job_id'].tolist() == ['7', '2', '4']
+    assert list(df.columns) == ['job_id']
+    np.testing.assert_array_equal(embeddings, postings[1][[7, 2, 4]])
+
+def test_read_partitions_unbounded_keeps_all_rows(partitions):
+    df = read_partitions(partitions)
+    assert sorted(df['job_id']) == [str(i) for i in range(8)]
+    assert isinstance(df['language'].dtype, pd.CategoricalDtype)
+    assert pd.api.types.is_datetime64_any_dtype(df['original_listed_time'])
+
+def test_read_partitions_empty_range(partitions):
+    df, embeddings = read_partitions(partitions, '2030-01-01', None, columns=['job_id'], with_embeddings=True)
+    assert df.empty
+    assert len(embeddings) == 0
+
+def test_write_partitions_rejects_misaligned_embeddings(tmp_path, postings):
+    with pytest.raises(ValueError):
+        write_partitions(postings[0], postings[1][:3], str(tmp_path))
+
+def test_rebuild_publishes_new_version(tmp_path, postings):
+    first = write_partitions(*postings, str(tmp_path))
+    second = write_partitions(postings[0].iloc[:2], postings[1][:2], str(tmp_path))
+    assert current_partitions(str(tmp_path)) == second
+    assert sorted(read_partitions(second)['job_id']) == ['0', '1']
+    assert len(read_partitions(first)) == 8
+
+    # Only the published version and the one before it are kept
+    third = write_partitions(*postings, str(tmp_path))
+    assert not os.path.exists(first)
+    assert sorted(name for name in os.listdir(tmp_path) if os.path.isdir(tmp_path / name)) == \
+        sorted(os.path.basename(path) for path in (second, third))
+
+def test_rebuild_replaces_unversioned_layout(tmp_path, postings):
+    legacy = tmp_path / PARTITIONS_FOLDER / 'month=2024-01'
+    legacy.mkdir(parents=True)
+    partitions = write_partitions(*postings, str(tmp_path))
+    assert not os.path.exists(tmp_path / PARTITIONS_FOLDER)
+    assert current_partitions(str(tmp_path)) == partitions
+
+def test_failed_build_keeps_published_version(tmp_path, postings):
+    partitions = write_partitions(*postings, str(tmp_path))
+    with mock.patch('modules.time_partitions.pq.write_table', side_effect=OSError('disk full')):
+        with pytest.raises(OSError):
+            write_partitions(*postings, str(tmp_path))
+    assert current_partitions(str(tmp_path)) == partitions
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(partitions), 'partitions.current']
+
+# Integration Tests
+def test_partitions_for_folder_renames_and_rebuilds(tmp_path, postings):
+    df, embeddings = postings
+    folder = tmp_path / 'jobs'
+    folder.mkdir()
+    write_dataset(df.rename(columns={'original_listed_time': 'CreatedAt'}), str(folder / 'jobs.parquet'))
+    write_embeddings(pd.DataFrame({'description_embeddings': list(embeddings)}), str(folder / 'embeddings.parquet'))
+
+    partitions = partitions_for_folder(str(folder), column_renames={'CreatedAt': 'original_listed_time'})
+    assert partitions == current_partitions(str(folder))
+    assert partitions_for_folder(str(folder), column_renames={'CreatedAt': 'original_listed_time'}) == partitions
+    assert len(read_partitions(partitions, '2024-01-01', '2024-02-01')) == 2
+
+    write_dataset(df.iloc[:2].rename(columns={'original_listed_time': 'CreatedAt'}), str(folder / 'jobs.parquet'))
+    write_embeddings(pd.DataFrame({'description_embeddings': list(embeddings[:2])}), str(folder / 'embeddings.parquet'))
+    os.utime(folder / 'jobs.parquet', (os.path.getmtime(partitions) + 10,) * 2)
+
+    rebuilt = partitions_for_folder(str(folder), column_renames={'CreatedAt': 'original_listed_time'})
+    assert rebuilt != partitions
+    assert sorted(read_partitions(rebuilt)['job_id']) == ['0', '1']
+    # A reader of the previous version can still finish
+    assert len(read_partitions(partitions, '2024-01-01', '2024-02-01')) == 2
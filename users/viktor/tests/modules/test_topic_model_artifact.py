@@ -0,0 +1,84 @@
+import pytest
+import numpy as np
+import os
+import sys
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules import TopicModelArtifact
+
+@pytest.fixture
+def centroids():
+    return np.array([[0.0, 0.0], [10.0, 10.0]], dtype=np.float32)
+
+@pytest.fixture
+def artifact(centroids):
+    rng = np.random.default_rng(0)
+    reference = np.abs(rng.normal(0.0, 1.0, 1000))
+    return TopicModelArtifact(
+        centroids=centroids,
+        keywords={0: ['python', 'java'], 1: ['sales', 'marketing']},
+        vocabulary={'python': 0, 'java': 1},
+        idf=[1.0, 2.0],
+        reference_distances=reference,
+        embedding_model='all-mpnet-base-v2',
+    )
+
+# Unit Tests
+def test_assign_nearest_centroid(artifact):
+    labels, distances = artifact.assign(np.array([[0.5, 0.0], [9.0, 10.0], [1.0, 1.0]]))
+    assert labels.tolist() == [0, 1, 0]
+    assert np.allclose(distances, [0.5, 1.0, np.sqrt(2)], atol=1e-5)
+
+def test_assign_accepts_string_embeddings(artifact):
+    labels, _ = artifact.assign(["[0.1, 0.2]", "[11.0, 9.5]"])
+    assert labels.tolist() == [0, 1]
+
+def test_assign_in_batches_matches_single_batch(artifact):
+    X = np.random.default_rng(1).normal(5.0, 4.0, (500, 2))
+    labels_small, distances_small = artifact.assign(X, batch_size=7)
+    labels_full, distances_full = artifact.assign(X)
+    assert np.array_equal(labels_small, labels_full)
+    assert np.allclose(distances_small, distances_full)
+
+def test_assign_dimension_mismatch(artifact):
+    with pytest.raises(ValueError):
+        artifact.assign(np.zeros((2, 3)))
+
+def test_detect_no_drift(artifact):
+    rng = np.random.default_rng(2)
+    report = artifact.detect_drift(np.abs(rng.normal(0.0, 1.0, 500)))
+    assert report['drift_detected'] is False
+
+def test_detect_drift(artifact):
+    rng = np.random.default_rng(3)
+    report = artifact.detect_drift(np.abs(rng.normal(3.0, 1.0, 500)))
+    assert report['drift_detected'] is True
+    assert report['current_median_distance'] > report['reference_median_distance']
+
+def test_reference_sample_is_bounded(centroids):
+    artifact = TopicModelArtifact(centroids, {0: [], 1: []}, reference_distances=np.arange(20000))
+    assert len(artifact.reference_distances) == TopicModelArtifact.MAX_REFERENCE_DISTANCES
+
+# Integration Tests
+def test_save_and_load_round_trip(artifact, tmp_path):
+    folder = artifact.save(str(tmp_path / 'topic_model'))
+    loaded = TopicModelArtifact.load(folder)
+
+    assert np.allclose(loaded.centroids, artifact.centroids)
+    assert loaded.keywords == artifact.keywords
+    assert loaded.vocabulary == artifact.vocabulary
+    assert loaded.model_version == artifact.model_version
+    assert loaded.embedding_model == 'all-mpnet-base-v2'
+    assert np.allclose(loaded.reference_distances, artifact.reference_distances)
+
+def test_load_missing_artifact(tmp_path):
+    with pytest.raises(FileNotFoundError):
+        TopicModelArtifact.load(str(tmp_path))
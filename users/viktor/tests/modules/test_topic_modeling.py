@@ -0,0 +1,75 @@
+import pytest
+from unittest import mock
+import numpy as np
+import os
+import sys
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.topic_modeling import TopicModel
+
+WORD_VECTORS = {
+    'python': [1.0, 0.0, 0.0],
+    'java': [0.0, 1.0, 0.0],
+    'sql': [1.0, 1.0, 0.0],
+    'sales': [0.0, 0.0, 1.0],
+    'marketing': [0.0, 1.0, 1.0],
+}
+
+@pytest.fixture
+def embedder():
+    embedder = mock.Mock()
+    embedder.generate_embeddings.side_effect = lambda words: np.array([WORD_VECTORS[w] for w in words])
+    return embedder
+
+@pytest.fixture
+def topic_model(tmp_path):
+    with mock.patch('modules.topic_modeling.SSEMEmbedder'):
+        return TopicModel([], [], n_topics=2, num_keywords=3, max_iter=10, model='mock', output_subfolder=str(tmp_path))
+
+@pytest.fixture
+def keywords():
+    return {
+        0: np.array(['python', 'java', 'sql']),
+        1: np.array(['sales', 'marketing', 'sql']),
+    }
+
+def reference_diversity(keywords):
+    """Per-topic diversity computed the straightforward way, for comparison."""
+    scores = []
+    for words in keywords.values():
+        vectors = np.array([WORD_VECTORS[w] for w in words], dtype=float)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        sims = vectors @ vectors.T
+        scores.append(np.mean(1 - sims[np.triu_indices_from(sims, k=1)]))
+    return round(np.mean(scores), 2)
+
+# Unit Tests
+def test_topic_diversity_matches_reference(topic_model, embedder, keywords):
+    score = topic_model.calculate_topic_diversity(keywords, embedder, num_keywords=3)
+    assert score == pytest.approx(reference_diversity(keywords))
+
+def test_topic_diversity_embeds_union_once(topic_model, embedder, keywords):
+    topic_model.calculate_topic_diversity(keywords, embedder, num_keywords=3)
+    assert embedder.generate_embeddings.call_count == 1
+    embedded_words = embedder.generate_embeddings.call_args[0][0]
+    assert sorted(embedded_words) == ['java', 'marketing', 'python', 'sales', 'sql']
+
+def test_topic_diversity_uses_cache(topic_model, embedder, keywords):
+    topic_model.calculate_topic_diversity(keywords, embedder, num_keywords=3)
+    topic_model.calculate_topic_diversity(keywords, embedder, num_keywords=3)
+    assert embedder.generate_embeddings.call_count == 1
+
+def test_unique_word_diversity(topic_model, keywords):
+    # 5 distinct words out of 6 keywords
+    assert topic_model.calculate_unique_word_diversity(keywords) == pytest.approx(0.83)
+
+def test_unique_word_diversity_empty(topic_model):
+    assert topic_model.calculate_unique_word_diversity({}) == 0.0
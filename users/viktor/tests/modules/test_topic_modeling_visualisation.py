@@ -0,0 +1,78 @@
+import threading
+import numpy as np
+import os
+import sys
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.topic_modeling_visualisation import TopicModelVisualizer, wordcloud_image
+
+SINGLE_CHARTS = ['silhouette_score.png', 'clustering_stability.png', 'topic_diversity.png', 'inertia_graph.png',
+                 'ari_graph.png']
+
+def make_keywords(n_topics):
+    words = ['python', 'java', 'sql', 'sales', 'marketing', 'design', 'finance', 'cloud']
+    return {topic: [words[(topic + i) % len(words)] for i in range(3)] for topic in range(n_topics)}
+
+def create_all(visualizer, n_topics):
+    visualizer.create_all_visualizations(0.8, 0.3, 0.9, {t: 100 / n_topics for t in range(n_topics)}, 12.5, 0.7,
+                                         make_keywords(n_topics))
+
+# Unit Tests
+def test_wordcloud_image_is_cached_per_keyword_list(tmp_path):
+    cache = str(tmp_path / 'cache')
+    first = wordcloud_image(['python', 'java'], cache, width=200, height=100)
+    assert first.shape == (100, 200, 3)
+    assert len(os.listdir(cache)) == 1
+    np.testing.assert_array_equal(wordcloud_image(['python', 'java'], cache, width=200, height=100), first)
+    wordcloud_image(['sales', 'marketing'], cache, width=200, height=100)
+    assert len(os.listdir(cache)) == 2
+
+def test_wordcloud_image_without_cache(tmp_path):
+    assert wordcloud_image(['python'], width=120, height=60).shape == (60, 120, 3)
+
+def test_wordcloud_grids_split_topics():
+    visualizer = TopicModelVisualizer(None, '.', 'experiment.txt')
+    grids = visualizer.wordcloud_grids(make_keywords(45))
+    assert [len(grid) for grid in grids] == [20, 20, 5]
+    assert grids[2][0][0] == 40
+
+def test_visualizer_is_pickled_without_model():
+    visualizer = TopicModelVisualizer(threading.Lock(), '.', 'experiment.txt')
+    assert visualizer.__getstate__()['model'] is None
+    assert visualizer.model is not None
+
+# Integration Tests
+def test_sequential_visualizations(tmp_path):
+    create_all(TopicModelVisualizer(None, str(tmp_path), 'experiment.txt'), 3)
+    files = set(os.listdir(tmp_path))
+    assert set(SINGLE_CHARTS) <= files
+    assert {'topic_percentage_chart.png', 'wordclouds_part_1.png', 'topic_modeling_experiment_report.docx'} <= files
+
+def test_combined_metrics_panel_replaces_single_charts(tmp_path):
+    create_all(TopicModelVisualizer(None, str(tmp_path), 'experiment.txt', combined_metrics=True), 3)
+    files = set(os.listdir(tmp_path))
+    assert 'metrics_panel.png' in files
+    assert not set(SINGLE_CHARTS) & files
+
+def test_parallel_visualizations_match_sequential_outputs(tmp_path, monkeypatch):
+    # Use the pool even on a single CPU
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    sequential, parallel = tmp_path / 'sequential', tmp_path / 'parallel'
+    sequential.mkdir()
+    parallel.mkdir()
+    cache = str(tmp_path / 'cache')
+    create_all(TopicModelVisualizer(None, str(sequential), 'experiment.txt', wordcloud_cache_folder=cache), 21)
+    # The model is never sent to the workers, so an unpicklable one is fine
+    create_all(TopicModelVisualizer(threading.Lock(), str(parallel), 'experiment.txt', max_workers=2,
+                                    wordcloud_cache_folder=cache), 21)
+    assert set(os.listdir(sequential)) == set(os.listdir(parallel))
+    assert {'wordclouds_part_1.png', 'wordclouds_part_2.png'} <= set(os.listdir(parallel))
+    assert len(os.listdir(cache)) == len({tuple(words) for words in make_keywords(21).values()})
@@ -0,0 +1,196 @@
+import pytest
+import numpy as np
+import pandas as pd
+import os
+import sys
+from unittest import mock
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules import TrendCube
+
+ROLES = ['role1', 'role2', 'Other']
+
+@pytest.fixture
+def df_features():
+    rng = np.random.default_rng(0)
+    scores = rng.dirichlet(np.ones(3), size=200)
+    df = pd.DataFrame(scores, columns=ROLES)
+    df['original_listed_time'] = pd.to_datetime('2020-01-01') + pd.to_timedelta(rng.integers(0, 900, 200), unit='D')
+    return df
+
+def reference_tables(df_features):
+    """The aggregation previously done by Box_Plots_Manager and the visualizers."""
+    df = df_features.copy()
+    df['year_month'] = df['original_listed_time'].dt.to_period('M')
+    trend_df = df.groupby('year_month')[ROLES].sum().reset_index()
+    trend_df['year_month'] = trend_df['year_month'].dt.to_timestamp()
+    df['month'] = df['year_month'].dt.month
+    monthly_trend_df = df.groupby('month')[ROLES].mean().reset_index()
+
+    adjusted = trend_df.assign(month=trend_df['year_month'].dt.month).merge(monthly_trend_df, on='month', suffixes=('', '_monthly'))
+    semiannual = adjusted.set_index('year_month')[ROLES].resample('6ME').sum()
+    return trend_df, monthly_trend_df, semiannual.div(semiannual.sum(axis=1), axis=0) * 100
+
+# Unit Tests
+def test_from_features_matches_reference(df_features):
+    trend_df, monthly_trend_df, semiannual_percent = reference_tables(df_features)
+    cube = TrendCube.from_features(df_features, ROLES)
+
+    pd.testing.assert_frame_equal(cube.semiannual_percentages(), semiannual_percent, check_freq=False, check_names=False)
+    pd.testing.assert_frame_equal(cube.trend_df(), trend_df, check_names=False)
+    monthly = cube.monthly_trend_df()
+    np.testing.assert_allclose(monthly[ROLES].to_numpy(), monthly_trend_df[ROLES].to_numpy())
+    assert list(monthly['month']) == list(monthly_trend_df['month'])
+
+def test_from_trends_does_not_mutate_input(df_features):
+    trend_df, monthly_trend_df, semiannual_percent = reference_tables(df_features)
+    columns = list(trend_df.columns)
+    cube = TrendCube.from_trends(trend_df, monthly_trend_df, ROLES)
+    assert list(trend_df.columns) == columns
+    pd.testing.assert_frame_equal(cube.semiannual_percentages(), semiannual_percent, check_freq=False, check_names=False)
+
+def test_invalid_dates():
+    df = pd.DataFrame({'role1': [1.0], 'original_listed_time': ['not a date']})
+    with pytest.raises(ValueError):
+        TrendCube.from_features(df, ['role1'])
+
+def test_missing_measure(df_features):
+    trend_df, monthly_trend_df, _ = reference_tables(df_features)
+    with pytest.raises(KeyError):
+        TrendCube.from_trends(trend_df, monthly_trend_df, ROLES).monthly_trend_df()
+
+def test_save_and_load(df_features, tmp_path):
+    cube = TrendCube.from_features(df_features, ['role2', 'role1', 'Other'])
+    loaded = TrendCube.load(cube.save(str(tmp_path / 'cube.parquet')))
+    assert loaded.role_columns == ['role2', 'role1', 'Other']
+    pd.testing.assert_frame_equal(loaded.semiannual_percentages(), cube.semiannual_percentages())
+    pd.testing.assert_frame_equal(loaded.monthly_trend_df(), cube.monthly_trend_df())
+
+def test_cache_key(tmp_path):
+    keywords = tmp_path / 'keywords.json'
+    keywords.write_text('{"x": ["y"]}')
+    key = TrendCube.cache_key('project', 'jobs', str(keywords), 0.5)
+
+    assert TrendCube.cache_key('project', 'jobs', str(keywords), 0.5) == key
+    assert TrendCube.cache_key('project', 'jobs_2024', str(keywords), 0.5) != key
+    assert TrendCube.cache_key('other_project', 'jobs', str(keywords), 0.5) != key
+    assert TrendCube.cache_key('project', 'jobs', str(keywords), 1.0) != key
+    assert TrendCube.cache_key('project', 'jobs', str(keywords), 0.5, ('2023-01-01', None)) != key
+    assert TrendCube.cache_key('project', 'jobs', str(keywords), 0.5, ('2023-01-01', None)) == \
+        TrendCube.cache_key('project', 'jobs', str(keywords), 0.5, (pd.Timestamp('2023-01-01'), None))
+    keywords.write_text('{"x": ["z"]}')
+    assert TrendCube.cache_key('project', 'jobs', str(keywords), 0.5) != key
+
+def test_dataset_version(tmp_path):
+    dataset = tmp_path / 'data.csv'
+    dataset.write_text('a\n1\n')
+    version = TrendCube.dataset_version([str(dataset)])
+    dataset.write_text('a\n1\n2\n')
+    assert TrendCube.dataset_version([str(dataset)]) != version
+
+def test_merge_equals_full_recompute(df_features):
+    df_features = df_features.sort_values('original_listed_time', ignore_index=True)
+    full = TrendCube.from_features(df_features, ROLES)
+    merged = TrendCube.from_features(df_features.iloc[:150], ROLES).merge(TrendCube.from_features(df_features.iloc[150:], ROLES))
+
+    pd.testing.assert_frame_equal(merged.select('month', 'sum'), full.select('month', 'sum'))
+    pd.testing.assert_frame_equal(merged.semiannual_percentages(), full.semiannual_percentages())
+    pd.testing.assert_frame_equal(merged.monthly_trend_df(), full.monthly_trend_df())
+
+def test_merge_overlapping_months(df_features):
+    full = TrendCube.from_features(df_features, ROLES)
+    merged = TrendCube.from_features(df_features.iloc[::2], ROLES).merge(TrendCube.from_features(df_features.iloc[1::2], ROLES))
+    pd.testing.assert_frame_equal(merged.select('month', 'count'), full.select('month', 'count'))
+    pd.testing.assert_frame_equal(merged.semiannual_percentages(), full.semiannual_percentages())
+
+def test_merge_keeps_metadata_and_checks_topics(df_features):
+    cube = TrendCube.from_features(df_features, ROLES)
+    cube.metadata['n_rows'] = 200
+    assert cube.merge(TrendCube.from_features(df_features, ROLES)).metadata == {'n_rows': 200}
+    with pytest.raises(ValueError):
+        cube.merge(TrendCube.from_features(df_features, ['role1', 'role2']))
+
+def test_metadata_saved_with_cube(df_features, tmp_path):
+    cube = TrendCube.from_features(df_features, ROLES)
+    cube.metadata.update({'n_rows': 200, 'rows_fingerprint': TrendCube.rows_fingerprint(df_features)})
+    loaded = TrendCube.load(cube.save(str(tmp_path / 'cube.parquet')))
+    assert loaded.metadata == cube.metadata
+
+def test_rows_fingerprint(df_features):
+    fingerprint = TrendCube.rows_fingerprint(df_features.iloc[:100])
+    assert TrendCube.rows_fingerprint(df_features.iloc[:100].copy()) == fingerprint
+    assert TrendCube.rows_fingerprint(df_features.iloc[:101]) != fingerprint
+    changed = df_features.iloc[:100].copy()
+    changed.loc[5, 'role1'] += 1
+    assert TrendCube.rows_fingerprint(changed) != fingerprint
+
+def test_rows_fingerprint_covers_embeddings(df_features):
+    embeddings = np.random.default_rng(1).normal(size=(len(df_features), 4)).astype(np.float32)
+    fingerprint = TrendCube.rows_fingerprint(df_features, embeddings)
+    assert TrendCube.rows_fingerprint(df_features, embeddings.copy(), block_size=7) == fingerprint
+    assert TrendCube.rows_fingerprint(df_features) != fingerprint
+    changed = embeddings.copy()
+    changed[150, 2] += 1
+    assert TrendCube.rows_fingerprint(df_features, changed) != fingerprint
+    with pytest.raises(ValueError):
+        TrendCube.rows_fingerprint(df_features, embeddings[:100])
+
+# Integration Tests
+def save_postings(registry, postings, embeddings):
+    embeddings_df = pd.DataFrame({'description_embeddings': [row.tolist() for row in embeddings]})
+    assert 'successfully' in registry.save_dataset(postings, embeddings_df, 'jobs', 'project')
+
+def test_cube_survives_registry_reupload(df_features, tmp_path):
+    from modules import DatasetRegistry
+    from managers.box_plots_manager import Box_Plots_Manager
+
+    postings = df_features[['original_listed_time']].sort_values('original_listed_time', ignore_index=True)
+    embeddings = np.random.default_rng(1).normal(size=(len(postings), 4)).astype(np.float32)
+    keywords = tmp_path / 'keywords.json'
+    keywords.write_text('{"role1": ["x"], "role2": ["y"]}')
+    base_folder = tmp_path / 'registry'
+    registry = DatasetRegistry(None, 'project', 'jobs', str(base_folder), base_folder / 'registry.db')
+
+    extracted = []
+    def build_trend_cube(self, df, embeddings_df, keyword_dict, role_columns):
+        # Scores derived from the embeddings, so changed embeddings change the cube
+        extracted.append(len(df))
+        scores = pd.DataFrame(np.asarray(embeddings_df)[:, :len(role_columns)], columns=role_columns)
+        scores['original_listed_time'] = df['original_listed_time'].to_numpy()
+        return TrendCube.from_features(scores, role_columns)
+
+    def load_cube():
+        manager = Box_Plots_Manager(str(base_folder / 'project' / 'jobs'), str(tmp_path / 'reports'))
+        folder = manager.selected_folder
+        return manager.load_trend_cube(os.path.join(folder, 'jobs.parquet'), os.path.join(folder, 'embeddings.parquet'),
+                                       str(keywords), {'role1': ['x'], 'role2': ['y']}, ROLES)
+
+    with mock.patch.object(Box_Plots_Manager, 'build_trend_cube', build_trend_cube):
+        save_postings(registry, postings.iloc[:150], embeddings[:150])
+        load_cube()
+
+        # Upload the dataset again with appended postings: only the new rows are extracted
+        registry.remove_dataset('project', 'jobs')
+        save_postings(registry, postings, embeddings)
+        appended = load_cube()
+        assert extracted == [150, 50]
+
+        # Changed embeddings of already aggregated rows rebuild the cube
+        changed = embeddings.copy()
+        changed[10] += 1
+        registry.remove_dataset('project', 'jobs')
+        save_postings(registry, postings, changed)
+        rebuilt = load_cube()
+        assert extracted == [150, 50, 200]
+
+    expected = build_trend_cube(None, postings, embeddings, None, ROLES)
+    pd.testing.assert_frame_equal(appended.select('month', 'sum'), expected.select('month', 'sum'))
+    assert not rebuilt.select('month', 'sum').equals(appended.select('month', 'sum'))
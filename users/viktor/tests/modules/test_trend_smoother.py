@@ -0,0 +1,83 @@
+import pytest
+from unittest import mock
+import numpy as np
+import pandas as pd
+import os
+import sys
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.trend_smoother import TrendSmoother, _fit_gp
+
+@pytest.fixture
+def trend_data():
+    x = np.arange(10)
+    return pd.DataFrame({
+        'content': 20 + 2 * x + np.sin(x),
+        'media': 40 - x + np.cos(x),
+        'pr': np.full(10, 12.0),
+    }, index=[f'{2018 + i // 2} H{i % 2 + 1}' for i in range(10)])
+
+# Unit Tests
+def test_invalid_method():
+    with pytest.raises(ValueError):
+        TrendSmoother(method='loess')
+
+@pytest.mark.parametrize('method', ['gp', 'gp_shared', 'spline'])
+def test_smooth_shapes(trend_data, method):
+    x_smooth, curves = TrendSmoother(method=method, n_jobs=1, n_restarts_optimizer=1).smooth(trend_data, n_points=50)
+    assert x_smooth.shape == (50,)
+    assert x_smooth[0] == 0 and x_smooth[-1] == len(trend_data) - 1
+    assert list(curves) == list(trend_data.columns)
+    assert all(curve.shape == (50,) for curve in curves.values())
+
+def test_gp_matches_single_fit(trend_data):
+    smoother = TrendSmoother(method='gp', n_jobs=2, n_restarts_optimizer=2)
+    x_smooth, curves = smoother.smooth(trend_data, n_points=20)
+    expected = _fit_gp(np.arange(10, dtype=float), trend_data['media'].to_numpy(), x_smooth, 10, 1e-2, 2, 0)
+    np.testing.assert_allclose(curves['media'], expected)
+
+@pytest.mark.parametrize('n_jobs, cpus, expected', [(-1, 2, 2), (-1, 8, 3), (2, 8, 2)])
+def test_gp_workers_are_capped_by_cpus_and_series(trend_data, n_jobs, cpus, expected):
+    smoother = TrendSmoother(method='gp', n_jobs=n_jobs, n_restarts_optimizer=0)
+    with mock.patch('modules.trend_smoother.effective_n_jobs', lambda n: cpus if n == -1 else n), \
+            mock.patch('modules.trend_smoother.Parallel') as parallel:
+        parallel.return_value.return_value = [np.zeros(5)] * 3
+        smoother.smooth(trend_data, n_points=5)
+    assert parallel.call_args.kwargs['n_jobs'] == expected
+
+def test_smoothing_follows_the_data(trend_data):
+    x = np.arange(len(trend_data))
+    for method in ('gp_shared', 'spline'):
+        x_smooth, curves = TrendSmoother(method=method).smooth(trend_data, n_points=len(x))
+        assert np.abs(curves['content'] - trend_data['content'].to_numpy()).max() < 5
+
+def test_curves_are_cached_on_disk(trend_data, tmp_path):
+    TrendSmoother(method='spline', cache_folder=str(tmp_path)).smooth(trend_data)
+    assert len(os.listdir(tmp_path)) == 3
+
+    smoother = TrendSmoother(method='spline', cache_folder=str(tmp_path))
+    with mock.patch.object(smoother, '_smooth_spline') as smooth_spline:
+        smoother.smooth(trend_data)
+    smooth_spline.assert_not_called()
+
+def test_cache_key_depends_on_settings(trend_data):
+    smoother = TrendSmoother()
+    y = trend_data['content'].to_numpy()
+    key = smoother.cache_key(y, 'gp', 10, 500)
+    assert smoother.cache_key(y, 'gp', 5, 500) != key
+    assert smoother.cache_key(y, 'spline', 10, 500) != key
+    assert smoother.cache_key(y + 1, 'gp', 10, 500) != key
+
+def test_method_selectable_per_run(trend_data):
+    smoother = TrendSmoother(method='gp')
+    with mock.patch('modules.trend_smoother.Parallel') as parallel:
+        smoother.smooth(trend_data, method='spline')
+    parallel.assert_not_called()
@@ -68,7 +68,7 @@ def test_extract_features_valid(sample_data, keyword_mapping):
     assert features.shape[0] == sample_data.shape[0]
 
 def test_extractor_column_not_found():
-    with pytest.raises(SystemExit):
+    with pytest.raises(KeyError):
         KeywordFeatureExtractorBoxPlots(
             df=pd.DataFrame({'info': ['missing column']}), 
             column='text', 
@@ -0,0 +1,97 @@
+import pytest
+from unittest import mock
+import os
+import sys
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.word2vec_preprocessing import Word2VecPreprocessor
+
+class FakeLemmatizer:
+    """Strips a trailing 's', standing in for the WordNet lemmatizer."""
+    calls = 0
+
+    def lemmatize(self, word):
+        FakeLemmatizer.calls += 1
+        return word[:-1] if word.endswith('s') else word
+
+@pytest.fixture(autouse=True)
+def fake_lemmatizer():
+    FakeLemmatizer.calls = 0
+    with mock.patch('modules.word2vec_preprocessing.WordNetLemmatizer', FakeLemmatizer):
+        yield
+
+@pytest.fixture
+def keywords():
+    return ['digital marketing', 'social_media', 'social media manager', 'ads']
+
+@pytest.fixture
+def preprocessor(keywords):
+    return Word2VecPreprocessor(['the', 'and', 'for'], keywords, normalize=True)
+
+# Unit Tests
+def test_preprocess_cleans_and_lemmatizes(preprocessor):
+    assert preprocessor.preprocess('The Brands and 2024 Skills!') == ['brand', 'skill']
+
+def test_tokens_are_kept_by_default(keywords):
+    preprocessor = Word2VecPreprocessor(['the', 'and', 'for'], keywords)
+    assert preprocessor.preprocess('The Brands and 2024 social media!') == ['the', 'brands', 'and', 'social', 'media',
+                                                                             'social_media']
+    assert preprocessor.normalize_term('Brands') == 'brands'
+    assert FakeLemmatizer.calls == 0
+
+def test_keywords_are_not_lemmatized(preprocessor):
+    assert preprocessor.preprocess('ads for brands') == ['ads', 'brand']
+
+def test_multi_word_keywords_are_appended(preprocessor):
+    tokens = preprocessor.preprocess('Digital marketing and social media manager')
+    assert tokens[:5] == ['digital', 'marketing', 'social', 'media', 'manager']
+    assert tokens[5:] == ['digital_marketing', 'social_media', 'social_media_manager']
+
+def test_lemmas_are_memoized(preprocessor):
+    preprocessor.preprocess('brands brands brands skills')
+    preprocessor.preprocess('skills brands')
+    assert FakeLemmatizer.calls == 2
+
+def test_preprocess_many_parallel_matches_serial(keywords):
+    texts = [f'digital marketing campaign {i} for brands' for i in range(40)]
+    serial = Word2VecPreprocessor(['for'], keywords).preprocess_many(texts)
+    parallel = Word2VecPreprocessor(['for'], keywords, n_jobs=2).preprocess_many(texts)
+    assert parallel == serial
+
+def test_preprocess_file_uses_cache(tmp_path, keywords):
+    input_file = tmp_path / 'jobs.csv'
+    input_file.write_text('Description\nsocial media ads\n')
+    preprocessor = Word2VecPreprocessor([], keywords, cache_folder=str(tmp_path / 'cache'))
+    first = preprocessor.preprocess_file(str(input_file), ['social media ads'])
+
+    with mock.patch.object(preprocessor, 'preprocess_many') as preprocess_many:
+        second = preprocessor.preprocess_file(str(input_file), ['social media ads'])
+    preprocess_many.assert_not_called()
+    assert second == first == [['social', 'media', 'ads', 'social_media']]
+
+@pytest.mark.parametrize('cache', [False, True])
+def test_preprocess_file_tokenizes_in_batches(tmp_path, keywords, cache):
+    input_file = tmp_path / 'jobs.csv'
+    input_file.write_text('Description\n' + '\n'.join(f'social media {i}' for i in range(5)) + '\n')
+    preprocessor = Word2VecPreprocessor([], keywords, cache_folder=str(tmp_path / 'cache') if cache else None)
+    texts = (f'social media {i}' for i in range(5))
+    with mock.patch.object(preprocessor, 'preprocess_many', wraps=preprocessor.preprocess_many) as preprocess_many:
+        tokenized = preprocessor.preprocess_file(str(input_file), texts, batch_size=2)
+    assert [len(call.args[0]) for call in preprocess_many.call_args_list] == [2, 2, 1]
+    assert tokenized == [preprocessor.preprocess(f'social media {i}') for i in range(5)]
+
+def test_cache_key_depends_on_settings(tmp_path, keywords):
+    input_file = tmp_path / 'jobs.csv'
+    input_file.write_text('Description\ntext\n')
+    key = Word2VecPreprocessor([], keywords).cache_key(str(input_file))
+    assert Word2VecPreprocessor(['text'], keywords).cache_key(str(input_file)) != key
+    assert Word2VecPreprocessor([], keywords[:1]).cache_key(str(input_file)) != key
+    assert Word2VecPreprocessor([], keywords, normalize=True).cache_key(str(input_file)) != key
@@ -0,0 +1,174 @@
+import pytest
+from unittest import mock
+import pandas as pd
+import json
+import os
+import sys
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.word2vec_embedding_trend_analysis import Word2Vec_Embedding_Analysis
+
+class FakeLemmatizer:
+    """Strips a trailing 's', standing in for the WordNet lemmatizer."""
+
+    def lemmatize(self, word):
+        return word[:-1] if word.endswith('s') else word
+
+@pytest.fixture
+def analysis(tmp_path):
+    input_file = tmp_path / 'jobs.csv'
+    pd.DataFrame({
+        'Description': [
+            'Social media and content for brands',
+            'Digital marketing with ads',
+            'Content writer',
+            'Market research analyst and PR',
+            'Branding and social media',
+            'Backend developer',
+        ],
+        'CreatedAt': ['2020-02-01', '2020-03-01', '2020-08-01', '2020-09-01', '2021-01-15', '2021-02-01'],
+    }).to_csv(input_file, index=False)
+    keywords_file = tmp_path / 'keywords.json'
+    keywords_file.write_text(json.dumps(['social media', 'digital marketing', 'market research', 'ads']))
+
+    with mock.patch('modules.word2vec_preprocessing.WordNetLemmatizer', FakeLemmatizer):
+        yield Word2Vec_Embedding_Analysis(str(input_file), str(tmp_path / 'output'), str(keywords_file), ['and', 'for'])
+
+def reference_trend_data(analysis):
+    """Trend percentages computed with per-document membership tests, for comparison."""
+    df = analysis.df.copy()
+    created_at = pd.to_datetime(df['CreatedAt'])
+    df['half_year'] = created_at.dt.year.astype(str) + " H" + ((created_at.dt.month - 1) // 6 + 1).astype(str)
+    for group, terms in analysis.TRACKED_KEYWORDS.items():
+        terms = [analysis.preprocessor.normalize_term(term) for term in terms]
+        df[group] = df['cleaned_text'].apply(lambda tokens: any(term in tokens for term in terms))
+    return df.groupby('half_year')[list(analysis.TRACKED_KEYWORDS.keys())].mean() * 100
+
+# Unit Tests
+def test_trend_data_matches_reference(analysis):
+    trend_data = analysis.compute_trend_data()
+    pd.testing.assert_frame_equal(trend_data, reference_trend_data(analysis), check_dtype=False)
+
+def test_trend_data_values(analysis):
+    trend_data = analysis.compute_trend_data()
+    assert list(trend_data.index) == ['2020 H1', '2020 H2', '2021 H1']
+    assert trend_data.loc['2020 H1', 'social_media'] == pytest.approx(50.0)
+    assert trend_data.loc['2020 H1', 'brand'] == pytest.approx(50.0)
+    assert trend_data.loc['2020 H2', 'market_research'] == pytest.approx(50.0)
+    assert trend_data.loc['2021 H1', 'branding'] == pytest.approx(50.0)
+
+def test_trend_table_computed_once(analysis):
+    with mock.patch.object(analysis.trend_tracker, 'compute', wraps=analysis.trend_tracker.compute) as compute:
+        analysis.compute_trend_data()
+        analysis.compute_trend_data(analysis.DEFAULT_DICTIONARY)
+    assert compute.call_count == 1
+
+def test_custom_trend_dictionaries(tmp_path):
+    input_file = tmp_path / 'jobs.csv'
+    pd.DataFrame({'Description': ['Machine learning in Python', 'Java developer'],
+                  'CreatedAt': ['2021-01-01', '2021-02-01']}).to_csv(input_file, index=False)
+    keywords_file = tmp_path / 'keywords.json'
+    keywords_file.write_text('[]')
+    dictionaries = {'Data': {'ml': ['machine learning'], 'languages': ['python', 'java']}}
+
+    with mock.patch('modules.word2vec_preprocessing.WordNetLemmatizer', FakeLemmatizer):
+        analysis = Word2Vec_Embedding_Analysis(str(input_file), str(tmp_path / 'output'), str(keywords_file), [],
+                                               trend_dictionaries=dictionaries)
+    trend_data = analysis.compute_trend_data('Data')
+    assert list(trend_data.columns) == ['ml', 'languages']
+    assert trend_data.loc['2021 H1', 'ml'] == pytest.approx(50.0)
+    assert trend_data.loc['2021 H1', 'languages'] == pytest.approx(100.0)
+    assert analysis._output_file('Data', 'trends.png').endswith('data_keywords_trends.png')
+
+def test_cached_trend_data_is_not_mutated(analysis):
+    trend_data = analysis.compute_trend_data()
+    trend_data.drop(columns=['content'], inplace=True)
+    assert 'content' in analysis.compute_trend_data().columns
+
+def test_token_file_has_one_line_per_document(analysis, tmp_path):
+    path = tmp_path / 'tokens.txt'
+    assert analysis.write_token_file(str(path)) == len(analysis.df)
+    lines = path.read_text().splitlines()
+    assert lines[2] == 'content writer'
+
+# Integration Tests
+def test_incremental_training_adds_new_postings(tmp_path):
+    input_file = tmp_path / 'jobs.csv'
+    postings = pd.DataFrame({
+        'Description': ['Social media and content', 'Digital marketing with ads', 'Content writer', 'Backend developer'],
+        'CreatedAt': ['2020-02-01', '2020-03-01', '2020-09-01', '2021-03-01'],
+    })
+    postings.iloc[:3].to_csv(input_file, index=False)
+    keywords_file = tmp_path / 'keywords.json'
+    keywords_file.write_text('[]')
+
+    def build_analysis():
+        return Word2Vec_Embedding_Analysis(str(input_file), str(tmp_path / 'output'), str(keywords_file), [])
+
+    analysis = build_analysis()
+    analysis.tokenize_and_train(workers=1, epochs=2)
+    versions = analysis.load_model_versions()
+    assert versions[0]['mode'] == 'full'
+    assert versions[0]['data_end'].startswith('2020-09-01')
+    assert 'backend' not in analysis.word2vec_model.wv
+
+    # A month later the new posting has been appended to the dataset
+    postings.to_csv(input_file, index=False)
+    analysis = build_analysis()
+    analysis.tokenize_and_train(incremental=True, workers=1)
+    versions = analysis.load_model_versions()
+    assert [version['mode'] for version in versions] == ['full', 'incremental']
+    assert versions[1]['n_documents'] == 1
+    assert versions[1]['data_start'] == versions[0]['data_start']
+    assert versions[1]['data_end'].startswith('2021-03-01')
+    assert 'backend' in analysis.word2vec_model.wv
+    assert 'content' in analysis.word2vec_model.wv
+
+def test_training_streams_the_corpus(analysis):
+    analysis.CHUNK_SIZE = 2
+    preprocess_many = mock.Mock(wraps=analysis.preprocessor.preprocess_many)
+    with mock.patch.object(analysis.preprocessor, 'preprocess_many', preprocess_many):
+        analysis.tokenize_and_train(workers=1, epochs=1)
+    # Tokenized in chunks, without building the token column
+    assert [len(call.args[0]) for call in preprocess_many.call_args_list] == [2, 2, 2]
+    assert 'cleaned_text' not in analysis.df
+    corpus = os.path.join(analysis.output_subfolder, analysis.CORPUS_FILE)
+    assert len(open(corpus).read().splitlines()) == len(analysis.df)
+    assert not os.path.exists(corpus + '.tmp')
+
+def test_descriptions_are_streamed_when_tokenized(analysis):
+    # Only the dates are held in the frame; the descriptions are read in chunks when tokenized
+    assert list(analysis.df.columns) == ['CreatedAt']
+    analysis.CHUNK_SIZE = 4
+    descriptions = pd.read_csv(analysis.input_file)['Description']
+    with mock.patch.object(analysis, 'read_description_chunks', wraps=analysis.read_description_chunks) as chunks:
+        cleaned_text = analysis.get_cleaned_text()
+    chunks.assert_called_once_with(analysis.input_file, None, 4)
+    assert cleaned_text.tolist() == [analysis.preprocess(text) for text in descriptions]
+
+def test_incremental_training_without_new_postings(analysis):
+    analysis.tokenize_and_train(workers=1, epochs=1)
+    analysis.tokenize_and_train(incremental=True, workers=1)
+    assert len(analysis.load_model_versions()) == 1
+
+def test_date_range_skips_descriptions_outside(tmp_path):
+    input_file = tmp_path / 'jobs.csv'
+    pd.DataFrame({
+        'Description': ['old posting', 'multi-line\nposting', 'recent posting', 'undated posting'],
+        'CreatedAt': ['2019-05-01', '2020-03-01', '2021-02-01', None],
+    }).to_csv(input_file, index=False)
+
+    df = Word2Vec_Embedding_Analysis.load_descriptions(str(input_file), ('2020-01-01', None))
+
+    assert df['Description'].tolist() == ['multi-line\nposting', 'recent posting']
+    assert len(Word2Vec_Embedding_Analysis.load_descriptions(str(input_file))) == 4
+    dates = Word2Vec_Embedding_Analysis.load_descriptions(str(input_file), ('2020-01-01', None), columns=['CreatedAt'])
+    assert dates['CreatedAt'].tolist() == ['2020-03-01', '2021-02-01']
@@ -15,6 +15,7 @@ src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
 sys.path.insert(0, src_dir)
 
 from modules.word_clouds import WordCloudGenerator
+import numpy as np
 
 @pytest.fixture
 def sample_df():
@@ -41,6 +42,21 @@ def keyword_dict():
 def mock_stopwords():
     return ['the', 'and', 'is', 'in', 'of', 'with']
 
+class FakeEmbedder:
+    """Embeds each keyword as a fixed vector derived from its characters."""
+    def __init__(self, model_name):
+        pass
+
+    def generate_embeddings(self, keywords):
+        return [[1.0 + len(keyword), 1.0 + sum(map(ord, keyword)) % 7, 1.0] for keyword in keywords]
+
+def make_generator(output_folder, n_topics, **kwargs):
+    words = ['python', 'java', 'sql', 'sales', 'marketing', 'design']
+    keyword_dict = {f'Topic {t}': [words[(t + i) % len(words)] for i in range(3)] for t in range(n_topics)}
+    embeddings = np.random.default_rng(0).random((10, 3)).astype(np.float32)
+    return WordCloudGenerator(embeddings, keyword_dict, str(output_folder), 'Job Roles', [], 'description_embeddings',
+                              **kwargs)
+
 # Unit Tests
 
 @patch('modules.text_preprocessor.TextPreprocessor.load_stopwords')
@@ -133,6 +149,12 @@ def test_generate_wordcloud_for_topic_with_invalid_column(mock_savefig, mock_mak
     with pytest.raises(KeyError):
         generator.generate_wordcloud_for_topic()
 
+
+def test_generator_is_pickled_without_embeddings(tmp_path):
+    generator = make_generator(tmp_path, 1)
+    assert generator.__getstate__()['embeddings_data'] is None
+    assert generator.embeddings_data is not None
+
 # Integration Tests
 
 @patch('modules.text_preprocessor.TextPreprocessor.load_stopwords')
@@ -176,4 +198,26 @@ def test_integration_wordcloud_generator_valid(mock_savefig, mock_makedirs, mock
     # Check that the image paths are returned and mock functions were called
     assert len(image_paths) > 0  # Ensure at least one image was generated
     mock_makedirs.assert_called()  # Ensure the output folder creation was attempted
-    mock_savefig.assert_called()  # Ensure plt.savefig was called to save the images
\ No newline at end of file
+    mock_savefig.assert_called()  # Ensure plt.savefig was called to save the images
+
+@patch('modules.word_clouds.SSEMEmbedder', FakeEmbedder)
+def test_sequential_groups_cache_layouts(tmp_path):
+    cache = tmp_path / 'cache'
+    image_paths = make_generator(tmp_path / 'out', 21, layout_cache_folder=str(cache)).generate_wordcloud_for_topic()
+    assert [os.path.basename(path).split('_')[2] for path in image_paths] == ['1', '2']
+    assert all(os.path.isfile(path) for path in image_paths)
+    # Topics with the same keywords share one layout
+    assert len(os.listdir(cache)) == 6
+
+@patch('modules.word_clouds.SSEMEmbedder', FakeEmbedder)
+def test_parallel_groups_match_sequential(tmp_path, monkeypatch):
+    # Use the pool even on a single CPU
+    monkeypatch.setattr(os, 'cpu_count', lambda: 2)
+    cache = tmp_path / 'cache'
+    sequential = make_generator(tmp_path / 'sequential', 21, layout_cache_folder=str(cache)).generate_wordcloud_for_topic()
+    parallel = make_generator(tmp_path / 'parallel', 21, max_workers=2,
+                              layout_cache_folder=str(cache)).generate_wordcloud_for_topic()
+    assert [os.path.basename(path).split('_')[2] for path in parallel] == ['1', '2']
+    assert all(os.path.isfile(path) for path in parallel)
+    assert len(sequential) == len(parallel)
+    assert len(os.listdir(cache)) == 6
@@ -0,0 +1,85 @@
+import pytest
+import numpy as np
+import os
+import sys
+from unittest.mock import patch
+
+# Add the src folder to the Python path
+current_dir = os.path.dirname(__file__)
+
+# Traverse up the directory structure to find 'src'
+src_dir = os.path.abspath(os.path.join(current_dir, '../../src'))
+
+# Add 'src' to the Python path
+sys.path.insert(0, src_dir)
+
+from modules.wordcloud_layouts import layout_key, wordcloud_layout, render_wordcloud, evict_layouts
+from modules.topic_modeling_visualisation import wordcloud_image
+
+FREQUENCIES = {'python': 3.0, 'java': 2.0, 'sql': 1.0}
+
+# Unit Tests
+def test_layout_key_ignores_word_order():
+    reordered = dict(reversed(list(FREQUENCIES.items())))
+    assert layout_key(FREQUENCIES, 200, 100, 'viridis') == layout_key(reordered, 200, 100, 'viridis')
+
+@pytest.mark.parametrize('frequencies, width, height, colormap', [
+    ({'python': 3.0, 'java': 2.5, 'sql': 1.0}, 200, 100, 'viridis'),
+    (FREQUENCIES, 300, 100, 'viridis'),
+    (FREQUENCIES, 200, 100, 'plasma'),
+])
+def test_layout_key_depends_on_frequencies_size_and_colormap(frequencies, width, height, colormap):
+    assert layout_key(frequencies, width, height, colormap) != layout_key(FREQUENCIES, 200, 100, 'viridis')
+
+def test_cached_layout_is_reused(tmp_path):
+    cache = str(tmp_path / 'cache')
+    layout = wordcloud_layout(FREQUENCIES, cache, width=200, height=100)
+    assert sorted(word for (word, _), *_ in layout) == sorted(FREQUENCIES)
+    assert os.listdir(cache) == [f"{layout_key(FREQUENCIES, 200, 100, 'viridis')}.json"]
+    with patch('modules.wordcloud_layouts.WordCloud.generate_from_frequencies') as generate:
+        assert wordcloud_layout(FREQUENCIES, cache, width=200, height=100) == layout
+    generate.assert_not_called()
+
+def test_render_wordcloud_draws_cached_layout(tmp_path):
+    cache = str(tmp_path / 'cache')
+    first = render_wordcloud(FREQUENCIES, cache, width=200, height=100)
+    assert first.shape == (100, 200, 3)
+    np.testing.assert_array_equal(render_wordcloud(FREQUENCIES, cache, width=200, height=100), first)
+    # The background is not part of the layout
+    render_wordcloud(FREQUENCIES, cache, width=200, height=100, background_color='black')
+    assert len(os.listdir(cache)) == 1
+
+def test_evict_layouts_removes_least_recently_used(tmp_path):
+    cache = str(tmp_path / 'cache')
+    frequencies = [{'python': 3.0, 'java': float(i + 1)} for i in range(3)]
+    paths = []
+    for age, frequency in enumerate(frequencies):
+        wordcloud_layout(frequency, cache, width=200, height=100)
+        paths.append(os.path.join(cache, f"{layout_key(frequency, 200, 100, 'viridis')}.json"))
+        os.utime(paths[-1], ns=(age * 10 ** 9, age * 10 ** 9))
+    # Reading a layout marks it as recently used
+    wordcloud_layout(frequencies[0], cache, width=200, height=100)
+
+    size = os.path.getsize(paths[1])
+    budget = sum(os.path.getsize(path) for path in paths) - size
+    assert evict_layouts(cache, budget) == [paths[1]]
+    assert sorted(os.listdir(cache)) == sorted(os.path.basename(path) for path in (paths[0], paths[2]))
+    assert evict_layouts(cache, budget) == []
+    assert evict_layouts(str(tmp_path / 'missing'), 0) == []
+
+def test_evicted_layout_is_recomputed(tmp_path):
+    cache = str(tmp_path / 'cache')
+    wordcloud_layout(FREQUENCIES, cache, width=200, height=100)
+    evict_layouts(cache, 0)
+    assert os.listdir(cache) == []
+    layout = wordcloud_layout(FREQUENCIES, cache, width=200, height=100)
+    assert sorted(word for (word, _), *_ in layout) == sorted(FREQUENCIES)
+    assert os.listdir(cache) == [f"{layout_key(FREQUENCIES, 200, 100, 'viridis')}.json"]
+
+# Integration Tests
+def test_layouts_are_shared_with_topic_model_word_clouds(tmp_path):
+    cache = str(tmp_path / 'cache')
+    wordcloud_image(['python', 'java'], cache, width=200, height=100)
+    with patch('modules.wordcloud_layouts.WordCloud.generate_from_frequencies') as generate:
+        render_wordcloud({'python': 1, 'java': 1}, cache, width=200, height=100)
+    generate.assert_not_called()